@@ -0,0 +1,343 @@
+import os
+import time
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Hesap özetinin önbellekte geçerli kalacağı süre (saniye)
+DEFAULT_ACCOUNT_TTL = float(os.getenv('ACCOUNT_CACHE_TTL', '5'))
+
+# Aynı anda yapılacak en fazla hesap isteği
+DEFAULT_ACCOUNT_WORKERS = int(os.getenv('ACCOUNT_FETCH_WORKERS', '4'))
+
+# Bu durumlardaki emirler açık sayılır
+OPEN_ORDER_STATUSES = ('NEW', 'PARTIALLY_FILLED')
+
+
+def client_key(client) -> Hashable:
+    """Hesap özetinin anahtarı: API anahtarı, testnet ve futures modu"""
+    return getattr(client, 'api_key', None), bool(getattr(client, 'testnet', False)), bool(getattr(client, 'futures', False))
+
+
+def _upsert(items: List[Dict], match: Callable[[Dict], bool], values: Optional[Dict]) -> List[Dict]:
+    """Listede eşleşen kaydı güncelle/ekle (values None ise sil); yeni liste döner"""
+    result = []
+    found = False
+    for item in items:
+        if match(item):
+            found = True
+            if values is not None:
+                result.append(dict(item, **values))
+        else:
+            result.append(item)
+    if not found and values is not None:
+        result.append(values)
+    return result
+
+
+def _order_from_event(order: Dict) -> Dict:
+    """executionReport / ORDER_TRADE_UPDATE alanlarını REST emir alanlarına çevir"""
+    return {
+        'symbol': order.get('s'),
+        'orderId': order.get('i'),
+        'clientOrderId': order.get('c'),
+        'side': order.get('S'),
+        'type': order.get('o'),
+        'price': order.get('p'),
+        'origQty': order.get('q'),
+        'executedQty': order.get('z'),
+        'status': order.get('X'),
+    }
+
+
+class AccountService:
+    """
+    Hesap durumu (bakiyeler, açık emirler, pozisyonlar) servisi
+
+    Hesap ve açık emir istekleri eşzamanlı yapılır; futures modunda pozisyonlar
+    aynı futures_account yanıtından alınır. Sadece bakiye gereken yerler
+    open_orders=False ile ağırlığı yüksek sembolsüz açık emir çağrısını atlar;
+    bu özet ayrı önbelleklenir. Özet, istemci anahtarına göre kısa
+    bir süre (TTL) önbellekte tutulur ve aynı anda gelen istekler tek bir
+    Binance çağrısını paylaşır; böylece birçok sekmeden gelen yenilemeler
+    borsaya tek istek olarak yansır. Kullanıcı veri akışına bağlanan hesaplar
+    (attach_stream) için özet süresiz geçerlidir ve apply_user_data_event ile
+    gelen olaylarla güncel tutulur.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_ACCOUNT_TTL, max_workers: int = DEFAULT_ACCOUNT_WORKERS):
+        """
+        Args:
+            ttl (float, optional): Önbellek süresi (saniye). Defaults to 5.
+            max_workers (int, optional): Eşzamanlı istek sayısı. Defaults to 4.
+        """
+        self.ttl = ttl
+        self.logger = logging.getLogger('account_service')
+        # Binance çağrıları ve hesap bazlı görevler ayrı havuzlarda çalışır (iç içe beklemede kilitlenmez)
+        self._calls = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='account-call')
+        self._tasks = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='account')
+        self._snapshots: Dict[Hashable, tuple] = {}
+        self._inflight: Dict[Hashable, Future] = {}
+        self._streaming = set()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.shared = 0
+        self.fetches = 0
+        self.errors = 0
+        self.stream_events = 0
+        self.fetch_ms = 0.0
+
+    def _fetch(self, client, open_orders: bool = True) -> Dict:
+        """Hesap ve (istenirse) açık emirleri eşzamanlı çek"""
+        started = time.perf_counter()
+        if open_orders:
+            account_future = self._calls.submit(client.get_account)
+            orders = client.get_open_orders() or []
+            account = account_future.result()
+        else:
+            account, orders = client.get_account(), None
+
+        balances, positions = [], []
+        if isinstance(account, dict):
+            if 'balances' in account:
+                balances = account['balances']
+            elif 'assets' in account:
+                balances = account['assets']
+            if getattr(client, 'futures', False):
+                # get_positions ile aynı filtre; ayrı bir futures_account çağrısı gerekmez
+                positions = [p for p in account.get('positions', []) if float(p.get('positionAmt', 0)) != 0]
+
+        elapsed = (time.perf_counter() - started) * 1000
+        with self._lock:
+            self.fetches += 1
+            self.fetch_ms += elapsed
+        return {
+            'account': account,
+            'balances': balances,
+            'open_orders': orders,
+            'positions': positions,
+            'futures': bool(getattr(client, 'futures', False)),
+            'updated': int(time.time() * 1000),
+            'source': 'rest',
+        }
+
+    @staticmethod
+    def _cacheable(snapshot: Dict) -> bool:
+        """Hata yanıtları önbelleğe alınmaz"""
+        account = snapshot['account']
+        return (isinstance(account, dict) and 'error' not in account
+                and not ('code' in account and account['code'] < 0))
+
+    def _fresh(self, key: Hashable, max_age: float) -> Optional[Dict]:
+        """Önbellekteki özet hâlâ geçerliyse döndür (kilit altında çağrılır)"""
+        cached = self._snapshots.get(key)
+        if cached is not None and max_age > 0 and (key[0] in self._streaming or time.monotonic() - cached[0] < max_age):
+            return cached[1]
+        return None
+
+    def snapshot(self, client, max_age: Optional[float] = None, open_orders: bool = True) -> Dict:
+        """
+        Hesap özetini önbellekten veya Binance'den al
+
+        Args:
+            client (BinanceClient): Binance istemcisi
+            max_age (float, optional): Kabul edilecek en eski özet (saniye); 0 her zaman yeniden çeker.
+                Defaults to None (TTL).
+            open_orders (bool, optional): Açık emirleri de çek. False ise sadece hesap çağrısı yapılır
+                ve özetteki open_orders None olur (geçerli tam özet varsa o döner). Defaults to True.
+
+        Returns:
+            dict: account (ham yanıt), balances, open_orders, positions, futures, updated (ms), source
+        """
+        key = (client_key(client), bool(open_orders))
+        max_age = self.ttl if max_age is None else max_age
+        with self._lock:
+            cached = self._fresh(key, max_age)
+            if cached is None and not open_orders:
+                # Tam özet bakiye isteğini de karşılar
+                cached = self._fresh((key[0], True), max_age)
+            if cached is not None:
+                self.hits += 1
+                return cached
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                self.misses += 1
+                future = self._inflight[key] = Future()
+            else:
+                self.shared += 1
+
+        if not owner:
+            return future.result()
+
+        try:
+            snapshot = self._fetch(client, open_orders)
+        except Exception as e:
+            with self._lock:
+                self.errors += 1
+                self._inflight.pop(key, None)
+            future.set_exception(e)
+            raise
+        with self._lock:
+            if self._cacheable(snapshot):
+                self._snapshots[key] = (time.monotonic(), snapshot)
+            self._inflight.pop(key, None)
+        future.set_result(snapshot)
+        return snapshot
+
+    def snapshots(self, providers: Dict[str, Callable[[], Any]], max_age: Optional[float] = None,
+                  open_orders: bool = True) -> Dict[str, Any]:
+        """
+        Birden fazla hesabın özetini eşzamanlı al (ör. testnet ve canlı)
+
+        Args:
+            providers (dict): Ad -> istemciyi döndüren fonksiyon (istemci yoksa None döndürür)
+            max_age (float, optional): snapshot ile aynı. Defaults to None.
+            open_orders (bool, optional): snapshot ile aynı. Defaults to True.
+
+        Returns:
+            dict: Ad -> özet; istemci yoksa None, hata olursa yakalanan Exception
+        """
+        def run(provider):
+            client = provider()
+            return None if client is None else self.snapshot(client, max_age, open_orders)
+
+        futures = {name: self._tasks.submit(run, provider) for name, provider in providers.items()}
+        results = {}
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                results[name] = e
+        return results
+
+    def invalidate(self, client=None) -> None:
+        """
+        Özeti önbellekten düşür (emir verildikten/iptal edildikten sonra)
+
+        Args:
+            client (BinanceClient, optional): İstemci. Defaults to None (tüm özetler).
+        """
+        with self._lock:
+            if client is None:
+                self._snapshots.clear()
+            else:
+                self._drop(client_key(client))
+
+    def _drop(self, account_key: Hashable) -> None:
+        """Hesabın tam ve sadece bakiye özetlerini düşür (kilit altında çağrılır)"""
+        for open_orders in (True, False):
+            self._snapshots.pop((account_key, open_orders), None)
+
+    def attach_stream(self, client) -> None:
+        """Hesap kullanıcı veri akışına bağlandı: özet artık süre dolunca yeniden çekilmez"""
+        with self._lock:
+            self._streaming.add(client_key(client))
+
+    def detach_stream(self, client) -> None:
+        """Akış koptu: özet tekrar TTL ile yenilenir"""
+        with self._lock:
+            self._streaming.discard(client_key(client))
+            self._drop(client_key(client))
+
+    def apply_user_data_event(self, client, event: Dict) -> bool:
+        """
+        Kullanıcı veri akışı olayını önbellekteki özete uygula
+
+        Spot outboundAccountPosition/executionReport ve futures
+        ACCOUNT_UPDATE/ORDER_TRADE_UPDATE olayları işlenir. Özet yerinde
+        değiştirilmez; yeni bir kopya yayınlanır.
+
+        Args:
+            client (BinanceClient): Olayın geldiği hesabın istemcisi
+            event (dict): Binance kullanıcı veri akışı olayı
+
+        Returns:
+            bool: Olay uygulandıysa True (önbellekte özet yoksa veya olay tanınmıyorsa False)
+        """
+        account_key = client_key(client)
+        event_type = event.get('e')
+        if event_type not in ('outboundAccountPosition', 'ACCOUNT_UPDATE', 'executionReport', 'ORDER_TRADE_UPDATE'):
+            return False
+        applied = False
+        with self._lock:
+            for key in ((account_key, True), (account_key, False)):
+                cached = self._snapshots.get(key)
+                if cached is None:
+                    continue
+                self._snapshots[key] = (time.monotonic(), self._apply_event(cached[1], event_type, event))
+                applied = True
+            if applied:
+                self.stream_events += 1
+        return applied
+
+    @staticmethod
+    def _apply_event(snapshot: Dict, event_type: str, event: Dict) -> Dict:
+        """Olayı özetin bir kopyasına uygula"""
+        snapshot = dict(snapshot)
+        if event_type == 'outboundAccountPosition':
+            for balance in event.get('B', []):
+                snapshot['balances'] = _upsert(
+                    snapshot['balances'], lambda item, asset=balance.get('a'): item.get('asset') == asset,
+                    {'asset': balance.get('a'), 'free': balance.get('f'), 'locked': balance.get('l')})
+        elif event_type == 'ACCOUNT_UPDATE':
+            update = event.get('a', {})
+            for balance in update.get('B', []):
+                snapshot['balances'] = _upsert(
+                    snapshot['balances'], lambda item, asset=balance.get('a'): item.get('asset') == asset,
+                    {'asset': balance.get('a'), 'walletBalance': balance.get('wb'),
+                     'crossWalletBalance': balance.get('cw')})
+            for position in update.get('P', []):
+                values = None
+                if float(position.get('pa', 0)) != 0:
+                    values = {'symbol': position.get('s'), 'positionSide': position.get('ps'),
+                              'positionAmt': position.get('pa'), 'entryPrice': position.get('ep'),
+                              'unrealizedProfit': position.get('up')}
+                snapshot['positions'] = _upsert(
+                    snapshot['positions'],
+                    lambda item, p=position: item.get('symbol') == p.get('s') and item.get('positionSide', p.get('ps')) == p.get('ps'),
+                    values)
+        elif snapshot['open_orders'] is not None:
+            # Sadece bakiye özetinde emir listesi tutulmaz
+            order = _order_from_event(event.get('o') if event_type == 'ORDER_TRADE_UPDATE' else event)
+            values = order if order['status'] in OPEN_ORDER_STATUSES else None
+            snapshot['open_orders'] = _upsert(
+                snapshot['open_orders'],
+                lambda item: item.get('orderId') == order['orderId'] and item.get('symbol') == order['symbol'],
+                values)
+
+        snapshot['updated'] = int(event.get('E') or time.time() * 1000)
+        snapshot['source'] = 'stream'
+        return snapshot
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'ttl': self.ttl,
+                'snapshots': len(self._snapshots),
+                'streaming': len(self._streaming),
+                'hits': self.hits,
+                'misses': self.misses,
+                'shared': self.shared,
+                'fetches': self.fetches,
+                'errors': self.errors,
+                'stream_events': self.stream_events,
+                'fetch_avg_ms': round(self.fetch_ms / self.fetches, 2) if self.fetches else 0.0,
+            }
+
+
+_account_service = None
+_account_service_lock = threading.Lock()
+
+
+def get_account_service() -> AccountService:
+    """Süreç genelinde paylaşılan hesap servisi"""
+    global _account_service
+    with _account_service_lock:
+        if _account_service is None:
+            _account_service = AccountService()
+        return _account_service
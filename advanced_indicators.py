@@ -2,6 +2,111 @@ import pandas as pd
 import numpy as np
 import logging
 
+from indicator_cache import cache_for
+from numba_compat import NUMBA_AVAILABLE, njit
+
+
+@njit(cache=True)
+def _supertrend_kernel(hl2, atr, close, multiplier, start, final_upper, final_lower, supertrend, direction):
+    """
+    Supertrend döngüsü (numba varsa derlenir, yoksa Python listeleri üzerinde çalışır)
+
+    Bantlar standart kurallarla taşınır: üst bant sadece düşerse veya önceki kapanış
+    bandın üstündeyse, alt bant sadece yükselirse veya önceki kapanış bandın altındaysa
+    güncellenir. Çıktı dizileri yerinde doldurulur.
+    """
+    n = len(close)
+    if start >= n:
+        return
+
+    final_upper[start] = hl2[start] + multiplier * atr[start]
+    final_lower[start] = hl2[start] - multiplier * atr[start]
+    if close[start] < final_lower[start]:
+        direction[start] = -1
+        supertrend[start] = final_upper[start]
+    else:
+        direction[start] = 1
+        supertrend[start] = final_lower[start]
+
+    for i in range(start + 1, n):
+        basic_upper = hl2[i] + multiplier * atr[i]
+        basic_lower = hl2[i] - multiplier * atr[i]
+        prev_upper = final_upper[i - 1]
+        prev_lower = final_lower[i - 1]
+        prev_close = close[i - 1]
+
+        # Son bantların taşınması
+        if basic_upper < prev_upper or prev_close > prev_upper:
+            final_upper[i] = basic_upper
+        else:
+            final_upper[i] = prev_upper
+        if basic_lower > prev_lower or prev_close < prev_lower:
+            final_lower[i] = basic_lower
+        else:
+            final_lower[i] = prev_lower
+
+        # Yön: aşağı trendde kapanış üst bandı, yukarı trendde alt bandı kırarsa döner
+        if direction[i - 1] == -1:
+            if close[i] > final_upper[i]:
+                direction[i] = 1
+            else:
+                direction[i] = -1
+        else:
+            if close[i] < final_lower[i]:
+                direction[i] = -1
+            else:
+                direction[i] = 1
+
+        if direction[i] == 1:
+            supertrend[i] = final_lower[i]
+        else:
+            supertrend[i] = final_upper[i]
+
+
+def supertrend_arrays(high: np.ndarray, low: np.ndarray, close: np.ndarray, atr: np.ndarray, multiplier: float = 3):
+    """
+    NumPy dizileri üzerinde Supertrend hesapla
+
+    Args:
+        high: Yüksek fiyatlar
+        low: Düşük fiyatlar
+        close: Kapanış fiyatları
+        atr: Average True Range değerleri (başta NaN olabilir)
+        multiplier: ATR çarpanı
+
+    Returns:
+        tuple: (supertrend, direction, final_upper, final_lower) dizileri. ATR'nin
+        hesaplanamadığı ilk satırlarda supertrend 0, yön 0 ve bantlar NaN'dır.
+    """
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    close = np.asarray(close, dtype=np.float64)
+    atr = np.asarray(atr, dtype=np.float64)
+    n = len(close)
+
+    hl2 = (high + low) / 2
+    valid = np.flatnonzero(np.isfinite(atr) & np.isfinite(hl2))
+    start = int(valid[0]) if len(valid) else n
+
+    if NUMBA_AVAILABLE:
+        final_upper = np.full(n, np.nan)
+        final_lower = np.full(n, np.nan)
+        supertrend = np.zeros(n)
+        direction = np.zeros(n, dtype=np.int64)
+        _supertrend_kernel(hl2, atr, close, float(multiplier), start, final_upper, final_lower, supertrend, direction)
+        return supertrend, direction, final_upper, final_lower
+
+    # Numba yoksa: Python listeleri üzerinde döngü, NumPy skalerlerinden çok daha hızlıdır
+    final_upper = [np.nan] * n
+    final_lower = [np.nan] * n
+    supertrend = [0.0] * n
+    direction = [0] * n
+    _supertrend_kernel(hl2.tolist(), atr.tolist(), close.tolist(), float(multiplier), start,
+                       final_upper, final_lower, supertrend, direction)
+    return (np.asarray(supertrend, dtype=np.float64), np.asarray(direction, dtype=np.int64),
+            np.asarray(final_upper, dtype=np.float64), np.asarray(final_lower, dtype=np.float64))
+
+
 class AdvancedIndicators:
     """
     Gelişmiş teknik indikatörler sınıfı.
@@ -60,15 +165,7 @@ class AdvancedIndicators:
         Relative Strength Index (RSI) hesapla
         """
         try:
-            delta = df['close'].diff()
-            gain = delta.where(delta > 0, 0)
-            loss = -delta.where(delta < 0, 0)
-            
-            avg_gain = gain.rolling(window=period).mean()
-            avg_loss = loss.rolling(window=period).mean()
-            
-            rs = avg_gain / avg_loss
-            df['rsi'] = 100 - (100 / (1 + rs))
+            df['rsi'] = cache_for(df).rsi(df, period)
             return df
         except Exception as e:
             self.logger.error(f"RSI hesaplanırken hata: {str(e)}")
@@ -118,52 +215,23 @@ class AdvancedIndicators:
     def calculate_supertrend(self, df: pd.DataFrame, period=10, multiplier=3) -> pd.DataFrame:
         """
         Supertrend indikatörü hesapla
+
+        Hesaplama ham NumPy dizileri üzerinde yapılır (numba varsa derlenmiş çekirdekle).
+        'upperband' ve 'lowerband' sütunları taşınmış son bantları içerir.
         """
         try:
             # Önce ATR hesapla
             if 'atr' not in df.columns:
                 df = self.calculate_atr(df, period)
             
-            hl2 = (df['high'] + df['low']) / 2
-            
-            # Üst ve alt bantları hesapla
-            df['upperband'] = hl2 + (multiplier * df['atr'])
-            df['lowerband'] = hl2 - (multiplier * df['atr'])
+            supertrend, direction, final_upper, final_lower = supertrend_arrays(
+                df['high'].to_numpy(), df['low'].to_numpy(), df['close'].to_numpy(),
+                df['atr'].to_numpy(), multiplier)
             
-            # Supertrend hesapla
-            df['supertrend'] = 0.0
-            df['supertrend_direction'] = 0  # 1: yukarı trend, -1: aşağı trend
-            
-            for i in range(period, len(df)):
-                curr_close = df['close'].iloc[i]
-                prev_close = df['close'].iloc[i-1]
-                curr_upper = df['upperband'].iloc[i]
-                curr_lower = df['lowerband'].iloc[i]
-                prev_upper = df['upperband'].iloc[i-1]
-                prev_lower = df['lowerband'].iloc[i-1]
-                
-                # Önceki Supertrend değerini al
-                prev_supertrend = df['supertrend'].iloc[i-1]
-                prev_direction = df['supertrend_direction'].iloc[i-1]
-                
-                # Supertrend yönünü güncelle
-                if prev_supertrend == prev_upper:
-                    if curr_close > curr_upper:
-                        curr_direction = 1  # Yukarı trend
-                        curr_supertrend = curr_lower
-                    else:
-                        curr_direction = -1  # Aşağı trend
-                        curr_supertrend = curr_upper
-                else:
-                    if curr_close < curr_lower:
-                        curr_direction = -1  # Aşağı trend
-                        curr_supertrend = curr_upper
-                    else:
-                        curr_direction = 1  # Yukarı trend
-                        curr_supertrend = curr_lower
-                
-                df.at[df.index[i], 'supertrend'] = curr_supertrend
-                df.at[df.index[i], 'supertrend_direction'] = curr_direction
+            df['upperband'] = final_upper
+            df['lowerband'] = final_lower
+            df['supertrend'] = supertrend
+            df['supertrend_direction'] = direction  # 1: yukarı trend, -1: aşağı trend
             
             return df
         except Exception as e:
@@ -215,7 +283,7 @@ class AdvancedIndicators:
         """
         try:
             col_name = column_name if column_name else f'ema{period}'
-            df[col_name] = df['close'].ewm(span=period, adjust=False).mean()
+            df[col_name] = cache_for(df).ema(df, period)
             return df
         except Exception as e:
             print(f"EMA hesaplanırken hata: {str(e)}")
@@ -235,11 +303,8 @@ class AdvancedIndicators:
             pd.DataFrame: MACD eklenmiş veri çerçevesi
         """
         try:
-            fast_ema = df['close'].ewm(span=fast_period, adjust=False).mean()
-            slow_ema = df['close'].ewm(span=slow_period, adjust=False).mean()
-            df['macd_line'] = fast_ema - slow_ema
-            df['signal_line'] = df['macd_line'].ewm(span=signal_period, adjust=False).mean()
-            df['macd_histogram'] = df['macd_line'] - df['signal_line']
+            df['macd_line'], df['signal_line'], df['macd_histogram'] = cache_for(df).macd(
+                df, fast_period, slow_period, signal_period)
             return df
         except Exception as e:
             print(f"MACD hesaplanırken hata: {str(e)}")
@@ -284,10 +349,8 @@ class AdvancedIndicators:
             pd.DataFrame: Bollinger Bantları eklenmiş veri çerçevesi
         """
         try:
-            df['bb_middle'] = df['close'].rolling(window=period).mean()
-            df['bb_std'] = df['close'].rolling(window=period).std()
-            df['bb_upper'] = df['bb_middle'] + (df['bb_std'] * std_dev)
-            df['bb_lower'] = df['bb_middle'] - (df['bb_std'] * std_dev)
+            df['bb_middle'], df['bb_std'], df['bb_upper'], df['bb_lower'] = cache_for(df).bollinger(
+                df, period, std_dev)
             return df
         except Exception as e:
             print(f"Bollinger Bantları hesaplanırken hata: {str(e)}")
@@ -306,11 +369,7 @@ class AdvancedIndicators:
             pd.DataFrame: Stokastik Osilatör eklenmiş veri çerçevesi
         """
         try:
-            low_min = df['low'].rolling(window=k_period).min()
-            high_max = df['high'].rolling(window=k_period).max()
-            
-            df['stoch_k'] = 100 * ((df['close'] - low_min) / (high_max - low_min))
-            df['stoch_d'] = df['stoch_k'].rolling(window=d_period).mean()
+            df['stoch_k'], df['stoch_d'] = cache_for(df).stochastic(df, k_period, d_period)
             return df
         except Exception as e:
             print(f"Stokastik Osilatör hesaplanırken hata: {str(e)}")
@@ -3,6 +3,7 @@ import numpy as np
 from typing import Dict, List, Tuple
 import logging
 from advanced_indicators import AdvancedIndicators
+from signal_encoding import BUY, SELL, SIGNAL_DTYPE
 
 class AdvancedStrategy:
     """
@@ -235,7 +236,7 @@ class AdvancedStrategy:
             df = self.indicators.calculate_all(df)
             
             # Sinyalleri oluştur
-            df['signal'] = 0  # 0: bekle, 1: al, -1: sat
+            df['signal'] = np.zeros(len(df), dtype=SIGNAL_DTYPE)  # 0: bekle, 1: al, -1: sat
             
             # EMA çapraz geçişleri
             df['ema_cross'] = 0
@@ -265,8 +266,8 @@ class AdvancedStrategy:
                 sell_signals = sell_signals & (df['st_signal'] == -1)
             
             # Sinyalleri işaretle
-            df.loc[buy_signals, 'signal'] = 1
-            df.loc[sell_signals, 'signal'] = -1
+            df.loc[buy_signals, 'signal'] = BUY
+            df.loc[sell_signals, 'signal'] = SELL
             
             # Gereksiz sütunları temizle
             columns_to_keep = required_columns + ['signal']
@@ -384,15 +385,15 @@ class TrimLossStrategy(AdvancedStrategy):
             
             # Eğer super() sinyalleri üretmediyse, temel sinyaller oluştur
             if 'signal' not in df.columns:
-                df['signal'] = 0
+                df['signal'] = np.zeros(len(df), dtype=SIGNAL_DTYPE)
                 
                 # Basit sinyaller oluşturalım (örneğin)
                 df['ema_20'] = df['close'].ewm(span=20, adjust=False).mean()
                 df['ema_50'] = df['close'].ewm(span=50, adjust=False).mean()
                 
                 # EMA kesişimleri
-                df.loc[df['ema_20'] > df['ema_50'], 'signal'] = 1  # Alım sinyali
-                df.loc[df['ema_20'] < df['ema_50'], 'signal'] = -1  # Satım sinyali
+                df.loc[df['ema_20'] > df['ema_50'], 'signal'] = BUY  # Alım sinyali
+                df.loc[df['ema_20'] < df['ema_50'], 'signal'] = SELL  # Satım sinyali
             
             # Trim Loss stratejisine özgü iyileştirmeler ekle
             # (Bu bir örnek olarak tutuldu, gerçek bir uygulama daha komplex olabilir)
@@ -579,7 +580,7 @@ class MultiTimeframeStrategy(AdvancedStrategy):
             df = self.indicators.calculate_all(df)
             
             # Başlangıçta sinyal sütunu ekle
-            df['signal'] = 0  # 0: bekle, 1: al, -1: sat
+            df['signal'] = np.zeros(len(df), dtype=SIGNAL_DTYPE)  # 0: bekle, 1: al, -1: sat
             
             # Birden fazla indikatör kombinasyonu 
             # EMA sinyalleri
@@ -606,8 +607,8 @@ class MultiTimeframeStrategy(AdvancedStrategy):
             combined_signal = 0.3 * ema_signal + 0.2 * rsi_signal + 0.25 * stoch_rsi_signal + 0.25 * macd_signal
             
             # Final sinyal kararı
-            df.loc[combined_signal >= 0.5, 'signal'] = 1    # Alım sinyali
-            df.loc[combined_signal <= -0.5, 'signal'] = -1  # Satım sinyali
+            df.loc[combined_signal >= 0.5, 'signal'] = BUY    # Alım sinyali
+            df.loc[combined_signal <= -0.5, 'signal'] = SELL  # Satım sinyali
             
             # Gereksiz sütunları temizle
             columns_to_keep = required_columns + ['signal']
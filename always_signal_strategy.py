@@ -2,6 +2,8 @@ import pandas as pd
 import numpy as np
 import logging
 
+from signal_encoding import SIGNAL_DTYPE, count_signals, signal_column
+
 class AlwaysSignalStrategy:
     """
     Her zaman sinyal üreten basit bir strateji.
@@ -148,48 +150,32 @@ class AlwaysSignalStrategy:
             # Veri kopyası oluştur
             result_df = df.copy()
             
-            # Sinyal sütunu oluştur
-            result_df['signal'] = 'HOLD'  # Varsayılan olarak HOLD
-            
             # Timestamp sütunu oluştur (eğer yoksa)
             if 'timestamp' not in result_df.columns and not isinstance(result_df.index[0], pd.Timestamp):
-                result_df['timestamp'] = [i * 1000 for i in range(len(result_df))]
+                result_df['timestamp'] = np.arange(len(result_df), dtype=np.int64) * 1000
             
             # Veri aralığını logla
             self.logger.info(f"Veri aralığı: {result_df.index[0]} - {result_df.index[-1]}")
             
-            # Her 2 mumdan birinde sinyal üret (daha fazla sinyal)
-            for i in range(len(result_df)):
-                try:
-                    # Timestamp değerini al
-                    if 'timestamp' in result_df.columns:
-                        timestamp = result_df.iloc[i]['timestamp']
-                    elif isinstance(result_df.index[i], pd.Timestamp):
-                        timestamp = int(result_df.index[i].timestamp() * 1000)
-                    else:
-                        timestamp = i * 1000
-                    
-                    # Her 2 mumdan birinde sinyal üret (daha fazla sinyal)
-                    if i % self.signal_frequency == 0:
-                        # Timestamp'in son basamağı çift ise BUY, tek ise SELL
-                        if (timestamp // 1000) % 2 == 0:
-                            result_df.iloc[i, result_df.columns.get_loc('signal')] = 'BUY'
-                        else:
-                            result_df.iloc[i, result_df.columns.get_loc('signal')] = 'SELL'
-                    else:
-                        result_df.iloc[i, result_df.columns.get_loc('signal')] = 'HOLD'
-                
-                except Exception as e:
-                    self.logger.error(f"Satır {i} için sinyal üretilirken hata: {str(e)}")
-                    result_df.iloc[i, result_df.columns.get_loc('signal')] = 'HOLD'
+            # Milisaniye zaman damgaları (timestamp sütunu veya zaman indeksi)
+            if 'timestamp' in result_df.columns:
+                timestamps = result_df['timestamp'].to_numpy()
+                if np.issubdtype(timestamps.dtype, np.datetime64):
+                    timestamps = timestamps.astype('datetime64[ms]')
+                timestamps = timestamps.astype(np.int64)
+            else:
+                timestamps = pd.DatetimeIndex(result_df.index).values.astype('datetime64[ms]').astype(np.int64)
+            
+            # Her signal_frequency mumdan birinde sinyal üret;
+            # timestamp'in saniye değeri çift ise BUY, tek ise SELL
+            active = np.arange(len(result_df)) % self.signal_frequency == 0
+            even = (timestamps // 1000) % 2 == 0
+            result_df['signal'] = signal_column(active & even, active & ~even)
             
             # Sinyal dağılımını logla
-            signal_counts = result_df['signal'].value_counts()
-            self.logger.info(f"Sinyal dağılımı: {signal_counts.to_dict()}")
-            
-            # BUY ve SELL sinyallerinin sayısını kontrol et
-            buy_sell_count = result_df['signal'].isin(['BUY', 'SELL']).sum()
-            self.logger.info(f"Toplam BUY/SELL sinyali: {buy_sell_count}")
+            signal_counts = count_signals(result_df['signal'])
+            self.logger.info(f"Sinyal dağılımı: {signal_counts}")
+            self.logger.info(f"Toplam BUY/SELL sinyali: {signal_counts['BUY'] + signal_counts['SELL']}")
             
             return result_df
         
@@ -201,5 +187,5 @@ class AlwaysSignalStrategy:
             # Hata durumunda orijinal veriyi döndür
             if 'signal' not in df.columns:
                 df = df.copy()
-                df['signal'] = 'HOLD'
+                df['signal'] = np.zeros(len(df), dtype=SIGNAL_DTYPE)
             return df
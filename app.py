@@ -1,15 +1,28 @@
-from flask import Flask, request, jsonify, render_template, redirect, url_for, session
+from flask import Flask, Response, request, jsonify, render_template, redirect, url_for, session
 import pandas as pd
 import numpy as np
 import logging
 import json
 import os
 import time
+import threading
 from datetime import datetime, timedelta
 import traceback
 from binance_client import BinanceClient
 from strategy_manager import StrategyManager
 from risk_manager import RiskManager
+from config_service import get_config_service
+from account_service import get_account_service
+from fetch_engine import get_fetch_engine
+from kline_stream import get_kline_stream
+from kline_decoder import klines_to_dataframe
+from signal_encoding import decode_signals, signal_label
+from bot_runtime import BotRuntime, worker_id
+from candle_scheduler import ServerClock
+from backtest_jobs import FINISHED_STATES, get_job_manager, parse_backtest_request
+from backtest_cache import get_backtest_cache
+from backtest_serializer import columnar_result, dumps_json, negotiate_format, render, to_rows
+from downsample import DEFAULT_METHOD, METHODS as DOWNSAMPLE_METHODS, downsample_payload
 
 # Loglama ayarları
 logging.basicConfig(
@@ -32,6 +45,9 @@ strategy_manager = StrategyManager()
 # Risk yöneticisini oluştur
 risk_manager = RiskManager()
 
+# config.json ve risk ayarları dışarıdan değiştirilirse bellekteki kopyalar yenilenir
+get_config_service().start()
+
 # API anahtarlarını al
 api_key = os.environ.get('BINANCE_LIVE_API_KEY', '')
 api_secret = os.environ.get('BINANCE_LIVE_API_SECRET', '')
@@ -149,6 +165,19 @@ def index():
         testnet=testnet
     )
 
+def _curve_resolution(data=None):
+    """İstekteki equity eğrisi çözünürlüğü: (piksel genişliği veya None, yöntem)"""
+    data = data or {}
+    points = request.args.get('points') or data.get('points')
+    method = request.args.get('downsample') or data.get('downsample') or DEFAULT_METHOD
+    if method not in DOWNSAMPLE_METHODS:
+        raise ValueError(f"Geçersiz örnekleme yöntemi: {method}. Geçerli değerler: {', '.join(DOWNSAMPLE_METHODS)}")
+    try:
+        points = int(points) if points else None
+    except (TypeError, ValueError):
+        raise ValueError(f"Geçersiz nokta sayısı: {points}")
+    return points, method
+
 @app.route('/api/backtest/run', methods=['POST'])
 def run_backtest():
     """Backtest çalıştır"""
@@ -167,6 +196,19 @@ def run_backtest():
         trailing_stop_pct = float(data.get('trailing_stop_pct', 0)) if data.get('trailing_stop_pct') else None
         trailing_profit_pct = float(data.get('trailing_profit_pct', 0)) if data.get('trailing_profit_pct') else None
         risk_per_trade_pct = float(data.get('risk_per_trade_pct', 1))
+        exit_mode = data.get('exit_mode', 'close')
+        fill_priority = data.get('fill_priority', 'stop_first')
+        
+        try:
+            response_format = negotiate_format(request.args.get('format') or data.get('format'))
+            points, downsample_method = _curve_resolution(data)
+        except ValueError as format_error:
+            return jsonify({'error': str(format_error)}), 400
+        
+        if exit_mode not in ('close', 'high_low'):
+            return jsonify({'error': f'Geçersiz çıkış modu: {exit_mode}. Geçerli değerler: close, high_low'}), 400
+        if fill_priority not in ('stop_first', 'target_first'):
+            return jsonify({'error': f'Geçersiz dolum önceliği: {fill_priority}. Geçerli değerler: stop_first, target_first'}), 400
         
         logger.info(f"Backtest isteği alındı: {symbol} {interval} {strategy_name}")
         logger.info(f"İşlem aralığı: {start_date_str} - {end_date_str}")
@@ -176,11 +218,7 @@ def run_backtest():
             logger.error("Başlangıç veya bitiş tarihi belirtilmemiş")
             return jsonify({'error': 'Başlangıç ve bitiş tarihi gerekli'}), 400
             
-        # Strateji yöneticisini al
-        from strategy_manager import StrategyManager
-        strategy_manager = StrategyManager()
-        
-        # Strateji sınıfını al
+        # Strateji sınıfını al (modül seviyesindeki yöneticiden, kayıt süreç genelinde paylaşılır)
         try:
             logger.info(f"Strateji sınıfını alınıyor: {strategy_name}")
             strategy_class = strategy_manager.get_strategy_class(strategy_name)
@@ -287,78 +325,19 @@ def run_backtest():
                 logger.info(f"Backtest çalıştırılıyor...")
                 result = backtester.run(df, strategy, symbol, interval, initial_balance, 
                                     take_profit_pct, stop_loss_pct, trailing_stop_pct, trailing_profit_pct,
-                                    risk_per_trade_pct)
+                                    risk_per_trade_pct, exit_mode, fill_priority)
                 
                 if not result:
                     logger.error("Backtest sonuçları hesaplanamadı")
                     return jsonify({'error': 'Backtest sonuçları hesaplanamadı'}), 400
                     
-                # İşlem listesini hazırla
-                trades = []
-                for trade in result.trades:
-                    trades.append({
-                        'entry_time': trade.entry_time.strftime('%Y-%m-%d %H:%M:%S') if hasattr(trade.entry_time, 'strftime') else str(trade.entry_time),
-                        'entry_price': float(trade.entry_price),
-                        'exit_time': trade.exit_time.strftime('%Y-%m-%d %H:%M:%S') if hasattr(trade.exit_time, 'strftime') else str(trade.exit_time) if trade.exit_time else None,
-                        'exit_price': float(trade.exit_price) if trade.exit_price is not None else None,
-                        'side': trade.side,
-                        'pnl': float(trade.pnl),
-                        'pnl_percent': float(trade.pnl_percent)
-                    })
-                
-                # Equity curve'i hazırla
-                equity_curve = []
-                for time, value in result.equity_curve:
-                    equity_curve.append({
-                        'time': time.strftime('%Y-%m-%d %H:%M:%S') if hasattr(time, 'strftime') else str(time),
-                        'value': float(value)
-                    })
-                
-                # Bakiye geçmişini hazırla
-                balance_history = []
-                for time, value in result.balance_history:
-                    balance_history.append({
-                        'time': time.strftime('%Y-%m-%d %H:%M:%S') if hasattr(time, 'strftime') else str(time),
-                        'value': float(value)
-                    })
-                
-                # Sinyal istatistiklerini hazırla
-                signal_stats = {
-                    'buy_signals': len([signal for signal in signals['signal'] if signal == 1]),
-                    'sell_signals': len([signal for signal in signals['signal'] if signal == -1]),
-                    'neutral_signals': len([signal for signal in signals['signal'] if signal == 0])
-                }
-                
-                # Sonuç
-                backtest_result_data = {
-                    'strategy': result.strategy,  # strategy_name yerine strategy
-                    'symbol': result.symbol,
-                    'interval': result.interval,
-                    'initial_balance': result.initial_balance,
-                    'final_balance': result.final_balance,
-                    'profit_loss': result.total_profit_loss,  # profit_loss yerine total_profit_loss
-                    'profit_loss_percent': result.total_profit_loss_pct,  # profit_loss_percent yerine total_profit_loss_pct
-                    'win_count': result.winning_trades,  # win_count yerine winning_trades
-                    'loss_count': result.losing_trades,  # loss_count yerine losing_trades
-                    'win_rate': result.win_rate,
-                    'max_drawdown': result.max_drawdown,
-                    'take_profit_pct': result.take_profit_pct,
-                    'stop_loss_pct': result.stop_loss_pct,
-                    'trailing_stop_pct': result.trailing_stop_pct,
-                    'trailing_profit_pct': result.trailing_profit_pct,
-                    'risk_per_trade_pct': result.risk_per_trade_pct,
-                    'equity_curve': result.equity_curve,
-                    'trades': result.trades,
-                    'signal_stats': result.signal_stats,  # Sinyal istatistikleri eklendi
-                    'date_range': {
-                        'start_date': start_date,
-                        'end_date': end_date,
-                        'data_points': len(df) if df is not None else 0
-                    }
-                }
+                # Sonuç sütun bazlı diziler olarak hazırlanır; istenen biçime tek seferde serileştirilir
+                payload = downsample_payload(columnar_result(result, df, start_date, end_date),
+                                             points, downsample_method)
+                body, mimetype = render(payload, response_format)
                 
                 logger.info(f"Backtest tamamlandı: {result.total_trades} işlem, P/L: {result.total_profit_loss_pct:.2f}%")
-                return jsonify(backtest_result_data)
+                return Response(body, mimetype=mimetype)
                 
             except Exception as e:
                 import traceback
@@ -384,6 +363,194 @@ def run_backtest():
         logger.error(traceback.format_exc())
         return jsonify({'error': f'Beklenmeyen hata: {str(e)}'}), 500
 
+@app.route('/api/backtest/jobs', methods=['POST'])
+def submit_backtest_job():
+    """Backtest'i arka planda çalıştırmak için kuyruğa al; iş kimliği hemen döner"""
+    try:
+        params = parse_backtest_request(request.get_json(silent=True))
+        strategy_class = strategy_manager.get_strategy_class(params['strategy'])
+        if not strategy_class:
+            return jsonify({'error': f"Strateji bulunamadı: {params['strategy']}"}), 404
+
+        # Aynı backtest daha önce çalıştırıldıysa sonuç süreç havuzuna gitmeden döner
+        cache = get_backtest_cache()
+        job = get_job_manager().submit(params, result=cache.get(cache.key(params, strategy_class)))
+        return jsonify({
+            'job_id': job.id,
+            'state': job.state,
+            'cached': job.cached,
+            'status_url': url_for('backtest_job_status', job_id=job.id),
+            'events_url': url_for('backtest_job_events', job_id=job.id)
+        }), 202
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"Backtest işi oluşturulurken hata: {str(e)}")
+        logger.error(traceback.format_exc())
+        return jsonify({'error': f'Beklenmeyen hata: {str(e)}'}), 500
+
+@app.route('/api/backtest/jobs', methods=['GET'])
+def list_backtest_jobs():
+    """Çalışan ve son bitmiş backtest işlerini listele"""
+    return jsonify({'jobs': get_job_manager().list_jobs(), 'cache': get_backtest_cache().stats()})
+
+@app.route('/api/backtest/jobs/<job_id>', methods=['GET'])
+def backtest_job_status(job_id):
+    """İş durumu, aşama ilerlemeleri ve (bittiyse) sonuç
+
+    ?format=json (satır biçimi), columnar (paralel diziler) veya arrow (sadece sonuç, Arrow IPC)
+    ?points=<piksel> equity eğrisini bu genişliğe indirir (?downsample=lttb|minmax); verilmezse tam çözünürlük
+    """
+    try:
+        response_format = negotiate_format(request.args.get('format'))
+        points, downsample_method = _curve_resolution()
+    except ValueError as format_error:
+        return jsonify({'error': str(format_error)}), 400
+
+    job = get_job_manager().snapshot(job_id, include_result=True)
+    if job is None:
+        return jsonify({'error': f'İş bulunamadı: {job_id}'}), 404
+    if job['result'] is not None:
+        job['result'] = downsample_payload(job['result'], points, downsample_method)
+        if response_format == 'arrow':
+            body, mimetype = render(job['result'], response_format)
+            return Response(body, mimetype=mimetype)
+        if response_format == 'json':
+            job['result'] = to_rows(job['result'])
+    return Response(dumps_json(job), mimetype='application/json')
+
+@app.route('/api/backtest/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_backtest_job(job_id):
+    """Kuyruktaki veya çalışan işi iptal et"""
+    if not get_job_manager().cancel(job_id):
+        return jsonify({'success': False, 'error': f'İş bulunamadı veya zaten bitti: {job_id}'}), 404
+    return jsonify({'success': True, 'job': get_job_manager().snapshot(job_id)})
+
+@app.route('/api/backtest/jobs/<job_id>/events')
+def backtest_job_events(job_id):
+    """İş ilerlemesini Server-Sent Events olarak yayınla; iş bitince akış kapanır"""
+    jobs = get_job_manager()
+    if jobs.get(job_id) is None:
+        return jsonify({'error': f'İş bulunamadı: {job_id}'}), 404
+
+    def stream():
+        version = -1
+        while True:
+            job = jobs.wait(job_id, version, timeout=15)
+            if job is None:
+                return
+            if job['version'] == version:
+                yield ": keepalive\n\n"
+                continue
+            version = job['version']
+            event = 'done' if job['state'] in FINISHED_STATES else 'progress'
+            yield f"event: {event}\ndata: {json.dumps(job)}\n\n"
+            if event == 'done':
+                return
+
+    return Response(stream(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+# Aynı anda tek optimizasyon çalışır; her biri kendi süreç havuzunu açar
+_optimize_lock = threading.Lock()
+
+@app.route('/api/backtest/optimize', methods=['POST'])
+def optimize_backtest():
+    """Strateji parametrelerini grid/random search ile optimize et"""
+    if not _optimize_lock.acquire(blocking=False):
+        return jsonify({'error': 'Başka bir optimizasyon çalışıyor, lütfen bitmesini bekleyin'}), 429
+    try:
+        from optimizer import build_param_sets, run_optimization, RANK_METRICS, DEFAULT_MAX_COMBINATIONS, DEFAULT_WORKERS
+        data = request.json or {}
+
+        symbol = data.get('symbol', 'BTCUSDT')
+        interval = data.get('interval', '1h')
+        strategy_name = data.get('strategy', 'SimpleStrategy')
+        sort_by = data.get('sort_by', 'total_profit_loss_pct')
+        top_n = int(data.get('top_n', 20))
+
+        if sort_by not in RANK_METRICS:
+            return jsonify({'error': f'Geçersiz sıralama metriği: {sort_by}. Geçerli değerler: {RANK_METRICS}'}), 400
+        exit_mode = data.get('exit_mode', 'close')
+        if exit_mode not in ('close', 'high_low'):
+            return jsonify({'error': f'Geçersiz çıkış modu: {exit_mode}. Geçerli değerler: close, high_low'}), 400
+        fill_priority = data.get('fill_priority', 'stop_first')
+        if fill_priority not in ('stop_first', 'target_first'):
+            return jsonify({'error': f'Geçersiz dolum önceliği: {fill_priority}. Geçerli değerler: stop_first, target_first'}), 400
+
+        try:
+            start_date = datetime.strptime(data.get('start_date', ''), '%Y-%m-%d')
+            end_date = min(datetime.strptime(data.get('end_date', ''), '%Y-%m-%d'), datetime.now())
+        except ValueError as date_error:
+            return jsonify({'error': f'Geçersiz tarih formatı: {str(date_error)}'}), 400
+        if start_date > end_date:
+            return jsonify({'error': 'Başlangıç tarihi bitiş tarihinden sonra olamaz'}), 400
+
+        strategy_class = strategy_manager.get_strategy_class(strategy_name)
+        if not strategy_class:
+            return jsonify({'error': f'Strateji bulunamadı: {strategy_name}'}), 404
+
+        # Parametre kombinasyonları
+        try:
+            param_sets = build_param_sets(
+                strategy_name,
+                method=data.get('method', 'grid'),
+                grid_points=int(data.get('grid_points', 5)),
+                samples=int(data.get('samples', 50)),
+                include=data.get('parameters'),
+                overrides=data.get('param_ranges'),
+                # İstemci sınırı sadece düşürebilir; sunucu sınırı OPTIMIZER_MAX_COMBINATIONS
+                max_combinations=min(int(data.get('max_combinations', DEFAULT_MAX_COMBINATIONS)),
+                                     DEFAULT_MAX_COMBINATIONS),
+                seed=data.get('seed')
+            )
+        except ValueError as param_error:
+            return jsonify({'error': str(param_error)}), 400
+
+        # Veri bir kez alınır, tüm kombinasyonlar paylaşılan bellekten kullanır
+        from binance_api import BinanceAPI
+        df = BinanceAPI().get_historical_klines(symbol, interval, start_date, end_date)
+        if df is None or df.empty:
+            return jsonify({'error': 'Veri alınamadı veya belirtilen tarih aralığında veri yok'}), 400
+
+        backtest_params = {
+            'initial_balance': float(data.get('initial_balance', 1000)),
+            'take_profit_pct': float(data['take_profit_pct']) if data.get('take_profit_pct') else None,
+            'stop_loss_pct': float(data['stop_loss_pct']) if data.get('stop_loss_pct') else None,
+            'trailing_stop_pct': float(data['trailing_stop_pct']) if data.get('trailing_stop_pct') else None,
+            'risk_per_trade_pct': float(data.get('risk_per_trade_pct', 1)),
+            'exit_mode': exit_mode,
+            'fill_priority': fill_priority
+        }
+
+        logger.info(f"Optimizasyon başlatılıyor: {symbol} {interval} {strategy_name}, {len(param_sets)} kombinasyon")
+        # Süreç sayısı da sadece düşürülebilir (OPTIMIZER_WORKERS)
+        workers = max(1, min(int(data.get('workers', DEFAULT_WORKERS)), DEFAULT_WORKERS))
+        try:
+            table = run_optimization(df, strategy_class, symbol, interval, param_sets, backtest_params,
+                                     workers=workers, sort_by=sort_by)
+        except ValueError as param_error:
+            # Stratejinin kullanmadığı parametreler (check_param_sets)
+            return jsonify({'error': str(param_error)}), 400
+
+        return jsonify({
+            'strategy': strategy_name,
+            'symbol': symbol,
+            'interval': interval,
+            'sort_by': sort_by,
+            'evaluated': len(table),
+            'failed': int(table['error'].notna().sum()) if 'error' in table.columns else 0,
+            'data_points': len(df),
+            'results': json.loads(table.head(top_n).to_json(orient='records'))
+        })
+
+    except Exception as e:
+        logger.error(f"Optimizasyon sırasında hata: {str(e)}")
+        logger.error(traceback.format_exc())
+        return jsonify({'error': f'Beklenmeyen hata: {str(e)}'}), 500
+    finally:
+        _optimize_lock.release()
+
 @app.route('/backtest')
 def backtest():
     """Backtest sayfası"""
@@ -492,10 +659,11 @@ def get_account():
             logger.error("Binance client başlatılamadı")
             return jsonify({"error": "Binance client başlatılamadı"}), 500
             
-        # Hesap bilgilerini al
+        # Hesap bilgilerini al (hesap ve açık emirler eşzamanlı çekilir, kısa süre önbellekte tutulur)
         try:
-            account = binance_client.get_account()
-            logger.info(f"Hesap bilgileri alındı: {account.keys() if isinstance(account, dict) else 'Hesap bilgisi alınamadı'}")
+            max_age = 0 if request.args.get('refresh', '').lower() == 'true' else None
+            snapshot = get_account_service().snapshot(binance_client, max_age=max_age)
+            account = snapshot['account']
             
             # Hesap bilgisi yoksa hata döndür
             if not account or not isinstance(account, dict):
@@ -506,30 +674,13 @@ def get_account():
             if 'code' in account and account['code'] < 0:
                 logger.error(f"API hatası: {account.get('msg', 'Bilinmeyen hata')}")
                 return jsonify({"error": f"API hatası: {account.get('msg', 'Bilinmeyen hata')}"}), 400
-                
-            # Bakiyeleri al
-            balances = []
-            if 'balances' in account:
-                balances = account['balances']
-            elif 'assets' in account:
-                balances = account['assets']
-            
-            # Açık emirleri al
-            open_orders = binance_client.get_open_orders()
-            
-            # Pozisyonları al
-            positions = []
-            try:
-                if binance_client.futures:
-                    positions = binance_client.get_positions()
-            except Exception as pos_error:
-                logger.error(f"Pozisyonlar alınırken hata: {str(pos_error)}")
             
-            # Sonuçları döndür
+            # Sonuçları döndür (bakiyeler, açık emirler ve futures pozisyonları özetten gelir)
             return jsonify({
-                "balances": balances,
-                "open_orders": open_orders,
-                "positions": positions
+                "balances": snapshot['balances'],
+                "open_orders": snapshot['open_orders'],
+                "positions": snapshot['positions'],
+                "updated": snapshot['updated']
             })
             
         except Exception as account_error:
@@ -548,56 +699,40 @@ def get_account():
 def account_info():
     """Hesap bilgilerini al"""
     try:
-        # Hem testnet hem de canlı hesap bilgilerini al
+        # Hem testnet hem de canlı hesap bilgilerini eşzamanlı al (sadece bakiyeler, kısa süre önbellekte tutulur)
         account_data = {}
+        snapshots = get_account_service().snapshots({
+            'testnet': lambda: get_binance_client(testnet=True),
+            'live': lambda: get_binance_client(testnet=False)
+        }, open_orders=False)
+        missing_keys = {
+            'testnet': 'Testnet API anahtarları ayarlanmamış',
+            'live': 'Canlı API anahtarları ayarlanmamış'
+        }
         
-        # Testnet hesap bilgileri
-        try:
-            testnet_client = get_binance_client(testnet=True)
-            if testnet_client:
-                testnet_info = testnet_client.get_account()
-                testnet_balances = [balance for balance in testnet_info.get('balances', []) 
-                                  if float(balance.get('free', 0)) > 0 or float(balance.get('locked', 0)) > 0]
-                account_data['testnet'] = {
-                    'available': True,
-                    'balances': testnet_balances,
-                    'canTrade': True
-                }
-            else:
-                account_data['testnet'] = {
-                    'available': False,
-                    'error': 'Testnet API anahtarları ayarlanmamış'
-                }
-        except Exception as testnet_error:
-            logger.error(f"Testnet hesap bilgileri alınırken hata: {str(testnet_error)}")
-            account_data['testnet'] = {
-                'available': False,
-                'error': str(testnet_error)
-            }
-        
-        # Canlı hesap bilgileri
-        try:
-            live_client = get_binance_client(testnet=False)
-            if live_client:
-                live_info = live_client.get_account()
-                live_balances = [balance for balance in live_info.get('balances', []) 
-                               if float(balance.get('free', 0)) > 0 or float(balance.get('locked', 0)) > 0]
-                account_data['live'] = {
+        for name, snapshot in snapshots.items():
+            try:
+                if isinstance(snapshot, Exception):
+                    raise snapshot
+                if snapshot is None:
+                    account_data[name] = {
+                        'available': False,
+                        'error': missing_keys[name]
+                    }
+                    continue
+                balances = [balance for balance in snapshot['account'].get('balances', [])
+                            if float(balance.get('free', 0)) > 0 or float(balance.get('locked', 0)) > 0]
+                account_data[name] = {
                     'available': True,
-                    'balances': live_balances,
+                    'balances': balances,
                     'canTrade': True
                 }
-            else:
-                account_data['live'] = {
+            except Exception as account_error:
+                logger.error(f"{'Testnet' if name == 'testnet' else 'Canlı'} hesap bilgileri alınırken hata: {str(account_error)}")
+                account_data[name] = {
                     'available': False,
-                    'error': 'Canlı API anahtarları ayarlanmamış'
+                    'error': str(account_error)
                 }
-        except Exception as live_error:
-            logger.error(f"Canlı hesap bilgileri alınırken hata: {str(live_error)}")
-            account_data['live'] = {
-                'available': False,
-                'error': str(live_error)
-            }
         
         # Şu anki aktif mod
         account_data['current'] = os.getenv('TESTNET', 'false').lower() == 'true'
@@ -635,6 +770,9 @@ def place_order():
             leverage=leverage
         )
         
+        # Bakiyeler ve açık emirler değişti; sonraki hesap isteği yeniden çeker
+        get_account_service().invalidate(binance_client)
+        
         return jsonify(order)
     except Exception as e:
         logger.error(f"Emir verilirken hata: {str(e)}")
@@ -869,6 +1007,11 @@ def get_strategies():
         logger.error(f"Stratejiler listelenirken hata: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/strategies/registry', methods=['GET'])
+def strategy_registry_stats():
+    """Strateji kaydı ve nesne havuzu metrikleri (soğuk/sıcak arama gecikmesi, yeniden yüklemeler)"""
+    return jsonify(dict(strategy_manager.registry.stats(), pool=strategy_manager.pool.stats()))
+
 @app.route('/api/advanced_analyze', methods=['POST'])
 def advanced_analyze():
     """Gelişmiş strateji analizi yap"""
@@ -886,20 +1029,26 @@ def advanced_analyze():
         timeframes = data.get('timeframes', ['1h'])
         logger.info(f"Seçilen zaman dilimleri: {timeframes}")
         
-        # Tüm zaman dilimleri için veri al
-        dataframes = {}
-        for interval in timeframes:
+        # Tüm zaman dilimleri için veriyi paylaşılan istek motoruyla paralel al
+        client = get_binance_client(testnet=False)
+        
+        def fetch_interval(interval):
             logger.info(f"{interval} için veri alınıyor...")
             try:
-                df = get_binance_client(testnet=False).get_historical_klines(symbol, interval, limit=100)
-                if df.empty:
-                    logger.error(f"{interval} için veri alınamadı")
-                    return jsonify({'error': f'{interval} için veri alınamadı'}), 400
-                dataframes[interval] = df.copy()
-                logger.info(f"{interval} için {len(df)} adet veri alındı")
+                return client.get_historical_klines(symbol, interval, limit=100), None
             except Exception as interval_error:
+                return None, interval_error
+        
+        dataframes = {}
+        for interval, (df, interval_error) in zip(timeframes, get_fetch_engine().map(fetch_interval, timeframes)):
+            if interval_error is not None:
                 logger.error(f"{interval} için veri alınırken hata: {str(interval_error)}")
                 return jsonify({'error': f'{interval} için veri alınırken hata: {str(interval_error)}'}), 400
+            if df.empty:
+                logger.error(f"{interval} için veri alınamadı")
+                return jsonify({'error': f'{interval} için veri alınamadı'}), 400
+            dataframes[interval] = df.copy()
+            logger.info(f"{interval} için {len(df)} adet veri alındı")
         
         # Strateji adını al
         strategy_name = data.get('strategy', 'Advanced')
@@ -956,7 +1105,7 @@ def advanced_analyze():
             'strategy': strategy_name,
             'symbol': symbol,
             'timeframes': timeframes,
-            'signal': signal,
+            'signal': signal_label(signal),
             'confidence': float(confidence) if isinstance(confidence, (np.int64, np.int32, np.float64, np.float32)) else confidence,
             'metrics': cleaned_metrics
         }
@@ -1139,57 +1288,79 @@ def test_api_connection():
         logger.error(f"API bağlantısı test edilirken hata: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+def _bot_order_handler(worker, signal, confidence):
+    """Bot işlem sinyalinde çağrılır (hesap bakiyesinin %5'i kadar pozisyon)"""
+    account = get_account_service().snapshot(binance_client, open_orders=False)['account']
+    balance = float(account.get('totalWalletBalance', 0))
+    position_size = balance * 0.05
+    side = "BUY" if signal == "BUY" else "SELL"
+    
+    # Gerçek emir vermek için aşağıdaki satırı aktif edin
+    # binance_client.place_order(worker.symbol, side, position_size)
+    
+    logger.info(f"Bot işlem sinyali: {side} {position_size} {worker.symbol} ({worker.strategy_name})")
+
+
+def _bot_stream_provider(symbol, interval):
+    """Çalışanın sembol/aralığı için kline akışına abone ol"""
+    client = binance_client
+    stream = get_kline_stream(
+        'futures' if client.futures else 'spot', testnet=client.testnet,
+        backfill=lambda s, i, start, limit: client.get_historical_klines(s, i, limit=limit, start_time=start))
+    stream.subscribe(symbol, interval)
+    return stream
+
+
+# Çok sembollü/çok stratejili bot çalışma ortamı
+bot_runtime = BotRuntime(
+    strategy_factory=lambda name: strategy_manager.get_strategy(name),
+    client_provider=lambda: binance_client,
+    stream_provider=_bot_stream_provider,
+    order_handler=_bot_order_handler,
+    # Mum kapanışları borsa sunucu saatine göre hesaplanır
+    clock=ServerClock(lambda: binance_client.get_server_time()),
+)
+
 @app.route('/api/bot/start', methods=['POST'])
 def start_bot():
-    """Botu başlat"""
+    """Bot çalışanı başlat (diğer çalışanlar etkilenmez)"""
     try:
-        data = request.json
+        data = request.get_json(silent=True) or {}
         symbol = data.get('symbol', 'BTCUSDT')
         interval = data.get('interval', '1h')
         strategy_name = data.get('strategy', 'MACD_EMA')
         
-        # Bot zaten çalışıyorsa durdur
-        if bot_status['running']:
-            stop_bot()
-        
-        # Bot ayarlarını güncelle
-        bot_status['symbol'] = symbol
-        bot_status['interval'] = interval
-        bot_status['strategy'] = strategy_name
-        bot_status['stop_event'].clear()
-        
-        # Bot thread'ini başlat
-        bot_status['thread'] = threading.Thread(target=bot_loop)
-        bot_status['thread'].daemon = True
-        bot_status['thread'].start()
-        
-        bot_status['running'] = True
+        worker = bot_runtime.start_worker(symbol, interval, strategy_name)
         
         return jsonify({
             "success": True,
+            "id": worker.id,
             "message": f"Bot başlatıldı: {symbol} {interval} {strategy_name}"
         })
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
     except Exception as e:
         logger.error(f"Bot başlatılırken hata: {str(e)}")
         return str(e), 500
 
 @app.route('/api/bot/stop', methods=['POST'])
 def stop_bot():
-    """Botu durdur"""
+    """Bot çalışanını durdur; kimlik veya sembol/aralık/strateji verilmezse tüm çalışanları durdur"""
     try:
-        if bot_status['running']:
-            # Thread'i durdur
-            bot_status['stop_event'].set()
-            
-            # Thread'in sonlanmasını bekle (en fazla 5 saniye)
-            if bot_status['thread']:
-                bot_status['thread'].join(timeout=5)
-            
-            bot_status['running'] = False
-            bot_status['thread'] = None
-            
+        data = request.get_json(silent=True) or {}
+        wid = data.get('id')
+        if not wid and data.get('symbol') and data.get('interval') and data.get('strategy'):
+            wid = worker_id(data['symbol'], data['interval'], data['strategy'])
+        
+        if wid:
+            stopped = [wid] if bot_runtime.stop_worker(wid) else []
+        else:
+            stopped = bot_runtime.stop_all()
+        
+        if stopped:
             return jsonify({
                 "success": True,
+                "stopped": stopped,
                 "message": "Bot durduruldu"
             })
         else:
@@ -1203,22 +1374,30 @@ def stop_bot():
 
 @app.route('/api/bot/status', methods=['GET'])
 def get_bot_status():
-    """Bot durumunu al"""
+    """Bot çalışma ortamının durumunu al (çalışanlar ve paylaşılan veri akışları)"""
     try:
-        status_data = {
-            "running": bot_status['running'],
-            "symbol": bot_status['symbol'],
-            "interval": bot_status['interval'],
-            "strategy": bot_status['strategy'],
-            "last_check": bot_status['last_check'].isoformat() if bot_status['last_check'] else None,
-            "last_signal": bot_status['last_signal'],
-        }
-        
-        return jsonify(status_data)
+        return jsonify(bot_runtime.status())
     except Exception as e:
         logger.error(f"Bot durumu alınırken hata: {str(e)}")
         return str(e), 500
 
+@app.route('/api/bot/workers', methods=['GET'])
+def list_bot_workers():
+    """Bot çalışanlarını ve metriklerini listele"""
+    try:
+        return jsonify({'workers': bot_runtime.list_workers()})
+    except Exception as e:
+        logger.error(f"Bot çalışanları listelenirken hata: {str(e)}")
+        return str(e), 500
+
+@app.route('/api/bot/workers/<path:wid>', methods=['GET'])
+def get_bot_worker(wid):
+    """Tek bir bot çalışanının durumunu al"""
+    worker = bot_runtime.get_worker(wid)
+    if worker is None:
+        return jsonify({'error': f"Bot bulunamadı: {wid}"}), 404
+    return jsonify(worker.to_dict())
+
 @app.route('/api/settings/api', methods=['POST'])
 def update_api_settings():
     """API ayarlarını güncelle"""
@@ -1423,26 +1602,23 @@ def get_strategy_signals():
         # Veri al
         try:
             klines = client.client.get_klines(symbol=symbol, interval=interval, limit=limit)
-            df = pd.DataFrame(klines, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume', 'close_time', 'quote_asset_volume', 'number_of_trades', 'taker_buy_base_asset_volume', 'taker_buy_quote_asset_volume', 'ignore'])
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+            df = klines_to_dataframe(klines).reset_index().rename(columns={
+                'quote_volume': 'quote_asset_volume',
+                'trades': 'number_of_trades',
+                'taker_buy_base': 'taker_buy_base_asset_volume',
+                'taker_buy_quote': 'taker_buy_quote_asset_volume'
+            })
             df['close_time'] = pd.to_datetime(df['close_time'], unit='ms')
-            df['open'] = df['open'].astype(float)
-            df['high'] = df['high'].astype(float)
-            df['low'] = df['low'].astype(float)
-            df['close'] = df['close'].astype(float)
-            df['volume'] = df['volume'].astype(float)
         except Exception as e:
             logger.error(f"Veri alınırken hata: {str(e)}")
             return jsonify({'error': f'Veri alınamadı: {str(e)}'}), 500
             
         # Strateji oluştur
         try:
-            strategy_class = strategy_manager.get_strategy(strategy_name)
-            if strategy_class is None:
+            strategy = strategy_manager.get_strategy(strategy_name)
+            if strategy is None:
                 logger.error(f"Strateji bulunamadı: {strategy_name}")
                 return jsonify({'error': f'Strateji bulunamadı: {strategy_name}'}), 404
-                
-            strategy = strategy_class()
         except Exception as e:
             logger.error(f"Strateji oluşturulurken hata: {str(e)}")
             return jsonify({'error': f'Strateji oluşturulamadı: {str(e)}'}), 500
@@ -1454,7 +1630,9 @@ def get_strategy_signals():
             logger.error(f"Sinyaller oluşturulurken hata: {str(e)}")
             return jsonify({'error': f'Sinyaller oluşturulamadı: {str(e)}'}), 500
             
-        # Sonuçları hazırla
+        # Sonuçları hazırla (int8 sinyal kodları BUY/SELL/HOLD olarak döner)
+        if 'signal' in signals.columns:
+            signals = signals.assign(signal=decode_signals(signals['signal']))
         result = []
         for i, row in signals.iterrows():
             result.append({
@@ -1464,7 +1642,7 @@ def get_strategy_signals():
                 'low': row['low'],
                 'close': row['close'],
                 'volume': row['volume'],
-                'signal': row.get('signal', 0),
+                'signal': row.get('signal', 'HOLD'),
                 'position': row.get('position', 0)
             })
             
@@ -1600,53 +1778,6 @@ def mask_api_key(key):
     # İlk 4 ve son 4 karakteri göster, arasını maskele
     return key[:4] + '*' * (len(key) - 8) + key[-4:]
 
-def bot_loop():
-    """Bot döngüsü - sürekli olarak sinyalleri kontrol eder ve işlem yapar"""
-    logger.info(f"Bot başlatıldı: {bot_status['symbol']} {bot_status['interval']} {bot_status['strategy']}")
-    
-    while not bot_status['stop_event'].is_set():
-        try:
-            # Verileri al
-            df = binance_client.get_historical_klines(bot_status['symbol'], bot_status['interval'], limit=100)
-            
-            # Strateji analizi yap
-            strategy = strategy_manager.get_strategy(bot_status['strategy'])
-            signal, confidence, metrics = strategy.analyze(df)
-            
-            # Sonuçları kaydet
-            bot_status['last_check'] = datetime.now()
-            bot_status['last_signal'] = {
-                'signal': signal,
-                'confidence': confidence,
-                'metrics': metrics
-            }
-            
-            logger.info(f"Bot sinyal: {signal} ({confidence:.2f}%) - {bot_status['symbol']} {bot_status['interval']}")
-            
-            # Sinyal varsa ve güven skoru yüksekse işlem yap
-            if signal in ['BUY', 'SELL'] and confidence > 75:
-                # Hesap bilgilerini al
-                account = binance_client.get_account()
-                
-                # İşlem büyüklüğünü hesapla (hesap bakiyesinin %5'i)
-                balance = float(account.get('totalWalletBalance', 0))
-                position_size = balance * 0.05
-                
-                # Emir ver
-                side = "BUY" if signal == "BUY" else "SELL"
-                
-                # Gerçek emir vermek için aşağıdaki satırı aktif edin
-                # binance_client.place_order(bot_status['symbol'], side, position_size)
-                
-                logger.info(f"Bot işlem sinyali: {side} {position_size} {bot_status['symbol']}")
-            
-            # Her kontrolden sonra bekle (interval'e göre ayarlanabilir)
-            time.sleep(60)  # 1 dakika bekle
-            
-        except Exception as e:
-            logger.error(f"Bot döngüsünde hata: {str(e)}")
-            time.sleep(30)  # Hata durumunda 30 saniye bekle
-
 @app.route('/api/analyze', methods=['POST'])
 def analyze():
     """Tüm stratejileri çalıştır ve sinyallerini döndür"""
@@ -1680,35 +1811,23 @@ def analyze():
                 
             logger.info(f"Piyasa verisi alındı: {len(market_data)} satır")
             
-            # DataFrame'e dönüştür
-            df = pd.DataFrame(market_data, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume', 'close_time', 'quote_asset_volume', 'number_of_trades', 'taker_buy_base_asset_volume', 'taker_buy_quote_asset_volume', 'ignore'])
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-            df.set_index('timestamp', inplace=True)
+            df = market_data
             
-            # Sayısal sütunları dönüştür
-            numeric_columns = ['open', 'high', 'low', 'close', 'volume', 'quote_asset_volume', 'taker_buy_base_asset_volume', 'taker_buy_quote_asset_volume']
-            df[numeric_columns] = df[numeric_columns].apply(pd.to_numeric)
+            # Göstergeler tüm stratejiler için bir kez hesaplanır (aynı son mum için istekler arası da paylaşılır)
+            from indicator_cache import get_request_cache
+            cache = get_request_cache(df, symbol, interval)
             
             # Tüm stratejileri çalıştır ve sinyallerini al
             signals = {}
-            strategies = strategy_manager.get_strategies()
-            
-            for strategy_name in strategies:
+            for strategy_name in strategy_manager.get_strategy_names():
                 try:
-                    strategy_instance = strategy_manager.create_strategy_instance(strategy_name, df)
-                    if strategy_instance:
-                        signal = strategy_instance.generate_signal()
-                        signals[strategy_name] = {
-                            'signal': signal,
-                            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                        }
-                    else:
-                        logger.warning(f"Strateji örneği oluşturulamadı: {strategy_name}")
-                        signals[strategy_name] = {
-                            'signal': 'ERROR',
-                            'error': 'Strateji örneği oluşturulamadı',
-                            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                        }
+                    strategy_instance = strategy_manager.get_strategy(strategy_name)
+                    signal, confidence, _ = strategy_instance.analyze(df)
+                    signals[strategy_name] = {
+                        'signal': signal_label(signal),
+                        'confidence': float(confidence or 0),
+                        'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                    }
                 except Exception as e:
                     logger.error(f"Strateji çalıştırılırken hata: {strategy_name} - {str(e)}")
                     signals[strategy_name] = {
@@ -1717,6 +1836,7 @@ def analyze():
                         'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
                     }
             
+            logger.info(f"Gösterge önbelleği: {cache.hits} isabet, {cache.misses} hesaplama")
             logger.info(f"Analiz tamamlandı: {len(signals)} strateji")
             return jsonify(signals)
             
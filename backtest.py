@@ -6,8 +6,10 @@ import time
 import json
 from typing import Dict, List, Tuple, Any
 from strategy_manager import StrategyManager
+from backtest_engine import ArrayBacktestResultMixin, MODE_LONG_SHORT, run_engine, signal_codes
+from signal_encoding import count_signals
 
-class BacktestResult:
+class BacktestResult(ArrayBacktestResultMixin):
     """
     Backtest sonuçlarını saklamak için sınıf
     """
@@ -43,6 +45,8 @@ class BacktestResult:
         self.trailing_stop_pct = None
         self.trailing_profit_pct = None
         self.risk_per_trade_pct = None
+        self.exit_mode = 'close'
+        self.fill_priority = 'stop_first'
         self.date_range = None
 
 class Trade:
@@ -67,7 +71,7 @@ class Backtester:
     
     def run(self, df, strategy, symbol, interval, initial_balance=1000.0, 
             take_profit_pct=None, stop_loss_pct=None, trailing_stop_pct=None, 
-            trailing_profit_pct=None, risk_per_trade_pct=1):
+            trailing_profit_pct=None, risk_per_trade_pct=1, exit_mode='close', fill_priority='stop_first'):
         """
         Backtest çalıştır.
         
@@ -82,6 +86,9 @@ class Backtester:
             trailing_stop_pct (float, optional): Trailing stop yüzdesi
             trailing_profit_pct (float, optional): Trailing profit yüzdesi
             risk_per_trade_pct (float, optional): Her işlemde risk alınacak yüzde
+            exit_mode (str, optional): TP/SL/trailing kontrolü 'close' (kapanış) veya 'high_low' (bar içi high/low)
+            fill_priority (str, optional): 'high_low' modunda aynı barda stop ve hedef görülürse
+                'stop_first' veya 'target_first'
             
         Returns:
             BacktestResult: Backtest sonuçları
@@ -143,365 +150,37 @@ class Backtester:
                 self.logger.info(f"Mevcut sütunlar: {df_signals.columns.tolist()}")
                 return result
             
-            # Sinyal dağılımını logla
-            signal_counts = df_signals['signal'].value_counts().to_dict()
-            self.logger.info(f"Sinyal dağılımı: {signal_counts}")
+            # Sinyaller kanonik int8 koda çevrilir (eski metin çıktısı da kabul edilir)
+            codes = signal_codes(df_signals['signal'])
+            self.logger.info(f"Sinyal dağılımı: {count_signals(codes)}")
             
-            # Backtest değişkenleri
-            balance = initial_balance
-            position = None  # LONG, SHORT veya None
-            entry_time = None
-            entry_price = None
-            position_size = 0
-            trades = []
-            equity_curve = []
-            balance_history = []
+            # Bar içi çıkış modu için OHLC sütunları gerekli
+            if exit_mode == 'high_low':
+                missing_columns = [col for col in ('open', 'high', 'low') if col not in df_signals.columns]
+                if missing_columns:
+                    self.logger.error(f"'high_low' çıkış modu için eksik sütunlar: {missing_columns}")
+                    return result
             
-            # Trailing stop ve profit için değişkenler
-            highest_price_since_entry = 0
-            lowest_price_since_entry = float('inf')
-            
-            # Strateji için işlem kararları
-            for i in range(1, len(df_signals)):
-                current_time = df_signals.index[i]
-                current_price = df_signals['close'].iloc[i]
-                current_signal = df_signals['signal'].iloc[i] if 'signal' in df_signals.columns else None
-                
-                # Sinyal yoksa devam et
-                if current_signal is None:
-                    continue
-                
-                # Equity curve için mevcut değeri kaydet
-                if position == 'LONG':
-                    current_value = balance + position_size * (current_price / entry_price - 1)
-                elif position == 'SHORT':
-                    current_value = balance + position_size * (1 - current_price / entry_price)
-                else:
-                    current_value = balance
-                
-                equity_curve.append((current_time, current_value))
-                balance_history.append((current_time, balance))
-                
-                # Pozisyon varsa, stop loss ve take profit kontrolleri
-                if position == 'LONG':
-                    # En yüksek fiyatı güncelle (trailing stop/profit için)
-                    highest_price_since_entry = max(highest_price_since_entry, current_price)
-                    
-                    # Stop loss kontrolü
-                    stop_loss_price = entry_price * (1 - stop_loss_pct / 100)
-                    if current_price <= stop_loss_price:
-                        self.logger.info(f"Stop loss tetiklendi: {current_time}, Fiyat: {current_price}, Stop: {stop_loss_price}")
-                        # Pozisyonu kapat
-                        pnl = position_size * (current_price / entry_price - 1)
-                        pnl_percent = (current_price / entry_price - 1) * 100
-                        balance += pnl
-                        
-                        # Trade'i kaydet
-                        trade = Trade(
-                            entry_time=entry_time,
-                            entry_price=entry_price,
-                            position_size=position_size,
-                            position=position,
-                            exit_time=current_time,
-                            exit_price=current_price,
-                            profit_loss=pnl,
-                            profit_loss_pct=pnl_percent
-                        )
-                        trades.append(trade)
-                        
-                        # Pozisyonu sıfırla
-                        position = None
-                        entry_price = 0
-                        entry_time = None
-                        position_size = 0
-                        highest_price_since_entry = 0
-                        lowest_price_since_entry = float('inf')
-                        continue
-                    
-                    # Take profit kontrolü
-                    take_profit_price = entry_price * (1 + take_profit_pct / 100)
-                    if current_price >= take_profit_price:
-                        self.logger.info(f"Take profit tetiklendi: {current_time}, Fiyat: {current_price}, TP: {take_profit_price}")
-                        # Pozisyonu kapat
-                        pnl = position_size * (current_price / entry_price - 1)
-                        pnl_percent = (current_price / entry_price - 1) * 100
-                        balance += pnl
-                        
-                        # Trade'i kaydet
-                        trade = Trade(
-                            entry_time=entry_time,
-                            entry_price=entry_price,
-                            position_size=position_size,
-                            position=position,
-                            exit_time=current_time,
-                            exit_price=current_price,
-                            profit_loss=pnl,
-                            profit_loss_pct=pnl_percent
-                        )
-                        trades.append(trade)
-                        
-                        # Pozisyonu sıfırla
-                        position = None
-                        entry_price = 0
-                        entry_time = None
-                        position_size = 0
-                        highest_price_since_entry = 0
-                        lowest_price_since_entry = float('inf')
-                        continue
-                    
-                    # Trailing stop kontrolü
-                    if trailing_stop_pct is not None and trailing_stop_pct > 0:
-                        trailing_stop_price = highest_price_since_entry * (1 - trailing_stop_pct / 100)
-                        if current_price <= trailing_stop_price and current_price > entry_price:
-                            self.logger.info(f"Trailing stop tetiklendi: {current_time}, Fiyat: {current_price}, Stop: {trailing_stop_price}")
-                            # Pozisyonu kapat
-                            pnl = position_size * (current_price / entry_price - 1)
-                            pnl_percent = (current_price / entry_price - 1) * 100
-                            balance += pnl
-                            
-                            # Trade'i kaydet
-                            trade = Trade(
-                                entry_time=entry_time,
-                                entry_price=entry_price,
-                                position_size=position_size,
-                                position=position,
-                                exit_time=current_time,
-                                exit_price=current_price,
-                                profit_loss=pnl,
-                                profit_loss_pct=pnl_percent
-                            )
-                            trades.append(trade)
-                            
-                            # Pozisyonu sıfırla
-                            position = None
-                            entry_price = 0
-                            entry_time = None
-                            position_size = 0
-                            highest_price_since_entry = 0
-                            lowest_price_since_entry = float('inf')
-                            continue
-                    
-                    # Trailing profit kontrolü
-                    if trailing_profit_pct is not None and trailing_profit_pct > 0 and current_price >= take_profit_price:
-                        trailing_profit_price = highest_price_since_entry * (1 - trailing_profit_pct / 100)
-                        if current_price <= trailing_profit_price:
-                            self.logger.info(f"Trailing profit tetiklendi: {current_time}, Fiyat: {current_price}, Profit: {trailing_profit_price}")
-                            # Pozisyonu kapat
-                            pnl = position_size * (current_price / entry_price - 1)
-                            pnl_percent = (current_price / entry_price - 1) * 100
-                            balance += pnl
-                            
-                            # Trade'i kaydet
-                            trade = Trade(
-                                entry_time=entry_time,
-                                entry_price=entry_price,
-                                position_size=position_size,
-                                position=position,
-                                exit_time=current_time,
-                                exit_price=current_price,
-                                profit_loss=pnl,
-                                profit_loss_pct=pnl_percent
-                            )
-                            trades.append(trade)
-                            
-                            # Pozisyonu sıfırla
-                            position = None
-                            entry_price = 0
-                            entry_time = None
-                            position_size = 0
-                            highest_price_since_entry = 0
-                            lowest_price_since_entry = float('inf')
-                            continue
-                
-                elif position == 'SHORT':
-                    # En düşük fiyatı güncelle (trailing stop/profit için)
-                    lowest_price_since_entry = min(lowest_price_since_entry, current_price)
-                    
-                    # Stop loss kontrolü
-                    stop_loss_price = entry_price * (1 + stop_loss_pct / 100)
-                    if current_price >= stop_loss_price:
-                        self.logger.info(f"Stop loss tetiklendi: {current_time}, Fiyat: {current_price}, Stop: {stop_loss_price}")
-                        # Pozisyonu kapat
-                        pnl = position_size * (1 - current_price / entry_price)
-                        pnl_percent = (1 - current_price / entry_price) * 100
-                        balance += pnl
-                        
-                        # Trade'i kaydet
-                        trade = Trade(
-                            entry_time=entry_time,
-                            entry_price=entry_price,
-                            position_size=position_size,
-                            position=position,
-                            exit_time=current_time,
-                            exit_price=current_price,
-                            profit_loss=pnl,
-                            profit_loss_pct=pnl_percent
-                        )
-                        trades.append(trade)
-                        
-                        # Pozisyonu sıfırla
-                        position = None
-                        entry_price = 0
-                        entry_time = None
-                        position_size = 0
-                        highest_price_since_entry = 0
-                        lowest_price_since_entry = float('inf')
-                        continue
-                    
-                    # Take profit kontrolü
-                    take_profit_price = entry_price * (1 - take_profit_pct / 100)
-                    if current_price <= take_profit_price:
-                        self.logger.info(f"Take profit tetiklendi: {current_time}, Fiyat: {current_price}, TP: {take_profit_price}")
-                        # Pozisyonu kapat
-                        pnl = position_size * (1 - current_price / entry_price)
-                        pnl_percent = (1 - current_price / entry_price) * 100
-                        balance += pnl
-                        
-                        # Trade'i kaydet
-                        trade = Trade(
-                            entry_time=entry_time,
-                            entry_price=entry_price,
-                            position_size=position_size,
-                            position=position,
-                            exit_time=current_time,
-                            exit_price=current_price,
-                            profit_loss=pnl,
-                            profit_loss_pct=pnl_percent
-                        )
-                        trades.append(trade)
-                        
-                        # Pozisyonu sıfırla
-                        position = None
-                        entry_price = 0
-                        entry_time = None
-                        position_size = 0
-                        highest_price_since_entry = 0
-                        lowest_price_since_entry = float('inf')
-                        continue
-                    
-                    # Trailing stop kontrolü
-                    if trailing_stop_pct is not None and trailing_stop_pct > 0:
-                        trailing_stop_price = lowest_price_since_entry * (1 + trailing_stop_pct / 100)
-                        if current_price >= trailing_stop_price and current_price < entry_price:
-                            self.logger.info(f"Trailing stop tetiklendi: {current_time}, Fiyat: {current_price}, Stop: {trailing_stop_price}")
-                            # Pozisyonu kapat
-                            pnl = position_size * (1 - current_price / entry_price)
-                            pnl_percent = (1 - current_price / entry_price) * 100
-                            balance += pnl
-                            
-                            # Trade'i kaydet
-                            trade = Trade(
-                                entry_time=entry_time,
-                                entry_price=entry_price,
-                                position_size=position_size,
-                                position=position,
-                                exit_time=current_time,
-                                exit_price=current_price,
-                                profit_loss=pnl,
-                                profit_loss_pct=pnl_percent
-                            )
-                            trades.append(trade)
-                            
-                            # Pozisyonu sıfırla
-                            position = None
-                            entry_price = 0
-                            entry_time = None
-                            position_size = 0
-                            highest_price_since_entry = 0
-                            lowest_price_since_entry = float('inf')
-                            continue
-                    
-                    # Trailing profit kontrolü
-                    if trailing_profit_pct is not None and trailing_profit_pct > 0 and current_price <= take_profit_price:
-                        trailing_profit_price = lowest_price_since_entry * (1 + trailing_profit_pct / 100)
-                        if current_price >= trailing_profit_price:
-                            self.logger.info(f"Trailing profit tetiklendi: {current_time}, Fiyat: {current_price}, Profit: {trailing_profit_price}")
-                            # Pozisyonu kapat
-                            pnl = position_size * (1 - current_price / entry_price)
-                            pnl_percent = (1 - current_price / entry_price) * 100
-                            balance += pnl
-                            
-                            # Trade'i kaydet
-                            trade = Trade(
-                                entry_time=entry_time,
-                                entry_price=entry_price,
-                                position_size=position_size,
-                                position=position,
-                                exit_time=current_time,
-                                exit_price=current_price,
-                                profit_loss=pnl,
-                                profit_loss_pct=pnl_percent
-                            )
-                            trades.append(trade)
-                            
-                            # Pozisyonu sıfırla
-                            position = None
-                            entry_price = 0
-                            entry_time = None
-                            position_size = 0
-                            highest_price_since_entry = 0
-                            lowest_price_since_entry = float('inf')
-                            continue
-                
-                # Pozisyon yoksa ve sinyal varsa gir
-                if position is None:
-                    if current_signal == "BUY":
-                        # Pozisyon büyüklüğünü hesapla
-                        position_size = balance * risk_per_trade_pct / 100
-                        
-                        # Pozisyon oluştur
-                        position = "LONG"
-                        entry_price = current_price
-                        entry_time = current_time
-                        highest_price_since_entry = current_price
-                        
-                        self.logger.info(f"LONG pozisyon oluşturuldu: {entry_time}, Fiyat: {entry_price}")
-                    
-                    elif current_signal == "SELL":
-                        # Pozisyon büyüklüğünü hesapla
-                        position_size = balance * risk_per_trade_pct / 100
-                        
-                        # Pozisyon oluştur
-                        position = "SHORT"
-                        entry_price = current_price
-                        entry_time = current_time
-                        lowest_price_since_entry = current_price
-                        
-                        self.logger.info(f"SHORT pozisyon oluşturuldu: {entry_time}, Fiyat: {entry_price}")
-                
-                # Pozisyon varsa ve ters sinyal varsa çık
-                elif position is not None and ((position == "LONG" and current_signal == "SELL") or (position == "SHORT" and current_signal == "BUY")):
-                    # PnL hesapla
-                    if position == "LONG":
-                        pnl = position_size * (current_price / entry_price - 1)
-                        pnl_percent = (current_price / entry_price - 1) * 100
-                    else:  # SHORT
-                        pnl = position_size * (1 - current_price / entry_price)
-                        pnl_percent = (1 - current_price / entry_price) * 100
-                    
-                    # Pozisyonu kapat
-                    balance += pnl
-                    
-                    # Trade'i kaydet
-                    trade = Trade(
-                        entry_time=entry_time,
-                        entry_price=entry_price,
-                        position_size=position_size,
-                        position=position,
-                        exit_time=current_time,
-                        exit_price=current_price,
-                        profit_loss=pnl,
-                        profit_loss_pct=pnl_percent
-                    )
-                    trades.append(trade)
-                    
-                    # Pozisyonu sıfırla
-                    position = None
-                    entry_price = 0
-                    entry_time = None
-                    position_size = 0
-                    highest_price_since_entry = 0
-                    lowest_price_since_entry = float('inf')
+            # Backtest işlemi (dizi tabanlı motor, LONG ve SHORT)
+            engine_result = run_engine(
+                df_signals['close'].to_numpy(dtype=np.float64),
+                codes,
+                initial_balance=initial_balance,
+                take_profit_pct=take_profit_pct,
+                stop_loss_pct=stop_loss_pct,
+                trailing_stop_pct=trailing_stop_pct,
+                trailing_profit_pct=trailing_profit_pct,
+                risk_per_trade_pct=risk_per_trade_pct,
+                mode=MODE_LONG_SHORT,
+                exit_mode=exit_mode,
+                fill_priority=fill_priority,
+                open_=df_signals['open'].to_numpy(dtype=np.float64) if exit_mode == 'high_low' else None,
+                high=df_signals['high'].to_numpy(dtype=np.float64) if exit_mode == 'high_low' else None,
+                low=df_signals['low'].to_numpy(dtype=np.float64) if exit_mode == 'high_low' else None
+            )
+            trades = engine_result.trades
+            balance = engine_result.final_balance
+            self.logger.info(f"Backtest tamamlandı: {len(trades)} işlem, Son bakiye: {balance:.2f}")
             
             # Sonuçları hazırla
             result.final_balance = balance
@@ -509,38 +188,26 @@ class Backtester:
             result.total_profit_loss_pct = (result.total_profit_loss / initial_balance) * 100
             
             # İşlem istatistiklerini hesapla
-            win_trades = [trade for trade in trades if trade.profit_loss > 0]
-            loss_trades = [trade for trade in trades if trade.profit_loss <= 0]
-            
-            result.trades = trades
-            result.winning_trades = len(win_trades)
-            result.losing_trades = len(loss_trades)
+            result.winning_trades = int(np.count_nonzero(trades['profit_loss'] > 0))
+            result.losing_trades = len(trades) - result.winning_trades
             result.total_trades = len(trades)
-            result.win_rate = (result.winning_trades / len(trades) * 100) if trades else 0
+            result.win_rate = (result.winning_trades / len(trades) * 100) if len(trades) else 0
             
-            # Equity eğrisini düzenle
-            result.equity_curve = [(time, value) for time, value in equity_curve]
-            result.balance_history = [(time, value) for time, value in balance_history]
+            # Equity eğrisi, bakiye geçmişi ve işlemler (listeler erişildiğinde oluşturulur)
+            result.set_arrays(df_signals.index, engine_result.equity, engine_result.balance, trades, Trade)
             
-            # Maksimum düşüşü hesapla
-            if equity_curve:
-                peak = 0
-                max_drawdown = 0
-                
-                for _, value in equity_curve:
-                    if value > peak:
-                        peak = value
-                    drawdown = (peak - value) / peak * 100
-                    max_drawdown = max(max_drawdown, drawdown)
-                
-                result.max_drawdown = max_drawdown
-                result.max_drawdown_pct = max_drawdown
+            # Maksimum düşüş
+            if len(engine_result.equity):
+                result.max_drawdown = engine_result.max_drawdown
+                result.max_drawdown_pct = engine_result.max_drawdown
             
             result.take_profit_pct = take_profit_pct
             result.stop_loss_pct = stop_loss_pct
             result.trailing_stop_pct = trailing_stop_pct
             result.trailing_profit_pct = trailing_profit_pct
             result.risk_per_trade_pct = risk_per_trade_pct
+            result.exit_mode = exit_mode
+            result.fill_priority = fill_priority
             
             return result
             
@@ -554,7 +221,8 @@ class Backtester:
                     initial_balance: float = 10000, position_size_percent: float = 60,
                     leverage: int = 10, strategy_name: str = "Five_Stage_Approval",
                     take_profit_pct: float = 10.0, stop_loss_pct: float = 5.0,
-                    trailing_stop_pct: float = None, trailing_profit_pct: float = None):
+                    trailing_stop_pct: float = None, trailing_profit_pct: float = None,
+                    exit_mode: str = 'close', fill_priority: str = 'stop_first'):
         """
         Backtest çalıştır
         
@@ -570,6 +238,8 @@ class Backtester:
             stop_loss_pct (float, optional): Zarar durdurma yüzdesi
             trailing_stop_pct (float, optional): Takip eden stop yüzdesi (None ise devre dışı)
             trailing_profit_pct (float, optional): Takip eden kar alma yüzdesi (None ise devre dışı)
+            exit_mode (str, optional): 'close' veya 'high_low' (bar içi high/low ile çıkış)
+            fill_priority (str, optional): 'stop_first' veya 'target_first'
             
         Returns:
             BacktestResult: Backtest sonuçları
@@ -578,15 +248,12 @@ class Backtester:
         result = BacktestResult(symbol, timeframe, strategy_name)
         result.initial_balance = initial_balance
         
-        # Strateji sınıfını al
-        strategy_class = self.strategy_manager.get_strategy(strategy_name)
-        if not strategy_class:
+        # Strateji nesnesini al (havuzdan, paylaşılan nesne)
+        strategy = self.strategy_manager.get_strategy(strategy_name)
+        if not strategy:
             self.logger.error(f"Strateji bulunamadı: {strategy_name}")
             return result
         
-        # Strateji örneği oluştur
-        strategy = strategy_class()
-        
         # Veriyi analiz et
         df_signals = strategy.generate_signals(df)
         
@@ -596,4 +263,5 @@ class Backtester:
         
         # Backtest çalıştır
         return self.run(df_signals, strategy, symbol, timeframe, initial_balance, 
-                        take_profit_pct, stop_loss_pct, trailing_stop_pct, trailing_profit_pct, position_size_percent)
+                        take_profit_pct, stop_loss_pct, trailing_stop_pct, trailing_profit_pct, position_size_percent,
+                        exit_mode, fill_priority)
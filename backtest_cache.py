@@ -0,0 +1,405 @@
+import os
+import ast
+import json
+import hashlib
+import inspect
+import logging
+import importlib
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from backtest_serializer import dumps_json, loads_json
+from kline_store import KlineStore
+from strategy_config import StrategyConfig
+
+logger = logging.getLogger(__name__)
+
+# Varsayılan önbellek dizini (data/backtest_cache)
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'backtest_cache')
+
+# Önbelleğin diskte kaplayabileceği en fazla boyut; 0 önbelleği kapatır
+DEFAULT_CACHE_MAX_BYTES = int(float(os.getenv('BACKTEST_CACHE_MAX_MB', '256')) * 1024 * 1024)
+
+# Sonuç biçimi değiştiğinde artırılır; eski kayıtlar kendiliğinden geçersiz olur
+CACHE_VERSION = 2
+
+# Simülasyonu belirleyen modüller; kaynakları değişirse tüm kayıtlar geçersiz olur
+ENGINE_MODULES = ('new_backtest', 'backtest_engine', 'signal_encoding', 'numba_compat')
+
+# Proje modüllerinin arandığı dizinler; stratejinin buradaki importları da anahtara girer
+SOURCE_DIRS = (os.path.dirname(os.path.abspath(__file__)),)
+
+# Anahtara giren backtest girdileri
+BACKTEST_FIELDS = ('initial_balance', 'take_profit_pct', 'stop_loss_pct', 'trailing_stop_pct',
+                   'trailing_profit_pct', 'risk_per_trade_pct', 'exit_mode', 'fill_priority')
+
+# Veri parmak izine giren kline sütunları
+FINGERPRINT_COLUMNS = ('open_time', 'open', 'high', 'low', 'close', 'volume')
+
+_file_hashes: Dict[str, tuple] = {}
+_file_imports: Dict[str, tuple] = {}
+_file_hashes_lock = threading.Lock()
+
+
+def file_digest(path: str) -> str:
+    """
+    Dosya içeriğinin SHA-256 özeti (boyut ve mtime değişmedikçe bellekten döner)
+
+    Args:
+        path (str): Dosya yolu
+
+    Returns:
+        str: Hex özet
+    """
+    stat = os.stat(path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    with _file_hashes_lock:
+        cached = _file_hashes.get(path)
+        if cached and cached[0] == signature:
+            return cached[1]
+    with open(path, 'rb') as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    with _file_hashes_lock:
+        _file_hashes[path] = (signature, digest)
+    return digest
+
+
+def source_fingerprint(obj) -> str:
+    """Sınıf veya modülün tanımlandığı kaynak dosyanın özeti"""
+    try:
+        path = inspect.getsourcefile(obj)
+    except TypeError:
+        path = None
+    if not path or not os.path.exists(path):
+        return f"{getattr(obj, '__module__', '')}.{getattr(obj, '__qualname__', obj)}"
+    return file_digest(path)
+
+
+def _resolve_module(name: str, directories) -> Optional[str]:
+    """Modül adını verilen dizinlerdeki kaynak dosyasına çevir (paket önce); bulunamazsa None"""
+    parts = name.split('.')
+    for directory in directories:
+        base = os.path.join(directory, *parts)
+        for path in (os.path.join(base, '__init__.py'), base + '.py'):
+            if os.path.isfile(path):
+                return path
+    return None
+
+
+def _local_imports(path: str) -> List[str]:
+    """
+    Dosyanın import ettiği proje modüllerinin kaynak yolları (dosya değişmedikçe bellekten döner)
+
+    Fonksiyon içindeki importlar da sayılır; site-packages ve standart kütüphane
+    modülleri SOURCE_DIRS altında olmadığı için atlanır.
+    """
+    stat = os.stat(path)
+    signature = (stat.st_mtime_ns, stat.st_size, SOURCE_DIRS)
+    with _file_hashes_lock:
+        cached = _file_imports.get(path)
+        if cached and cached[0] == signature:
+            return cached[1]
+
+    with open(path, 'rb') as f:
+        tree = ast.parse(f.read(), filename=path)
+    package_dir = os.path.dirname(path)
+    names = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.extend((alias.name, SOURCE_DIRS) for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                # Göreli import: dosyanın paketinden yukarı çıkılır
+                directory = package_dir
+                for _ in range(node.level - 1):
+                    directory = os.path.dirname(directory)
+                directories = (directory,)
+            else:
+                directories = SOURCE_DIRS
+            module = node.module or ''
+            names.append((module, directories))
+            # from paket import altmodül
+            names.extend((f"{module}.{alias.name}".lstrip('.'), directories) for alias in node.names)
+
+    paths = []
+    for name, directories in names:
+        resolved = _resolve_module(name, directories) if name else None
+        if resolved and resolved != path and resolved not in paths:
+            paths.append(resolved)
+    with _file_hashes_lock:
+        _file_imports[path] = (signature, paths)
+    return paths
+
+
+def dependency_fingerprint(obj) -> Dict[str, str]:
+    """
+    Sınıf veya modülün kaynak dosyası ile dolaylı olarak import ettiği proje modüllerinin özetleri
+
+    Strateji kendi dosyası değişmese de kullandığı gösterge, önbellek veya temel
+    sınıf modülleri değişince sonuç değişebilir; bu yüzden hepsi anahtara girer.
+
+    Returns:
+        dict: Dosya yolu -> SHA-256 özeti (kaynak dosya bulunamazsa {ad: ad})
+    """
+    try:
+        path = inspect.getsourcefile(obj)
+    except TypeError:
+        path = None
+    if not path or not os.path.exists(path):
+        name = source_fingerprint(obj)
+        return {name: name}
+
+    digests, pending = {}, [os.path.abspath(path)]
+    while pending:
+        current = pending.pop()
+        if current in digests:
+            continue
+        digests[current] = file_digest(current)
+        pending.extend(_local_imports(current))
+    return digests
+
+
+def effective_parameters(strategy_name: str, overrides: Optional[Dict] = None,
+                         config: Optional[StrategyConfig] = None) -> Dict:
+    """
+    StrategyConfig'teki parametre değerlerini istekteki geçersiz kılmalarla birleştir
+
+    Args:
+        strategy_name (str): Strateji adı
+        overrides (dict, optional): İstekte verilen parametreler
+        config (StrategyConfig, optional): Yapılandırma. Defaults to config.json.
+
+    Returns:
+        dict: Parametre adı -> geçerli değer
+    """
+    config = config or StrategyConfig()
+    definition = config.get_strategy_parameters(strategy_name) or {}
+    parameters = {name: spec.get('value', spec.get('default')) if isinstance(spec, dict) else spec
+                  for name, spec in (definition.get('parameters') or {}).items()}
+    parameters.update(overrides or {})
+    return parameters
+
+
+def _to_ms(value) -> int:
+    return int(value.timestamp() * 1000) if isinstance(value, datetime) else int(value)
+
+
+class BacktestCache:
+    """
+    İçerik adresli, diskte saklanan backtest sonuç önbelleği
+
+    Anahtar; strateji sınıfı, kaynak dosyası ve import ettiği proje modülleri,
+    geçerli parametreler, sembol, aralık, tarih aralığı, TP/SL/trailing/risk
+    girdileri, simülasyon modüllerinin kaynakları ve kline deposundaki verinin
+    özetinden oluşur. Bunlardan biri değişince anahtar da değişir; eski kayıt
+    boyut sınırı aşıldığında en az kullanılanlardan başlanarak silinir.
+
+    Kline deposu istenen aralığı tamamen kapsamıyorsa (ör. bitiş bugünse ve son
+    mum henüz kapanmadıysa) sonuç sabit olmadığı için önbelleğe alınmaz.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+                 kline_store: Optional[KlineStore] = None, config: Optional[StrategyConfig] = None):
+        """
+        Args:
+            cache_dir (str, optional): Önbellek dizini. Defaults to data/backtest_cache.
+            max_bytes (int, optional): En fazla toplam boyut; 0 önbelleği kapatır.
+                Defaults to BACKTEST_CACHE_MAX_MB.
+            kline_store (KlineStore, optional): Veri özeti için kline deposu.
+                Defaults to BinanceAPI ile aynı piyasa deposu.
+            config (StrategyConfig, optional): Strateji yapılandırması. Defaults to config.json.
+        """
+        self.cache_dir = cache_dir or DEFAULT_CACHE_DIR
+        self.max_bytes = int(max_bytes)
+        testnet = os.getenv('TESTNET', 'false').lower() == 'true'
+        self.kline_store = kline_store or KlineStore(market='spot_testnet' if testnet else 'spot')
+        self.config = config
+        self.logger = logging.getLogger(__name__)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def data_fingerprint(self, symbol: str, interval: str, start_time: int, end_time: int) -> Optional[str]:
+        """
+        Kline deposundaki aralığın özeti
+
+        Returns:
+            str: Hex özet veya depo aralığı tamamen kapsamıyorsa None
+        """
+        if self.kline_store.missing_ranges(symbol, interval, start_time, end_time):
+            return None
+        columns = self.kline_store.read(symbol, interval, start_time, end_time)
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(str(len(columns['open_time'])).encode())
+        for name in FINGERPRINT_COLUMNS:
+            digest.update(np.ascontiguousarray(columns[name]).tobytes())
+        return digest.hexdigest()
+
+    def key(self, params: Dict, strategy_class) -> Optional[str]:
+        """
+        Backtest isteğinin önbellek anahtarı
+
+        Args:
+            params (dict): parse_backtest_request çıktısı
+            strategy_class: Strateji sınıfı
+
+        Returns:
+            str: Anahtar veya sonuç önbelleğe alınamıyorsa None
+        """
+        if not self.enabled:
+            return None
+        symbol, interval = params['symbol'], params['interval']
+        start_time, end_time = _to_ms(params['start_date']), _to_ms(params['end_date'])
+
+        data = self.data_fingerprint(symbol, interval, start_time, end_time)
+        if data is None:
+            return None
+
+        material = {
+            'version': CACHE_VERSION,
+            'strategy': f"{strategy_class.__module__}.{strategy_class.__qualname__}",
+            'strategy_source': sorted(dependency_fingerprint(strategy_class).values()),
+            'engine_source': [source_fingerprint(importlib.import_module(name)) for name in ENGINE_MODULES],
+            'parameters': effective_parameters(params['strategy'], params.get('parameters'), self.config),
+            'symbol': symbol,
+            'interval': interval,
+            'start_time': start_time,
+            'end_time': end_time,
+            'backtest': {field: params.get(field) for field in BACKTEST_FIELDS},
+            'data': data,
+        }
+        encoded = json.dumps(material, sort_keys=True, default=str).encode()
+        return hashlib.sha256(encoded).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def get(self, key: Optional[str]) -> Optional[Dict]:
+        """
+        Önbellekteki sonucu oku
+
+        Returns:
+            dict: Kaydedilmiş sonuç veya None
+        """
+        if not key or not self.enabled:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                payload = loads_json(f.read())
+            # Son kullanım zamanı silme sırasını belirler
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        except Exception as e:
+            self.logger.error(f"Backtest önbelleği okunurken hata: {key} - {str(e)}")
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return payload
+
+    def put(self, key: Optional[str], payload: Dict) -> bool:
+        """
+        Sonucu önbelleğe atomik olarak yaz ve gerekirse eski kayıtları sil
+
+        Returns:
+            bool: Yazıldıysa True
+        """
+        if not key or not self.enabled:
+            return False
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(dumps_json(payload))
+            os.replace(tmp_path, path)
+        except Exception as e:
+            self.logger.error(f"Backtest önbelleğine yazılırken hata: {key} - {str(e)}")
+            return False
+        self.evict()
+        return True
+
+    def _entries(self):
+        entries = []
+        if not os.path.isdir(self.cache_dir):
+            return entries
+        for shard in os.scandir(self.cache_dir):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith('.json'):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def evict(self) -> int:
+        """
+        Toplam boyut sınırı aşılmışsa en az kullanılan kayıtları sil
+
+        Returns:
+            int: Silinen kayıt sayısı
+        """
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        if removed:
+            self.logger.info(f"Backtest önbelleğinden {removed} kayıt silindi")
+        return removed
+
+    def clear(self) -> int:
+        """Tüm kayıtları sil"""
+        entries = self._entries()
+        for _, _, path in entries:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        return len(entries)
+
+    def stats(self) -> Dict:
+        entries = self._entries()
+        return {
+            'enabled': self.enabled,
+            'entries': len(entries),
+            'bytes': sum(size for _, size, _ in entries),
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+
+_backtest_cache = None
+_backtest_cache_lock = threading.Lock()
+
+
+def get_backtest_cache() -> BacktestCache:
+    """Süreç genelinde paylaşılan önbellek nesnesi (kayıtlar diskte süreçler arası paylaşılır)"""
+    global _backtest_cache
+    with _backtest_cache_lock:
+        if _backtest_cache is None:
+            _backtest_cache = BacktestCache()
+        return _backtest_cache
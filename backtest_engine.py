@@ -0,0 +1,485 @@
+import logging
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from numba_compat import NUMBA_AVAILABLE, njit
+from signal_encoding import encode_signals
+
+logger = logging.getLogger(__name__)
+
+# Motor modları
+MODE_LONG_ONLY = 0   # new_backtest: sadece LONG, gecikmeli equity, çıkış barında yeniden giriş
+MODE_LONG_SHORT = 1  # backtest: LONG/SHORT, anlık equity, çıkış barında yeniden giriş yok
+
+# Çıkış nedenleri
+EXIT_NONE = 0
+EXIT_SIGNAL = 1
+EXIT_STOP_LOSS = 2
+EXIT_TAKE_PROFIT = 3
+EXIT_TRAILING_STOP = 4
+EXIT_TRAILING_PROFIT = 5
+
+# Çıkış değerlendirme modları
+EXIT_MODE_CLOSE = 0     # TP/SL/trailing sadece kapanış fiyatıyla kontrol edilir
+EXIT_MODE_HIGH_LOW = 1  # TP/SL/trailing bar içi high/low ile kontrol edilir
+
+# Aynı barda hem stop hem hedef görüldüğünde hangisinin önce dolacağı
+FILL_STOP_FIRST = 0
+FILL_TARGET_FIRST = 1
+
+EXIT_MODES = {'close': EXIT_MODE_CLOSE, 'high_low': EXIT_MODE_HIGH_LOW}
+FILL_PRIORITIES = {'stop_first': FILL_STOP_FIRST, 'target_first': FILL_TARGET_FIRST}
+
+EXIT_REASONS = {
+    EXIT_SIGNAL: 'SIGNAL',
+    EXIT_STOP_LOSS: 'STOP_LOSS',
+    EXIT_TAKE_PROFIT: 'TAKE_PROFIT',
+    EXIT_TRAILING_STOP: 'TRAILING_STOP',
+    EXIT_TRAILING_PROFIT: 'TRAILING_PROFIT',
+}
+
+# İşlem kayıtları için yapılandırılmış dizi tipi
+TRADE_DTYPE = np.dtype([
+    ('entry_index', np.int64),
+    ('exit_index', np.int64),
+    ('side', np.int8),          # 1: LONG, -1: SHORT
+    ('entry_price', np.float64),
+    ('exit_price', np.float64),
+    ('position_size', np.float64),
+    ('profit_loss', np.float64),
+    ('profit_loss_pct', np.float64),
+    ('exit_reason', np.int8),
+])
+
+
+def signal_codes(signals) -> np.ndarray:
+    """
+    Sinyal sütununu int8 koda dönüştür (BUY: 1, SELL: -1, diğer: 0)
+
+    Kanonik int8 sinyaller kopyalanmadan kullanılır; eski metin ve tamsayı
+    sinyalleri signal_encoding.encode_signals ile dönüştürülür.
+
+    Args:
+        signals: Sinyal serisi veya dizisi
+
+    Returns:
+        np.ndarray: int8 sinyal kodları
+    """
+    return encode_signals(signals)
+
+
+@njit(cache=True)
+def _backtest_kernel(open_, high, low, close, signal, initial_balance, take_profit_pct, stop_loss_pct,
+                     trailing_stop_pct, trailing_profit_pct, risk_per_trade_pct, mode, exit_mode, fill_priority,
+                     equity_out, balance_out, entry_side, entry_size, exit_reason, exit_price):
+    """
+    Bar bazlı backtest döngüsü (numba varsa derlenir)
+
+    Devre dışı TP/SL/trailing değerleri NaN olarak verilir. i. bar için equity ve
+    bakiye, çıktı dizilerinin i-1. elemanına yazılır; giriş ve çıkışlar bar bazlı
+    olay dizilerine işlenir.
+
+    EXIT_MODE_HIGH_LOW modunda TP/SL/trailing seviyeleri barın high/low değerleriyle
+    kontrol edilir ve seviyeden (açılış seviyeyi aşmışsa açılıştan) doldurulur.
+    Trailing seviyesi önceki barların en yüksek/en düşük değerinden hesaplanır.
+    Aynı barda hem stop hem hedef görülürse önce açılışa bakılır, açılış iki
+    seviyenin arasındaysa fill_priority belirler. Sinyal çıkışları kapanıştan yapılır.
+
+    Returns:
+        float: Son bakiye
+    """
+    n = len(close)
+    balance = initial_balance
+    equity = initial_balance
+    position = 0
+    size = 0.0
+    entry = 0.0
+    highest = 0.0
+    lowest = np.inf
+
+    for i in range(1, n):
+        price = close[i]
+        sig = signal[i]
+
+        # Equity ve bakiye kaydı
+        if mode == MODE_LONG_ONLY:
+            equity_out[i - 1] = equity
+        elif position == 1:
+            equity_out[i - 1] = balance + size * (price / entry - 1)
+        elif position == -1:
+            equity_out[i - 1] = balance + size * (1 - price / entry)
+        else:
+            equity_out[i - 1] = balance
+        balance_out[i - 1] = balance
+
+        if position == 1 and mode == MODE_LONG_ONLY:
+            equity = balance + size * (price - entry) / entry
+
+        reason = EXIT_NONE
+        fill = price
+        if position != 0 and exit_mode == EXIT_MODE_HIGH_LOW:
+            bar_open = open_[i]
+            stop_reason = EXIT_NONE
+            stop_price = np.nan
+            if position == 1:
+                if stop_loss_pct == stop_loss_pct:
+                    stop_price = entry * (1 - stop_loss_pct / 100)
+                    stop_reason = EXIT_STOP_LOSS
+                if trailing_stop_pct == trailing_stop_pct:
+                    trail_price = highest * (1 - trailing_stop_pct / 100)
+                    if trail_price > entry and not (stop_price >= trail_price):
+                        stop_price = trail_price
+                        stop_reason = EXIT_TRAILING_STOP
+                target_price = entry * (1 + take_profit_pct / 100)
+                stop_hit = low[i] <= stop_price
+                target_hit = high[i] >= target_price
+                stop_gapped = bar_open <= stop_price
+                target_gapped = bar_open >= target_price
+            else:
+                if stop_loss_pct == stop_loss_pct:
+                    stop_price = entry * (1 + stop_loss_pct / 100)
+                    stop_reason = EXIT_STOP_LOSS
+                if trailing_stop_pct == trailing_stop_pct:
+                    trail_price = lowest * (1 + trailing_stop_pct / 100)
+                    if trail_price < entry and not (stop_price <= trail_price):
+                        stop_price = trail_price
+                        stop_reason = EXIT_TRAILING_STOP
+                target_price = entry * (1 - take_profit_pct / 100)
+                stop_hit = high[i] >= stop_price
+                target_hit = low[i] <= target_price
+                stop_gapped = bar_open >= stop_price
+                target_gapped = bar_open <= target_price
+
+            if stop_hit and target_hit:
+                if stop_gapped:
+                    target_hit = False
+                elif target_gapped or fill_priority == FILL_TARGET_FIRST:
+                    stop_hit = False
+
+            if stop_hit:
+                reason = stop_reason
+                fill = bar_open if stop_gapped else stop_price
+            elif target_hit:
+                reason = EXIT_TAKE_PROFIT
+                fill = bar_open if target_gapped else target_price
+            elif sig == -position:
+                reason = EXIT_SIGNAL
+
+            highest = max(highest, high[i])
+            lowest = min(lowest, low[i])
+        elif position == 1:
+            highest = max(highest, price)
+            if mode == MODE_LONG_ONLY:
+                if take_profit_pct == take_profit_pct and price >= entry * (1 + take_profit_pct / 100):
+                    reason = EXIT_TAKE_PROFIT
+                elif stop_loss_pct == stop_loss_pct and price <= entry * (1 - stop_loss_pct / 100):
+                    reason = EXIT_STOP_LOSS
+                elif (trailing_stop_pct == trailing_stop_pct and price <= highest * (1 - trailing_stop_pct / 100)
+                      and price > entry):
+                    reason = EXIT_TRAILING_STOP
+                elif sig == -1:
+                    reason = EXIT_SIGNAL
+            else:
+                take_profit_price = entry * (1 + take_profit_pct / 100)
+                if stop_loss_pct == stop_loss_pct and price <= entry * (1 - stop_loss_pct / 100):
+                    reason = EXIT_STOP_LOSS
+                elif take_profit_pct == take_profit_pct and price >= take_profit_price:
+                    reason = EXIT_TAKE_PROFIT
+                elif (trailing_stop_pct == trailing_stop_pct and price <= highest * (1 - trailing_stop_pct / 100)
+                      and price > entry):
+                    reason = EXIT_TRAILING_STOP
+                elif (trailing_profit_pct == trailing_profit_pct and price >= take_profit_price
+                      and price <= highest * (1 - trailing_profit_pct / 100)):
+                    reason = EXIT_TRAILING_PROFIT
+                elif sig == -1:
+                    reason = EXIT_SIGNAL
+        elif position == -1:
+            lowest = min(lowest, price)
+            take_profit_price = entry * (1 - take_profit_pct / 100)
+            if stop_loss_pct == stop_loss_pct and price >= entry * (1 + stop_loss_pct / 100):
+                reason = EXIT_STOP_LOSS
+            elif take_profit_pct == take_profit_pct and price <= take_profit_price:
+                reason = EXIT_TAKE_PROFIT
+            elif (trailing_stop_pct == trailing_stop_pct and price >= lowest * (1 + trailing_stop_pct / 100)
+                  and price < entry):
+                reason = EXIT_TRAILING_STOP
+            elif (trailing_profit_pct == trailing_profit_pct and price <= take_profit_price
+                  and price >= lowest * (1 + trailing_profit_pct / 100)):
+                reason = EXIT_TRAILING_PROFIT
+            elif sig == 1:
+                reason = EXIT_SIGNAL
+
+        # Pozisyonu kapat
+        if reason != EXIT_NONE:
+            if mode == MODE_LONG_ONLY:
+                balance = balance + size * (fill - entry) / entry
+                equity = balance
+            elif position == 1:
+                balance += size * (fill / entry - 1)
+            else:
+                balance += size * (1 - fill / entry)
+            exit_reason[i] = reason
+            exit_price[i] = fill
+            position = 0
+            size = 0.0
+            highest = 0.0
+            lowest = np.inf
+            if mode == MODE_LONG_SHORT:
+                continue
+
+        # Yeni pozisyon aç
+        if position == 0:
+            if sig == 1:
+                position = 1
+            elif sig == -1 and mode == MODE_LONG_SHORT:
+                position = -1
+            if position != 0:
+                size = balance * risk_per_trade_pct / 100
+                entry = price
+                highest = price
+                lowest = price
+                entry_side[i] = position
+                entry_size[i] = size
+
+    return balance
+
+
+def _disabled_as_nan(value: Optional[float], positive_only: bool = False) -> float:
+    """None (veya positive_only ise <= 0) değerleri devre dışı anlamında NaN'a çevir"""
+    if value is None or (positive_only and value <= 0):
+        return np.nan
+    return float(value)
+
+
+class EngineResult:
+    """Dizi tabanlı backtest motorunun çıktısı"""
+
+    def __init__(self, equity, balance, trades, final_balance, max_drawdown):
+        self.equity = equity
+        self.balance = balance
+        self.trades = trades
+        self.final_balance = final_balance
+        self.max_drawdown = max_drawdown
+
+
+def run_engine(close, signal, initial_balance: float = 1000.0, take_profit_pct: Optional[float] = None,
+               stop_loss_pct: Optional[float] = None, trailing_stop_pct: Optional[float] = None,
+               trailing_profit_pct: Optional[float] = None, risk_per_trade_pct: float = 1.0,
+               mode: int = MODE_LONG_ONLY, exit_mode: str = 'close', fill_priority: str = 'stop_first',
+               open_=None, high=None, low=None) -> EngineResult:
+    """
+    Kapanış fiyatları ve sinyal kodları üzerinde backtest çalıştır
+
+    Args:
+        close: Kapanış fiyatları
+        signal: int8 sinyal kodları (1: BUY, -1: SELL, 0: bekle)
+        initial_balance (float): Başlangıç bakiyesi
+        take_profit_pct (float, optional): Kar alma yüzdesi (None: devre dışı)
+        stop_loss_pct (float, optional): Zarar durdurma yüzdesi (None: devre dışı)
+        trailing_stop_pct (float, optional): Takip eden stop yüzdesi (None: devre dışı)
+        trailing_profit_pct (float, optional): Takip eden kar alma yüzdesi (None: devre dışı)
+        risk_per_trade_pct (float): Her işlemde kullanılacak bakiye yüzdesi
+        mode (int): MODE_LONG_ONLY veya MODE_LONG_SHORT
+        exit_mode (str): 'close' (kapanışa göre) veya 'high_low' (bar içi high/low'a göre)
+        fill_priority (str): Aynı barda stop ve hedef görülürse 'stop_first' veya 'target_first'
+        open_: Açılış fiyatları (sadece 'high_low' modunda gerekli)
+        high: En yüksek fiyatlar (sadece 'high_low' modunda gerekli)
+        low: En düşük fiyatlar (sadece 'high_low' modunda gerekli)
+
+    Returns:
+        EngineResult: equity/bakiye dizileri (2. bardan itibaren), işlemler ve özet değerler
+    """
+    if exit_mode not in EXIT_MODES:
+        raise ValueError(f"Geçersiz çıkış modu: {exit_mode}. Geçerli değerler: {list(EXIT_MODES)}")
+    if fill_priority not in FILL_PRIORITIES:
+        raise ValueError(f"Geçersiz dolum önceliği: {fill_priority}. Geçerli değerler: {list(FILL_PRIORITIES)}")
+
+    close = np.ascontiguousarray(close, dtype=np.float64)
+    signal = np.ascontiguousarray(signal, dtype=np.int8)
+    if exit_mode == 'high_low':
+        if open_ is None or high is None or low is None:
+            raise ValueError("'high_low' çıkış modu için open, high ve low dizileri gerekli")
+        open_ = np.ascontiguousarray(open_, dtype=np.float64)
+        high = np.ascontiguousarray(high, dtype=np.float64)
+        low = np.ascontiguousarray(low, dtype=np.float64)
+    else:
+        # Kapanış modunda high/low kullanılmaz
+        open_ = high = low = close
+    n = len(close)
+    steps = max(n - 1, 0)
+
+    # Önceden ayrılmış çıktı dizileri
+    equity = np.empty(steps, dtype=np.float64)
+    balance = np.empty(steps, dtype=np.float64)
+    entry_side = np.zeros(n, dtype=np.int8)
+    entry_size = np.zeros(n, dtype=np.float64)
+    exit_reason = np.zeros(n, dtype=np.int8)
+    exit_price = np.zeros(n, dtype=np.float64)
+
+    # backtest.py trailing değerlerini sadece > 0 ise uygular
+    positive_only = mode == MODE_LONG_SHORT
+    params = (
+        float(initial_balance),
+        _disabled_as_nan(take_profit_pct),
+        _disabled_as_nan(stop_loss_pct),
+        _disabled_as_nan(trailing_stop_pct, positive_only),
+        _disabled_as_nan(trailing_profit_pct, positive_only) if mode == MODE_LONG_SHORT else np.nan,
+        float(risk_per_trade_pct),
+        int(mode),
+        EXIT_MODES[exit_mode],
+        FILL_PRIORITIES[fill_priority],
+    )
+
+    if NUMBA_AVAILABLE:
+        final_balance = _backtest_kernel(open_, high, low, close, signal, *params,
+                                         equity, balance, entry_side, entry_size, exit_reason, exit_price)
+    else:
+        # Numba yoksa döngü Python listeleri üzerinde çalışır, sonra dizilere kopyalanır
+        equity_list = [0.0] * steps
+        balance_list = [0.0] * steps
+        entry_side_list = [0] * n
+        entry_size_list = [0.0] * n
+        exit_reason_list = [0] * n
+        exit_price_list = [0.0] * n
+        close_list = close.tolist()
+        if exit_mode == 'high_low':
+            open_list, high_list, low_list = open_.tolist(), high.tolist(), low.tolist()
+        else:
+            open_list = high_list = low_list = close_list
+        final_balance = _backtest_kernel(open_list, high_list, low_list, close_list, signal.tolist(), *params,
+                                         equity_list, balance_list, entry_side_list, entry_size_list,
+                                         exit_reason_list, exit_price_list)
+        equity[:] = equity_list
+        balance[:] = balance_list
+        entry_side[:] = entry_side_list
+        entry_size[:] = entry_size_list
+        exit_reason[:] = exit_reason_list
+        exit_price[:] = exit_price_list
+        del equity_list, balance_list, entry_side_list, entry_size_list, exit_reason_list, exit_price_list
+        del close_list, open_list, high_list, low_list
+
+    trades = _build_trades(close, entry_side, entry_size, exit_reason, exit_price, mode)
+
+    # Maksimum drawdown (new_backtest zirveyi başlangıç bakiyesinden, backtest 0'dan başlatır)
+    max_drawdown = 0.0
+    if steps:
+        initial_peak = float(initial_balance) if mode == MODE_LONG_ONLY else 0.0
+        peak = np.maximum.accumulate(np.maximum(equity, initial_peak))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            drawdown = np.where(peak > 0, (peak - equity) / peak * 100, 0.0)
+        max_drawdown = max(0.0, float(drawdown.max()))
+
+    return EngineResult(equity, balance, trades, float(final_balance), max_drawdown)
+
+
+def _build_trades(close, entry_side, entry_size, exit_reason, exit_fill, mode) -> np.ndarray:
+    """Bar bazlı giriş/çıkış olaylarından kapanmış işlemlerin yapılandırılmış dizisini oluştur"""
+    entries = np.flatnonzero(entry_side)
+    exits = np.flatnonzero(exit_reason)
+    count = len(exits)  # Son açık pozisyon işlem olarak sayılmaz
+    entries = entries[:count]
+
+    trades = np.empty(count, dtype=TRADE_DTYPE)
+    if count == 0:
+        return trades
+
+    side = entry_side[entries]
+    entry_price = close[entries]
+    exit_price = exit_fill[exits]
+    size = entry_size[entries]
+
+    trades['entry_index'] = entries
+    trades['exit_index'] = exits
+    trades['side'] = side
+    trades['entry_price'] = entry_price
+    trades['exit_price'] = exit_price
+    trades['position_size'] = size
+    trades['exit_reason'] = exit_reason[exits]
+
+    # Kar/zarar, döngüdeki formüllerle aynı şekilde hesaplanır
+    if mode == MODE_LONG_ONLY:
+        trades['profit_loss'] = size * (exit_price - entry_price) / entry_price
+        trades['profit_loss_pct'] = (exit_price - entry_price) / entry_price * 100
+    else:
+        long_side = side == 1
+        trades['profit_loss'] = np.where(long_side, size * (exit_price / entry_price - 1),
+                                         size * (1 - exit_price / entry_price))
+        trades['profit_loss_pct'] = np.where(long_side, (exit_price / entry_price - 1) * 100,
+                                             (1 - exit_price / entry_price) * 100)
+    return trades
+
+
+class ArrayBacktestResultMixin:
+    """
+    Sonuçları diziler halinde saklayan BacktestResult'lar için uyumluluk katmanı.
+
+    equity_curve, balance_history ve trades eski (zaman, değer) listeleri ve Trade
+    nesneleri olarak sadece erişildiğinde oluşturulur.
+    """
+
+    def set_arrays(self, times, equity: np.ndarray, balance: np.ndarray, trades: np.ndarray, trade_class) -> None:
+        """
+        Motor çıktısını sonuca bağla
+
+        Args:
+            times: Bar zamanları (tüm veri)
+            equity (np.ndarray): 2. bardan itibaren equity değerleri
+            balance (np.ndarray): 2. bardan itibaren bakiye değerleri
+            trades (np.ndarray): TRADE_DTYPE tipinde işlemler
+            trade_class: Eski Trade sınıfı
+        """
+        self.times = pd.DatetimeIndex(times) if not isinstance(times, pd.Index) else times
+        self.equity_values = equity
+        self.balance_values = balance
+        self.trades_array = trades
+        self._trade_class = trade_class
+        self._equity_curve = None
+        self._balance_history = None
+        self._trades = None
+
+    @property
+    def equity_curve(self):
+        if self._equity_curve is None:
+            equity = getattr(self, 'equity_values', None)
+            self._equity_curve = [] if equity is None else list(zip(self.times[1:], equity.tolist()))
+        return self._equity_curve
+
+    @equity_curve.setter
+    def equity_curve(self, value):
+        self._equity_curve = value
+
+    @property
+    def balance_history(self):
+        if self._balance_history is None:
+            balance = getattr(self, 'balance_values', None)
+            self._balance_history = [] if balance is None else list(zip(self.times[1:], balance.tolist()))
+        return self._balance_history
+
+    @balance_history.setter
+    def balance_history(self, value):
+        self._balance_history = value
+
+    @property
+    def trades(self):
+        if self._trades is None:
+            trades = getattr(self, 'trades_array', None)
+            self._trades = [] if trades is None else [
+                self._trade_class(
+                    entry_time=self.times[trade['entry_index']],
+                    entry_price=float(trade['entry_price']),
+                    position_size=float(trade['position_size']),
+                    position='LONG' if trade['side'] == 1 else 'SHORT',
+                    exit_time=self.times[trade['exit_index']],
+                    exit_price=float(trade['exit_price']),
+                    profit_loss=float(trade['profit_loss']),
+                    profit_loss_pct=float(trade['profit_loss_pct'])
+                )
+                for trade in trades
+            ]
+        return self._trades
+
+    @trades.setter
+    def trades(self, value):
+        self._trades = value
@@ -0,0 +1,507 @@
+import os
+import time
+import uuid
+import queue
+import logging
+import threading
+import traceback
+import multiprocessing
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+from backtest_cache import get_backtest_cache
+from backtest_serializer import columnar_result
+from kline_planner import plan_kline_requests
+
+logger = logging.getLogger(__name__)
+
+# Aynı anda çalışan backtest süreci sayısı
+DEFAULT_JOB_WORKERS = int(os.getenv('BACKTEST_JOB_WORKERS', '2'))
+
+# Saklanan bitmiş iş sayısı (en eskisi silinir)
+DEFAULT_JOB_HISTORY = int(os.getenv('BACKTEST_JOB_HISTORY', '50'))
+
+# Veri indirme ilerlemesinin kaç parçada raporlanacağı
+FETCH_CHUNKS = int(os.getenv('BACKTEST_FETCH_CHUNKS', '10'))
+
+PHASES = ('fetch', 'signals', 'simulation')
+ACTIVE_STATES = ('queued', 'running')
+FINISHED_STATES = ('completed', 'failed', 'cancelled')
+
+VALID_INTERVALS = ['1m', '3m', '5m', '15m', '30m', '1h', '2h', '4h', '6h', '8h', '12h', '1d', '3d', '1w', '1M']
+
+
+class JobCancelled(Exception):
+    """İş iptal edildiğinde çalışan süreçte fırlatılır"""
+
+
+def parse_backtest_request(data: Dict) -> Dict:
+    """
+    /api/backtest/run ile aynı alanları doğrula ve iş parametrelerine dönüştür
+
+    Args:
+        data (dict): İstek gövdesi
+
+    Returns:
+        dict: Çalışan sürece gönderilecek parametreler
+
+    Raises:
+        ValueError: Eksik veya geçersiz alan
+    """
+    data = data or {}
+
+    def optional_float(key):
+        return float(data[key]) if data.get(key) else None
+
+    params = {
+        'symbol': str(data.get('symbol', 'BTCUSDT')).upper(),
+        'interval': data.get('interval', '1h'),
+        'strategy': data.get('strategy', 'SimpleStrategy'),
+        'parameters': dict(data.get('parameters') or {}),
+        'initial_balance': float(data.get('initial_balance', 1000)),
+        'take_profit_pct': optional_float('take_profit_pct'),
+        'stop_loss_pct': optional_float('stop_loss_pct'),
+        'trailing_stop_pct': optional_float('trailing_stop_pct'),
+        'trailing_profit_pct': optional_float('trailing_profit_pct'),
+        'risk_per_trade_pct': float(data.get('risk_per_trade_pct', 1)),
+        'exit_mode': data.get('exit_mode', 'close'),
+        'fill_priority': data.get('fill_priority', 'stop_first'),
+    }
+
+    if params['interval'] not in VALID_INTERVALS:
+        raise ValueError(f"Geçersiz zaman aralığı: {params['interval']}. Geçerli değerler: {', '.join(VALID_INTERVALS)}")
+    if params['exit_mode'] not in ('close', 'high_low'):
+        raise ValueError(f"Geçersiz çıkış modu: {params['exit_mode']}. Geçerli değerler: close, high_low")
+    if params['fill_priority'] not in ('stop_first', 'target_first'):
+        raise ValueError(f"Geçersiz dolum önceliği: {params['fill_priority']}. Geçerli değerler: stop_first, target_first")
+
+    if not data.get('start_date') or not data.get('end_date'):
+        raise ValueError('Başlangıç ve bitiş tarihi gerekli')
+    try:
+        start_date = datetime.strptime(data['start_date'], '%Y-%m-%d')
+        end_date = min(datetime.strptime(data['end_date'], '%Y-%m-%d'), datetime.now())
+    except ValueError as date_error:
+        raise ValueError(f"Geçersiz tarih formatı: {str(date_error)}")
+    if start_date > end_date:
+        raise ValueError('Başlangıç tarihi bitiş tarihinden sonra olamaz')
+
+    params['start_date'] = start_date
+    params['end_date'] = end_date
+    return params
+
+
+def fetch_chunks(interval: str, start_date: datetime, end_date: datetime,
+                 chunks: int = FETCH_CHUNKS) -> List[tuple]:
+    """
+    Tarih aralığını istek pencerelerine hizalı en fazla `chunks` parçaya böl
+
+    Her parça ayrı indirilir ve sonrasında ilerleme raporlanır; parçalar kline
+    planlayıcısının pencerelerini bölmediği için fazladan istek oluşmaz.
+
+    Returns:
+        list: [(başlangıç, bitiş), ...] datetime çiftleri
+    """
+    windows = plan_kline_requests(interval, int(start_date.timestamp() * 1000), int(end_date.timestamp() * 1000))
+    if not windows:
+        return [(start_date, end_date)]
+
+    chunks = max(1, min(int(chunks), len(windows)))
+    bounds = [round(i * len(windows) / chunks) for i in range(chunks + 1)]
+    return [(datetime.fromtimestamp(windows[bounds[i]][0] / 1000),
+             datetime.fromtimestamp(windows[bounds[i + 1] - 1][1] / 1000))
+            for i in range(chunks)]
+
+
+def run_backtest_job(params: Dict, context: 'JobContext') -> Dict:
+    """
+    Backtest işini çalıştır (çalışan süreçte): veri indir, sinyal üret, simüle et
+
+    Args:
+        params (dict): parse_backtest_request çıktısı
+        context (JobContext): İlerleme raporlama ve iptal kontrolü
+
+    Returns:
+        dict: columnar_result çıktısı
+    """
+    from binance_api import BinanceAPI
+    from new_backtest import Backtester
+    from optimizer import create_strategy
+    from strategy_manager import get_strategy_registry
+
+    symbol, interval = params['symbol'], params['interval']
+    start_date, end_date = params['start_date'], params['end_date']
+
+    strategy_class = get_strategy_registry().get(params['strategy'])
+    if not strategy_class:
+        raise ValueError(f"Strateji bulunamadı: {params['strategy']}")
+
+    # Aynı girdilerle daha önce çalıştırılmış backtest diskteki önbellekten döner
+    cache = get_backtest_cache()
+    cached = cache.get(cache.key(params, strategy_class))
+    if cached is not None:
+        for phase in PHASES:
+            context.progress(phase, 100)
+        return cached
+
+    # Veri parça parça indirilir; her parçadan sonra ilerleme ve iptal kontrol edilir
+    api = BinanceAPI()
+    chunks = fetch_chunks(interval, start_date, end_date)
+    frames = []
+    context.progress('fetch', 0)
+    for i, (chunk_start, chunk_end) in enumerate(chunks):
+        context.check()
+        frame = api.get_historical_klines(symbol, interval, chunk_start, chunk_end)
+        if frame is not None and not frame.empty:
+            frames.append(frame)
+        context.progress('fetch', (i + 1) / len(chunks) * 100)
+
+    if not frames:
+        raise ValueError(f"Veri alınamadı veya belirtilen tarih aralığında veri yok: {symbol} {interval} "
+                         f"{start_date.strftime('%Y-%m-%d')} - {end_date.strftime('%Y-%m-%d')}")
+    df = pd.concat(frames)
+    df = df[~df.index.duplicated(keep='last')].sort_index()
+
+    context.check()
+    strategy = create_strategy(strategy_class, params.get('parameters') or {})
+    result = Backtester().run(
+        df, strategy, symbol, interval, params['initial_balance'],
+        params['take_profit_pct'], params['stop_loss_pct'], params['trailing_stop_pct'],
+        params['trailing_profit_pct'], params['risk_per_trade_pct'], params['exit_mode'],
+        params['fill_priority'], progress=context.progress
+    )
+    context.check()
+    # Backtester hataları loglayıp boş sonuç döndürür; risk parametreleri sadece başarılı çalışmanın sonunda yazılır
+    if result.risk_per_trade_pct is None:
+        raise ValueError('Backtest sonuçları hesaplanamadı')
+
+    context.progress('simulation', 100)
+    payload = columnar_result(result, df, start_date, end_date)
+    # Veri artık depoda olduğu için anahtar indirme sonrası hesaplanır
+    cache.put(cache.key(params, strategy_class), payload)
+    return payload
+
+
+class JobContext:
+    """Çalışan süreç tarafında ilerleme bildirimi ve iptal kontrolü"""
+
+    def __init__(self, job_id: str, updates, cancel_event):
+        self.job_id = job_id
+        self.updates = updates
+        self.cancel_event = cancel_event
+        self._last = {}
+
+    def progress(self, phase: str, percent: float) -> None:
+        """Aşama ilerlemesini ana sürece gönder (tam sayı yüzde değiştiğinde)"""
+        percent = int(max(0.0, min(100.0, percent)))
+        if self._last.get(phase) == percent:
+            return
+        self._last[phase] = percent
+        self.updates.put((self.job_id, phase, percent))
+
+    def cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+    def check(self) -> None:
+        """İş iptal edildiyse JobCancelled fırlat"""
+        if self.cancel_event.is_set():
+            raise JobCancelled(self.job_id)
+
+
+def _execute(job_id: str, runner: Callable, params: Dict, updates, cancel_event) -> Dict:
+    """Çalışan süreçte işi çalıştır; sonuç veya hata sözlük olarak döner"""
+    context = JobContext(job_id, updates, cancel_event)
+    try:
+        context.check()
+        updates.put((job_id, 'state', 'running'))
+        return {'state': 'completed', 'result': runner(params, context)}
+    except JobCancelled:
+        return {'state': 'cancelled'}
+    except Exception as e:
+        return {'state': 'failed', 'error': f"{type(e).__name__}: {str(e)}", 'traceback': traceback.format_exc()}
+
+
+class BacktestJob:
+    """Tek bir backtest işinin durumu (ana süreçte)"""
+
+    def __init__(self, job_id: str, params: Dict, cancel_event):
+        self.id = job_id
+        self.params = params
+        self.state = 'queued'
+        self.progress = {phase: 0 for phase in PHASES}
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.result = None
+        self.error = None
+        self.traceback = None
+        self.cancel_event = cancel_event
+        self.future = None
+        self.cached = False
+        self.version = 0
+
+    @property
+    def done(self) -> bool:
+        return self.state in FINISHED_STATES
+
+    @property
+    def percent(self) -> float:
+        return round(sum(self.progress.values()) / len(PHASES), 1)
+
+    def to_dict(self, include_result: bool = False) -> Dict:
+        data = {
+            'id': self.id,
+            'state': self.state,
+            'symbol': self.params.get('symbol'),
+            'interval': self.params.get('interval'),
+            'strategy': self.params.get('strategy'),
+            'progress': dict(self.progress),
+            'percent': self.percent,
+            'created': datetime.fromtimestamp(self.created).isoformat(),
+            'started': datetime.fromtimestamp(self.started).isoformat() if self.started else None,
+            'finished': datetime.fromtimestamp(self.finished).isoformat() if self.finished else None,
+            'duration': round((self.finished or time.time()) - (self.started or self.created), 3),
+            'error': self.error,
+            'cached': self.cached,
+            'version': self.version,
+        }
+        if include_result:
+            data['result'] = self.result
+        return data
+
+
+class BacktestJobManager:
+    """
+    Backtest işlerini süreç havuzunda arka planda çalıştırır
+
+    İşler bir kimlikle kuyruğa alınır; çalışan süreçler ilerlemeyi paylaşılan bir
+    kuyruğa yazar ve ana süreçteki dinleyici iş durumlarını günceller. İptal,
+    kuyruktaki işler için anında, çalışan işler için bir sonraki kontrol
+    noktasında gerçekleşir. Bitmiş işlerin sadece son `history_size` tanesi tutulur.
+    """
+
+    def __init__(self, runner: Callable = run_backtest_job, max_workers: int = DEFAULT_JOB_WORKERS,
+                 history_size: int = DEFAULT_JOB_HISTORY, mp_context: str = 'spawn'):
+        """
+        Args:
+            runner (callable, optional): (params, context) -> sonuç; süreçlere gönderildiği için
+                modül seviyesinde tanımlı olmalıdır. Defaults to run_backtest_job.
+            max_workers (int, optional): Süreç sayısı. Defaults to BACKTEST_JOB_WORKERS.
+            history_size (int, optional): Saklanan bitmiş iş sayısı. Defaults to BACKTEST_JOB_HISTORY.
+            mp_context (str, optional): multiprocessing başlatma yöntemi. Defaults to 'spawn'.
+        """
+        self.logger = logging.getLogger(__name__)
+        self.runner = runner
+        self.max_workers = max(1, int(max_workers))
+        self.history_size = max(1, int(history_size))
+        self.mp_context = mp_context
+
+        self.active: Dict[str, BacktestJob] = {}
+        self.pending: deque = deque()
+        self.history: 'OrderedDict[str, BacktestJob]' = OrderedDict()
+
+        self._lock = threading.RLock()
+        self._changed = threading.Condition(self._lock)
+        self._manager = None
+        self._updates = None
+        self._executor = None
+        self._listener = None
+        self._running = False
+
+    def _ensure_started(self) -> None:
+        if self._running:
+            return
+        context = multiprocessing.get_context(self.mp_context)
+        self._manager = context.Manager()
+        self._updates = self._manager.Queue()
+        self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+        self._running = True
+        self._listener = threading.Thread(target=self._listen, name='backtest-jobs', daemon=True)
+        self._listener.start()
+        self.logger.info(f"Backtest iş havuzu başlatıldı ({self.max_workers} süreç)")
+
+    def _listen(self) -> None:
+        """Çalışan süreçlerden gelen ilerleme mesajlarını işle"""
+        while self._running:
+            try:
+                job_id, key, value = self._updates.get(timeout=0.2)
+            except queue.Empty:
+                continue
+            except Exception:
+                if self._running:
+                    self.logger.error(f"İlerleme kuyruğu okunurken hata: {traceback.format_exc()}")
+                return
+            with self._lock:
+                job = self.active.get(job_id)
+                if job is None or job.done:
+                    continue
+                if key == 'state':
+                    job.state = value
+                    job.started = time.time()
+                else:
+                    job.progress[key] = value
+                self._touch(job)
+
+    def _touch(self, job: BacktestJob) -> None:
+        job.version += 1
+        self._changed.notify_all()
+
+    def submit(self, params: Dict, result: Optional[Dict] = None) -> BacktestJob:
+        """
+        Backtest işini kuyruğa al
+
+        Args:
+            params (dict): parse_backtest_request çıktısı (runner'a aynen gönderilir)
+            result (dict, optional): Önbellekten gelen sonuç; verilirse iş havuza
+                gönderilmeden tamamlanmış olarak kaydedilir
+
+        Returns:
+            BacktestJob: Kuyruktaki (veya tamamlanmış) iş
+        """
+        if result is not None:
+            job = BacktestJob(uuid.uuid4().hex[:12], params, threading.Event())
+            job.cached = True
+            job.started = job.created
+            self._finish(job, {'state': 'completed', 'result': result})
+            self.logger.info(f"Backtest sonucu önbellekten döndü: {job.id} {params.get('symbol')} "
+                             f"{params.get('interval')} {params.get('strategy')}")
+            return job
+
+        with self._lock:
+            self._ensure_started()
+            job = BacktestJob(uuid.uuid4().hex[:12], params, self._manager.Event())
+            self.active[job.id] = job
+            self.pending.append(job.id)
+            self._touch(job)
+            self._dispatch()
+        self.logger.info(f"Backtest işi kuyruğa alındı: {job.id} {params.get('symbol')} "
+                         f"{params.get('interval')} {params.get('strategy')}")
+        return job
+
+    def _dispatch(self) -> None:
+        """Boş süreç varsa sıradaki işleri havuza gönder
+
+        İşler havuza sadece boş süreç olduğunda verilir; böylece kuyruktaki işler
+        ProcessPoolExecutor'ın iç kuyruğuna girmeden anında iptal edilebilir.
+        """
+        while self.pending and sum(1 for job in self.active.values() if job.future) < self.max_workers:
+            job = self.active[self.pending.popleft()]
+            job.future = self._executor.submit(_execute, job.id, self.runner, job.params,
+                                               self._updates, job.cancel_event)
+            job.future.add_done_callback(lambda future, job_id=job.id: self._on_done(job_id, future))
+
+    def _on_done(self, job_id: str, future=None) -> None:
+        with self._lock:
+            job = self.active.pop(job_id, None)
+            if job is None:
+                return
+            if future is None or future.cancelled():
+                outcome = {'state': 'cancelled'}
+            else:
+                try:
+                    outcome = future.result()
+                except Exception as e:
+                    outcome = {'state': 'failed', 'error': f"{type(e).__name__}: {str(e)}"}
+            self._finish(job, outcome)
+
+        if job.state == 'failed':
+            self.logger.error(f"Backtest işi başarısız: {job.id} - {job.error}")
+        else:
+            self.logger.info(f"Backtest işi bitti: {job.id} ({job.state})")
+
+    def _finish(self, job: BacktestJob, outcome: Dict) -> None:
+        """İşi sonucuyla birlikte geçmişe taşı ve sıradaki işleri başlat"""
+        with self._lock:
+            self.active.pop(job.id, None)
+            job.state = outcome['state']
+            job.result = outcome.get('result')
+            job.error = outcome.get('error')
+            job.traceback = outcome.get('traceback')
+            job.finished = time.time()
+            if job.state == 'completed':
+                job.progress = {phase: 100 for phase in PHASES}
+
+            self.history[job.id] = job
+            while len(self.history) > self.history_size:
+                self.history.popitem(last=False)
+            self._touch(job)
+            if self._running:
+                self._dispatch()
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        İşi iptal et
+
+        Returns:
+            bool: İş bulunduysa ve henüz bitmemişse True
+        """
+        with self._lock:
+            job = self.active.get(job_id)
+            if job is None:
+                return False
+            job.cancel_event.set()
+            if job.future is None:
+                # Henüz havuza verilmemiş iş doğrudan bitirilir
+                self.pending.remove(job_id)
+                self._on_done(job_id)
+            else:
+                # Çalışan süreç bir sonraki kontrol noktasında durur
+                self.logger.info(f"Çalışan backtest işine iptal isteği gönderildi: {job_id}")
+            return True
+
+    def get(self, job_id: str) -> Optional[BacktestJob]:
+        with self._lock:
+            return self.active.get(job_id) or self.history.get(job_id)
+
+    def snapshot(self, job_id: str, include_result: bool = False) -> Optional[Dict]:
+        with self._lock:
+            job = self.get(job_id)
+            return job.to_dict(include_result) if job else None
+
+    def wait(self, job_id: str, version: int = -1, timeout: Optional[float] = None) -> Optional[Dict]:
+        """
+        İşin durumu `version` sürümünden farklı olana kadar bekle (SSE için)
+
+        Returns:
+            dict: İş durumu (zaman aşımında değişmemiş olabilir) veya iş yoksa None
+        """
+        with self._changed:
+            self._changed.wait_for(lambda: (self.get(job_id) is None or self.get(job_id).version != version),
+                                   timeout=timeout)
+            return self.snapshot(job_id)
+
+    def list_jobs(self) -> List[Dict]:
+        with self._lock:
+            jobs = list(self.active.values()) + list(reversed(self.history.values()))
+            return [job.to_dict() for job in jobs]
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Çalışan işleri iptal et ve süreç havuzunu kapat"""
+        with self._lock:
+            if not self._running:
+                return
+            self._running = False
+            for job_id in list(self.active):
+                self.cancel(job_id)
+            executor = self._executor
+        executor.shutdown(wait=wait, cancel_futures=True)
+        if self._listener:
+            self._listener.join(1)
+        self._manager.shutdown()
+        self.logger.info("Backtest iş havuzu durduruldu")
+
+
+_job_manager = None
+_job_manager_lock = threading.Lock()
+
+
+def get_job_manager() -> BacktestJobManager:
+    """Uygulama genelinde paylaşılan iş yöneticisi"""
+    global _job_manager
+    with _job_manager_lock:
+        if _job_manager is None:
+            _job_manager = BacktestJobManager()
+        return _job_manager
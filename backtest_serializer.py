@@ -0,0 +1,258 @@
+import json
+import logging
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# orjson ve pyarrow opsiyonel bağımlılıklardır; yoksa standart json kullanılır, arrow biçimi sunulmaz
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+try:
+    import pyarrow as pa
+    ARROW_AVAILABLE = True
+except ImportError:
+    pa = None
+    ARROW_AVAILABLE = False
+
+# json: eski satır biçimi (backtest sayfası), columnar: paralel diziler, arrow: Arrow IPC akışı
+FORMATS = ('json', 'columnar', 'arrow')
+DEFAULT_FORMAT = 'json'
+
+MIMETYPES = {
+    'json': 'application/json',
+    'columnar': 'application/json',
+    'arrow': 'application/vnd.apache.arrow.stream',
+}
+
+# Sonuçtaki tekil alanlar (eski yanıt adlarıyla)
+SUMMARY_FIELDS = {
+    'strategy': 'strategy',
+    'symbol': 'symbol',
+    'interval': 'interval',
+    'initial_balance': 'initial_balance',
+    'final_balance': 'final_balance',
+    'profit_loss': 'total_profit_loss',
+    'profit_loss_percent': 'total_profit_loss_pct',
+    'total_trades': 'total_trades',
+    'win_count': 'winning_trades',
+    'loss_count': 'losing_trades',
+    'win_rate': 'win_rate',
+    'max_drawdown': 'max_drawdown',
+    'take_profit_pct': 'take_profit_pct',
+    'stop_loss_pct': 'stop_loss_pct',
+    'trailing_stop_pct': 'trailing_stop_pct',
+    'trailing_profit_pct': 'trailing_profit_pct',
+    'risk_per_trade_pct': 'risk_per_trade_pct',
+    'exit_mode': 'exit_mode',
+    'fill_priority': 'fill_priority',
+}
+
+TRADE_FIELDS = ('entry_time', 'exit_time', 'side', 'entry_price', 'exit_price', 'position_size',
+                'pnl', 'pnl_percent', 'exit_reason')
+
+TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def negotiate_format(value: Optional[str]) -> str:
+    """
+    İstekteki format parametresini doğrula
+
+    Args:
+        value (str, optional): 'json', 'columnar' veya 'arrow'. Defaults to 'json'.
+
+    Returns:
+        str: Geçerli biçim
+
+    Raises:
+        ValueError: Bilinmeyen biçim veya pyarrow yüklü değilken 'arrow'
+    """
+    fmt = (value or DEFAULT_FORMAT).lower()
+    if fmt not in FORMATS:
+        raise ValueError(f"Geçersiz yanıt biçimi: {value}. Geçerli değerler: {', '.join(FORMATS)}")
+    if fmt == 'arrow' and not ARROW_AVAILABLE:
+        raise ValueError("Arrow biçimi için pyarrow yüklü olmalı")
+    return fmt
+
+
+def epoch_ms(times) -> np.ndarray:
+    """Zaman dizisini epoch milisaniye (int64) dizisine çevir (saat dilimsiz zamanlar UTC kabul edilir)"""
+    index = pd.DatetimeIndex(times)
+    if index.tz is not None:
+        index = index.tz_convert('UTC').tz_localize(None)
+    return index.values.astype('datetime64[ms]').astype(np.int64)
+
+
+def _scalar(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def columnar_result(result, df: Optional[pd.DataFrame], start_date: datetime, end_date: datetime) -> Dict:
+    """
+    BacktestResult'ı satır nesnesi oluşturmadan sütun bazlı sonuç sözlüğüne çevir
+
+    Equity/bakiye eğrisi ortak bir epoch-ms zaman dizisi ve değer dizileri, işlemler
+    ise paralel diziler olarak döner; diziler motor çıktısının kendisidir.
+
+    Args:
+        result: ArrayBacktestResultMixin tabanlı backtest sonucu
+        df (pd.DataFrame, optional): Backtest verisi (veri noktası sayısı için)
+        start_date (datetime): Başlangıç tarihi
+        end_date (datetime): Bitiş tarihi
+
+    Returns:
+        dict: Tekil alanlar, 'curve', 'trades', 'signal_stats' ve 'date_range'
+    """
+    times = getattr(result, 'times', None)
+    times_ms = epoch_ms(times) if times is not None else np.empty(0, dtype=np.int64)
+    equity = getattr(result, 'equity_values', None)
+    balance = getattr(result, 'balance_values', None)
+    trades = getattr(result, 'trades_array', None)
+
+    curve = {
+        'time': times_ms[1:] if equity is not None else np.empty(0, dtype=np.int64),
+        'equity': np.asarray(equity if equity is not None else [], dtype=np.float64),
+        'balance': np.asarray(balance if balance is not None else [], dtype=np.float64),
+    }
+    if trades is None:
+        trade_columns = {name: np.empty(0) for name in TRADE_FIELDS}
+    else:
+        trade_columns = {
+            'entry_time': times_ms[trades['entry_index']],
+            'exit_time': times_ms[trades['exit_index']],
+            'side': trades['side'],
+            'entry_price': trades['entry_price'],
+            'exit_price': trades['exit_price'],
+            'position_size': trades['position_size'],
+            'pnl': trades['profit_loss'],
+            'pnl_percent': trades['profit_loss_pct'],
+            'exit_reason': trades['exit_reason'],
+        }
+
+    payload = {name: _scalar(getattr(result, attribute, None)) for name, attribute in SUMMARY_FIELDS.items()}
+    payload.update({
+        'format': 'columnar',
+        'curve': curve,
+        'trades': {name: np.ascontiguousarray(values) for name, values in trade_columns.items()},
+        'signal_stats': {str(key): int(value) for key, value in (getattr(result, 'signal_stats', None) or {}).items()},
+        'date_range': {
+            'start_date': start_date.strftime('%Y-%m-%d'),
+            'end_date': end_date.strftime('%Y-%m-%d'),
+            'data_points': len(df) if df is not None else 0
+        }
+    })
+    return payload
+
+
+def _format_times(values) -> list:
+    if len(values) == 0:
+        return []
+    return pd.to_datetime(np.asarray(values, dtype=np.int64), unit='ms').strftime(TIME_FORMAT).tolist()
+
+
+def to_rows(payload: Dict) -> Dict:
+    """
+    Sütun bazlı sonucu eski satır biçimine çevir (backtest sayfası ve eski istemciler için)
+
+    Returns:
+        dict: equity_curve/balance_history [[zaman, değer], ...] ve işlem sözlükleri
+    """
+    curve, trades = payload['curve'], payload['trades']
+    times = _format_times(curve['time'])
+    sides = np.where(np.asarray(trades['side']) == 1, 'LONG', 'SHORT').tolist()
+    entry_times, exit_times = _format_times(trades['entry_time']), _format_times(trades['exit_time'])
+    columns = {name: np.asarray(trades[name], dtype=np.float64).tolist()
+               for name in ('entry_price', 'exit_price', 'pnl', 'pnl_percent')}
+
+    rows = {key: value for key, value in payload.items() if key not in ('format', 'curve', 'trades')}
+    rows['equity_curve'] = [list(point) for point in zip(times, np.asarray(curve['equity'], dtype=np.float64).tolist())]
+    rows['balance_history'] = [list(point) for point in zip(times, np.asarray(curve['balance'], dtype=np.float64).tolist())]
+    rows['trades'] = [{
+        'entry_time': entry_times[i],
+        'entry_price': columns['entry_price'][i],
+        'exit_time': exit_times[i],
+        'exit_price': columns['exit_price'][i],
+        'side': sides[i],
+        'pnl': columns['pnl'][i],
+        'pnl_percent': columns['pnl_percent'][i],
+    } for i in range(len(sides))]
+    return rows
+
+
+def _json_default(value):
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (datetime, pd.Timestamp)):
+        return value.isoformat()
+    raise TypeError(f"JSON'a çevrilemeyen tip: {type(value).__name__}")
+
+
+def dumps_json(obj) -> bytes:
+    """NumPy dizilerini destekleyen hızlı JSON serileştirme (orjson yoksa standart json)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=_json_default,
+                            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, default=_json_default).encode('utf-8')
+
+
+def loads_json(data):
+    """dumps_json ile yazılmış veriyi oku"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps_arrow(payload: Dict) -> bytes:
+    """
+    Sonucu Arrow IPC akışı olarak serileştir
+
+    Akıştaki tablo equity eğrisidir (time, equity, balance); tekil alanlar ve
+    paralel işlem dizileri şema meta verisinde JSON olarak taşınır.
+    """
+    if not ARROW_AVAILABLE:
+        raise ValueError("Arrow biçimi için pyarrow yüklü olmalı")
+    curve = payload['curve']
+    table = pa.table({
+        'time': pa.array(np.asarray(curve['time'], dtype=np.int64), type=pa.timestamp('ms')),
+        'equity': np.asarray(curve['equity'], dtype=np.float64),
+        'balance': np.asarray(curve['balance'], dtype=np.float64),
+    })
+    summary = {key: value for key, value in payload.items() if key not in ('curve', 'trades')}
+    table = table.replace_schema_metadata({
+        'summary': dumps_json(summary),
+        'trades': dumps_json(payload['trades']),
+    })
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def render(payload: Dict, fmt: str = DEFAULT_FORMAT) -> Tuple[bytes, str]:
+    """
+    Sonucu istenen biçimde serileştir
+
+    Args:
+        payload (dict): columnar_result çıktısı
+        fmt (str, optional): 'json', 'columnar' veya 'arrow'. Defaults to 'json'.
+
+    Returns:
+        tuple: (gövde, mimetype)
+    """
+    if fmt == 'arrow':
+        return dumps_arrow(payload), MIMETYPES['arrow']
+    if fmt == 'columnar':
+        return dumps_json(payload), MIMETYPES['columnar']
+    return dumps_json(to_rows(payload)), MIMETYPES['json']
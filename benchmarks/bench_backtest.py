@@ -0,0 +1,89 @@
+"""
+Backtest motoru hız karşılaştırması
+
+Kullanım:
+    python benchmarks/bench_backtest.py [satır_sayısı]
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backtest_engine import MODE_LONG_ONLY, run_engine, signal_codes  # noqa: E402
+from numba_compat import NUMBA_AVAILABLE  # noqa: E402
+
+
+def make_signals(rows, seed=42):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.001, rows)))
+    signals = rng.choice(np.array(['BUY', 'SELL', 'HOLD'], dtype=object), size=rows, p=[0.01, 0.01, 0.98])
+    index = pd.date_range('2020-01-01', periods=rows, freq='min')
+    return pd.DataFrame({'close': close, 'signal': signals}, index=index)
+
+
+def legacy_backtest(df, take_profit_pct=2.0, stop_loss_pct=1.0, risk_per_trade_pct=10.0):
+    """Eski .iloc döngüsü (karşılaştırma için, sadece LONG)"""
+    balance = equity = 1000.0
+    position = None
+    size = entry = highest = 0
+    equity_curve = []
+    for i in range(1, len(df)):
+        current_time = df.index[i]
+        price = df['close'].iloc[i]
+        signal = df['signal'].iloc[i]
+        equity_curve.append((current_time, equity))
+        if position:
+            equity = balance + size * (price - entry) / entry
+            highest = max(highest, price)
+            if (price >= entry * (1 + take_profit_pct / 100) or price <= entry * (1 - stop_loss_pct / 100)
+                    or signal == "SELL"):
+                balance += size * (price - entry) / entry
+                equity = balance
+                position = None
+        if position is None and signal == "BUY":
+            size = balance * risk_per_trade_pct / 100
+            entry = highest = price
+            position = "LONG"
+    return balance
+
+
+def run_new(df):
+    return run_engine(df['close'].to_numpy(), signal_codes(df['signal']), 1000.0, 2.0, 1.0, None, None, 10.0,
+                      MODE_LONG_ONLY)
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    df = make_signals(rows)
+    print(f"Numba: {'var' if NUMBA_AVAILABLE else 'yok (saf Python yolu)'}")
+
+    # İlk çağrı (numba varsa derleme süresini de içerir)
+    run_new(df.iloc[:1000])
+    started = time.perf_counter()
+    result = run_new(df)
+    new_time = time.perf_counter() - started
+
+    # Bellek ölçümü ayrı çalıştırılır (tracemalloc süreyi etkiler)
+    tracemalloc.start()
+    run_new(df)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"Yeni motor, {rows} bar: {new_time:.2f} s, {len(result.trades)} işlem, "
+          f"tepe bellek: {peak / 1024 / 1024:.0f} MB")
+
+    # Eski döngü çok yavaş olduğu için küçük bir örnek üzerinde ölçülüp ölçeklenir
+    sample = min(rows, 20_000)
+    started = time.perf_counter()
+    legacy_backtest(df.iloc[:sample])
+    legacy_time = (time.perf_counter() - started) * rows / sample
+    print(f"Eski döngü, {rows} bar (tahmini): {legacy_time:.1f} s")
+    print(f"Hızlanma: ~{legacy_time / new_time:.0f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+Equity eğrisi örnekleme (LTTB / min-max) hız ve yanıt boyutu ölçümü
+
+Kullanım:
+    python benchmarks/bench_downsample.py [nokta_sayısı] [piksel_genişliği]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backtest_serializer import dumps_json  # noqa: E402
+from downsample import lttb_indices, minmax_indices  # noqa: E402
+
+
+def make_curve(points, seed=42):
+    rng = np.random.default_rng(seed)
+    time_ms = 1_577_836_800_000 + np.arange(points, dtype=np.int64) * 60_000
+    equity = 1000 * np.exp(np.cumsum(rng.normal(0, 0.0005, points)))
+    return time_ms, equity
+
+
+def reference_lttb(x, y, threshold):
+    """Nokta nokta Python LTTB (karşılaştırma için)"""
+    n = len(y)
+    every = (n - 2) / (threshold - 2)
+    selected = [0]
+    a = 0
+    for i in range(threshold - 2):
+        next_start = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        if i == threshold - 3:
+            next_start, next_end = n - 1, n
+        avg_x = sum(x[next_start:next_end]) / (next_end - next_start)
+        avg_y = sum(y[next_start:next_end]) / (next_end - next_start)
+        start, end = int(i * every) + 1, int((i + 1) * every) + 1
+        best, best_area = start, -1.0
+        for j in range(start, min(end, n - 1)):
+            area = abs((x[a] - avg_x) * (y[j] - y[a]) - (x[a] - x[j]) * (avg_y - y[a]))
+            if area > best_area:
+                best, best_area = j, area
+        selected.append(best)
+        a = best
+    selected.append(n - 1)
+    return selected
+
+
+def timed(fn, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main():
+    points = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    width = int(sys.argv[2]) if len(sys.argv) > 2 else 1600
+    time_ms, equity = make_curve(points)
+
+    full_size = len(dumps_json({'time': time_ms, 'equity': equity}))
+    print(f"{points} nokta, {width} piksel; tam eğri: {full_size / 1024 / 1024:.1f} MB")
+
+    lttb_time, lttb = timed(lambda: lttb_indices(time_ms, equity, width))
+    minmax_time, minmax = timed(lambda: minmax_indices(equity, width))
+    for name, elapsed, indices in (('LTTB', lttb_time, lttb), ('Min/max', minmax_time, minmax)):
+        size = len(dumps_json({'time': time_ms[indices], 'equity': equity[indices]}))
+        print(f"{name:8s}: {elapsed * 1000:7.1f} ms, {len(indices)} nokta, {size / 1024:.0f} KB")
+
+    # Saf Python LTTB yavaş olduğu için küçük bir örnek üzerinde ölçülüp ölçeklenir
+    sample = min(points, 50_000)
+    x, y = time_ms[:sample].astype(float).tolist(), equity[:sample].tolist()
+    python_time, _ = timed(lambda: reference_lttb(x, y, max(3, width * sample // points)), repeat=1)
+    python_time *= points / sample
+    print(f"Saf Python LTTB (tahmini): {python_time * 1000:.0f} ms, hızlanma: ~{python_time / lttb_time:.0f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+Ham kline çözümleme (DataFrame + to_numeric vs tipli çözücü) hız ve bellek ölçümü
+
+Kullanım:
+    python benchmarks/bench_kline_decoder.py [kline_sayısı]
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kline_decoder import klines_to_dataframe  # noqa: E402
+
+
+def make_klines(rows, start=1_577_836_800_000):
+    klines = []
+    for i in range(rows):
+        open_time = start + i * 60_000
+        price = 30000 + (i % 5000) * 0.13
+        klines.append([open_time, f"{price:.8f}", f"{price + 4:.8f}", f"{price - 4:.8f}", f"{price + 1:.8f}",
+                       f"{12.5 + i % 100:.8f}", open_time + 59_999, f"{price * 12.5:.8f}", 1000 + i % 700,
+                       f"{6.25:.8f}", f"{price * 6.25:.8f}", "0"])
+    return klines
+
+
+def legacy_convert(klines):
+    """Eski BinanceClient._convert_klines_to_dataframe dönüşümü"""
+    df = pd.DataFrame(klines, columns=[
+        'timestamp', 'open', 'high', 'low', 'close', 'volume',
+        'close_time', 'quote_volume', 'trades', 'taker_buy_base',
+        'taker_buy_quote', 'ignore'
+    ])
+    for col in ['open', 'high', 'low', 'close', 'volume']:
+        df[col] = pd.to_numeric(df[col], errors='coerce')
+    df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+    df.set_index('timestamp', inplace=True)
+    return df
+
+
+def measure(fn, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, result
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    klines = make_klines(rows)
+    print(f"{rows} kline")
+
+    cases = (
+        ('Eski (DataFrame)', lambda: legacy_convert(klines)),
+        ('Tipli çözücü', lambda: klines_to_dataframe(klines)),
+        ('Kompakt (float32)', lambda: klines_to_dataframe(klines, compact=True)),
+    )
+    baseline = None
+    for name, fn in cases:
+        elapsed, peak, df = measure(fn)
+        size = df.memory_usage(deep=True).sum()
+        baseline = baseline or (elapsed, peak)
+        print(f"{name:18s}: {elapsed * 1000:7.1f} ms ({baseline[0] / elapsed:4.1f}x), "
+              f"tepe bellek {peak / 1024 / 1024:6.1f} MB ({baseline[1] / peak:4.1f}x), "
+              f"DataFrame {size / 1024 / 1024:5.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""
+Sinyal sütunu (metin vs int8) bellek ve sayım/kodlama hızı ölçümü
+
+Kullanım:
+    python benchmarks/bench_signal_encoding.py [satır_sayısı]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from signal_encoding import count_signals, encode_signals, signal_column  # noqa: E402
+
+
+def timed(fn, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = np.random.default_rng(42)
+    buy = rng.random(rows) < 0.05
+    sell = ~buy & (rng.random(rows) < 0.05)
+
+    labels = pd.Series(np.where(buy, 'BUY', np.where(sell, 'SELL', 'HOLD')).astype(object))
+    codes = pd.Series(signal_column(buy, sell))
+
+    label_size = labels.memory_usage(deep=True)
+    code_size = codes.memory_usage(deep=True)
+    print(f"{rows} satır; metin: {label_size / 1024 / 1024:.1f} MB, int8: {code_size / 1024 / 1024:.1f} MB "
+          f"({label_size / code_size:.0f}x)")
+
+    build_labels, _ = timed(lambda: np.where(buy, 'BUY', np.where(sell, 'SELL', 'HOLD')).astype(object))
+    build_codes, _ = timed(lambda: signal_column(buy, sell))
+    print(f"Sütun oluşturma : metin {build_labels * 1000:6.1f} ms, int8 {build_codes * 1000:6.1f} ms")
+
+    count_labels, _ = timed(lambda: labels.value_counts().to_dict())
+    count_codes, _ = timed(lambda: count_signals(codes))
+    print(f"Sinyal sayımı   : metin {count_labels * 1000:6.1f} ms, int8 {count_codes * 1000:6.1f} ms")
+
+    adapt, _ = timed(lambda: encode_signals(labels))
+    native, _ = timed(lambda: encode_signals(codes))
+    print(f"Motor girdisi   : metin uyarlayıcı {adapt * 1000:6.1f} ms, int8 {native * 1000:6.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""
+Strateji kaydı soğuk/sıcak arama gecikmesi ölçümü
+
+Eski StrategyManager her oluşturulduğunda tüm strateji dosyalarını import edip
+sınıfları inspect ile tarıyordu; kayıt bir kez AST ile tarar, modülleri ilk
+kullanımda import eder ve sonraki aramaları sözlükten yapar.
+
+Kullanım:
+    python benchmarks/bench_strategy_registry.py [arama_sayısı]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from strategy_manager import StrategyRegistry  # noqa: E402
+
+
+def main():
+    lookups = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    started = time.perf_counter()
+    registry = StrategyRegistry()
+    scan_ms = (time.perf_counter() - started) * 1000
+    names = registry.names()
+    print(f"Tarama: {scan_ms:.1f} ms, {len(names)} strateji (modül import edilmeden)")
+
+    started = time.perf_counter()
+    for name in names:
+        registry.get(name)
+    cold_ms = (time.perf_counter() - started) * 1000
+    print(f"Soğuk aramalar (modül importu dahil): {cold_ms:.1f} ms")
+
+    keys = [name.lower().replace('strategy', '') for name in names]
+    started = time.perf_counter()
+    for i in range(lookups):
+        registry.get(keys[i % len(keys)])
+    warm_us = (time.perf_counter() - started) / lookups * 1_000_000
+    print(f"Sıcak arama: {warm_us:.2f} µs/arama ({lookups} arama)")
+
+    stats = registry.stats()
+    print(f"Metrikler: soğuk ort. {stats['cold_avg_ms']} ms, sıcak ort. {stats['warm_avg_ms']} ms, "
+          f"yeniden yükleme {stats['reloads']}")
+
+
+if __name__ == '__main__':
+    main()
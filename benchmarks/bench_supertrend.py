@@ -0,0 +1,77 @@
+"""
+Supertrend hesaplama hızı karşılaştırması
+
+Kullanım:
+    python benchmarks/bench_supertrend.py [satır_sayısı]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from advanced_indicators import AdvancedIndicators  # noqa: E402
+from numba_compat import NUMBA_AVAILABLE  # noqa: E402
+
+
+def make_ohlcv(rows, seed=42):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.005, rows)))
+    high = close * (1 + rng.uniform(0, 0.01, rows))
+    low = close * (1 - rng.uniform(0, 0.01, rows))
+    index = pd.date_range('2020-01-01', periods=rows, freq='min')
+    return pd.DataFrame({'open': close, 'high': high, 'low': low, 'close': close, 'volume': 1.0}, index=index)
+
+
+def legacy_supertrend(df, multiplier=3, period=10):
+    """Eski .iloc / df.at döngüsü (karşılaştırma için)"""
+    hl2 = (df['high'] + df['low']) / 2
+    df['upperband'] = hl2 + (multiplier * df['atr'])
+    df['lowerband'] = hl2 - (multiplier * df['atr'])
+    df['supertrend'] = 0.0
+    df['supertrend_direction'] = 0
+    for i in range(period, len(df)):
+        curr_close = df['close'].iloc[i]
+        curr_upper = df['upperband'].iloc[i]
+        curr_lower = df['lowerband'].iloc[i]
+        prev_upper = df['upperband'].iloc[i-1]
+        prev_supertrend = df['supertrend'].iloc[i-1]
+        if prev_supertrend == prev_upper:
+            direction, value = (1, curr_lower) if curr_close > curr_upper else (-1, curr_upper)
+        else:
+            direction, value = (-1, curr_upper) if curr_close < curr_lower else (1, curr_lower)
+        df.at[df.index[i], 'supertrend'] = value
+        df.at[df.index[i], 'supertrend_direction'] = direction
+    return df
+
+
+def timed(func, *args):
+    started = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - started
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    indicators = AdvancedIndicators()
+
+    df = indicators.calculate_atr(make_ohlcv(rows), 10)
+    print(f"Numba: {'var' if NUMBA_AVAILABLE else 'yok (saf Python yolu)'}")
+
+    # İlk çağrı (numba varsa derleme süresini de içerir)
+    indicators.calculate_supertrend(df.copy())
+    new_time = min(timed(indicators.calculate_supertrend, df.copy()) for _ in range(3))
+    print(f"Yeni Supertrend, {rows} satır: {new_time * 1000:.1f} ms")
+
+    # Eski döngü çok yavaş olduğu için küçük bir örnek üzerinde ölçülüp ölçeklenir
+    sample = min(rows, 10_000)
+    legacy_time = timed(legacy_supertrend, df.iloc[:sample].copy()) * rows / sample
+    print(f"Eski Supertrend, {rows} satır (tahmini): {legacy_time:.1f} s")
+    print(f"Hızlanma: ~{legacy_time / new_time:.0f}x")
+
+
+if __name__ == '__main__':
+    main()
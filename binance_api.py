@@ -4,6 +4,9 @@ import pandas as pd
 from datetime import datetime, timedelta
 from binance.client import Client
 from dotenv import load_dotenv
+from kline_store import KlineStore, columns_to_dataframe
+from kline_planner import fetch_planned_klines
+from fetch_engine import get_fetch_engine, get_weight_limiter, kline_request_weight
 
 # Logging
 logger = logging.getLogger('binance_api')
@@ -19,6 +22,9 @@ class BinanceAPI:
         # TestNet mi yoksa Live mı kontrol et
         testnet = os.getenv('TESTNET', 'false').lower() == 'true'
         
+        # Yerel kline deposu
+        self.kline_store = KlineStore(market='spot_testnet' if testnet else 'spot')
+        
         if testnet:
             api_key = os.getenv('BINANCE_TEST_API_KEY')
             api_secret = os.getenv('BINANCE_TEST_API_SECRET')
@@ -72,49 +78,47 @@ class BinanceAPI:
             logger.info(f"Veri alınıyor: {symbol} {interval} {start_date} - {end_date}")
             logger.info(f"Zaman damgaları: {start_timestamp} - {end_timestamp}")
             
-            # Binance API'sinden veri al
-            try:
-                klines = self.client.get_historical_klines(
-                    symbol=symbol,
-                    interval=interval,
-                    start_str=start_timestamp,
-                    end_str=end_timestamp
-                )
-                logger.info(f"Alınan veri miktarı: {len(klines)} kayıt")
-            except Exception as api_error:
-                logger.error(f"Binance API'sinden veri alınırken hata: {str(api_error)}")
-                if "Invalid symbol" in str(api_error):
-                    logger.error(f"Geçersiz sembol: {symbol}")
-                elif "Invalid interval" in str(api_error):
-                    logger.error(f"Geçersiz zaman aralığı: {interval}")
-                else:
-                    logger.error(f"API hatası detayı: {repr(api_error)}")
-                raise api_error
+            # Binance API'sinden sadece depoda olmayan kısımları planlanmış pencerelerle al
+            def fetch_range(gap_start, gap_end):
+                try:
+                    klines = fetch_planned_klines(
+                        lambda window_start, window_end, limit: self._request_klines(
+                            symbol, interval, limit, window_start, window_end
+                        ),
+                        interval,
+                        gap_start,
+                        gap_end,
+                        log=logger,
+                        engine=get_fetch_engine()
+                    )
+                    logger.info(f"Alınan veri miktarı: {len(klines)} kayıt")
+                    return klines
+                except Exception as api_error:
+                    logger.error(f"Binance API'sinden veri alınırken hata: {str(api_error)}")
+                    if "Invalid symbol" in str(api_error):
+                        logger.error(f"Geçersiz sembol: {symbol}")
+                    elif "Invalid interval" in str(api_error):
+                        logger.error(f"Geçersiz zaman aralığı: {interval}")
+                    else:
+                        logger.error(f"API hatası detayı: {repr(api_error)}")
+                    raise api_error
+            
+            columns = self.kline_store.get_klines(symbol, interval, start_timestamp, end_timestamp, fetch_range)
             
             # Veri boş ise boş DataFrame dön
-            if not klines:
+            if len(columns['open_time']) == 0:
                 logger.warning(f"Belirtilen tarih aralığında veri bulunamadı: {symbol} {interval}")
                 logger.warning(f"Zaman aralığı (ms): {start_timestamp} - {end_timestamp}")
                 logger.warning(f"Zaman aralığı (insan okunaklı): {start_date.strftime('%Y-%m-%d %H:%M:%S')} - {end_date.strftime('%Y-%m-%d %H:%M:%S')}")
                 return pd.DataFrame()
                 
             # Veriyi DataFrame'e dönüştür
-            df = pd.DataFrame(
-                klines,
-                columns=[
-                    'timestamp', 'open', 'high', 'low', 'close', 'volume',
-                    'close_time', 'quote_asset_volume', 'number_of_trades',
-                    'taker_buy_base_asset_volume', 'taker_buy_quote_asset_volume', 'ignore'
-                ]
-            )
-            
-            # Veri dönüşümlerini yap
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-            df.set_index('timestamp', inplace=True)
-            
-            # Sayısal sütunları dönüştür
-            numeric_columns = ['open', 'high', 'low', 'close', 'volume']
-            df[numeric_columns] = df[numeric_columns].apply(pd.to_numeric)
+            df = columns_to_dataframe(columns).rename(columns={
+                'quote_volume': 'quote_asset_volume',
+                'trades': 'number_of_trades',
+                'taker_buy_base': 'taker_buy_base_asset_volume',
+                'taker_buy_quote': 'taker_buy_quote_asset_volume'
+            })
             
             logger.info(f"Veri alındı: {len(df)} satır, ilk tarih: {df.index[0].strftime('%Y-%m-%d %H:%M:%S')}, son tarih: {df.index[-1].strftime('%Y-%m-%d %H:%M:%S')}")
             
@@ -127,6 +131,22 @@ class BinanceAPI:
             logger.error(f"Hata detayı:\n{traceback.format_exc()}")
             raise e
             
+    def _request_klines(self, symbol, interval, limit, start_time, end_time):
+        """
+        Paylaşılan ağırlık bütçesini kullanarak tek bir kline isteği gönder
+        
+        Returns:
+            list: Ham kline listesi
+        """
+        get_weight_limiter().acquire(kline_request_weight(limit))
+        return self.client.get_klines(
+            symbol=symbol,
+            interval=interval,
+            limit=limit,
+            startTime=start_time,
+            endTime=end_time
+        )
+            
     def get_exchange_info(self, symbol=None):
         """
         Borsa bilgilerini al
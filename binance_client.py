@@ -8,6 +8,10 @@ import time
 from datetime import datetime, timedelta
 import numpy as np
 import random
+from kline_decoder import COMPACT_DEFAULT, klines_to_dataframe
+from kline_store import KlineStore, columns_to_dataframe
+from kline_planner import expected_kline_count, fetch_planned_klines
+from fetch_engine import RestKlineFetcher, get_fetch_engine, get_weight_limiter, kline_request_weight
 
 # .env dosyasını yükle
 load_dotenv()
@@ -31,6 +35,13 @@ class BinanceClient:
         self.has_valid_keys = False
         self.futures = False  # Varsayılan olarak spot işlemler için
         
+        # Yerel kline deposu (piyasa anahtarına göre)
+        self.use_kline_store = os.getenv('KLINE_STORE', 'true').lower() == 'true'
+        self._kline_stores = {}
+        self._kline_fetchers = {}
+        # Borsadan gelen klineleri float32 fiyatlarla çöz (KLINE_COMPACT)
+        self.compact_klines = COMPACT_DEFAULT
+        
         # API anahtarları boşsa, client başlatma
         if not api_key or not api_secret:
             self.logger.warning("API anahtarları boş, client başlatılmadı")
@@ -240,12 +251,17 @@ class BinanceClient:
                     self.logger.warning(f"Limit {limit} çok büyük, {max_limit} olarak ayarlandı")
                     limit = max_limit
                 
-                # Tarih aralığı varsa ve büyükse, parçalara böl
-                if start_time and end_time and (end_time - start_time) > 1000 * 60 * 60 * 24 * 30:  # 30 günden fazla
+                # Tarih aralığı varsa yerel depodan sun, sadece eksik kısımları borsadan al
+                if start_time and end_time and self.use_kline_store:
+                    return self._get_historical_klines_from_store(symbol, interval, start_time, end_time)
+                
+                # Tarih aralığı tek istekte alınamayacak kadar büyükse, parçalara böl
+                if start_time and end_time and expected_kline_count(interval, start_time, end_time) > limit:
                     self.logger.info("Tarih aralığı büyük, parçalara bölünüyor...")
                     return self._get_historical_klines_in_chunks(symbol, interval, start_time, end_time, limit)
                 
-                # Normal veri alımı
+                # Normal veri alımı (paylaşılan ağırlık bütçesinden düş)
+                get_weight_limiter().acquire(kline_request_weight(limit, self.futures))
                 if self.testnet:
                     # Testnet için client kullan
                     if self.futures:
@@ -315,6 +331,115 @@ class BinanceClient:
             self.logger.error(traceback.format_exc())
             return pd.DataFrame()
             
+    def _get_kline_store(self):
+        """
+        Aktif piyasa için kline deposunu döndür
+
+        Returns:
+            KlineStore: spot/futures ve testnet/live ayrımına göre depo
+        """
+        market = 'futures' if self.futures else 'spot'
+        if self.testnet:
+            market += '_testnet'
+        if market not in self._kline_stores:
+            self._kline_stores[market] = KlineStore(market=market)
+        return self._kline_stores[market]
+
+    def _get_historical_klines_from_store(self, symbol, interval, start_time, end_time):
+        """
+        Tarih aralığını yerel kline deposundan al, eksik baş/son kısımları borsadan tamamla
+        
+        Args:
+            symbol (str): İşlem çifti
+            interval (str): Zaman aralığı
+            start_time (int): Başlangıç zamanı (milisaniye)
+            end_time (int): Bitiş zamanı (milisaniye)
+            
+        Returns:
+            pd.DataFrame: Mum verileri
+        """
+        def fetch_range(gap_start, gap_end):
+            return self._fetch_klines_in_chunks(symbol, interval, gap_start, gap_end)
+        
+        columns = self._get_kline_store().get_klines(symbol, interval, start_time, end_time, fetch_range)
+        df = columns_to_dataframe(columns)
+        
+        if df.empty:
+            self.logger.error(f"Veri alınamadı: {symbol} {interval}")
+        else:
+            self.logger.info(f"Başarıyla {len(df)} adet mum verisi alındı")
+            self.logger.info(f"Veri aralığı: {df.index[0]} - {df.index[-1]}")
+        return df
+
+    def _get_base_url(self):
+        """
+        Aktif piyasa için API kök adresini döndür
+        
+        Returns:
+            str: API kök adresi
+        """
+        if self.testnet:
+            return 'https://testnet.binancefuture.com' if self.futures else 'https://testnet.binance.vision'
+        return 'https://fapi.binance.com' if self.futures else 'https://api.binance.com'
+
+    def _get_kline_fetcher(self):
+        """
+        Aktif piyasa için REST kline istemcisini döndür (kline uç noktası imza gerektirmez)
+        
+        Returns:
+            RestKlineFetcher: Paylaşılan ağırlık sınırlayıcıyı kullanan istemci
+        """
+        base_url = self._get_base_url()
+        if base_url not in self._kline_fetchers:
+            self._kline_fetchers[base_url] = RestKlineFetcher(base_url, futures=self.futures)
+        return self._kline_fetchers[base_url]
+
+    def get_server_time(self):
+        """
+        Aktif piyasanın sunucu zamanını al
+        
+        Returns:
+            int: Sunucu zamanı (milisaniye)
+        """
+        return self._get_kline_fetcher().get_server_time()
+
+    def _request_klines(self, symbol, interval, limit, start_time=None, end_time=None):
+        """
+        Tek bir kline isteği gönder (hata durumunda exception yükseltir)
+        
+        Returns:
+            list: Ham kline listesi
+        """
+        return self._get_kline_fetcher().get_klines(symbol, interval, limit, start_time, end_time)
+
+    def _fetch_klines_in_chunks(self, symbol, interval, start_time, end_time, limit=1000):
+        """
+        Tarih aralığını planlanmış pencereler halinde ham kline listesi olarak al
+        
+        Pencereler zaman aralığına göre tam olarak limit kadar mum içerecek şekilde
+        hesaplanır ve paylaşılan istek motoruyla paralel alınır; hız, süreç genelindeki
+        ağırlık sınırlayıcı ile belirlenir. Dönen veride tekrarlar atılır ve boşluklar
+        loglanır. Hatalar yakalanmaz; böylece depo başarısız aralıkları kapsanmış saymaz.
+        
+        Args:
+            symbol (str): İşlem çifti
+            interval (str): Zaman aralığı
+            start_time (int): Başlangıç zamanı (milisaniye)
+            end_time (int): Bitiş zamanı (milisaniye)
+            limit (int): Her parça için limit
+            
+        Returns:
+            list: Birleştirilmiş ham kline listesi
+        """
+        self.logger.info(f"Parçalı veri alımı başlatılıyor: {symbol} {interval}")
+        
+        def request_window(window_start, window_end, window_limit):
+            self.logger.info(f"Parça alınıyor: {pd.to_datetime(window_start, unit='ms')} - {pd.to_datetime(window_end, unit='ms')}")
+            return self._request_klines(symbol, interval, window_limit, window_start, window_end)
+        
+        return fetch_planned_klines(request_window, interval, start_time, end_time, limit,
+                                    log=self.logger, engine=get_fetch_engine())
+
     def _get_historical_klines_in_chunks(self, symbol, interval, start_time, end_time, limit=1000):
         """
         Büyük tarih aralıkları için parçalı veri alımı
@@ -330,99 +455,22 @@ class BinanceClient:
             pd.DataFrame: Birleştirilmiş veri
         """
         try:
-            self.logger.info(f"Parçalı veri alımı başlatılıyor: {symbol} {interval}")
+            klines = self._fetch_klines_in_chunks(symbol, interval, start_time, end_time, limit)
             
-            # Tarih aralığını parçalara böl
-            time_chunks = []
-            chunk_size = 1000 * 60 * 60 * 24 * 30  # 30 günlük parçalar
-            current_start = start_time
+            if not klines:
+                self.logger.error("Hiç veri alınamadı")
+                return pd.DataFrame()
             
-            while current_start < end_time:
-                current_end = min(current_start + chunk_size, end_time)
-                time_chunks.append((current_start, current_end))
-                current_start = current_end
+            # Planlayıcı veriyi sıralı ve tekrarsız döndürür
+            result_df = self._convert_klines_to_dataframe(klines)
             
-            self.logger.info(f"Toplam {len(time_chunks)} parça oluşturuldu")
+            self.logger.info(f"Toplam {len(result_df)} satır veri alındı")
             
-            # Her parça için veri al ve birleştir
-            all_data = []
-            for i, (chunk_start, chunk_end) in enumerate(time_chunks):
-                self.logger.info(f"Parça {i+1}/{len(time_chunks)} alınıyor: {pd.to_datetime(chunk_start, unit='ms')} - {pd.to_datetime(chunk_end, unit='ms')}")
-                
-                # API çağrısını yap
-                if self.testnet:
-                    if self.futures:
-                        klines = self.client.futures_klines(symbol=symbol, interval=interval, limit=limit, 
-                                                          startTime=chunk_start, endTime=chunk_end)
-                    else:
-                        klines = self.client.get_klines(symbol=symbol, interval=interval, limit=limit, 
-                                                      startTime=chunk_start, endTime=chunk_end)
-                else:
-                    if self.futures:
-                        klines = self.client.futures_klines(symbol=symbol, interval=interval, limit=limit, 
-                                                          startTime=chunk_start, endTime=chunk_end)
-                    else:
-                        try:
-                            self.logger.info(f"get_klines çağrılıyor: {symbol}, {interval}, limit={limit}, startTime={start_time}, endTime={end_time}")
-                            klines = self.client.get_klines(symbol=symbol, interval=interval, limit=limit, 
-                                                           startTime=chunk_start, endTime=chunk_end)
-                            self.logger.info(f"get_klines yanıt alındı, veri sayısı: {len(klines) if klines else 0}")
-                        except Exception as kline_error:
-                            self.logger.error(f"get_klines hata: {str(kline_error)}")
-                            # Hata durumunda daha kısa bir zaman aralığı dene
-                            try:
-                                if chunk_start and chunk_end:
-                                    # Zaman aralığını son 30 güne sınırla
-                                    now = int(time.time() * 1000)
-                                    new_start = max(chunk_start, now - (30 * 24 * 60 * 60 * 1000))  # son 30 gün
-                                    self.logger.info(f"Alternatif tarih aralığı deneniyor: {pd.to_datetime(new_start, unit='ms')} - {pd.to_datetime(chunk_end, unit='ms')}")
-                                    klines = self.client.get_klines(symbol=symbol, interval=interval, limit=limit, 
-                                                                   startTime=new_start, endTime=chunk_end)
-                                    self.logger.info(f"Alternatif get_klines yanıt alındı, veri sayısı: {len(klines) if klines else 0}")
-                                else:
-                                    # Son 100 veri noktasını al
-                                    self.logger.info(f"Son {limit} veri noktası alınıyor...")
-                                    klines = self.client.get_klines(symbol=symbol, interval=interval, limit=limit)
-                                    self.logger.info(f"Son veriler alındı, veri sayısı: {len(klines) if klines else 0}")
-                            except Exception as alt_error:
-                                self.logger.error(f"Alternatif veri alımı da başarısız: {str(alt_error)}")
-                                klines = []
-                
-                # Veri varsa DataFrame'e dönüştür ve ekle
-                if klines:
-                    chunk_df = self._convert_klines_to_dataframe(klines)
-                    if not chunk_df.empty:
-                        all_data.append(chunk_df)
-                        self.logger.info(f"Parça {i+1} veri sayısı: {len(chunk_df)}")
-                    else:
-                        self.logger.warning(f"Parça {i+1} için veri alınamadı")
-                else:
-                    self.logger.warning(f"Parça {i+1} için veri alınamadı")
-                
-                # API limitlerini aşmamak için kısa bir bekleme
-                import time
-                time.sleep(0.5)
+            # Veri aralığını logla
+            if not result_df.empty:
+                self.logger.info(f"Veri aralığı: {result_df.index[0]} - {result_df.index[-1]}")
             
-            # Tüm verileri birleştir
-            if all_data:
-                result_df = pd.concat(all_data)
-                
-                # Duplike kayıtları temizle
-                result_df = result_df[~result_df.index.duplicated(keep='first')]
-                
-                # Tarihe göre sırala
-                result_df.sort_index(inplace=True)
-                
-                self.logger.info(f"Toplam {len(result_df)} satır veri alındı")
-                
-                # Veri aralığını logla
-                if not result_df.empty:
-                    self.logger.info(f"Veri aralığı: {result_df.index[0]} - {result_df.index[-1]}")
-                
-                return result_df
-            else:
-                self.logger.error("Hiç veri alınamadı")
-                return pd.DataFrame()
+            return result_df
                 
         except Exception as e:
             self.logger.error(f"Parçalı veri alımında hata: {str(e)}")
@@ -440,21 +488,8 @@ class BinanceClient:
                 self.logger.warning("Boş klines verisi")
                 return pd.DataFrame()
                 
-            # DataFrame oluştur
-            df = pd.DataFrame(klines, columns=[
-                'timestamp', 'open', 'high', 'low', 'close', 'volume',
-                'close_time', 'quote_volume', 'trades', 'taker_buy_base',
-                'taker_buy_quote', 'ignore'
-            ])
-            
-            # Veri tiplerini düzelt
-            numeric_columns = ['open', 'high', 'low', 'close', 'volume']
-            for col in numeric_columns:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-                
-            # Zaman damgasını datetime'a çevir ve index olarak ayarla
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-            df.set_index('timestamp', inplace=True)
+            # Ham yanıtı doğrudan tipli sütunlara çöz ('ignore' atlanır)
+            df = klines_to_dataframe(klines, compact=self.compact_klines)
             
             return df
             
@@ -674,18 +709,7 @@ class BinanceClient:
         
         try:
             # API URL'sini belirle
-            if self.testnet:
-                if self.futures:
-                    base_url = 'https://testnet.binancefuture.com'
-                else:
-                    base_url = 'https://testnet.binance.vision'
-            else:
-                if self.futures:
-                    base_url = 'https://fapi.binance.com'
-                else:
-                    base_url = 'https://api.binance.com'
-                    
-            url = f"{base_url}{endpoint}"
+            url = f"{self._get_base_url()}{endpoint}"
             
             # Parametreleri hazırla
             if params is None:
@@ -0,0 +1,469 @@
+import os
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from candle_scheduler import CandleScheduler, Firing, ServerClock, last_close_ms
+from fetch_engine import get_fetch_engine
+from indicator_cache import bind_cache, get_request_cache
+from kline_planner import interval_to_ms
+from signal_encoding import signal_label
+from streaming_indicators import StreamingIndicatorSet
+
+logger = logging.getLogger(__name__)
+
+# Piyasa verisi alma ve strateji değerlendirme için ortak iş parçacığı sayısı
+DEFAULT_MAX_WORKERS = int(os.getenv('BOT_RUNTIME_WORKERS', '8'))
+
+# Akıştan bu kadar süre (mum süresine ek, saniye) kapanış gelmezse REST'e dönülür
+STREAM_GRACE_SECONDS = 30
+
+# İşlem sinyali için gereken en düşük güven skoru
+MIN_CONFIDENCE = 75
+
+# REST yoklamasında alınacak mum sayısı
+POLL_LIMIT = 100
+
+
+def worker_id(symbol: str, interval: str, strategy_name: str) -> str:
+    """Çalışan kimliği (ör. BTCUSDT:1h:MACD_EMA)"""
+    return f"{symbol.upper()}:{interval}:{strategy_name}"
+
+
+def _json_safe(values: Dict[str, float]) -> Dict[str, Optional[float]]:
+    """NaN değerleri (yetersiz veri) JSON'da null olacak şekilde None yap"""
+    return {name: (value if value == value else None) for name, value in values.items()}
+
+
+class BotWorker:
+    """
+    Tek bir (sembol, aralık, strateji) için bot çalışanı.
+
+    Çalışan veri almaz; aynı sembol/aralığı izleyen çalışanlar MarketFeed üzerinden
+    aynı veriyi paylaşır. Durum ve metrikler to_dict() ile okunur.
+    """
+
+    def __init__(self, symbol: str, interval: str, strategy_name: str, strategy,
+                 order_handler: Optional[Callable[['BotWorker', str, float], None]] = None):
+        self.id = worker_id(symbol, interval, strategy_name)
+        self.symbol = symbol.upper()
+        self.interval = interval
+        self.strategy_name = strategy_name
+        self.strategy = strategy
+        self.order_handler = order_handler
+
+        self.status = 'running'
+        self.started_at = datetime.now()
+        self.last_check = None
+        self.last_signal = None
+        self.evaluations = 0
+        self.trade_signals = 0
+        self.errors = 0
+        self.last_error = None
+        self.last_eval_ms = None
+        self.total_eval_ms = 0.0
+        self.logger = logging.getLogger(__name__)
+
+    def evaluate(self, df: pd.DataFrame, indicators: Optional[Dict[str, float]] = None) -> None:
+        """
+        Stratejiyi veri üzerinde çalıştır ve sonucu kaydet
+
+        Args:
+            df (pd.DataFrame): Mum verisi (çalışana özel kopya)
+            indicators (dict, optional): Akış göstergelerinin son değerleri
+        """
+        started = time.perf_counter()
+        try:
+            signal, confidence, metrics = self.strategy.analyze(df)
+            # int8 kodları veya eski metin sinyalleri BUY/SELL/HOLD olarak kaydedilir
+            signal = signal_label(signal)
+            self.last_check = datetime.now()
+            self.last_signal = {
+                'signal': signal,
+                'confidence': confidence,
+                'metrics': metrics,
+                'indicators': indicators or {}
+            }
+            self.logger.info(f"Bot sinyal: {signal} ({confidence:.2f}%) - {self.id}")
+
+            # Sinyal varsa ve güven skoru yüksekse işlem yap
+            if signal in ['BUY', 'SELL'] and confidence > MIN_CONFIDENCE:
+                self.trade_signals += 1
+                if self.order_handler is not None:
+                    self.order_handler(self, signal, confidence)
+            self.status = 'running'
+        except Exception as e:
+            self.errors += 1
+            self.last_error = str(e)
+            self.status = 'error'
+            self.logger.error(f"Bot çalışanında hata ({self.id}): {str(e)}")
+        finally:
+            elapsed = (time.perf_counter() - started) * 1000
+            self.evaluations += 1
+            self.last_eval_ms = elapsed
+            self.total_eval_ms += elapsed
+
+    def to_dict(self) -> Dict:
+        """Çalışan durumu ve metrikleri"""
+        return {
+            'id': self.id,
+            'symbol': self.symbol,
+            'interval': self.interval,
+            'strategy': self.strategy_name,
+            'status': self.status,
+            'started_at': self.started_at.isoformat(),
+            'last_check': self.last_check.isoformat() if self.last_check else None,
+            'last_signal': self.last_signal,
+            'metrics': {
+                'evaluations': self.evaluations,
+                'trade_signals': self.trade_signals,
+                'errors': self.errors,
+                'last_error': self.last_error,
+                'last_eval_ms': round(self.last_eval_ms, 3) if self.last_eval_ms is not None else None,
+                'avg_eval_ms': round(self.total_eval_ms / self.evaluations, 3) if self.evaluations else None,
+            },
+        }
+
+
+class MarketFeed:
+    """
+    Bir sembol/aralık için paylaşılan piyasa verisi.
+
+    Veri her mumda bir kez alınır (akıştan veya REST ile); göstergeler ve gösterge
+    önbelleği bu sembol/aralığı izleyen tüm çalışanlar arasında paylaşılır.
+    """
+
+    def __init__(self, symbol: str, interval: str, stream=None):
+        self.symbol = symbol.upper()
+        self.interval = interval
+        self.stream = stream
+        self.workers: Dict[str, BotWorker] = {}
+        self.indicators = StreamingIndicatorSet.default()
+        self.seen_closes = stream.close_count(symbol, interval) if stream is not None else 0
+        self.busy = False
+        self.last_run = None
+        self.last_source = None
+        self.last_latency_ms = None
+        self.fetches = 0
+        self.errors = 0
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        return self.symbol, self.interval
+
+    def to_dict(self) -> Dict:
+        return {
+            'symbol': self.symbol,
+            'interval': self.interval,
+            'workers': sorted(self.workers),
+            'source': self.last_source,
+            'stream_connected': bool(self.stream is not None and self.stream.connected),
+            'fetches': self.fetches,
+            'errors': self.errors,
+            'last_latency_ms': self.last_latency_ms,
+            'last_run': datetime.fromtimestamp(self.last_run).isoformat() if self.last_run else None,
+        }
+
+
+class BotRuntime:
+    """
+    Çok sembollü, çok stratejili bot çalışma ortamı.
+
+    Her (sembol, aralık, strateji) bağımsız bir çalışandır. Aynı sembol/aralığı izleyen
+    çalışanlar bir MarketFeed paylaşır. Akışı olan veriler WebSocket mum kapanışlarıyla,
+    akışı olmayanlar sunucu saatine hizalı CandleScheduler ile tetiklenir; aynı anda
+    kapanan tüm veriler tek seferde alınır. Veri alma ve strateji değerlendirmesi ortak
+    iş parçacığı havuzunda çalışır, her tetiklemenin karar gecikmesi kaydedilir.
+    """
+
+    def __init__(self, strategy_factory: Callable[[str], object], client_provider: Callable[[], object],
+                 stream_provider: Optional[Callable[[str, str], object]] = None,
+                 order_handler: Optional[Callable[[BotWorker, str, float], None]] = None,
+                 max_workers: int = DEFAULT_MAX_WORKERS, clock: Optional[ServerClock] = None,
+                 fire_delay_ms: Optional[int] = None, tick: float = 1.0):
+        """
+        Çalışma ortamını oluştur
+
+        Args:
+            strategy_factory (callable): Strateji adından strateji nesnesi oluşturan fonksiyon
+            client_provider (callable): REST için BinanceClient döndüren fonksiyon
+            stream_provider (callable, optional): (symbol, interval) için abone olunmuş KlineStream
+                döndüren fonksiyon; None veya None dönerse REST yoklaması kullanılır
+            order_handler (callable, optional): İşlem sinyalinde çağrılır: (worker, signal, confidence)
+            max_workers (int, optional): Ortak iş parçacığı sayısı
+            clock (ServerClock, optional): Borsa sunucu saati (mum kapanışlarının hesaplanması için)
+            fire_delay_ms (int, optional): Kapanıştan sonra tetikleme gecikmesi (milisaniye)
+            tick (float, optional): Akış zamanlayıcısının en uzun bekleme süresi (saniye)
+        """
+        self.strategy_factory = strategy_factory
+        self.client_provider = client_provider
+        self.stream_provider = stream_provider
+        self.order_handler = order_handler
+        self.tick = tick
+        self.logger = logging.getLogger(__name__)
+
+        self.feeds: Dict[Tuple[str, str], MarketFeed] = {}
+        self._lock = threading.RLock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='bot-runtime')
+        self._scheduler = None
+        candle_options = {} if fire_delay_ms is None else {'fire_delay_ms': fire_delay_ms}
+        self.candles = CandleScheduler(self._on_boundary, clock=clock, **candle_options)
+
+    # --- Çalışan yönetimi ---
+
+    def start_worker(self, symbol: str, interval: str, strategy_name: str) -> BotWorker:
+        """
+        Yeni çalışan başlat
+
+        Args:
+            symbol (str): Sembol
+            interval (str): Zaman aralığı
+            strategy_name (str): Strateji adı
+
+        Returns:
+            BotWorker: Başlatılan çalışan
+
+        Raises:
+            ValueError: Çalışan zaten varsa, aralık veya strateji geçersizse
+        """
+        interval_to_ms(interval)
+        wid = worker_id(symbol, interval, strategy_name)
+        with self._lock:
+            if self.get_worker(wid) is not None:
+                raise ValueError(f"Bot zaten çalışıyor: {wid}")
+
+        strategy = self.strategy_factory(strategy_name)
+        if strategy is None:
+            raise ValueError(f"Strateji bulunamadı: {strategy_name}")
+        worker = BotWorker(symbol, interval, strategy_name, strategy, self.order_handler)
+
+        with self._lock:
+            feed = self.feeds.get((worker.symbol, interval))
+            if feed is None:
+                feed = MarketFeed(worker.symbol, interval, self._open_stream(worker.symbol, interval))
+                self.feeds[feed.key] = feed
+                if feed.stream is None:
+                    self.candles.add(feed.key, interval)
+            feed.workers[worker.id] = worker
+        self._ensure_scheduler()
+        self._wake.set()
+        self.logger.info(f"Bot başlatıldı: {worker.id}")
+        return worker
+
+    def stop_worker(self, wid: str) -> bool:
+        """
+        Çalışanı durdur; sembol/aralığı izleyen başka çalışan kalmazsa akış aboneliği de kaldırılır
+
+        Returns:
+            bool: Çalışan bulunup durdurulduysa True
+        """
+        with self._lock:
+            for key, feed in list(self.feeds.items()):
+                worker = feed.workers.pop(wid, None)
+                if worker is None:
+                    continue
+                worker.status = 'stopped'
+                if not feed.workers:
+                    del self.feeds[key]
+                    self.candles.remove(key)
+                    if feed.stream is not None:
+                        feed.stream.unsubscribe(feed.symbol, feed.interval)
+                self.logger.info(f"Bot durduruldu: {wid}")
+                return True
+        return False
+
+    def stop_all(self) -> List[str]:
+        """Tüm çalışanları durdur ve durdurulanların kimliklerini döndür"""
+        stopped = [worker.id for worker in self.workers()]
+        for wid in stopped:
+            self.stop_worker(wid)
+        return stopped
+
+    def shutdown(self) -> None:
+        """Çalışanları durdur, zamanlayıcıyı ve iş parçacığı havuzunu kapat"""
+        self.stop_all()
+        self._stop.set()
+        self._wake.set()
+        self.candles.stop()
+        if self._scheduler is not None:
+            self._scheduler.join(timeout=5)
+        self._executor.shutdown(wait=True)
+
+    def workers(self) -> List[BotWorker]:
+        with self._lock:
+            return [worker for feed in self.feeds.values() for worker in feed.workers.values()]
+
+    def get_worker(self, wid: str) -> Optional[BotWorker]:
+        with self._lock:
+            for feed in self.feeds.values():
+                if wid in feed.workers:
+                    return feed.workers[wid]
+        return None
+
+    def list_workers(self) -> List[Dict]:
+        """Tüm çalışanların durum ve metrikleri"""
+        return [worker.to_dict() for worker in self.workers()]
+
+    def status(self) -> Dict:
+        """Çalışma ortamı özeti (çalışanlar ve paylaşılan veri akışları)"""
+        with self._lock:
+            feeds = [feed.to_dict() for feed in self.feeds.values()]
+        workers = self.list_workers()
+        return {'running': bool(workers), 'workers': workers, 'feeds': feeds, 'scheduler': self.candles.metrics()}
+
+    # --- Zamanlayıcı ---
+
+    def _open_stream(self, symbol: str, interval: str):
+        if self.stream_provider is None:
+            return None
+        try:
+            stream = self.stream_provider(symbol, interval)
+            if stream is not None:
+                stream.add_listener(self._on_candle_close)
+            return stream
+        except Exception as e:
+            self.logger.warning(f"Kline akışı başlatılamadı, REST yoklaması kullanılacak: {str(e)}")
+            return None
+
+    def _on_candle_close(self, symbol, interval, buffer) -> None:
+        self._wake.set()
+
+    def _ensure_scheduler(self) -> None:
+        with self._lock:
+            if self._scheduler is None or not self._scheduler.is_alive():
+                self._stop.clear()
+                self._scheduler = threading.Thread(target=self._scheduler_loop, name='bot-scheduler', daemon=True)
+                self._scheduler.start()
+            self.candles.start()
+
+    def _scheduler_loop(self) -> None:
+        """Akış kapanışlarını, ilk değerlendirmeleri ve kopuk akışların REST yedeğini izle"""
+        while not self._stop.is_set():
+            self._wake.wait(self.tick)
+            self._wake.clear()
+            with self._lock:
+                feeds = list(self.feeds.values())
+            now = time.time()
+            for feed in feeds:
+                source = self._due_source(feed, now)
+                if source is None:
+                    continue
+                if not self._submit(self._run_feeds, [feed], source):
+                    return  # Havuz kapatıldı
+
+    def _on_boundary(self, firing: Firing) -> None:
+        """CandleScheduler işleyicisi: aynı kapanıştaki tüm REST verilerini tek seferde işle"""
+        with self._lock:
+            feeds = [self.feeds[key] for key in firing.keys if key in self.feeds]
+        feeds = [feed for feed in feeds if not feed.busy and feed.workers]
+        if feeds:
+            self._submit(self._run_feeds, feeds, 'rest', firing)
+
+    def _submit(self, fn, feeds: List[MarketFeed], *args) -> bool:
+        for feed in feeds:
+            feed.busy = True
+        try:
+            self._executor.submit(fn, feeds, *args)
+            return True
+        except RuntimeError:
+            for feed in feeds:
+                feed.busy = False
+            return False
+
+    def _due_source(self, feed: MarketFeed, now: float) -> Optional[str]:
+        """Zamanlayıcı dışında veri alınacaksa kaynağı ('stream' veya 'rest') döndür"""
+        if feed.busy or not feed.workers:
+            return None
+        if feed.last_run is None:
+            return 'stream' if feed.stream is not None else 'rest'
+        if feed.stream is None:
+            return None  # Kapanışlar CandleScheduler ile tetiklenir
+        if feed.stream.close_count(feed.symbol, feed.interval) > feed.seen_closes:
+            return 'stream'
+        if now - feed.last_run > interval_to_ms(feed.interval) / 1000 + STREAM_GRACE_SECONDS:
+            self.logger.warning(f"Kline akışından mum kapanışı gelmedi, veriler REST ile alınıyor: "
+                                f"{feed.symbol} {feed.interval}")
+            return 'rest'
+        return None
+
+    def _fetch(self, feed: MarketFeed, source: str) -> Tuple[pd.DataFrame, bool, Optional[int]]:
+        """Veriyi al; (veri, son mum kapandı mı, son kapanış zamanı) döndür"""
+        step = interval_to_ms(feed.interval)
+        if source == 'stream':
+            feed.seen_closes = feed.stream.close_count(feed.symbol, feed.interval)
+            df = feed.stream.frame(feed.symbol, feed.interval)
+            buffer = feed.stream.buffers.get(feed.key)
+            last_closed = bool(buffer is not None and buffer.last_closed)
+            boundary = None
+            if buffer is not None and buffer.last_open_time is not None:
+                boundary = buffer.last_open_time + (step if last_closed else 0)
+            return df, last_closed, boundary
+
+        df = self.client_provider().get_historical_klines(feed.symbol, feed.interval, limit=POLL_LIMIT)
+        boundary = last_close_ms(feed.interval, self.candles.clock.now_ms())
+        last_closed = False
+        if df is not None and not df.empty:
+            last_open = pd.Timestamp(df.index[-1]).value // 1_000_000
+            last_closed = last_open + step <= boundary
+        return df, last_closed, boundary
+
+    def _run_feeds(self, feeds: List[MarketFeed], source: str, firing: Optional[Firing] = None) -> None:
+        """
+        Verileri bir kez al, göstergeleri güncelle ve her sembol/aralığın tüm çalışanlarını değerlendir
+
+        Birden fazla veri aynı kapanışta tetiklendiyse istekler paylaşılan istek motoruyla
+        paralel gönderilir. Karar gecikmesi firing üzerinden kaydedilir.
+        """
+        fetch_started = time.perf_counter()
+
+        def fetch(feed):
+            try:
+                return self._fetch(feed, source)
+            except Exception as e:
+                return e
+
+        results = get_fetch_engine().map(fetch, feeds)
+        fetch_ms = (time.perf_counter() - fetch_started) * 1000
+
+        for feed, result in zip(feeds, results):
+            try:
+                if isinstance(result, Exception):
+                    raise result
+                df, last_closed, boundary = result
+                feed.fetches += 1
+                feed.last_source = source
+                if df is None or df.empty:
+                    raise ValueError(f"Veri alınamadı: {feed.symbol} {feed.interval}")
+
+                indicators = _json_safe(feed.indicators.sync(df, last_closed=last_closed))
+                # Stratejiler göstergeleri aynı önbellekten alır; her çalışan kendi kopyasında çalışır
+                cache = get_request_cache(df, feed.symbol, feed.interval)
+                with self._lock:
+                    workers = list(feed.workers.values())
+                for worker in workers:
+                    frame = df.copy()
+                    bind_cache(frame, cache)
+                    worker.evaluate(frame, indicators)
+
+                if firing is None and source == 'stream' and boundary is not None and last_closed:
+                    # Akış kapanışları da aynı gecikme kayıtlarına eklenir
+                    stream_firing = self.candles.complete(self.candles.begin(boundary, [feed.key], 'stream'))
+                    feed.last_latency_ms = stream_firing.latency_ms
+            except Exception as e:
+                feed.errors += 1
+                self.logger.error(f"Piyasa verisi işlenirken hata ({feed.symbol} {feed.interval}): {str(e)}")
+            finally:
+                feed.last_run = time.time()
+                feed.busy = False
+
+        if firing is not None:
+            self.candles.complete(firing, fetch_ms)
+            for feed in feeds:
+                feed.last_latency_ms = firing.latency_ms
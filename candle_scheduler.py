@@ -0,0 +1,341 @@
+import os
+import time
+import heapq
+import logging
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+from kline_planner import align_open_time, interval_to_ms
+
+logger = logging.getLogger(__name__)
+
+# Mum kapanışından sonra değerlendirmenin başlatılacağı gecikme (milisaniye)
+DEFAULT_FIRE_DELAY_MS = int(os.getenv('CANDLE_FIRE_DELAY_MS', '50'))
+
+# Sunucu zamanı farkının yeniden ölçülme aralığı (saniye)
+CLOCK_SYNC_INTERVAL = float(os.getenv('SERVER_TIME_SYNC_INTERVAL', '600'))
+
+# Saklanacak son tetikleme kaydı sayısı
+DEFAULT_HISTORY_SIZE = 500
+
+
+def next_close_ms(interval: str, now_ms: int) -> int:
+    """
+    Şu andan sonraki ilk mum kapanışı (bir sonraki mumun açılış zamanı)
+
+    Args:
+        interval (str): Zaman aralığı
+        now_ms (int): Şimdiki zaman (milisaniye, UTC)
+
+    Returns:
+        int: Kapanış zamanı (milisaniye)
+    """
+    if interval == '1M':
+        # Aylık mumlar takvim ayına göre kapanır
+        now = datetime.fromtimestamp(now_ms / 1000, tz=timezone.utc)
+        year, month = (now.year + 1, 1) if now.month == 12 else (now.year, now.month + 1)
+        return int(datetime(year, month, 1, tzinfo=timezone.utc).timestamp() * 1000)
+    return align_open_time(now_ms + 1, interval)
+
+
+def last_close_ms(interval: str, now_ms: int) -> int:
+    """Şu ana kadar gerçekleşen son mum kapanışı (milisaniye)"""
+    if interval == '1M':
+        now = datetime.fromtimestamp(now_ms / 1000, tz=timezone.utc)
+        return int(datetime(now.year, now.month, 1, tzinfo=timezone.utc).timestamp() * 1000)
+    return next_close_ms(interval, now_ms) - interval_to_ms(interval)
+
+
+class ServerClock:
+    """
+    Borsa sunucu zamanı.
+
+    Yerel saat ile sunucu saati arasındaki fark, istek gidiş-dönüş süresinin ortası
+    alınarak ölçülür ve belirli aralıklarla yenilenir. Ölçüm başarısız olursa son
+    bilinen fark (başlangıçta 0) kullanılır.
+    """
+
+    def __init__(self, time_source: Optional[Callable[[], int]] = None, sync_interval: float = CLOCK_SYNC_INTERVAL,
+                 samples: int = 3):
+        """
+        Args:
+            time_source (callable, optional): Sunucu zamanını (milisaniye) döndüren fonksiyon
+            sync_interval (float, optional): Yeniden ölçüm aralığı (saniye)
+            samples (int, optional): Her ölçümde yapılacak istek sayısı (en kısa gidiş-dönüş seçilir)
+        """
+        self.time_source = time_source
+        self.sync_interval = sync_interval
+        self.samples = samples
+        self.offset_ms = 0.0
+        self.rtt_ms = None
+        self.synced_at = None
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    def sync(self) -> bool:
+        """
+        Sunucu zamanı farkını ölç
+
+        Returns:
+            bool: Ölçüm başarılıysa True
+        """
+        if self.time_source is None:
+            return False
+        best = None
+        for _ in range(self.samples):
+            try:
+                sent = time.time() * 1000
+                server = float(self.time_source())
+                received = time.time() * 1000
+            except Exception as e:
+                self.logger.warning(f"Sunucu zamanı alınamadı: {str(e)}")
+                continue
+            rtt = received - sent
+            if best is None or rtt < best[0]:
+                best = (rtt, server - (sent + received) / 2)
+
+        with self._lock:
+            self.synced_at = time.monotonic()
+            if best is None:
+                return False
+            self.rtt_ms, self.offset_ms = best
+        self.logger.info(f"Sunucu zamanı farkı: {self.offset_ms:.1f} ms (gidiş-dönüş {self.rtt_ms:.1f} ms)")
+        return True
+
+    def now_ms(self) -> int:
+        """Sunucu saatine göre şimdiki zaman (milisaniye)"""
+        if self.time_source is not None and (
+                self.synced_at is None or time.monotonic() - self.synced_at >= self.sync_interval):
+            self.sync()
+        return int(time.time() * 1000 + self.offset_ms)
+
+
+class Firing:
+    """Bir mum kapanışında tetiklenen değerlendirme grubu ve gecikme ölçümleri"""
+
+    __slots__ = ('boundary_ms', 'keys', 'source', 'fired_ms', 'fetch_ms', 'decided_ms')
+
+    def __init__(self, boundary_ms: int, keys: List[Hashable], source: str, fired_ms: int):
+        self.boundary_ms = boundary_ms
+        self.keys = keys
+        self.source = source
+        self.fired_ms = fired_ms
+        self.fetch_ms = None
+        self.decided_ms = None
+
+    @property
+    def fire_lag_ms(self) -> int:
+        return self.fired_ms - self.boundary_ms
+
+    @property
+    def latency_ms(self) -> Optional[int]:
+        """Mum kapanışından karar anına kadar geçen süre"""
+        return None if self.decided_ms is None else self.decided_ms - self.boundary_ms
+
+    def to_dict(self) -> Dict:
+        return {
+            'boundary': self.boundary_ms,
+            'jobs': [list(key) if isinstance(key, tuple) else key for key in self.keys],
+            'source': self.source,
+            'fire_lag_ms': self.fire_lag_ms,
+            'fetch_ms': round(self.fetch_ms, 3) if self.fetch_ms is not None else None,
+            'latency_ms': self.latency_ms,
+        }
+
+
+class CandleScheduler:
+    """
+    Mum kapanışına hizalı zamanlayıcı.
+
+    Her iş (anahtar, aralık) çiftidir. Aralığın bir sonraki kapanışı sunucu saatinden
+    hesaplanır ve kapanıştan fire_delay_ms sonra tetiklenir. Aynı anda kapanan tüm
+    işler (farklı aralıklar dahil) tek bir Firing olarak işleyiciye verilir; böylece
+    veri tek seferde alınabilir. İşleyici, karar verildiğinde complete() çağırır ve
+    gecikme kaydedilir.
+    """
+
+    def __init__(self, handler: Callable[[Firing], None], clock: Optional[ServerClock] = None,
+                 fire_delay_ms: int = DEFAULT_FIRE_DELAY_MS, history_size: int = DEFAULT_HISTORY_SIZE):
+        self.handler = handler
+        self.clock = clock or ServerClock()
+        self.fire_delay_ms = fire_delay_ms
+        self.logger = logging.getLogger(__name__)
+
+        self._jobs: Dict[Hashable, str] = {}
+        self._heap: List[Tuple[int, str]] = []  # (kapanış, aralık)
+        self._scheduled: Dict[str, int] = {}
+        self._history = deque(maxlen=history_size)
+        self._firings = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    # --- İşler ---
+
+    def add(self, key: Hashable, interval: str) -> int:
+        """
+        İş ekle
+
+        Args:
+            key: İş anahtarı (ör. (sembol, aralık))
+            interval (str): Zaman aralığı
+
+        Returns:
+            int: İşin ilk kapanış zamanı (milisaniye)
+        """
+        interval_to_ms(interval)
+        with self._lock:
+            self._jobs[key] = interval
+            if interval not in self._scheduled:
+                boundary = next_close_ms(interval, self.clock.now_ms())
+                self._scheduled[interval] = boundary
+                heapq.heappush(self._heap, (boundary, interval))
+            boundary = self._scheduled[interval]
+        self._wake.set()
+        return boundary
+
+    def remove(self, key: Hashable) -> None:
+        """İşi kaldır (aralığın başka işi kalmazsa zamanlaması da kalkar)"""
+        with self._lock:
+            interval = self._jobs.pop(key, None)
+            if interval is not None and interval not in self._jobs.values():
+                self._scheduled.pop(interval, None)
+
+    def jobs(self) -> Dict[Hashable, str]:
+        with self._lock:
+            return dict(self._jobs)
+
+    def next_fire_ms(self) -> Optional[int]:
+        """Bir sonraki tetikleme zamanı (milisaniye) veya iş yoksa None"""
+        with self._lock:
+            self._drop_stale()
+            return self._heap[0][0] + self.fire_delay_ms if self._heap else None
+
+    def _drop_stale(self) -> None:
+        # Kaldırılmış aralıklara ait yığın girdilerini at
+        while self._heap and self._scheduled.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+
+    # --- Tetikleme ---
+
+    def due(self, now_ms: Optional[int] = None) -> List[Firing]:
+        """
+        Zamanı gelen işleri kapanışa göre grupla ve sonraki kapanışları planla
+
+        Args:
+            now_ms (int, optional): Şimdiki sunucu zamanı
+
+        Returns:
+            list: Tetiklenecek Firing listesi (kapanış sırasıyla)
+        """
+        now_ms = self.clock.now_ms() if now_ms is None else now_ms
+        groups: Dict[int, List[Hashable]] = {}
+        with self._lock:
+            while True:
+                self._drop_stale()
+                if not self._heap or self._heap[0][0] + self.fire_delay_ms > now_ms:
+                    break
+                boundary, interval = heapq.heappop(self._heap)
+                # Geç kalındıysa sadece en son kapanış tetiklenir, aradakiler atlanır
+                latest = max(boundary, last_close_ms(interval, now_ms - self.fire_delay_ms))
+                if latest > boundary:
+                    missed = (latest - boundary) // interval_to_ms(interval) if interval != '1M' else 1
+                    self.logger.warning(f"{interval} için {missed} mum kapanışı atlandı")
+                keys = [key for key, job_interval in self._jobs.items() if job_interval == interval]
+                groups.setdefault(latest, []).extend(keys)
+
+                following = next_close_ms(interval, latest)
+                self._scheduled[interval] = following
+                heapq.heappush(self._heap, (following, interval))
+        return [self.begin(boundary, keys, 'schedule', now_ms) for boundary, keys in sorted(groups.items())]
+
+    def begin(self, boundary_ms: int, keys: List[Hashable], source: str, fired_ms: Optional[int] = None) -> Firing:
+        """Tetiklemeyi başlat (zamanlayıcı dışındaki kaynaklar, ör. WebSocket kapanışları için de)"""
+        return Firing(boundary_ms, keys, source, self.clock.now_ms() if fired_ms is None else fired_ms)
+
+    def complete(self, firing: Firing, fetch_ms: Optional[float] = None) -> Firing:
+        """
+        Karar verildiğini kaydet
+
+        Args:
+            firing (Firing): Tamamlanan tetikleme
+            fetch_ms (float, optional): Veri alma süresi
+
+        Returns:
+            Firing: Gecikmesi kaydedilen tetikleme
+        """
+        firing.fetch_ms = fetch_ms
+        firing.decided_ms = self.clock.now_ms()
+        with self._lock:
+            self._history.append(firing)
+            self._firings += 1
+        return firing
+
+    def run_pending(self, now_ms: Optional[int] = None) -> int:
+        """Zamanı gelen işleri işleyiciye ver; tetikleme sayısını döndür"""
+        firings = self.due(now_ms)
+        for firing in firings:
+            try:
+                self.handler(firing)
+            except Exception as e:
+                self.logger.error(f"Zamanlayıcı işleyicisinde hata: {str(e)}")
+        return len(firings)
+
+    def metrics(self) -> Dict:
+        """Tetikleme ve karar gecikmesi özeti (son kayıtlar üzerinden)"""
+        with self._lock:
+            history = list(self._history)
+            firings = self._firings
+        latencies = np.array([f.latency_ms for f in history], dtype=np.float64)
+        summary = None
+        if len(latencies):
+            summary = {
+                'avg': round(float(latencies.mean()), 3),
+                'p50': round(float(np.percentile(latencies, 50)), 3),
+                'p95': round(float(np.percentile(latencies, 95)), 3),
+                'max': round(float(latencies.max()), 3),
+            }
+        return {
+            'firings': firings,
+            'fire_delay_ms': self.fire_delay_ms,
+            'clock_offset_ms': round(self.clock.offset_ms, 3),
+            'next_fire': self.next_fire_ms(),
+            'latency_ms': summary,
+            'recent': [f.to_dict() for f in history[-10:]],
+        }
+
+    # --- İş parçacığı ---
+
+    def start(self) -> 'CandleScheduler':
+        if self._thread is not None and self._thread.is_alive():
+            return self
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='candle-scheduler', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            next_fire = self.next_fire_ms()
+            if next_fire is None:
+                wait = 1.0
+            else:
+                # Uzun beklemeler saat kaymasına karşı parçalanır
+                wait = min(max(next_fire - self.clock.now_ms(), 0) / 1000, 1.0)
+            if wait > 0:
+                self._wake.wait(wait)
+                self._wake.clear()
+                continue
+            self.run_pending()
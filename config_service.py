@@ -0,0 +1,273 @@
+import os
+import copy
+import json
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Dosya değişikliklerinin kontrol aralığı (saniye)
+DEFAULT_POLL_INTERVAL = float(os.getenv('CONFIG_POLL_INTERVAL', '2'))
+
+
+class ConfigFile:
+    """
+    Tek bir JSON yapılandırma dosyasının bellekteki, doğrulanmış kopyası
+
+    Okumalar dosyaya dokunmaz: `data` son yüklenen/yazılan nesneyi döndürür ve
+    bu nesne hiçbir zaman yerinde değiştirilmez (salt okunur kullanılmalıdır).
+    Güncellemeler kopya üzerinde yapılır, doğrulanır, geçici dosyaya yazılıp
+    rename ile atomik olarak yerine konur ve ancak ondan sonra bellekteki kopya
+    değişir. Dosya dışarıdan değiştirildiğinde (mtime/boyut) yeniden yüklenir;
+    geçersiz içerik loglanır ve eski ayarlar korunur.
+    """
+
+    def __init__(self, service: 'ConfigService', path: str, default: Optional[Callable[[], Dict]] = None,
+                 validate: Optional[Callable[[Dict], Dict]] = None, create: bool = False):
+        """
+        Args:
+            service (ConfigService): Değişiklik olaylarını yayınlayan servis
+            path (str): Dosya yolu
+            default (callable, optional): Dosya yoksa veya okunamazsa kullanılacak ayarları üretir
+            validate (callable, optional): Ayarları doğrulayıp normalize eder, geçersizse ValueError fırlatır
+            create (bool, optional): Dosya yoksa varsayılan ayarlarla oluştur. Defaults to False.
+        """
+        self.service = service
+        self.path = path
+        self.default = default or dict
+        self.validate = validate or (lambda data: data)
+        self.logger = logging.getLogger('config_service')
+        self._lock = threading.RLock()
+        self._signature: Optional[Tuple[int, int]] = None
+        self._data: Dict = {}
+        self.loads = 0
+        self.writes = 0
+        self.errors = 0
+
+        if not os.path.exists(path):
+            self._data = self.validate(self.default())
+            if create:
+                self.write(self._data)
+        else:
+            self.reload(force=True)
+
+    @property
+    def data(self) -> Dict:
+        """Bellekteki ayarlar (dosya okunmaz)"""
+        return self._data
+
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.path)
+            return stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return None
+
+    def changed(self) -> bool:
+        """Dosya son yüklemeden/yazmadan sonra değişti mi"""
+        return self._stat() != self._signature
+
+    def reload(self, force: bool = False) -> bool:
+        """
+        Dosya değiştiyse yeniden yükle
+
+        Args:
+            force (bool, optional): Değişiklik olmasa da oku. Defaults to False.
+
+        Returns:
+            bool: Ayarlar değiştiyse True
+        """
+        with self._lock:
+            signature = self._stat()
+            if not force and signature == self._signature:
+                return False
+            self._signature = signature
+            if signature is None:
+                # Dosya silindi: bellekteki ayarlar korunur
+                return False
+
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = self.validate(json.load(f))
+            except Exception as e:
+                self.errors += 1
+                self.logger.error(f"Yapılandırma yüklenirken hata: {self.path} - {str(e)}")
+                if self.loads == 0 and self.writes == 0:
+                    self._data = self.validate(self.default())
+                return False
+
+            old, self._data = self._data, data
+            self.loads += 1
+        if old != data:
+            self.service.publish(self.path, old, data, 'file')
+            return True
+        return False
+
+    def write(self, data: Dict) -> bool:
+        """
+        Ayarları doğrula, dosyaya atomik olarak yaz ve bellekteki kopyayı değiştir
+
+        Args:
+            data (dict): Yeni ayarlar (bu nesne servis tarafından sahiplenilir)
+
+        Returns:
+            bool: Başarılı ise True
+        """
+        with self._lock:
+            try:
+                data = self.validate(data)
+                directory = os.path.dirname(os.path.abspath(self.path))
+                os.makedirs(directory, exist_ok=True)
+                tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, indent=4, ensure_ascii=False)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.path)
+            except Exception as e:
+                self.errors += 1
+                self.logger.error(f"Yapılandırma kaydedilirken hata: {self.path} - {str(e)}")
+                return False
+
+            old, self._data = self._data, data
+            self._signature = self._stat()
+            self.writes += 1
+        if old != data:
+            self.service.publish(self.path, old, data, 'write')
+        return True
+
+    def update(self, mutate: Callable[[Dict], Optional[Dict]]) -> bool:
+        """
+        Ayarların kopyasını değiştir ve yaz (oku-değiştir-yaz tek kilit altında)
+
+        Args:
+            mutate (callable): Kopyayı yerinde değiştirir veya yeni ayarları döndürür
+
+        Returns:
+            bool: Başarılı ise True
+        """
+        with self._lock:
+            data = copy.deepcopy(self._data)
+            result = mutate(data)
+            return self.write(data if result is None else result)
+
+    def stats(self) -> Dict:
+        return {'path': self.path, 'loads': self.loads, 'writes': self.writes, 'errors': self.errors}
+
+
+class ConfigService:
+    """
+    Yapılandırma dosyalarını bellekte tutan, değişiklikleri izleyen ve yayınlayan servis
+
+    Her dosya mutlak yoluyla bir kez yüklenir; aynı dosyayı kullanan tüm
+    StrategyConfig/RiskManager nesneleri aynı ConfigFile'ı paylaşır. Arka plan
+    iş parçacığı dosyaların mtime değerlerini yoklar (inotify bağımlılığı
+    olmadan) ve dışarıdan yapılan değişiklikleri yükler. Yazma ve yeniden
+    yükleme sonrası dinleyiciler callback(path, eski, yeni, kaynak) ile
+    çağrılır; kaynak 'write' veya 'file' olur.
+    """
+
+    def __init__(self, poll_interval: float = DEFAULT_POLL_INTERVAL):
+        self.poll_interval = poll_interval
+        self.logger = logging.getLogger('config_service')
+        self._files: Dict[str, ConfigFile] = {}
+        self._listeners: List[Callable[[str, Dict, Dict, str], None]] = []
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+        self.events = 0
+
+    def file(self, path: str, default: Optional[Callable[[], Dict]] = None,
+             validate: Optional[Callable[[Dict], Dict]] = None, create: bool = False) -> ConfigFile:
+        """
+        Dosyanın paylaşılan ConfigFile nesnesini döndür (ilk çağrıda yüklenir, sonra değiştiyse yenilenir)
+
+        Args:
+            path (str): Dosya yolu
+            default (callable, optional): Varsayılan ayarları üreten fonksiyon
+            validate (callable, optional): Doğrulama/normalize fonksiyonu
+            create (bool, optional): Dosya yoksa oluştur. Defaults to False.
+
+        Returns:
+            ConfigFile: Paylaşılan yapılandırma dosyası
+        """
+        path = os.path.abspath(path)
+        with self._lock:
+            config_file = self._files.get(path)
+            if config_file is None:
+                config_file = self._files[path] = ConfigFile(self, path, default, validate, create)
+                return config_file
+        # İzleme çalışmıyorsa (CLI, testler) dış değişiklikler burada yakalanır; değişmediyse tek stat
+        config_file.reload()
+        return config_file
+
+    def add_listener(self, callback: Callable[[str, Dict, Dict, str], None]) -> None:
+        """Yapılandırma değiştiğinde çağrılacak fonksiyon ekle: callback(path, eski, yeni, kaynak)"""
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback) -> None:
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def publish(self, path: str, old: Dict, new: Dict, source: str) -> None:
+        """Değişikliği dinleyicilere bildir"""
+        self.events += 1
+        self.logger.info(f"Yapılandırma değişti ({source}): {path}")
+        for callback in list(self._listeners):
+            try:
+                callback(path, old, new, source)
+            except Exception as e:
+                self.logger.error(f"Yapılandırma dinleyicisinde hata: {str(e)}")
+
+    def check(self) -> int:
+        """
+        Tüm dosyaları kontrol et ve değişenleri yeniden yükle
+
+        Returns:
+            int: Değişen dosya sayısı
+        """
+        with self._lock:
+            files = list(self._files.values())
+        return sum(1 for config_file in files if config_file.changed() and config_file.reload())
+
+    def start(self) -> None:
+        """Dosya izleme iş parçacığını başlat"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._watch, name='config-watch', daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(1)
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.check()
+            except Exception as e:
+                self.logger.error(f"Yapılandırma dosyaları kontrol edilirken hata: {str(e)}")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            files = [config_file.stats() for config_file in self._files.values()]
+        return {'files': files, 'events': self.events,
+                'watching': self._thread is not None and self._thread.is_alive()}
+
+
+_config_service = None
+_config_service_lock = threading.Lock()
+
+
+def get_config_service() -> ConfigService:
+    """Süreç genelinde paylaşılan yapılandırma servisi"""
+    global _config_service
+    with _config_service_lock:
+        if _config_service is None:
+            _config_service = ConfigService()
+        return _config_service
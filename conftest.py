@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+
+
+def make_ohlcv(rows=300, seed=0, start='2023-01-01', price=100.0, volatility=0.01, drift=0.0,
+               open_noise=0.0, wick=0.0, spread=0.0, volume=1.0, tz=None):
+    """
+    Testler için saatlik sahte OHLCV verisi (geometrik rastgele yürüyüş)
+
+    Args:
+        rows (int, optional): Mum sayısı. Defaults to 300.
+        seed (int, optional): Rastgelelik tohumu. Defaults to 0.
+        start (str, optional): İlk mumun zamanı. Defaults to '2023-01-01'.
+        price (float, optional): Başlangıç fiyatı. Defaults to 100.0.
+        volatility (float, optional): Mum başına getiri standart sapması. Defaults to 0.01.
+        drift (float veya np.ndarray, optional): Mum başına ortalama getiri. Defaults to 0.0.
+        open_noise (float, optional): Açılışın kapanıştan sapması; 0 ise open = close. Defaults to 0.0.
+        wick (float, optional): Gövdenin üstüne/altına en fazla rastgele fitil oranı. Defaults to 0.0.
+        spread (float, optional): high/low için sabit oran. Defaults to 0.0.
+        volume (float veya tuple, optional): Sabit hacim veya (dağılım, *argümanlar),
+            ör. ('lognormal', 3, 0.8). Defaults to 1.0.
+        tz (str, optional): Zaman dilimi. Defaults to None.
+
+    Returns:
+        pd.DataFrame: open, high, low, close, volume sütunlu veri
+    """
+    rng = np.random.default_rng(seed)
+    close = price * np.exp(np.cumsum(drift + rng.normal(0, volatility, rows)))
+    open_ = close * (1 + rng.normal(0, open_noise, rows)) if open_noise else close
+    high = np.maximum(open_, close) * (1 + spread)
+    low = np.minimum(open_, close) * (1 - spread)
+    if wick:
+        high = high * (1 + rng.uniform(0, wick, rows))
+        low = low * (1 - rng.uniform(0, wick, rows))
+    if isinstance(volume, tuple):
+        distribution, *args = volume
+        volume = getattr(rng, distribution)(*args, rows)
+    index = pd.date_range(start, periods=rows, freq='h', tz=tz)
+    return pd.DataFrame({'open': open_, 'high': high, 'low': low, 'close': close, 'volume': volume}, index=index)
+
+
+def make_klines(start, end, interval_ms=60_000):
+    """
+    Testler için start ile end arasındaki (dahil) açılış zamanlarında Binance ham kline listesi
+
+    Değerler açılış zamanından türetilir; aynı aralık her istendiğinde aynı mumlar döner.
+
+    Args:
+        start (int): Başlangıç zamanı (milisaniye, aralığa yukarı yuvarlanır)
+        end (int): Bitiş zamanı (milisaniye)
+        interval_ms (int, optional): Mum süresi. Defaults to 60_000 (1m).
+
+    Returns:
+        list: Ham kline satırları
+    """
+    klines = []
+    for open_time in range(start + (-start % interval_ms), end + 1, interval_ms):
+        step = open_time // interval_ms % 1000
+        price = 42000 + step * 0.37
+        volume = 1.5 + step
+        klines.append([open_time, f"{price:.8f}", f"{price + 5:.8f}", f"{price - 5:.8f}", f"{price + 1:.8f}",
+                       f"{volume:.8f}", open_time + interval_ms - 1, f"{volume * price:.8f}", 100 + step,
+                       f"{volume / 3:.8f}", f"{volume / 3 * price:.8f}", "0"])
+    return klines
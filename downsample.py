@@ -0,0 +1,144 @@
+import logging
+from typing import Dict, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+METHODS = ('lttb', 'minmax')
+DEFAULT_METHOD = 'lttb'
+
+# Grafik genişliği için üst sınır (istemci çok büyük bir değer gönderirse)
+MAX_POINTS = 20_000
+
+
+def lttb_indices(x, y, threshold: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets ile seçilen noktaların indeksleri
+
+    İlk ve son nokta her zaman korunur; aradaki noktalar threshold - 2 kovaya
+    bölünür ve her kovadan, önceki seçilen nokta ile sonraki kovanın ortalaması
+    arasında en büyük üçgeni oluşturan nokta seçilir. Kova ortalamaları tek
+    seferde, üçgen alanları kova bazında vektörel hesaplanır; Python döngüsü
+    nokta sayısına değil kova sayısına bağlıdır.
+
+    Args:
+        x: X değerleri (ör. epoch-ms zamanlar), artan sırada
+        y: Y değerleri
+        threshold (int): İstenen nokta sayısı
+
+    Returns:
+        np.ndarray: Seçilen noktaların artan indeksleri (int64)
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n, dtype=np.int64)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    buckets = threshold - 2
+    every = (n - 2) / buckets
+    edges = (np.arange(buckets + 1) * every).astype(np.int64) + 1
+    edges[-1] = n - 1
+
+    sizes = np.diff(edges)
+    avg_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1) / sizes
+    avg_y = np.add.reduceat(y[1:n - 1], edges[:-1] - 1) / sizes
+    # Son kovanın "sonraki kovası" son noktadır
+    next_x = np.append(avg_x[1:], x[n - 1])
+    next_y = np.append(avg_y[1:], y[n - 1])
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    a = 0
+    for i in range(buckets):
+        lo, hi = edges[i], edges[i + 1]
+        ax, ay = x[a], y[a]
+        area = np.abs((ax - next_x[i]) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (next_y[i] - ay))
+        a = lo + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def minmax_indices(y, points: int) -> np.ndarray:
+    """
+    Min/max kovaları ile seçilen noktaların indeksleri
+
+    Veri points // 2 kovaya bölünür ve her kovanın en küçük ve en büyük noktası
+    korunur; tepe ve dipler hiçbir zaman kaybolmaz. Tamamen vektöreldir.
+
+    Args:
+        y: Y değerleri
+        points (int): Üst sınır nokta sayısı (yaklaşık piksel genişliği)
+
+    Returns:
+        np.ndarray: Seçilen noktaların artan indeksleri (int64)
+    """
+    n = len(y)
+    buckets = points // 2
+    if points >= n or buckets < 1:
+        return np.arange(n, dtype=np.int64)
+
+    y = np.asarray(y, dtype=np.float64)
+    starts = (np.arange(buckets) * (n / buckets)).astype(np.int64)
+    sizes = np.diff(np.append(starts, n))
+    bucket_of = np.repeat(np.arange(buckets), sizes)
+
+    # Her kovada min/max değerine eşit ilk noktanın indeksi
+    mins = np.minimum.reduceat(y, starts)
+    maxs = np.maximum.reduceat(y, starts)
+    min_hits = np.flatnonzero(y == mins[bucket_of])
+    max_hits = np.flatnonzero(y == maxs[bucket_of])
+    min_idx = min_hits[np.searchsorted(min_hits, starts)]
+    max_idx = max_hits[np.searchsorted(max_hits, starts)]
+
+    return np.unique(np.concatenate([[0, n - 1], min_idx, max_idx]))
+
+
+def downsample_indices(x, y, points: int, method: str = DEFAULT_METHOD) -> np.ndarray:
+    """
+    Seçilen yöntemle korunacak noktaların indeksleri
+
+    Args:
+        x: X değerleri
+        y: Y değerleri
+        points (int): İstenen nokta sayısı
+        method (str, optional): 'lttb' veya 'minmax'. Defaults to 'lttb'.
+
+    Returns:
+        np.ndarray: Artan indeksler
+    """
+    if method not in METHODS:
+        raise ValueError(f"Geçersiz örnekleme yöntemi: {method}. Geçerli değerler: {', '.join(METHODS)}")
+    points = min(int(points), MAX_POINTS)
+    if method == 'minmax':
+        return minmax_indices(y, points)
+    return lttb_indices(x, y, points)
+
+
+def downsample_payload(payload: Dict, points: Optional[int], method: str = DEFAULT_METHOD) -> Dict:
+    """
+    Sütun bazlı backtest sonucundaki equity eğrisini grafik genişliğine indir
+
+    Noktalar equity değerine göre seçilir, bakiye aynı indekslerden alınır.
+    İşlemler ve tekil alanlar değişmez.
+
+    Args:
+        payload (dict): columnar_result çıktısı
+        points (int, optional): Piksel genişliği; None veya 0 tam çözünürlük döndürür
+        method (str, optional): 'lttb' veya 'minmax'. Defaults to 'lttb'.
+
+    Returns:
+        dict: Yeni 'curve' ve 'curve_info' alanlarıyla sonucun sığ kopyası
+    """
+    curve = payload['curve']
+    total = len(curve['time'])
+    if not points or points >= total:
+        info = {'points': total, 'returned': total, 'method': None}
+        return dict(payload, curve_info=info)
+
+    index = downsample_indices(curve['time'], curve['equity'], points, method)
+    sampled = {name: np.asarray(values)[index] for name, values in curve.items()}
+    info = {'points': total, 'returned': int(len(index)), 'method': method}
+    return dict(payload, curve=sampled, curve_info=info)
@@ -0,0 +1,245 @@
+import os
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, List, Optional
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+# Binance dakikalık istek ağırlığı limiti (IP başına)
+DEFAULT_WEIGHT_PER_MINUTE = int(os.getenv('BINANCE_WEIGHT_PER_MINUTE', '1200'))
+
+# Aynı anda çalışacak en fazla istek sayısı
+DEFAULT_MAX_WORKERS = int(os.getenv('BINANCE_FETCH_WORKERS', '8'))
+
+
+def kline_request_weight(limit: int, futures: bool = False) -> int:
+    """
+    Kline isteğinin Binance ağırlığını hesapla
+
+    Spot /api/v3/klines her limitte 2 ağırlıktır; futures /fapi/v1/klines
+    ağırlığı limite göre kademelidir.
+
+    Args:
+        limit (int): İstenen mum sayısı
+        futures (bool, optional): Vadeli işlem uç noktası mı? Defaults to False.
+
+    Returns:
+        int: İstek ağırlığı
+    """
+    if not futures:
+        return 2
+    if limit < 100:
+        return 1
+    if limit < 500:
+        return 2
+    if limit <= 1000:
+        return 5
+    return 10
+
+
+class WeightLimiter:
+    """
+    Binance istek ağırlığı için token-bucket sınırlayıcı.
+
+    Kova dakikada `capacity` kadar ağırlıkla sürekli dolar; her istek ağırlığı kadar
+    token harcar. Sunucunun döndürdüğü X-MBX-USED-WEIGHT-1M başlığı ile senkronize
+    edilebilir, böylece süreç dışındaki kullanım da hesaba katılır.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_WEIGHT_PER_MINUTE, period: float = 60.0):
+        """
+        Sınırlayıcıyı başlat
+
+        Args:
+            capacity (int, optional): Periyot başına toplam ağırlık. Defaults to 1200.
+            period (float, optional): Periyot süresi (saniye). Defaults to 60.
+        """
+        self.capacity = float(capacity)
+        self.period = float(period)
+        self.rate = self.capacity / self.period
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.condition = threading.Condition()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, weight: int = 1) -> float:
+        """
+        Ağırlık kadar token al, yeterli token yoksa bekle
+
+        Args:
+            weight (int, optional): İstek ağırlığı. Defaults to 1.
+
+        Returns:
+            float: Beklenen süre (saniye)
+        """
+        weight = min(float(weight), self.capacity)
+        waited = 0.0
+        with self.condition:
+            while True:
+                self._refill()
+                if self.tokens >= weight:
+                    self.tokens -= weight
+                    return waited
+                delay = (weight - self.tokens) / self.rate
+                self.condition.wait(delay)
+                waited += delay
+
+    def sync(self, used_weight: int) -> None:
+        """
+        Sunucunun bildirdiği kullanılmış ağırlık ile kovayı senkronize et
+
+        Args:
+            used_weight (int): X-MBX-USED-WEIGHT-1M başlığındaki değer
+        """
+        with self.condition:
+            self._refill()
+            self.tokens = min(self.tokens, max(0.0, self.capacity - float(used_weight)))
+
+    def pause(self, seconds: float) -> None:
+        """
+        Sunucu 429/418 döndürdüğünde kovayı boşalt ve verilen süre bekle
+
+        Args:
+            seconds (float): Retry-After süresi (saniye)
+        """
+        with self.condition:
+            self.tokens = -seconds * self.rate
+            self.updated = time.monotonic()
+
+
+class FetchEngine:
+    """Süreç genelinde paylaşılan, sınırlı eşzamanlılıkla istek çalıştıran motor"""
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS, limiter: Optional[WeightLimiter] = None):
+        """
+        Motoru başlat
+
+        Args:
+            max_workers (int, optional): Aynı anda çalışan istek sayısı. Defaults to 8.
+            limiter (WeightLimiter, optional): Ağırlık sınırlayıcı. Defaults to paylaşılan sınırlayıcı.
+        """
+        self.max_workers = max_workers
+        self.limiter = limiter or get_weight_limiter()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='binance-fetch')
+
+    def map(self, fn: Callable, items: Iterable) -> List:
+        """
+        Fonksiyonu öğelere paralel uygula, sonuçları sırayla döndür
+
+        Motorun kendi iş parçacıklarından çağrılırsa kilitlenmeyi önlemek için sırayla çalışır.
+
+        Args:
+            fn (callable): Her öğe için çağrılacak fonksiyon
+            items (iterable): Öğeler
+
+        Returns:
+            list: Sonuçlar (öğe sırasıyla)
+        """
+        items = list(items)
+        if len(items) <= 1 or threading.current_thread().name.startswith('binance-fetch'):
+            return [fn(item) for item in items]
+        return list(self.executor.map(fn, items))
+
+
+class RestKlineFetcher:
+    """Binance REST kline uç noktası için ağırlık farkındalıklı istemci"""
+
+    def __init__(self, base_url: str, futures: bool = False, limiter: Optional[WeightLimiter] = None,
+                 session: Optional[requests.Session] = None, timeout: float = 10.0, max_retries: int = 3):
+        """
+        İstemciyi başlat
+
+        Args:
+            base_url (str): API kök adresi (örn. https://api.binance.com)
+            futures (bool, optional): Vadeli işlem uç noktası kullanılsın mı? Defaults to False.
+            limiter (WeightLimiter, optional): Ağırlık sınırlayıcı. Defaults to paylaşılan sınırlayıcı.
+            session (requests.Session, optional): HTTP oturumu
+            timeout (float, optional): İstek zaman aşımı (saniye). Defaults to 10.
+            max_retries (int, optional): 429/418 sonrası tekrar sayısı. Defaults to 3.
+        """
+        self.base_url = base_url.rstrip('/')
+        self.futures = futures
+        self.endpoint = '/fapi/v1/klines' if futures else '/api/v3/klines'
+        self.limiter = limiter or get_weight_limiter()
+        self.session = session or requests.Session()
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.logger = logging.getLogger(__name__)
+
+    def get_klines(self, symbol: str, interval: str, limit: int = 500,
+                   start_time: Optional[int] = None, end_time: Optional[int] = None) -> List[list]:
+        """
+        Kline verisi al
+
+        Returns:
+            list: Ham kline listesi
+        """
+        params = {'symbol': symbol, 'interval': interval, 'limit': limit}
+        if start_time is not None:
+            params['startTime'] = int(start_time)
+        if end_time is not None:
+            params['endTime'] = int(end_time)
+
+        weight = kline_request_weight(limit, self.futures)
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire(weight)
+            response = self.session.get(f"{self.base_url}{self.endpoint}", params=params, timeout=self.timeout)
+
+            used_weight = response.headers.get('X-MBX-USED-WEIGHT-1M') or response.headers.get('X-MBX-USED-WEIGHT-1m')
+            if used_weight is not None:
+                self.limiter.sync(int(used_weight))
+
+            if response.status_code in (418, 429) and attempt < self.max_retries:
+                retry_after = float(response.headers.get('Retry-After', '1'))
+                self.logger.warning(f"İstek limiti aşıldı ({response.status_code}), {retry_after} sn bekleniyor")
+                self.limiter.pause(retry_after)
+                continue
+
+            response.raise_for_status()
+            return response.json()
+        return []
+
+    def get_server_time(self) -> int:
+        """
+        Borsa sunucu zamanını al (ağırlık 1)
+
+        Returns:
+            int: Sunucu zamanı (milisaniye)
+        """
+        endpoint = '/fapi/v1/time' if self.endpoint.startswith('/fapi') else '/api/v3/time'
+        self.limiter.acquire(1)
+        response = self.session.get(f"{self.base_url}{endpoint}", timeout=self.timeout)
+        response.raise_for_status()
+        return int(response.json()['serverTime'])
+
+
+_engine_lock = threading.Lock()
+_weight_limiter = None
+_fetch_engine = None
+
+
+def get_weight_limiter() -> WeightLimiter:
+    """Süreç genelinde paylaşılan ağırlık sınırlayıcıyı döndür"""
+    global _weight_limiter
+    with _engine_lock:
+        if _weight_limiter is None:
+            _weight_limiter = WeightLimiter()
+        return _weight_limiter
+
+
+def get_fetch_engine() -> FetchEngine:
+    """Süreç genelinde paylaşılan istek motorunu döndür"""
+    global _fetch_engine
+    limiter = get_weight_limiter()
+    with _engine_lock:
+        if _fetch_engine is None:
+            _fetch_engine = FetchEngine(limiter=limiter)
+        return _fetch_engine
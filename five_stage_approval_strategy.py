@@ -3,6 +3,7 @@ import numpy as np
 from typing import Dict, List, Tuple
 import logging
 from advanced_indicators import AdvancedIndicators
+from signal_encoding import BUY, HOLD, SIGNAL_DTYPE, confidence_column
 
 class FiveStageApprovalStrategy:
     """
@@ -129,21 +130,7 @@ class FiveStageApprovalStrategy:
                 return "BEKLE", 0, {"error": "Veri çerçevesi boş"}
             
             # Gerekli indikatörleri hesapla
-            # 1. EMA - Trend yönünü belirlemek için
-            df = self.indicators.add_ema(df, self.ema_short_period, 'ema_short')
-            df = self.indicators.add_ema(df, self.ema_long_period, 'ema_long')
-            
-            # 2. MACD - Momentum ve trend gücünü ölçmek için
-            df = self.indicators.add_macd(df, self.macd_fast_period, self.macd_slow_period, self.macd_signal_period)
-            
-            # 3. RSI - Aşırı alım/satım durumlarını belirlemek için
-            df = self.indicators.add_rsi(df, self.rsi_period)
-            
-            # 4. Bollinger Bantları - Volatilite ve fiyat aralıklarını belirlemek için
-            df = self.indicators.add_bollinger_bands(df, self.bollinger_period, self.bollinger_std_dev)
-            
-            # 5. Stokastik Osilatör - Momentum ve trend dönüşlerini belirlemek için
-            df = self.indicators.add_stochastic(df, self.stochastic_k_period, self.stochastic_d_period)
+            df = self.add_indicators(df)
             
             # Son satırı al
             last_row = df.iloc[-1]
@@ -290,46 +277,132 @@ class FiveStageApprovalStrategy:
         signal, _, _ = self.analyze(df)
         return signal
     
+    def add_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        5 aşamanın kullandığı tüm indikatörleri hesapla
+        
+        Args:
+            df: Veri çerçevesi
+            
+        Returns:
+            pd.DataFrame: İndikatörler eklenmiş veri çerçevesi
+        """
+        # 1. EMA - Trend yönünü belirlemek için
+        df = self.indicators.add_ema(df, self.ema_short_period, 'ema_short')
+        df = self.indicators.add_ema(df, self.ema_long_period, 'ema_long')
+        
+        # 2. MACD - Momentum ve trend gücünü ölçmek için
+        df = self.indicators.add_macd(df, self.macd_fast_period, self.macd_slow_period, self.macd_signal_period)
+        
+        # 3. RSI - Aşırı alım/satım durumlarını belirlemek için
+        df = self.indicators.add_rsi(df, self.rsi_period)
+        
+        # 4. Bollinger Bantları - Volatilite ve fiyat aralıklarını belirlemek için
+        df = self.indicators.add_bollinger_bands(df, self.bollinger_period, self.bollinger_std_dev)
+        
+        # 5. Stokastik Osilatör - Momentum ve trend dönüşlerini belirlemek için
+        df = self.indicators.add_stochastic(df, self.stochastic_k_period, self.stochastic_d_period)
+        return df
+    
+    def analyze_batch(self, df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        5 aşamayı indikatör dizileri üzerinde tek geçişte tüm satırlara uygula
+        
+        Her satırın sonucu, analyze() metodunun o satıra kadarki veriyle
+        döndürdüğü sinyal ve güven oranıyla aynıdır.
+        
+        Args:
+            df: add_indicators() ile hesaplanmış indikatörleri içeren veri çerçevesi
+            
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: int8 sinyal kodları (BUY/bekle) ve güven oranları
+        """
+        close = df['close'].to_numpy(dtype=float)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # 1. Aşama: Trend Analizi (EMA ile)
+            ema_short = df['ema_short'].to_numpy(dtype=float)
+            ema_long = df['ema_long'].to_numpy(dtype=float)
+            trend_up = ema_short > ema_long
+            trend_down = ema_short < ema_long
+            trend_strength = np.where(trend_up, (ema_short / ema_long - 1) * 100,
+                                      np.where(trend_down, (1 - ema_short / ema_long) * 100, 0.0))
+            trend_confirmed = trend_up & (trend_strength > 0.5)
+            
+            # 2. Aşama: Momentum Analizi (MACD ile)
+            macd_line = df['macd_line'].to_numpy(dtype=float)
+            signal_line = df['signal_line'].to_numpy(dtype=float)
+            macd_histogram = df['macd_histogram'].to_numpy(dtype=float)
+            macd_buy = (macd_line > signal_line) & (macd_histogram > 0)
+            macd_sell = (macd_line < signal_line) & (macd_histogram < 0)
+            macd_strength = np.where(
+                macd_buy, np.where(signal_line != 0, np.abs(macd_line / signal_line), 1.0),
+                np.where(macd_sell, np.where(macd_line != 0, np.abs(signal_line / macd_line), 1.0), 0.0))
+            momentum_confirmed = macd_buy & (macd_strength > 1.05)
+            
+            # 3. Aşama: Aşırı Alım/Satım Analizi (RSI ile)
+            rsi = df['rsi'].to_numpy(dtype=float)
+            rsi_low = rsi < self.rsi_oversold
+            rsi_high = ~rsi_low & (rsi > self.rsi_overbought)
+            rsi_strength = np.where(rsi_low, (self.rsi_oversold - rsi) / self.rsi_oversold * 100,
+                                    np.where(rsi_high, (rsi - self.rsi_overbought) / (100 - self.rsi_overbought) * 100, 0.0))
+            rsi_confirmed = ~rsi_high
+            
+            # 4. Aşama: Volatilite Analizi (Bollinger Bantları ile)
+            bb_upper = df['bb_upper'].to_numpy(dtype=float)
+            bb_lower = df['bb_lower'].to_numpy(dtype=float)
+            bb_low = close < bb_lower
+            bb_high = ~bb_low & (close > bb_upper)
+            bb_strength = np.where(bb_low, (bb_lower - close) / bb_lower * 100,
+                                   np.where(bb_high, (close - bb_upper) / bb_upper * 100, 0.0))
+            volatility_confirmed = ~bb_high
+            
+            # 5. Aşama: Trend Dönüşü Analizi (Stokastik Osilatör ile)
+            stoch_k = df['stoch_k'].to_numpy(dtype=float)
+            stoch_d = df['stoch_d'].to_numpy(dtype=float)
+            stoch_low = (stoch_k < self.stochastic_oversold) & (stoch_d < self.stochastic_oversold)
+            stoch_high = ~stoch_low & (stoch_k > self.stochastic_overbought) & (stoch_d > self.stochastic_overbought)
+            stoch_strength = np.where(
+                stoch_low, (self.stochastic_oversold - stoch_k) / self.stochastic_oversold * 100,
+                np.where(stoch_high, (stoch_k - self.stochastic_overbought) / (100 - self.stochastic_overbought) * 100, 0.0))
+            stochastic_confirmed = ~stoch_high
+            
+            # Tüm aşamaların onayı ve güven oranı
+            all_confirmed = trend_confirmed & momentum_confirmed & rsi_confirmed & volatility_confirmed & stochastic_confirmed
+            confidence = (trend_strength + macd_strength + rsi_strength + bb_strength + stoch_strength) / 5
+        
+        signals = np.where(all_confirmed, BUY, HOLD).astype(SIGNAL_DTYPE)
+        return signals, confidence
+    
     def generate_signals(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Tüm veri için sinyal üret
         
+        İndikatörler bir kez hesaplanır ve 5 aşama analyze_batch() ile tüm
+        satırlara tek geçişte uygulanır.
+        
         Args:
             df: Veri çerçevesi
             
         Returns:
-            pd.DataFrame: Sinyaller eklenmiş veri çerçevesi
+            pd.DataFrame: Sinyaller ve güven oranları eklenmiş veri çerçevesi
         """
         if df.empty:
             return df
             
         try:
             # Gerekli indikatörleri hesapla
-            # 1. EMA - Trend yönünü belirlemek için
-            df = self.indicators.add_ema(df, self.ema_short_period, 'ema_short')
-            df = self.indicators.add_ema(df, self.ema_long_period, 'ema_long')
+            df = self.add_indicators(df)
             
-            # 2. MACD - Momentum ve trend gücünü ölçmek için
-            df = self.indicators.add_macd(df, self.macd_fast_period, self.macd_slow_period, self.macd_signal_period)
+            # Sinyalleri hesapla (ısınma dönemindeki satırlar bekle olarak kalır)
+            start = max(self.ema_long_period, self.macd_slow_period, self.rsi_period,
+                        self.bollinger_period, self.stochastic_k_period) + 5
+            signals, confidence = self.analyze_batch(df)
+            signals[:start] = HOLD
+            confidence[:start] = 0
             
-            # 3. RSI - Aşırı alım/satım durumlarını belirlemek için
-            df = self.indicators.add_rsi(df, self.rsi_period)
-            
-            # 4. Bollinger Bantları - Volatilite ve fiyat aralıklarını belirlemek için
-            df = self.indicators.add_bollinger_bands(df, self.bollinger_period, self.bollinger_std_dev)
-            
-            # 5. Stokastik Osilatör - Momentum ve trend dönüşlerini belirlemek için
-            df = self.indicators.add_stochastic(df, self.stochastic_k_period, self.stochastic_d_period)
-            
-            # Sinyalleri hesapla
-            df['signal'] = 'WAIT'  # Varsayılan sinyal
-            
-            for i in range(max(self.ema_long_period, self.macd_slow_period, self.rsi_period, 
-                               self.bollinger_period, self.stochastic_k_period) + 5, len(df)):
-                # Her bir satır için sinyal hesapla
-                signal, _, _ = self.analyze(df.iloc[:i+1])
-                df.loc[df.index[i], 'signal'] = signal
-                
+            df['signal'] = signals
+            df['confidence'] = confidence_column(confidence)
             return df
             
         except Exception as e:
@@ -338,7 +411,7 @@ class FiveStageApprovalStrategy:
             print(traceback.format_exc())
             # Hata durumunda boş sinyaller döndür
             if 'signal' not in df.columns:
-                df['signal'] = 'WAIT'
+                df['signal'] = np.zeros(len(df), dtype=SIGNAL_DTYPE)
             return df
     
     def calculate_bollinger_bands(self, df: pd.DataFrame) -> pd.DataFrame:
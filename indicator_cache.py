@@ -0,0 +1,295 @@
+import os
+import logging
+import threading
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Dict, Hashable, Iterator, Optional, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# İstekler arası saklanacak en fazla veri seti (sembol/aralık/son mum) sayısı
+DEFAULT_CACHE_SIZE = int(os.getenv('INDICATOR_CACHE_SIZE', '32'))
+
+
+class IndicatorCache:
+    """
+    Bir veri seti için hesaplanmış göstergelerin önbelleği.
+
+    Anahtar (seri kimliği, gösterge, parametreler) üçlüsüdür. Seri kimliği sütun
+    adı ve satır sayısıdır; önbellek tek bir veri setine bağlı olduğu için bu
+    yeterlidir. Aynı veri üzerinde çalışan stratejiler EMA, RSI, ATR, MACD ve
+    Bollinger değerlerini bir kez hesaplar.
+    """
+
+    def __init__(self, values: Optional[Dict[Hashable, object]] = None):
+        self._values: Dict[Hashable, object] = dict(values or {})
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, df: pd.DataFrame, column: str, indicator: str, params: Tuple, compute: Callable):
+        """
+        Göstergeyi önbellekten al, yoksa hesapla ve sakla
+
+        Args:
+            df (pd.DataFrame): Veri
+            column (str): Kaynak sütun (birden fazla sütun kullanan göstergeler için 'ohlc')
+            indicator (str): Gösterge adı
+            params (tuple): Gösterge parametreleri
+            compute (callable): Önbellekte yoksa çağrılacak hesaplama fonksiyonu
+
+        Returns:
+            Gösterge değeri (Series veya Series demeti)
+        """
+        key = ((column, len(df)), indicator, params)
+        with self._lock:
+            if key in self._values:
+                self.hits += 1
+                return self._values[key]
+            self.misses += 1
+            value = compute()
+            self._values[key] = value
+            return value
+
+    def __len__(self):
+        return len(self._values)
+
+    def snapshot(self) -> Dict[Hashable, object]:
+        """Hesaplanmış göstergelerin kopyası (anahtar -> değer)"""
+        with self._lock:
+            return dict(self._values)
+
+    def ema(self, df: pd.DataFrame, period: int, column: str = 'close') -> pd.Series:
+        """Üstel hareketli ortalama (adjust=False)"""
+        return self.get(df, column, 'ema', (period,),
+                        lambda: df[column].ewm(span=period, adjust=False).mean())
+
+    def sma(self, df: pd.DataFrame, period: int, column: str = 'close') -> pd.Series:
+        """Basit hareketli ortalama"""
+        return self.get(df, column, 'sma', (period,), lambda: df[column].rolling(window=period).mean())
+
+    def rolling_std(self, df: pd.DataFrame, period: int, column: str = 'close') -> pd.Series:
+        """Kayan standart sapma"""
+        return self.get(df, column, 'std', (period,), lambda: df[column].rolling(window=period).std())
+
+    def rsi(self, df: pd.DataFrame, period: int = 14, column: str = 'close') -> pd.Series:
+        """RSI (kazanç/kayıpların basit hareketli ortalaması ile)"""
+        def compute():
+            delta = df[column].diff()
+            gain = delta.where(delta > 0, 0).rolling(window=period).mean()
+            loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
+            return 100 - (100 / (1 + gain / loss))
+        return self.get(df, column, 'rsi', (period,), compute)
+
+    def true_range(self, df: pd.DataFrame) -> pd.Series:
+        """True Range"""
+        def compute():
+            high_low = df['high'] - df['low']
+            high_close = abs(df['high'] - df['close'].shift())
+            low_close = abs(df['low'] - df['close'].shift())
+            return pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
+        return self.get(df, 'ohlc', 'true_range', (), compute)
+
+    def atr(self, df: pd.DataFrame, period: int = 14) -> pd.Series:
+        """ATR (True Range'in basit hareketli ortalaması)"""
+        return self.get(df, 'ohlc', 'atr', (period,), lambda: self.true_range(df).rolling(window=period).mean())
+
+    def macd(self, df: pd.DataFrame, fast: int = 12, slow: int = 26, signal: int = 9,
+             column: str = 'close') -> Tuple[pd.Series, pd.Series, pd.Series]:
+        """
+        MACD
+
+        Returns:
+            tuple: (macd çizgisi, sinyal çizgisi, histogram)
+        """
+        def compute():
+            macd_line = self.ema(df, fast, column) - self.ema(df, slow, column)
+            signal_line = macd_line.ewm(span=signal, adjust=False).mean()
+            return macd_line, signal_line, macd_line - signal_line
+        return self.get(df, column, 'macd', (fast, slow, signal), compute)
+
+    def bollinger(self, df: pd.DataFrame, period: int = 20, std_dev: float = 2.0,
+                  column: str = 'close') -> Tuple[pd.Series, pd.Series, pd.Series, pd.Series]:
+        """
+        Bollinger Bantları
+
+        Returns:
+            tuple: (orta bant, standart sapma, üst bant, alt bant)
+        """
+        def compute():
+            middle = self.sma(df, period, column)
+            std = self.rolling_std(df, period, column)
+            return middle, std, middle + (std * std_dev), middle - (std * std_dev)
+        return self.get(df, column, 'bollinger', (period, std_dev), compute)
+
+    def stochastic(self, df: pd.DataFrame, k_period: int = 14, d_period: int = 3) -> Tuple[pd.Series, pd.Series]:
+        """
+        Stokastik Osilatör
+
+        Returns:
+            tuple: (%K, %D)
+        """
+        def compute():
+            low_min = df['low'].rolling(window=k_period).min()
+            high_max = df['high'].rolling(window=k_period).max()
+            stoch_k = 100 * ((df['close'] - low_min) / (high_max - low_min))
+            return stoch_k, stoch_k.rolling(window=d_period).mean()
+        return self.get(df, 'ohlc', 'stochastic', (k_period, d_period), compute)
+
+
+class IndicatorCacheLRU:
+    """
+    İstekler arası gösterge önbellekleri (LRU).
+
+    Anahtar sembol, aralık ve son mumdur (açılış zamanı, kapanış fiyatı ve hacim);
+    böylece oluşmakta olan mum güncellendiğinde önbellek de yenilenir.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._caches: 'OrderedDict[Hashable, IndicatorCache]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(df: pd.DataFrame, symbol: str, interval: str) -> Tuple:
+        last = df.iloc[-1]
+        return (symbol, interval, len(df), df.index[0], df.index[-1],
+                float(last['close']), float(last['volume']) if 'volume' in df.columns else None)
+
+    def get(self, df: pd.DataFrame, symbol: str, interval: str) -> IndicatorCache:
+        """
+        Veri setinin önbelleğini döndür (yoksa oluştur)
+
+        Args:
+            df (pd.DataFrame): Veri
+            symbol (str): Sembol
+            interval (str): Zaman aralığı
+
+        Returns:
+            IndicatorCache: Gösterge önbelleği
+        """
+        key = self.make_key(df, symbol, interval)
+        with self._lock:
+            cache = self._caches.get(key)
+            if cache is not None:
+                self._caches.move_to_end(key)
+                return cache
+            cache = IndicatorCache()
+            self._caches[key] = cache
+            while len(self._caches) > self.maxsize:
+                self._caches.popitem(last=False)
+            return cache
+
+    def clear(self) -> None:
+        with self._lock:
+            self._caches.clear()
+
+    def __len__(self):
+        return len(self._caches)
+
+
+# Veri çerçevesi nesnesi -> bağlı önbellek (nesne silinince kayıt da silinir)
+_bound: Dict[int, Tuple[weakref.ref, IndicatorCache]] = {}
+_bound_lock = threading.Lock()
+_lru = IndicatorCacheLRU()
+# cache_scope ile iş parçacığına atanan önbellek
+_scoped = threading.local()
+
+
+def bind_cache(df: pd.DataFrame, cache: IndicatorCache) -> IndicatorCache:
+    """
+    Önbelleği veri çerçevesine bağla; bu nesneyle cache_for çağrıları aynı önbelleği döndürür
+
+    Args:
+        df (pd.DataFrame): Veri
+        cache (IndicatorCache): Önbellek
+
+    Returns:
+        IndicatorCache: Bağlanan önbellek
+    """
+    key = id(df)
+
+    def _release(_, key=key):
+        with _bound_lock:
+            _bound.pop(key, None)
+
+    with _bound_lock:
+        _bound[key] = (weakref.ref(df, _release), cache)
+    return cache
+
+
+def cache_for(df: pd.DataFrame) -> IndicatorCache:
+    """
+    Veri çerçevesine bağlı önbelleği döndür; bağlı değilse geçici yeni bir önbellek döndür
+
+    Stratejiler göstergeleri bu fonksiyonla alır. Önbellek sadece aynı nesneye
+    bağlıdır; kopyalar veya dilimler kendi geçici önbelleğini kullanır. cache_scope
+    içinde bağlı olmayan çerçeveler kapsamın önbelleğini kullanır.
+
+    Args:
+        df (pd.DataFrame): Veri
+
+    Returns:
+        IndicatorCache: Gösterge önbelleği
+    """
+    with _bound_lock:
+        entry = _bound.get(id(df))
+    if entry is not None and entry[0]() is df:
+        return entry[1]
+    scoped = getattr(_scoped, 'cache', None)
+    if scoped is not None:
+        return scoped
+    return IndicatorCache()
+
+
+@contextmanager
+def cache_scope(cache: IndicatorCache) -> Iterator[IndicatorCache]:
+    """
+    Bu iş parçacığında bağlı olmayan tüm veri çerçeveleri için önbelleği belirle
+
+    Stratejiler veriyi kopyalayıp göstergeleri kopya üzerinde istediğinde de aynı
+    önbellek kullanılır. Anahtar sadece sütun ve satır sayısı olduğu için kapsam
+    içinde tek bir veri seti işlenmelidir (ör. optimizasyon çalışanları).
+
+    Args:
+        cache (IndicatorCache): Kapsam boyunca kullanılacak önbellek
+
+    Yields:
+        IndicatorCache: Aynı önbellek
+    """
+    previous = getattr(_scoped, 'cache', None)
+    _scoped.cache = cache
+    try:
+        yield cache
+    finally:
+        _scoped.cache = previous
+
+
+def get_request_cache(df: pd.DataFrame, symbol: Optional[str] = None, interval: Optional[str] = None) -> IndicatorCache:
+    """
+    İstek için önbellek al ve veri çerçevesine bağla
+
+    Sembol ve aralık verilirse önbellek istekler arası LRU'dan alınır (aynı son
+    mum için önceki istekte hesaplanan göstergeler yeniden kullanılır).
+
+    Args:
+        df (pd.DataFrame): Veri
+        symbol (str, optional): Sembol
+        interval (str, optional): Zaman aralığı
+
+    Returns:
+        IndicatorCache: Veri çerçevesine bağlı önbellek
+    """
+    if symbol and interval and df is not None and not df.empty:
+        cache = _lru.get(df, symbol, interval)
+    else:
+        cache = IndicatorCache()
+    return bind_cache(df, cache)
+
+
+def get_indicator_lru() -> IndicatorCacheLRU:
+    """Süreç genelinde paylaşılan LRU önbelleğini döndür"""
+    return _lru
@@ -0,0 +1,89 @@
+import os
+import logging
+from operator import itemgetter
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Binance kline yanıtındaki sütunlar ve tipleri (yanıttaki sırayla, kullanılmayan 'ignore' hariç)
+KLINE_COLUMNS = [
+    ('open_time', np.int64),
+    ('open', np.float64),
+    ('high', np.float64),
+    ('low', np.float64),
+    ('close', np.float64),
+    ('volume', np.float64),
+    ('close_time', np.int64),
+    ('quote_volume', np.float64),
+    ('trades', np.int64),
+    ('taker_buy_base', np.float64),
+    ('taker_buy_quote', np.float64),
+]
+
+# Kompakt modda fiyat/hacim sütunları float32 olarak çözülür (bellek yarıya iner)
+COMPACT_DEFAULT = os.getenv('KLINE_COMPACT', 'false').lower() == 'true'
+
+
+def decode_klines(klines: List[list], compact: bool = False,
+                  columns: Optional[Iterable[str]] = None) -> Dict[str, np.ndarray]:
+    """
+    Binance ham kline listesini tipli NumPy sütunlarına çöz
+
+    Ara DataFrame veya nesne dizisi oluşturulmaz: her sütun ham satırlardan
+    doğrudan önceden boyutu belirlenmiş tipli bir diziye okunur. Zaman damgaları
+    int64 milisaniye, fiyat/hacim sütunları float64 (kompakt modda float32)
+    olur; 'ignore' sütunu hiç okunmaz.
+
+    Args:
+        klines (list): Binance'den gelen ham kline listesi
+        compact (bool, optional): Fiyat/hacim sütunları float32 olsun mu? Defaults to False.
+        columns (iterable, optional): Sadece bu sütunları çöz. Defaults to None (tümü).
+
+    Returns:
+        dict: Sütun adı -> NumPy dizisi (KLINE_COLUMNS sırasıyla)
+    """
+    wanted = None if columns is None else set(columns)
+    if wanted is not None:
+        unknown = wanted - {name for name, _ in KLINE_COLUMNS}
+        if unknown:
+            raise ValueError(f"Bilinmeyen kline sütunları: {', '.join(sorted(unknown))}")
+
+    count = len(klines)
+    decoded = {}
+    for position, (name, dtype) in enumerate(KLINE_COLUMNS):
+        if wanted is not None and name not in wanted:
+            continue
+        values = map(itemgetter(position), klines)
+        if dtype is np.int64:
+            decoded[name] = np.fromiter(map(int, values), dtype=np.int64, count=count)
+        else:
+            target = np.float32 if compact else np.float64
+            # Fiyatlar metin olarak gelir; float() tek geçişte Python float'ına çevirir
+            decoded[name] = np.fromiter(map(float, values), dtype=target, count=count)
+    return decoded
+
+
+def klines_to_dataframe(klines: List[list], compact: bool = False,
+                        columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """
+    Binance ham kline listesini timestamp index'li DataFrame'e çöz
+
+    Args:
+        klines (list): Binance'den gelen ham kline listesi
+        compact (bool, optional): Fiyat/hacim sütunları float32 olsun mu? Defaults to False.
+        columns (iterable, optional): open_time dışında alınacak sütunlar. Defaults to None (tümü).
+
+    Returns:
+        pd.DataFrame: timestamp index'li veriler; kline yoksa boş DataFrame
+    """
+    if not klines:
+        return pd.DataFrame()
+
+    wanted = None if columns is None else set(columns) | {'open_time'}
+    decoded = decode_klines(klines, compact=compact, columns=wanted)
+    index = pd.to_datetime(decoded.pop('open_time'), unit='ms')
+    index.name = 'timestamp'
+    return pd.DataFrame(decoded, index=index, copy=False)
@@ -0,0 +1,226 @@
+import logging
+from typing import Callable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Binance tek istekte en fazla 1000 mum döndürür
+MAX_KLINES_PER_REQUEST = 1000
+
+# Zaman aralıklarının milisaniye karşılıkları
+INTERVAL_MS = {
+    '1m': 60 * 1000,
+    '3m': 3 * 60 * 1000,
+    '5m': 5 * 60 * 1000,
+    '15m': 15 * 60 * 1000,
+    '30m': 30 * 60 * 1000,
+    '1h': 60 * 60 * 1000,
+    '2h': 2 * 60 * 60 * 1000,
+    '4h': 4 * 60 * 60 * 1000,
+    '6h': 6 * 60 * 60 * 1000,
+    '8h': 8 * 60 * 60 * 1000,
+    '12h': 12 * 60 * 60 * 1000,
+    '1d': 24 * 60 * 60 * 1000,
+    '3d': 3 * 24 * 60 * 60 * 1000,
+    '1w': 7 * 24 * 60 * 60 * 1000,
+    '1M': 31 * 24 * 60 * 60 * 1000,  # Yaklaşık değer, ay uzunluğu değişken
+}
+
+# Haftalık mumlar pazartesi açılır; Unix epoch ise perşembeye denk gelir
+WEEK_OFFSET_MS = 4 * 24 * 60 * 60 * 1000
+
+
+def interval_to_ms(interval: str) -> int:
+    """
+    Zaman aralığını milisaniyeye çevir
+
+    Args:
+        interval (str): Zaman aralığı (1m, 5m, 1h, 1d, ...)
+
+    Returns:
+        int: Milisaniye cinsinden aralık
+    """
+    if interval not in INTERVAL_MS:
+        raise ValueError(f"Geçersiz zaman aralığı: {interval}")
+    return INTERVAL_MS[interval]
+
+
+def align_open_time(timestamp: int, interval: str) -> int:
+    """
+    Zamanı, o anda veya sonrasında açılan ilk mumun açılış zamanına yuvarla
+
+    Args:
+        timestamp (int): Zaman (milisaniye)
+        interval (str): Zaman aralığı
+
+    Returns:
+        int: İlk mumun açılış zamanı (milisaniye)
+    """
+    step = interval_to_ms(interval)
+    offset = WEEK_OFFSET_MS if interval == '1w' else 0
+    return timestamp + (-(timestamp - offset) % step)
+
+
+def plan_kline_requests(interval: str, start_time: int, end_time: int,
+                        limit: int = MAX_KLINES_PER_REQUEST) -> List[Tuple[int, int]]:
+    """
+    Tarih aralığını her biri tam olarak limit kadar mum içeren istek pencerelerine böl
+
+    Args:
+        interval (str): Zaman aralığı
+        start_time (int): Başlangıç zamanı (milisaniye)
+        end_time (int): Bitiş zamanı (milisaniye)
+        limit (int, optional): İstek başına mum sayısı. Defaults to 1000.
+
+    Returns:
+        list: [(pencere_başlangıcı, pencere_bitişi), ...] milisaniye cinsinden
+    """
+    limit = max(1, min(int(limit), MAX_KLINES_PER_REQUEST))
+    if end_time < start_time:
+        return []
+
+    # Aylık mumların uzunluğu sabit değil; 1000 ay tek istekte kalır
+    if interval == '1M':
+        return [(start_time, end_time)]
+
+    step = interval_to_ms(interval)
+    window_size = step * limit
+    windows = []
+    current = align_open_time(start_time, interval)
+    if current > end_time:
+        return []
+
+    # İlk pencere orijinal başlangıçtan başlar, sonraki pencereler mum sınırlarından
+    window_start = start_time
+    while current <= end_time:
+        window_end = min(current + window_size - 1, end_time)
+        windows.append((window_start, window_end))
+        current += window_size
+        window_start = current
+    return windows
+
+
+def expected_kline_count(interval: str, start_time: int, end_time: int) -> int:
+    """
+    Aralıkta açılması beklenen mum sayısı
+
+    Returns:
+        int: Beklenen mum sayısı
+    """
+    if end_time < start_time:
+        return 0
+    first = align_open_time(start_time, interval)
+    if first > end_time:
+        return 0
+    return (end_time - first) // interval_to_ms(interval) + 1
+
+
+def dedupe_klines(klines: List[list]) -> Tuple[List[list], int]:
+    """
+    Ham kline listesini açılış zamanına göre sırala ve tekrarları at
+
+    Args:
+        klines (list): Ham kline listesi
+
+    Returns:
+        tuple: (temizlenmiş liste, atılan tekrar sayısı)
+    """
+    if not klines:
+        return [], 0
+
+    is_sorted = all(klines[i][0] < klines[i + 1][0] for i in range(len(klines) - 1))
+    if is_sorted:
+        return klines, 0
+
+    unique = {}
+    for row in klines:
+        unique.setdefault(row[0], row)
+    result = [unique[key] for key in sorted(unique)]
+    return result, len(klines) - len(result)
+
+
+def find_kline_gaps(open_times: List[int], interval: str) -> List[Tuple[int, int]]:
+    """
+    Ardışık mumlar arasındaki boşlukları bul
+
+    Args:
+        open_times (list): Sıralı açılış zamanları (milisaniye)
+        interval (str): Zaman aralığı
+
+    Returns:
+        list: [(ilk_eksik_açılış, son_eksik_açılış), ...]
+    """
+    if interval == '1M' or len(open_times) < 2:
+        return []
+
+    step = interval_to_ms(interval)
+    gaps = []
+    for previous, current in zip(open_times[:-1], open_times[1:]):
+        if current - previous > step:
+            gaps.append((previous + step, current - step))
+    return gaps
+
+
+def fetch_planned_klines(request_fn: Callable[[int, int, int], List[list]], interval: str,
+                         start_time: int, end_time: int, limit: int = MAX_KLINES_PER_REQUEST,
+                         log: Optional[logging.Logger] = None, engine=None) -> List[list]:
+    """
+    Planlanan pencereleri iste, birleştir, tekrarları at ve boşlukları raporla
+
+    Args:
+        request_fn (callable): (başlangıç, bitiş, limit) -> ham kline listesi
+        interval (str): Zaman aralığı
+        start_time (int): Başlangıç zamanı (milisaniye)
+        end_time (int): Bitiş zamanı (milisaniye)
+        limit (int, optional): İstek başına mum sayısı. Defaults to 1000.
+        log (logging.Logger, optional): Kullanılacak logger
+        engine (FetchEngine, optional): Verilirse pencereler paralel istenir
+
+    Returns:
+        list: Sıralı ve tekrarsız ham kline listesi
+    """
+    log = log or logger
+    windows = plan_kline_requests(interval, start_time, end_time, limit)
+    log.info(f"{interval} için {len(windows)} istek planlandı "
+             f"(beklenen mum sayısı: {expected_kline_count(interval, start_time, end_time)})")
+
+    def request_window(window):
+        return request_fn(window[0], window[1], limit)
+
+    if engine is not None:
+        results = engine.map(request_window, windows)
+    else:
+        results = [request_window(window) for window in windows]
+
+    all_klines = []
+    for i, klines in enumerate(results):
+        if klines:
+            all_klines.extend(klines)
+        else:
+            log.warning(f"Pencere {i+1}/{len(windows)} için veri alınamadı")
+
+    return check_klines(all_klines, interval, log)
+
+
+def check_klines(klines: List[list], interval: str, log: Optional[logging.Logger] = None) -> List[list]:
+    """
+    Kline listesindeki tekrarları at ve boşlukları logla
+
+    Args:
+        klines (list): Ham kline listesi
+        interval (str): Zaman aralığı
+        log (logging.Logger, optional): Kullanılacak logger
+
+    Returns:
+        list: Sıralı ve tekrarsız ham kline listesi
+    """
+    log = log or logger
+    klines, duplicates = dedupe_klines(klines)
+    if duplicates:
+        log.warning(f"{duplicates} adet tekrarlanan mum atıldı")
+
+    gaps = find_kline_gaps([row[0] for row in klines], interval)
+    if gaps:
+        missing = sum((gap_end - gap_start) // interval_to_ms(interval) + 1 for gap_start, gap_end in gaps)
+        log.warning(f"Veride {len(gaps)} boşluk bulundu, toplam {missing} eksik mum")
+    return klines
+
@@ -0,0 +1,382 @@
+import os
+import json
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: süreçler arası kilit yok, sadece süreç içi kilit kullanılır
+    fcntl = None
+
+import numpy as np
+import pandas as pd
+
+from kline_decoder import KLINE_COLUMNS, decode_klines
+from kline_planner import interval_to_ms
+
+logger = logging.getLogger(__name__)
+
+# Varsayılan depolama dizini (data/klines)
+DEFAULT_STORE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'klines')
+
+# Seri dizini -> süreç içi yazma kilidi (aynı seriyi kullanan tüm KlineStore nesneleri paylaşır)
+_series_locks: Dict[str, threading.Lock] = {}
+_series_locks_guard = threading.Lock()
+
+
+def raw_klines_to_columns(klines: List[list]) -> Dict[str, np.ndarray]:
+    """
+    Binance ham kline listesini tipli NumPy sütunlarına dönüştür
+
+    Args:
+        klines (list): Binance'den gelen ham kline listesi
+
+    Returns:
+        dict: Sütun adı -> NumPy dizisi
+    """
+    # Depo her zaman tam hassasiyetle (float64) yazar
+    return decode_klines(klines)
+
+
+def empty_columns() -> Dict[str, np.ndarray]:
+    """Boş sütun sözlüğü döndür"""
+    return {name: np.empty(0, dtype=dtype) for name, dtype in KLINE_COLUMNS}
+
+
+def columns_to_dataframe(columns: Dict[str, np.ndarray]) -> pd.DataFrame:
+    """
+    Sütun sözlüğünü BinanceClient ile aynı biçimde DataFrame'e dönüştür
+
+    Args:
+        columns (dict): Sütun adı -> NumPy dizisi
+
+    Returns:
+        pd.DataFrame: timestamp index'li OHLCV verileri
+    """
+    if len(columns['open_time']) == 0:
+        return pd.DataFrame()
+
+    index = pd.to_datetime(columns['open_time'], unit='ms')
+    index.name = 'timestamp'
+    data = {name: np.asarray(columns[name]) for name, _ in KLINE_COLUMNS if name != 'open_time'}
+    return pd.DataFrame(data, index=index)
+
+
+class KlineStore:
+    """
+    Yerel, sütun bazlı kline deposu.
+
+    Her piyasa/sembol/zaman aralığı için bir dizin tutulur; her sütun bu dizinde
+    sadece sona eklenen ayrı bir ikili dosyadır ve okuma memory-map ile yapılır.
+    Depo, kapsanan zaman aralıklarını meta.json içinde saklar; istenen aralığın
+    sadece depoda olmayan kısımları borsadan alınır.
+
+    Yazma ve okuma, seri dizinindeki .lock dosyası üzerinde flock ile süreçler
+    arası kilitlenir (yazıcı özel, okuyucu paylaşımlı); aynı süreçteki farklı
+    nesneler ayrıca ortak bir threading kilidi kullanır. meta.json geçerli satır
+    sayısının ve sütun dosyası neslinin tek kaynağıdır: sona ekleme öncesi
+    dosyalar meta'daki satır sayısına kırpılır, yeniden yazma ise yeni nesil
+    dosyalara yapılıp meta ile tek adımda devreye alınır. Böylece yarıda kalan
+    bir yazma sonraki okuma ve eklemeleri bozmaz.
+    """
+
+    def __init__(self, base_dir: Optional[str] = None, market: str = 'spot'):
+        """
+        Kline deposunu başlat
+
+        Args:
+            base_dir (str, optional): Depo kök dizini. Defaults to data/klines.
+            market (str, optional): Piyasa anahtarı (spot, futures, spot_testnet...). Defaults to 'spot'.
+        """
+        self.base_dir = base_dir or DEFAULT_STORE_DIR
+        self.market = market
+        self.logger = logging.getLogger(__name__)
+
+    @contextmanager
+    def _lock(self, symbol: str, interval: str, shared: bool = False):
+        """
+        Seri için kilit al
+
+        Args:
+            symbol (str): İşlem çifti
+            interval (str): Zaman aralığı
+            shared (bool, optional): Okuma için paylaşımlı kilit. Defaults to False (yazma, özel kilit).
+        """
+        series_dir = os.path.abspath(self._series_dir(symbol, interval))
+        os.makedirs(series_dir, exist_ok=True)
+        thread_lock = None
+        if not shared:
+            with _series_locks_guard:
+                thread_lock = _series_locks.setdefault(series_dir, threading.Lock())
+            thread_lock.acquire()
+        try:
+            if fcntl is None:
+                yield
+                return
+            with open(os.path.join(series_dir, '.lock'), 'a+') as lock_file:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+        finally:
+            if thread_lock is not None:
+                thread_lock.release()
+
+    def _series_dir(self, symbol: str, interval: str) -> str:
+        """Sembol/aralık için dizin yolunu döndür"""
+        return os.path.join(self.base_dir, self.market, symbol.upper(), interval)
+
+    def _meta_path(self, symbol: str, interval: str) -> str:
+        return os.path.join(self._series_dir(symbol, interval), 'meta.json')
+
+    def _column_path(self, symbol: str, interval: str, column: str, generation: int = 0) -> str:
+        name = f'{column}.bin' if generation == 0 else f'{column}.{generation}.bin'
+        return os.path.join(self._series_dir(symbol, interval), name)
+
+    @staticmethod
+    def _tmp_path(path: str) -> str:
+        """Süreç ve iş parçacığına özgü geçici dosya yolu"""
+        return f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+    def get_meta(self, symbol: str, interval: str) -> Optional[Dict]:
+        """
+        Depo meta bilgisini al
+
+        Returns:
+            dict: {'rows', 'covered': [[başlangıç, bitiş], ...], 'generation'} veya None
+        """
+        meta_path = self._meta_path(symbol, interval)
+        if not os.path.exists(meta_path):
+            return None
+        try:
+            with open(meta_path, 'r') as f:
+                return json.load(f)
+        except Exception as e:
+            self.logger.error(f"Kline meta okunurken hata: {symbol} {interval} - {str(e)}")
+            return None
+
+    def _write_meta(self, symbol: str, interval: str, meta: Dict) -> None:
+        """Meta bilgisini atomik olarak yaz"""
+        meta_path = self._meta_path(symbol, interval)
+        tmp_path = self._tmp_path(meta_path)
+        with open(tmp_path, 'w') as f:
+            json.dump(meta, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, meta_path)
+
+    def _load_columns(self, symbol: str, interval: str, rows: int, generation: int = 0) -> Dict[str, np.ndarray]:
+        """Sütun dosyalarının ilk `rows` satırını memory-map ile aç"""
+        if rows <= 0:
+            return empty_columns()
+        columns = {}
+        for name, dtype in KLINE_COLUMNS:
+            path = self._column_path(symbol, interval, name, generation)
+            columns[name] = np.memmap(path, dtype=dtype, mode='r', shape=(rows,))
+        return columns
+
+    def read(self, symbol: str, interval: str, start_time: int, end_time: int) -> Dict[str, np.ndarray]:
+        """
+        Depodaki veriyi oku (open_time start_time ile end_time arasında olanlar)
+
+        Args:
+            symbol (str): İşlem çifti
+            interval (str): Zaman aralığı
+            start_time (int): Başlangıç zamanı (milisaniye)
+            end_time (int): Bitiş zamanı (milisaniye)
+
+        Returns:
+            dict: Sütun adı -> NumPy dizisi (memory-map görünümü)
+        """
+        if self.get_meta(symbol, interval) is None:
+            return empty_columns()
+
+        # Açılan memory-map'ler dosya yerine konsa veya silinse de eski içeriği görmeye devam eder
+        with self._lock(symbol, interval, shared=True):
+            meta = self.get_meta(symbol, interval)
+            if not meta or meta.get('rows', 0) == 0:
+                return empty_columns()
+            columns = self._load_columns(symbol, interval, meta['rows'], meta.get('generation', 0))
+        open_time = columns['open_time']
+        lo = int(np.searchsorted(open_time, start_time, side='left'))
+        hi = int(np.searchsorted(open_time, end_time, side='right'))
+        return {name: values[lo:hi] for name, values in columns.items()}
+
+    @staticmethod
+    def _covered(meta: Optional[Dict]) -> List[List[int]]:
+        """Meta bilgisindeki kapsanan aralıklar (eski tek aralıklı meta da okunur)"""
+        if not meta:
+            return []
+        if 'covered' in meta:
+            return [list(span) for span in meta['covered']]
+        if meta.get('covered_start') is not None:
+            return [[meta['covered_start'], meta['covered_end']]]
+        return []
+
+    def missing_ranges(self, symbol: str, interval: str, start_time: int, end_time: int) -> List[Tuple[int, int]]:
+        """
+        İstenen aralığın depoda olmayan kısımlarını bul
+
+        Returns:
+            list: [(başlangıç, bitiş), ...] milisaniye cinsinden eksik aralıklar
+        """
+        gaps = []
+        cursor = start_time
+        for covered_start, covered_end in self._covered(self.get_meta(symbol, interval)):
+            if covered_end < cursor:
+                continue
+            if covered_start > end_time:
+                break
+            if covered_start > cursor:
+                gaps.append((cursor, covered_start - 1))
+            cursor = covered_end + 1
+        if cursor <= end_time:
+            gaps.append((cursor, end_time))
+        return gaps
+
+    def _write_columns(self, symbol: str, interval: str, columns: Dict[str, np.ndarray], mode: str,
+                       generation: int = 0, rows: int = 0) -> None:
+        """
+        Sütunları dosyalara yaz
+
+        'ab' modunda dosyalar önce meta'daki `rows` satırına kırpılır (yarıda kalmış
+        bir eklemenin artıkları silinir), sonra sona eklenir. 'wb' modunda dosyalar
+        geçici adla yazılıp yerine konur.
+        """
+        for name, dtype in KLINE_COLUMNS:
+            path = self._column_path(symbol, interval, name, generation)
+            values = np.ascontiguousarray(columns[name], dtype=dtype)
+            if mode == 'wb':
+                tmp_path = self._tmp_path(path)
+                with open(tmp_path, 'wb') as f:
+                    values.tofile(f)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, path)
+            else:
+                with open(path, 'r+b' if os.path.exists(path) else 'wb') as f:
+                    f.truncate(rows * np.dtype(dtype).itemsize)
+                    f.seek(0, os.SEEK_END)
+                    values.tofile(f)
+                    f.flush()
+                    os.fsync(f.fileno())
+
+    def _remove_generation(self, symbol: str, interval: str, generation: int) -> None:
+        """Artık meta'da kullanılmayan nesil dosyalarını sil"""
+        for name, _ in KLINE_COLUMNS:
+            try:
+                os.remove(self._column_path(symbol, interval, name, generation))
+            except OSError as e:
+                self.logger.warning(f"Eski kline dosyası silinemedi: {symbol} {interval} {name} - {str(e)}")
+
+    def merge(self, symbol: str, interval: str, start_time: int, end_time: int,
+              new_columns: Dict[str, np.ndarray], now_ms: Optional[int] = None) -> None:
+        """
+        Borsadan alınan bir aralığı depoya ekle
+
+        Sadece kapanmış mumlar saklanır. Yeni mumlar mevcut verinin sonundaysa
+        dosyalara eklenir, başında veya arasındaysa dosyalar sıralı olarak yeniden
+        yazılır. Kapsanan aralıklar ayrı ayrı tutulur; birbirine değmeyen bir
+        aralık aradaki boşluğu kapsanmış saymaz.
+
+        Args:
+            symbol (str): İşlem çifti
+            interval (str): Zaman aralığı
+            start_time (int): Alınan aralığın başlangıcı (milisaniye)
+            end_time (int): Alınan aralığın bitişi (milisaniye)
+            new_columns (dict): Alınan veri sütunları
+            now_ms (int, optional): Şu anki zaman (milisaniye)
+        """
+        now_ms = now_ms if now_ms is not None else int(time.time() * 1000)
+        interval_ms = interval_to_ms(interval)
+
+        # Sadece istenen aralıktaki kapanmış mumları sakla
+        keep = ((new_columns['close_time'] < now_ms)
+                & (new_columns['open_time'] >= start_time)
+                & (new_columns['open_time'] <= end_time))
+        new_columns = {name: values[keep] for name, values in new_columns.items()}
+
+        # Kapsanan bitiş: aralık tamamen geçmişteyse end_time, değilse son kapanmış mum
+        if end_time + interval_ms <= now_ms:
+            fetched_end = end_time
+        elif len(new_columns['open_time']) > 0:
+            fetched_end = int(new_columns['open_time'][-1])
+        else:
+            return
+
+        with self._lock(symbol, interval):
+            meta = self.get_meta(symbol, interval) or {'rows': 0}
+            rows = int(meta.get('rows', 0))
+            generation = int(meta.get('generation', 0))
+            old_generation = None
+
+            existing = self._load_columns(symbol, interval, rows, generation)
+            keep = ~np.isin(new_columns['open_time'], existing['open_time'])
+            added = {name: values[keep] for name, values in new_columns.items()}
+            if rows == 0 or len(added['open_time']) == 0 or added['open_time'][0] > existing['open_time'][-1]:
+                # Son kısım: yeni mumlar mevcut son mumdan sonra, meta'daki satır sayısından itibaren ekle
+                del existing
+                self._write_columns(symbol, interval, added, 'ab', generation, rows)
+            else:
+                # Baş veya ara kısım: birleştirip sırala, yeni nesil dosyalara yaz (meta yazılınca devreye girer)
+                merged = {name: np.concatenate([np.asarray(existing[name]), added[name]]) for name, _ in KLINE_COLUMNS}
+                del existing
+                order = np.argsort(merged['open_time'], kind='stable')
+                merged = {name: values[order] for name, values in merged.items()}
+                old_generation, generation = generation, generation + 1
+                self._write_columns(symbol, interval, merged, 'wb', generation)
+            rows += int(len(added['open_time']))
+
+            # Kapsanan aralıkları birleştir (değen veya çakışan aralıklar tek aralık olur)
+            covered = []
+            for span in sorted(self._covered(meta) + [[int(start_time), int(fetched_end)]]):
+                if covered and span[0] <= covered[-1][1] + 1:
+                    covered[-1][1] = max(covered[-1][1], span[1])
+                else:
+                    covered.append(span)
+
+            self._write_meta(symbol, interval, {'rows': rows, 'covered': covered, 'generation': generation})
+            if old_generation is not None:
+                self._remove_generation(symbol, interval, old_generation)
+
+    def get_klines(self, symbol: str, interval: str, start_time: int, end_time: int,
+                   fetch_fn: Callable[[int, int], List[list]]) -> Dict[str, np.ndarray]:
+        """
+        Aralığı depodan sun, eksik kısımları fetch_fn ile borsadan al
+
+        Args:
+            symbol (str): İşlem çifti
+            interval (str): Zaman aralığı
+            start_time (int): Başlangıç zamanı (milisaniye)
+            end_time (int): Bitiş zamanı (milisaniye)
+            fetch_fn (callable): (start_ms, end_ms) -> ham kline listesi
+
+        Returns:
+            dict: Sütun adı -> NumPy dizisi
+        """
+        gaps = self.missing_ranges(symbol, interval, start_time, end_time)
+        live = None
+        for gap_start, gap_end in gaps:
+            self.logger.info(f"Kline deposunda eksik aralık alınıyor: {symbol} {interval} "
+                             f"{pd.to_datetime(gap_start, unit='ms')} - {pd.to_datetime(gap_end, unit='ms')}")
+            klines = fetch_fn(gap_start, gap_end) or []
+            columns = raw_klines_to_columns(klines) if klines else empty_columns()
+            now_ms = int(time.time() * 1000)
+            self.merge(symbol, interval, gap_start, gap_end, columns, now_ms=now_ms)
+
+            # Henüz kapanmamış mumlar depoya yazılmaz, sadece bu yanıta eklenir
+            forming = columns['close_time'] >= now_ms
+            if forming.any():
+                live = {name: values[forming] for name, values in columns.items()}
+
+        if not gaps:
+            self.logger.info(f"Kline verisi tamamen yerel depodan okundu: {symbol} {interval}")
+
+        columns = self.read(symbol, interval, start_time, end_time)
+        if live is not None:
+            columns = {name: np.concatenate([np.asarray(columns[name]), live[name]]) for name, _ in KLINE_COLUMNS}
+        return columns
@@ -0,0 +1,432 @@
+import os
+import json
+import time
+import asyncio
+import logging
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Pazar ve ağ başına birleşik (multiplex) akış adresleri
+STREAM_URLS = {
+    ('spot', False): 'wss://stream.binance.com:9443/stream',
+    ('spot', True): 'wss://stream.testnet.binance.vision/stream',
+    ('futures', False): 'wss://fstream.binance.com/stream',
+    ('futures', True): 'wss://stream.binancefuture.com/stream',
+}
+
+# Her sembol/aralık için bellekte tutulacak mum sayısı
+DEFAULT_BUFFER_SIZE = int(os.getenv('KLINE_BUFFER_SIZE', '500'))
+
+# Yeniden bağlanma bekleme süreleri (saniye, üstel artış)
+RECONNECT_DELAY = 1.0
+MAX_RECONNECT_DELAY = 60.0
+
+# Geri doldurma fonksiyonu: (symbol, interval, start_time, limit) -> DataFrame
+BackfillFn = Callable[[str, str, Optional[int], int], pd.DataFrame]
+
+
+def stream_name(symbol: str, interval: str) -> str:
+    """Binance kline akış adı (ör. btcusdt@kline_1m)"""
+    return f"{symbol.lower()}@kline_{interval}"
+
+
+class KlineRingBuffer:
+    """
+    Bir sembol/aralık için son mumların halka tamponu.
+
+    Değerler önceden ayrılmış NumPy dizilerinde tutulur; yeni mum eklemek veya
+    oluşan mumu güncellemek O(1)'dir. Sadece son mum oluşmakta olabilir.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_BUFFER_SIZE):
+        self.capacity = capacity
+        self.open_time = np.zeros(capacity, dtype=np.int64)
+        self.values = np.zeros((capacity, 5), dtype=np.float64)  # open, high, low, close, volume
+        self.last_closed = False
+        self._start = 0
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def last_open_time(self) -> Optional[int]:
+        if not self._size:
+            return None
+        return int(self.open_time[(self._start + self._size - 1) % self.capacity])
+
+    def update(self, open_time: int, open_: float, high: float, low: float, close: float, volume: float,
+               closed: bool) -> str:
+        """
+        Mumu ekle veya son mumu güncelle
+
+        Args:
+            open_time (int): Açılış zamanı (milisaniye)
+            open_, high, low, close, volume (float): Mum değerleri
+            closed (bool): Mum kapandı mı
+
+        Returns:
+            str: 'new' (yeni mum), 'update' (son mum güncellendi) veya 'stale' (eski mum, yok sayıldı)
+        """
+        with self._lock:
+            last = self.last_open_time
+            if last is not None and open_time < last:
+                return 'stale'
+            if last is not None and open_time == last:
+                pos = (self._start + self._size - 1) % self.capacity
+                status = 'update'
+            else:
+                if self._size < self.capacity:
+                    pos = (self._start + self._size) % self.capacity
+                    self._size += 1
+                else:
+                    pos = self._start
+                    self._start = (self._start + 1) % self.capacity
+                status = 'new'
+            self.open_time[pos] = open_time
+            self.values[pos] = (open_, high, low, close, volume)
+            self.last_closed = closed
+            return status
+
+    def merge_frame(self, df: pd.DataFrame, now_ms: Optional[int] = None) -> int:
+        """
+        REST'ten alınan mumları tampona işle
+
+        Son satır, 'close_time' sütunu varsa ve zamanı geçmişse kapanmış, aksi halde
+        oluşan mum kabul edilir.
+
+        Args:
+            df (pd.DataFrame): BinanceClient.get_historical_klines biçiminde veri
+            now_ms (int, optional): Şimdiki zaman (milisaniye)
+
+        Returns:
+            int: Tampona eklenen veya tamamlanan kapanmış mum sayısı
+        """
+        if df is None or df.empty:
+            return 0
+        now_ms = int(time.time() * 1000) if now_ms is None else now_ms
+        if isinstance(df.index, pd.DatetimeIndex):
+            open_times = df.index.values.astype('datetime64[ms]').astype(np.int64)
+        else:
+            open_times = df.index.to_numpy()
+        values = df[['open', 'high', 'low', 'close', 'volume']].to_numpy(dtype=np.float64)
+        last_closed = 'close_time' in df.columns and int(df['close_time'].iloc[-1]) < now_ms
+
+        closed_count = 0
+        n = len(df)
+        for i in range(n):
+            closed = i < n - 1 or last_closed
+            was_closed = self.last_closed
+            status = self.update(int(open_times[i]), *values[i].tolist(), closed=closed)
+            if closed and (status == 'new' or (status == 'update' and not was_closed)):
+                closed_count += 1
+        return closed_count
+
+    def frame(self, include_forming: bool = True) -> pd.DataFrame:
+        """
+        Tamponu BinanceClient.get_historical_klines biçiminde DataFrame olarak döndür
+
+        Args:
+            include_forming (bool): Oluşmakta olan son mum dahil edilsin mi
+
+        Returns:
+            pd.DataFrame: Mum verisi (indeks açılış zamanı)
+        """
+        with self._lock:
+            order = (self._start + np.arange(self._size)) % self.capacity
+            if not include_forming and self._size and not self.last_closed:
+                order = order[:-1]
+            open_time = self.open_time[order]
+            values = self.values[order]
+        df = pd.DataFrame(values, columns=['open', 'high', 'low', 'close', 'volume'],
+                          index=pd.to_datetime(open_time, unit='ms'))
+        df.index.name = 'timestamp'
+        return df
+
+
+class KlineStream:
+    """
+    Tek bir pazar (spot/futures) için çoklu kline akışı.
+
+    Tüm sembol/aralık abonelikleri tek bir WebSocket bağlantısı üzerinden alınır ve
+    her biri için bir halka tamponu tutulur. Bağlantı koparsa üstel beklemeyle yeniden
+    bağlanılır ve aradaki mumlar REST ile geri doldurulur. Mum kapandığında
+    dinleyiciler çağrılır ve wait_for_close ile bekleyenler uyandırılır.
+    """
+
+    def __init__(self, url: str, backfill: Optional[BackfillFn] = None, buffer_size: int = DEFAULT_BUFFER_SIZE,
+                 reconnect_delay: float = RECONNECT_DELAY, max_reconnect_delay: float = MAX_RECONNECT_DELAY):
+        self.url = url
+        self.backfill = backfill
+        self.buffer_size = buffer_size
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.logger = logging.getLogger(__name__)
+
+        self.buffers: Dict[Tuple[str, str], KlineRingBuffer] = {}
+        self.connected = False
+        self.reconnects = 0
+        self._listeners: List[Callable[[str, str, KlineRingBuffer], None]] = []
+        self._close_counts: Dict[Tuple[str, str], int] = {}
+        self._condition = threading.Condition()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._loop = None
+        self._ws = None
+        self._stop = threading.Event()
+        self._request_id = 0
+
+    # --- Abonelikler ---
+
+    def subscribe(self, symbol: str, interval: str) -> KlineRingBuffer:
+        """
+        Sembol/aralık akışına abone ol (tampon REST ile doldurulur)
+
+        Args:
+            symbol (str): Sembol
+            interval (str): Zaman aralığı
+
+        Returns:
+            KlineRingBuffer: Abonelik tamponu
+        """
+        key = (symbol.upper(), interval)
+        with self._lock:
+            buffer = self.buffers.get(key)
+            if buffer is not None:
+                return buffer
+            buffer = KlineRingBuffer(self.buffer_size)
+            self.buffers[key] = buffer
+
+        self._backfill(key, buffer)
+        self._send_threadsafe('SUBSCRIBE', [stream_name(*key)])
+        self.logger.info(f"Kline akışına abone olundu: {key[0]} {key[1]}")
+        return buffer
+
+    def unsubscribe(self, symbol: str, interval: str) -> None:
+        """Aboneliği kaldır"""
+        key = (symbol.upper(), interval)
+        with self._lock:
+            if self.buffers.pop(key, None) is None:
+                return
+        self._send_threadsafe('UNSUBSCRIBE', [stream_name(*key)])
+
+    def add_listener(self, callback: Callable[[str, str, KlineRingBuffer], None]) -> None:
+        """Mum kapanışında çağrılacak fonksiyon ekle: callback(symbol, interval, buffer)"""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback) -> None:
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def frame(self, symbol: str, interval: str, include_forming: bool = True) -> pd.DataFrame:
+        """Aboneliğin mum verisini DataFrame olarak döndür"""
+        buffer = self.buffers.get((symbol.upper(), interval))
+        return buffer.frame(include_forming) if buffer is not None else pd.DataFrame()
+
+    def close_count(self, symbol: str, interval: str) -> int:
+        """Şimdiye kadar işlenen mum kapanışı sayısı"""
+        with self._condition:
+            return self._close_counts.get((symbol.upper(), interval), 0)
+
+    def wait_for_close(self, symbol: str, interval: str, after: Optional[int] = None,
+                       timeout: Optional[float] = None) -> bool:
+        """
+        Yeni bir mum kapanışını bekle
+
+        Args:
+            symbol (str): Sembol
+            interval (str): Zaman aralığı
+            after (int, optional): close_count değeri; bundan sonraki kapanış beklenir
+                (verilmezse çağrı anındaki sayı kullanılır)
+            timeout (float, optional): En fazla bekleme süresi (saniye)
+
+        Returns:
+            bool: Kapanış olduysa True, zaman aşımı veya durdurma durumunda False
+        """
+        key = (symbol.upper(), interval)
+        with self._condition:
+            if after is None:
+                after = self._close_counts.get(key, 0)
+            self._condition.wait_for(lambda: self._close_counts.get(key, 0) > after or self._stop.is_set(), timeout)
+            return self._close_counts.get(key, 0) > after
+
+    # --- Yaşam döngüsü ---
+
+    def start(self) -> 'KlineStream':
+        """Akış iş parçacığını başlat"""
+        if self._thread is not None and self._thread.is_alive():
+            return self
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._thread_main, name='kline-stream', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Akışı durdur ve bağlantıyı kapat"""
+        self._stop.set()
+        with self._condition:
+            self._condition.notify_all()
+        if self._loop is not None and self._ws is not None:
+            try:
+                asyncio.run_coroutine_threadsafe(self._ws.close(), self._loop)
+            except RuntimeError:
+                pass
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _thread_main(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._loop.run_until_complete(self._run())
+        finally:
+            self._loop.close()
+            self._loop = None
+
+    async def _run(self) -> None:
+        # Üst düzey connect tüm websockets sürümlerinde vardır (python-binance'in getirdiği sürüm dahil)
+        from websockets import connect
+
+        delay = self.reconnect_delay
+        first = True
+        while not self._stop.is_set():
+            streams = [stream_name(*key) for key in list(self.buffers)]
+            if not streams:
+                await asyncio.sleep(0.1)
+                continue
+            try:
+                async with connect(f"{self.url}?streams={'/'.join(streams)}") as ws:
+                    self._ws = ws
+                    self.connected = True
+                    delay = self.reconnect_delay
+                    if first:
+                        self.logger.info(f"Kline akışı bağlandı: {len(streams)} akış")
+                    else:
+                        self.reconnects += 1
+                        self.logger.info("Kline akışı yeniden bağlandı, boşluklar REST ile dolduruluyor")
+                        await asyncio.to_thread(self._backfill_all)
+                    first = False
+
+                    # Bağlantı kurulurken eklenen abonelikler
+                    missing = [stream_name(*key) for key in list(self.buffers) if stream_name(*key) not in streams]
+                    if missing:
+                        await self._send(ws, 'SUBSCRIBE', missing)
+
+                    async for message in ws:
+                        self._handle_message(message)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if not self._stop.is_set():
+                    self.logger.warning(f"Kline akışı bağlantısı koptu: {str(e)}")
+            finally:
+                self._ws = None
+                self.connected = False
+
+            if self._stop.is_set():
+                break
+            # Üstel bekleme (durdurma isteğine duyarlı)
+            await asyncio.to_thread(self._stop.wait, delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+            first = False
+
+    async def _send(self, ws, method: str, params: List[str]) -> None:
+        self._request_id += 1
+        await ws.send(json.dumps({'method': method, 'params': params, 'id': self._request_id}))
+
+    def _send_threadsafe(self, method: str, params: List[str]) -> None:
+        loop, ws = self._loop, self._ws
+        if loop is None or ws is None:
+            return  # Bağlanınca adres tüm abonelikleri içerir
+        try:
+            asyncio.run_coroutine_threadsafe(self._send(ws, method, params), loop)
+        except RuntimeError as e:
+            self.logger.warning(f"Abonelik mesajı gönderilemedi: {str(e)}")
+
+    # --- Mesaj işleme ---
+
+    def _handle_message(self, message) -> None:
+        try:
+            payload = json.loads(message)
+        except ValueError:
+            self.logger.warning("Geçersiz kline akışı mesajı")
+            return
+        data = payload.get('data', payload)
+        if not isinstance(data, dict) or data.get('e') != 'kline':
+            return  # Abonelik yanıtları vb.
+
+        k = data['k']
+        key = (k['s'].upper(), k['i'])
+        buffer = self.buffers.get(key)
+        if buffer is None:
+            return
+        status = buffer.update(int(k['t']), float(k['o']), float(k['h']), float(k['l']), float(k['c']),
+                               float(k['v']), bool(k['x']))
+        if status != 'stale' and k['x']:
+            self._notify_close(key, buffer)
+
+    def _notify_close(self, key: Tuple[str, str], buffer: KlineRingBuffer, count: int = 1) -> None:
+        with self._condition:
+            self._close_counts[key] = self._close_counts.get(key, 0) + count
+            self._condition.notify_all()
+        for callback in list(self._listeners):
+            try:
+                callback(key[0], key[1], buffer)
+            except Exception as e:
+                self.logger.error(f"Kline dinleyicisinde hata: {str(e)}")
+
+    # --- REST geri doldurma ---
+
+    def _backfill(self, key: Tuple[str, str], buffer: KlineRingBuffer) -> int:
+        """Tampondaki son mumdan itibaren (boşsa son buffer_size mum) REST ile doldur"""
+        if self.backfill is None:
+            return 0
+        try:
+            df = self.backfill(key[0], key[1], buffer.last_open_time, min(self.buffer_size, 1000))
+        except Exception as e:
+            self.logger.error(f"Kline geri doldurma hatası ({key[0]} {key[1]}): {str(e)}")
+            return 0
+        initial = len(buffer) == 0
+        closed = buffer.merge_frame(df)
+        if closed and not initial:
+            self.logger.info(f"{key[0]} {key[1]}: {closed} eksik mum REST ile dolduruldu")
+            self._notify_close(key, buffer, closed)
+        return closed
+
+    def _backfill_all(self) -> None:
+        for key, buffer in list(self.buffers.items()):
+            self._backfill(key, buffer)
+
+
+_streams: Dict[Tuple[str, bool], KlineStream] = {}
+_streams_lock = threading.Lock()
+
+
+def get_kline_stream(market: str = 'spot', testnet: bool = False, backfill: Optional[BackfillFn] = None) -> KlineStream:
+    """
+    Pazar başına paylaşılan (tek bağlantılı) kline akışını döndür, gerekirse başlat
+
+    Args:
+        market (str): 'spot' veya 'futures'
+        testnet (bool): Testnet akışı mı
+        backfill (callable, optional): REST geri doldurma fonksiyonu
+
+    Returns:
+        KlineStream: Çalışan akış
+    """
+    key = (market, bool(testnet))
+    with _streams_lock:
+        stream = _streams.get(key)
+        if stream is None:
+            url = os.getenv(f"KLINE_STREAM_URL_{market.upper()}", STREAM_URLS[key])
+            stream = KlineStream(url, backfill=backfill)
+            _streams[key] = stream
+        elif backfill is not None:
+            stream.backfill = backfill
+        return stream.start()
@@ -3,8 +3,10 @@ import numpy as np
 import logging
 from datetime import datetime
 import time
-from typing import Dict, List, Tuple, Any, Optional
+from typing import Callable, Dict, List, Tuple, Any, Optional
 from strategy_manager import StrategyManager
+from backtest_engine import ArrayBacktestResultMixin, MODE_LONG_ONLY, run_engine, signal_codes
+from signal_encoding import count_signals
 
 class Trade:
     """
@@ -23,7 +25,7 @@ class Trade:
         self.profit_loss_pct = profit_loss_pct
         self.status = status  # OPEN veya CLOSED
 
-class BacktestResult:
+class BacktestResult(ArrayBacktestResultMixin):
     """
     Backtest sonuçlarını saklamak için sınıf
     """
@@ -49,6 +51,8 @@ class BacktestResult:
         self.trailing_stop_pct = None
         self.trailing_profit_pct = None
         self.risk_per_trade_pct = None
+        self.exit_mode = 'close'
+        self.fill_priority = 'stop_first'
         self.signal_stats = {}
 
 class Backtester:
@@ -68,7 +72,9 @@ class Backtester:
     def run(self, df: pd.DataFrame, strategy, symbol: str, interval: str, 
             initial_balance: float = 1000.0, take_profit_pct: Optional[float] = None, 
             stop_loss_pct: Optional[float] = None, trailing_stop_pct: Optional[float] = None, 
-            trailing_profit_pct: Optional[float] = None, risk_per_trade_pct: float = 1.0) -> BacktestResult:
+            trailing_profit_pct: Optional[float] = None, risk_per_trade_pct: float = 1.0,
+            exit_mode: str = 'close', fill_priority: str = 'stop_first',
+            progress: Optional[Callable[[str, float], None]] = None) -> BacktestResult:
         """
         Backtest çalıştır.
         
@@ -83,6 +89,11 @@ class Backtester:
             trailing_stop_pct (float, optional): Takip eden zarar durdurma yüzdesi
             trailing_profit_pct (float, optional): Takip eden kar alma yüzdesi  
             risk_per_trade_pct (float): Her işlemde risk alınacak yüzde
+            exit_mode (str): TP/SL/trailing kontrolü 'close' (kapanış) veya 'high_low' (bar içi high/low)
+            fill_priority (str): 'high_low' modunda aynı barda stop ve hedef görülürse
+                'stop_first' veya 'target_first'
+            progress (callable, optional): Aşama ilerlemesi için (aşama, yüzde) ile çağrılır
+                ('signals' ve 'simulation')
             
         Returns:
             BacktestResult: Backtest sonuçları
@@ -161,7 +172,11 @@ class Backtester:
                 return result
                 
             # Stratejiden sinyalleri al
+            if progress:
+                progress('signals', 0)
             signals_df = strategy_obj.generate_signals(df)
+            if progress:
+                progress('signals', 100)
             
             if signals_df is None or signals_df.empty:
                 self.logger.error("Sinyal üretilemedi veya boş DataFrame döndü")
@@ -172,135 +187,33 @@ class Backtester:
                 self.logger.info(f"Mevcut sütunlar: {signals_df.columns.tolist()}")
                 return result
                 
-            # Sinyal dağılımı
-            signal_counts = signals_df['signal'].value_counts().to_dict()
-            self.logger.info(f"Sinyal dağılımı: {signal_counts}")
-            
-            # Sinyal istatistiklerini ekle
-            result.signal_stats = {}
-            for signal_val, count in signal_counts.items():
-                if isinstance(signal_val, (int, float)):
-                    if signal_val == 1 or signal_val == 'BUY':
-                        result.signal_stats['BUY'] = count
-                    elif signal_val == -1 or signal_val == 'SELL':
-                        result.signal_stats['SELL'] = count
-                    elif signal_val == 0 or signal_val == 'HOLD':
-                        result.signal_stats['HOLD'] = count
-                    else:
-                        result.signal_stats[f"SİNYAL_{signal_val}"] = count
-                else:
-                    result.signal_stats[str(signal_val)] = count
-            
-            # Backtest işlemi
-            balance = initial_balance
-            equity = initial_balance
-            position = None  # LONG, SHORT veya None
-            position_size = 0
-            entry_price = 0
-            entry_time = None
-            
-            trades = []  # Tüm işlemler
-            equity_curve = []  # Equity eğrisi
-            balance_history = []  # Bakiye geçmişi
-            
-            # Takip eden stop için değişkenler
-            highest_price_since_entry = 0
-            lowest_price_since_entry = float('inf')
-            
-            # Her zaman noktası için işlem kararları
-            for i in range(1, len(signals_df)):
-                # Güncel değerler
-                current_time = signals_df.index[i]
-                current_price = signals_df['close'].iloc[i]
-                current_signal = signals_df['signal'].iloc[i]
-                
-                # Equity güncelle ve kaydet
-                equity_curve.append((current_time, equity))
-                balance_history.append((current_time, balance))
-                
-                # Açık pozisyonun kar/zarar durumu
-                if position:
-                    # Long pozisyon için kar/zarar
-                    if position == "LONG":
-                        unrealized_pnl = position_size * (current_price - entry_price) / entry_price
-                        equity = balance + unrealized_pnl
-                        
-                        # Takip eden stop için en yüksek fiyatı güncelle
-                        highest_price_since_entry = max(highest_price_since_entry, current_price)
-                        
-                        # Take profit kontrolü
-                        take_profit_triggered = False
-                        if take_profit_pct is not None:
-                            take_profit_price = entry_price * (1 + take_profit_pct / 100)
-                            if current_price >= take_profit_price:
-                                take_profit_triggered = True
-                                
-                        # Stop loss kontrolü
-                        stop_loss_triggered = False
-                        if stop_loss_pct is not None:
-                            stop_loss_price = entry_price * (1 - stop_loss_pct / 100)
-                            if current_price <= stop_loss_price:
-                                stop_loss_triggered = True
-                                
-                        # Trailing stop kontrolü
-                        trailing_stop_triggered = False
-                        if trailing_stop_pct is not None:
-                            trailing_stop_price = highest_price_since_entry * (1 - trailing_stop_pct / 100)
-                            if current_price <= trailing_stop_price and current_price > entry_price:
-                                trailing_stop_triggered = True
-                                
-                        # Pozisyonu kapat (take profit, stop loss, trailing stop veya SELL sinyali ile)
-                        if take_profit_triggered or stop_loss_triggered or trailing_stop_triggered or current_signal == "SELL":
-                            # Kar/zarar hesapla
-                            profit_loss = position_size * (current_price - entry_price) / entry_price
-                            new_balance = balance + profit_loss
-                            profit_loss_pct = (current_price - entry_price) / entry_price * 100
-                            
-                            # İşlemi kaydet
-                            trade = Trade(
-                                entry_time=entry_time,
-                                entry_price=entry_price,
-                                position_size=position_size,
-                                position=position,
-                                exit_time=current_time,
-                                exit_price=current_price,
-                                profit_loss=profit_loss,
-                                profit_loss_pct=profit_loss_pct
-                            )
-                            trades.append(trade)
-                            
-                            # Bakiyeyi güncelle
-                            balance = new_balance
-                            equity = balance
-                            
-                            # Pozisyonu sıfırla
-                            position = None
-                            position_size = 0
-                            
-                            # Log
-                            self.logger.info(f"LONG pozisyon kapatıldı: {current_time}, Fiyat: {current_price}, P/L: {profit_loss:.2f} ({profit_loss_pct:.2f}%)")
-                            
-                    # Short pozisyon için kar/zarar (gelecekte eklenebilir)
-                    # ...
-                    
-                # Yeni pozisyon açma
-                if position is None:  # Açık pozisyon yoksa
-                    if current_signal == "BUY":
-                        # Risk bazlı pozisyon büyüklüğü
-                        position_size = (balance * risk_per_trade_pct / 100)
-                        entry_price = current_price
-                        entry_time = current_time
-                        position = "LONG"
-                        
-                        # Takip değişkenlerini sıfırla
-                        highest_price_since_entry = current_price
-                        lowest_price_since_entry = current_price
-                        
-                        self.logger.info(f"LONG pozisyon açıldı: {current_time}, Fiyat: {current_price}, Miktar: {position_size}")
-                        
-                    # SHORT pozisyonlar için (gelecekte eklenebilir)
-                    # elif current_signal == "SELL":
-                    #    ...
+            # Sinyaller kanonik int8 koda çevrilir (eski metin çıktısı da kabul edilir)
+            codes = signal_codes(signals_df['signal'])
+            result.signal_stats = count_signals(codes)
+            self.logger.info(f"Sinyal dağılımı: {result.signal_stats}")
+            
+            # Backtest işlemi (dizi tabanlı motor)
+            if progress:
+                progress('simulation', 0)
+            engine_result = run_engine(
+                signals_df['close'].to_numpy(dtype=np.float64),
+                codes,
+                initial_balance=initial_balance,
+                take_profit_pct=take_profit_pct,
+                stop_loss_pct=stop_loss_pct,
+                trailing_stop_pct=trailing_stop_pct,
+                risk_per_trade_pct=risk_per_trade_pct,
+                mode=MODE_LONG_ONLY,
+                exit_mode=exit_mode,
+                fill_priority=fill_priority,
+                open_=signals_df['open'].to_numpy(dtype=np.float64) if exit_mode == 'high_low' else None,
+                high=signals_df['high'].to_numpy(dtype=np.float64) if exit_mode == 'high_low' else None,
+                low=signals_df['low'].to_numpy(dtype=np.float64) if exit_mode == 'high_low' else None
+            )
+            trades = engine_result.trades
+            balance = engine_result.final_balance
+            if progress:
+                progress('simulation', 100)
             
             # Sonuçları hazırla
             self.logger.info(f"Backtest tamamlandı: {len(trades)} işlem, Son bakiye: {balance:.2f}")
@@ -311,32 +224,18 @@ class Backtester:
             result.total_profit_loss_pct = (result.total_profit_loss / initial_balance) * 100
             
             # İşlem istatistikleri
-            win_trades = [trade for trade in trades if trade.profit_loss > 0]
-            loss_trades = [trade for trade in trades if trade.profit_loss <= 0]
-            
-            result.trades = trades
-            result.winning_trades = len(win_trades)
-            result.losing_trades = len(loss_trades)
+            result.winning_trades = int(np.count_nonzero(trades['profit_loss'] > 0))
+            result.losing_trades = len(trades) - result.winning_trades
             result.total_trades = len(trades)
-            result.win_rate = (result.winning_trades / len(trades) * 100) if trades else 0
+            result.win_rate = (result.winning_trades / len(trades) * 100) if len(trades) else 0
             
-            # Equity eğrisi ve bakiye geçmişi
-            result.equity_curve = equity_curve
-            result.balance_history = balance_history
+            # Equity eğrisi, bakiye geçmişi ve işlemler (listeler erişildiğinde oluşturulur)
+            result.set_arrays(signals_df.index, engine_result.equity, engine_result.balance, trades, Trade)
             
-            # Maksimum drawdown hesapla
-            if equity_curve:
-                peak = initial_balance
-                max_drawdown = 0
-                
-                for _, value in equity_curve:
-                    if value > peak:
-                        peak = value
-                    drawdown = (peak - value) / peak * 100 if peak > 0 else 0
-                    max_drawdown = max(max_drawdown, drawdown)
-                
-                result.max_drawdown = max_drawdown
-                result.max_drawdown_pct = max_drawdown
+            # Maksimum drawdown
+            if len(engine_result.equity):
+                result.max_drawdown = engine_result.max_drawdown
+                result.max_drawdown_pct = engine_result.max_drawdown
             
             # Risk yönetimi parametreleri
             result.take_profit_pct = take_profit_pct
@@ -344,6 +243,8 @@ class Backtester:
             result.trailing_stop_pct = trailing_stop_pct
             result.trailing_profit_pct = trailing_profit_pct
             result.risk_per_trade_pct = risk_per_trade_pct
+            result.exit_mode = exit_mode
+            result.fill_priority = fill_priority
             
             return result
             
@@ -0,0 +1,19 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Numba opsiyonel bir bağımlılıktır; yoksa saf Python/NumPy yolu kullanılır
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Numba yüklü değilse fonksiyonu olduğu gibi döndüren yedek dekoratör"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+        return decorator
@@ -0,0 +1,586 @@
+import os
+import sys
+import time
+import logging
+import argparse
+import inspect
+import importlib
+import itertools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+from typing import Any, Dict, Hashable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from indicator_cache import IndicatorCache, cache_scope
+from strategy_config import StrategyConfig
+
+logger = logging.getLogger(__name__)
+
+# Tek seferde çalıştırılabilecek en fazla parametre kombinasyonu
+DEFAULT_MAX_COMBINATIONS = int(os.getenv('OPTIMIZER_MAX_COMBINATIONS', '500'))
+
+# Varsayılan süreç sayısı
+DEFAULT_WORKERS = int(os.getenv('OPTIMIZER_WORKERS', str(max(1, (os.cpu_count() or 2) - 1))))
+
+# Süreç sayısı üst sınırı (CPU sayısından fazla süreç hızlandırmaz)
+MAX_WORKERS = os.cpu_count() or 1
+
+# Sıralamada küçük değerin daha iyi olduğu metrikler
+ASCENDING_METRICS = {'max_drawdown'}
+
+RANK_METRICS = ['total_profit_loss_pct', 'final_balance', 'win_rate', 'total_trades', 'max_drawdown']
+
+
+class ParameterSpace:
+    """Strateji parametreleri için arama uzayı (config.json'daki min/max aralıkları)"""
+
+    def __init__(self, parameters: Dict[str, Dict]):
+        """
+        Arama uzayını oluştur
+
+        Args:
+            parameters (dict): Parametre adı -> {'type', 'min', 'max', 'default', 'step'?, 'values'?}
+        """
+        self.parameters = parameters
+
+    @classmethod
+    def from_config(cls, strategy_name: str, config: Optional[StrategyConfig] = None,
+                    include: Optional[List[str]] = None, overrides: Optional[Dict[str, Any]] = None) -> 'ParameterSpace':
+        """
+        Strateji yapılandırmasından arama uzayı oluştur
+
+        Args:
+            strategy_name (str): Strateji adı
+            config (StrategyConfig, optional): Yapılandırma. Defaults to config.json.
+            include (list, optional): Taranacak parametreler (diğerleri varsayılan değerde kalır)
+            overrides (dict, optional): Parametre aralığı geçersiz kılmaları;
+                değer listesi veya {'min', 'max', 'step'} sözlüğü
+
+        Returns:
+            ParameterSpace: Arama uzayı
+        """
+        config = config or StrategyConfig()
+        definition = config.get_strategy_parameters(strategy_name)
+        if not definition:
+            raise ValueError(f"Strateji yapılandırması bulunamadı: {strategy_name}")
+
+        parameters = definition['parameters']
+        overrides = overrides or {}
+        unknown = [name for name in list(include or []) + list(overrides) if name not in parameters]
+        if unknown:
+            raise ValueError(f"Bilinmeyen parametreler: {unknown}")
+
+        space = {}
+        for name, spec in parameters.items():
+            spec = dict(spec)
+            if include is not None and name not in include and name not in overrides:
+                # Taranmayan parametre varsayılan değerinde sabit kalır
+                spec['values'] = [spec.get('default')]
+            override = overrides.get(name)
+            if isinstance(override, (list, tuple)):
+                spec['values'] = list(override)
+            elif isinstance(override, dict):
+                spec.update(override)
+                spec.pop('values', None)
+            space[name] = spec
+        return cls(space)
+
+    @staticmethod
+    def _cast(spec: Dict, value):
+        return int(round(value)) if spec.get('type') == 'int' else round(float(value), 6)
+
+    def axis(self, name: str, grid_points: int = 5) -> List:
+        """
+        Bir parametrenin ızgara değerleri
+
+        Args:
+            name (str): Parametre adı
+            grid_points (int, optional): 'step' tanımlı değilse eksen başına nokta sayısı. Defaults to 5.
+
+        Returns:
+            list: Parametre değerleri
+        """
+        spec = self.parameters[name]
+        if 'values' in spec:
+            return list(spec['values'])
+        low, high = spec['min'], spec['max']
+        if spec.get('step'):
+            raw = np.arange(low, high + spec['step'] / 2, spec['step'])
+        else:
+            raw = np.linspace(low, high, max(1, grid_points))
+        values = []
+        for value in raw:
+            value = self._cast(spec, value)
+            if value not in values:
+                values.append(value)
+        return values
+
+    def grid_size(self, grid_points: int = 5) -> int:
+        """Izgaradaki toplam kombinasyon sayısı"""
+        size = 1
+        for name in self.parameters:
+            size *= len(self.axis(name, grid_points))
+        return size
+
+    def grid(self, grid_points: int = 5) -> List[Dict]:
+        """
+        Tüm ızgara kombinasyonlarını üret
+
+        Returns:
+            list: Parametre sözlükleri
+        """
+        names = list(self.parameters)
+        axes = [self.axis(name, grid_points) for name in names]
+        return [dict(zip(names, combo)) for combo in itertools.product(*axes)]
+
+    def sample(self, samples: int, seed: Optional[int] = None) -> List[Dict]:
+        """
+        Aralıklardan rastgele örnekler üret (tekrar edenler atılır)
+
+        Args:
+            samples (int): Örnek sayısı
+            seed (int, optional): Rastgelelik tohumu
+
+        Returns:
+            list: Parametre sözlükleri
+        """
+        rng = np.random.default_rng(seed)
+        results, seen = [], set()
+        for _ in range(samples * 10):
+            if len(results) >= samples:
+                break
+            params = {}
+            for name, spec in self.parameters.items():
+                if 'values' in spec:
+                    params[name] = spec['values'][rng.integers(len(spec['values']))]
+                elif spec.get('type') == 'int':
+                    params[name] = int(rng.integers(spec['min'], spec['max'] + 1))
+                else:
+                    params[name] = self._cast(spec, rng.uniform(spec['min'], spec['max']))
+            key = tuple(params.items())
+            if key not in seen:
+                seen.add(key)
+                results.append(params)
+        return results
+
+
+def create_strategy(strategy_class, params: Dict) -> Any:
+    """
+    Strateji nesnesini verilen parametrelerle oluştur
+
+    Stratejilerin parametre alma şekilleri farklı olduğu için sırasıyla `params`
+    sözlüğü, aynı isimli init argümanları ve aynı isimli (veya `_period` ekli)
+    nitelikler denenir. `params` sözlüğü alan stratejilerde parametre
+    default_params içinde tanımlı olmalıdır. Uygulanamayan bir parametre
+    sessizce atlanmaz; aksi halde farklı kombinasyonlar aynı backtest'i
+    çalıştırıp farklıymış gibi sıralanırdı.
+
+    Args:
+        strategy_class: Strateji sınıfı
+        params (dict): Parametre değerleri
+
+    Returns:
+        Strateji nesnesi
+
+    Raises:
+        ValueError: Strateji bir veya daha fazla parametreyi kullanmıyorsa
+    """
+    init_parameters = inspect.signature(strategy_class.__init__).parameters
+    kwargs = {}
+    if 'name' in init_parameters:
+        kwargs['name'] = 'Advanced' if strategy_class.__name__ == 'AdvancedStrategy' else strategy_class.__name__
+    if 'params' in init_parameters:
+        kwargs['params'] = dict(params)
+    else:
+        kwargs.update({key: value for key, value in params.items() if key in init_parameters})
+
+    strategy = strategy_class(**kwargs)
+
+    unapplied = []
+    for key, value in params.items():
+        if 'params' in kwargs:
+            defaults = getattr(strategy, 'default_params', None)
+            if isinstance(defaults, dict) and key not in defaults:
+                unapplied.append(key)
+            continue
+        if key in kwargs:
+            continue
+        for attribute in (key, f"{key}_period"):
+            if hasattr(strategy, attribute):
+                setattr(strategy, attribute, value)
+                break
+        else:
+            if isinstance(getattr(strategy, 'params', None), dict) and key in strategy.params:
+                strategy.params[key] = value
+            else:
+                unapplied.append(key)
+
+    if unapplied:
+        raise ValueError(f"{strategy_class.__name__} şu parametreleri kullanmıyor: {unapplied}")
+    return strategy
+
+
+def check_param_sets(strategy_class, param_sets: List[Dict]) -> None:
+    """
+    Parametre kombinasyonlarının stratejiye uygulanabildiğini backtest'ten önce doğrula
+
+    Args:
+        strategy_class: Strateji sınıfı
+        param_sets (list): Parametre sözlükleri
+
+    Raises:
+        ValueError: Strateji bir parametreyi kullanmıyorsa
+    """
+    seen = set()
+    for params in param_sets:
+        names = tuple(sorted(params))
+        if names not in seen:
+            seen.add(names)
+            create_strategy(strategy_class, params)
+
+
+# Çalışan süreçlerin paylaşılan veri durumu
+_worker_state: Dict[str, Any] = {}
+
+
+def precompute_indicators(df: pd.DataFrame, strategy_class, param_sets: List[Dict]) -> Dict[Hashable, object]:
+    """
+    Stratejinin parametreden bağımsız göstergelerini bir kez hesapla
+
+    İlk ve son kombinasyonun sinyalleri ayrı önbelleklerle üretilir; ikisinde de
+    aynı anahtarla (gösterge ve parametreleri) istenen göstergeler parametreden
+    bağımsız kabul edilir. Anahtar parametreleri içerdiği için yanlış sınıflanan
+    bir gösterge sadece gereksiz paylaşılır, sonucu değiştirmez.
+
+    Args:
+        df (pd.DataFrame): OHLCV verisi
+        strategy_class: Strateji sınıfı
+        param_sets (list): Denenecek parametre sözlükleri
+
+    Returns:
+        dict: Önbellek anahtarı -> Series veya Series demeti (tek kombinasyonda boş)
+    """
+    if len(param_sets) < 2:
+        return {}
+    computed = []
+    try:
+        for params in (param_sets[0], param_sets[-1]):
+            with cache_scope(IndicatorCache()) as cache:
+                create_strategy(strategy_class, params).generate_signals(df.copy())
+            computed.append(cache.snapshot())
+    except Exception as e:
+        logger.warning(f"Göstergeler önceden hesaplanamadı, çalışanlar kendisi hesaplayacak: {str(e)}")
+        return {}
+
+    def shareable(value):
+        parts = value if isinstance(value, tuple) else (value,)
+        return all(isinstance(part, pd.Series) and len(part) == len(df)
+                   and pd.api.types.is_numeric_dtype(part) for part in parts)
+
+    first, last = computed
+    return {key: value for key, value in first.items() if key in last and shareable(value)}
+
+
+def _share_frame(df: pd.DataFrame, indicators: Optional[Dict[Hashable, object]] = None):
+    """
+    DataFrame'in sayısal sütunlarını, zaman indeksini ve hazır göstergeleri tek bir paylaşılan bellek bloğuna kopyala
+
+    Returns:
+        tuple: (SharedMemory, çalışanlara gönderilecek tanım)
+    """
+    columns = [column for column in df.columns if pd.api.types.is_numeric_dtype(df[column])]
+    shared = []
+    for key, value in (indicators or {}).items():
+        parts = value if isinstance(value, tuple) else (value,)
+        shared.append({'key': key, 'tuple': isinstance(value, tuple), 'names': [part.name for part in parts]})
+    rows = len(df)
+    height = len(columns) + 1 + sum(len(entry['names']) for entry in shared)
+    shm = shared_memory.SharedMemory(create=True, size=max(1, height * rows * 8))
+    block = np.ndarray((height, rows), dtype=np.float64, buffer=shm.buf)
+
+    index = pd.DatetimeIndex(df.index)
+    # as_unit pandas 2.0 gerektirir; values her sürümde UTC datetime64 döndürür
+    block[0].view(np.int64)[:] = index.values.astype('datetime64[ns]').astype(np.int64)
+    for row, column in enumerate(columns, start=1):
+        block[row] = df[column].to_numpy(dtype=np.float64)
+    row = len(columns) + 1
+    for value in (indicators or {}).values():
+        for part in (value if isinstance(value, tuple) else (value,)):
+            block[row] = part.to_numpy(dtype=np.float64)
+            row += 1
+
+    spec = {
+        'name': shm.name,
+        'columns': columns,
+        'indicators': shared,
+        'rows': rows,
+        'tz': str(index.tz) if index.tz is not None else None,
+        'index_name': df.index.name,
+    }
+    del block
+    return shm, spec
+
+
+def _block(buffer, spec: Dict) -> np.ndarray:
+    height = len(spec['columns']) + 1 + sum(len(entry['names']) for entry in spec.get('indicators', []))
+    return np.ndarray((height, spec['rows']), dtype=np.float64, buffer=buffer)
+
+
+def _frame_from_shared(buffer, spec: Dict) -> pd.DataFrame:
+    """Paylaşılan bellek bloğu üzerinde (kopyasız) DataFrame oluştur"""
+    block = _block(buffer, spec)
+    index = pd.DatetimeIndex(block[0].view(np.int64).view('datetime64[ns]'), name=spec['index_name'])
+    if spec['tz']:
+        index = index.tz_localize('UTC').tz_convert(spec['tz'])
+    return pd.DataFrame({column: block[row] for row, column in enumerate(spec['columns'], start=1)},
+                        index=index, copy=False)
+
+
+def _indicators_from_shared(buffer, spec: Dict, index: pd.Index) -> Dict[Hashable, object]:
+    """Paylaşılan bloktaki hazır göstergeleri (kopyasız) önbellek değerlerine dönüştür"""
+    block = _block(buffer, spec)
+    row = len(spec['columns']) + 1
+    values = {}
+    for entry in spec.get('indicators', []):
+        parts = []
+        for name in entry['names']:
+            parts.append(pd.Series(block[row], index=index, name=name, copy=False))
+            row += 1
+        values[entry['key']] = tuple(parts) if entry['tuple'] else parts[0]
+    return values
+
+
+def _init_worker(spec: Dict, log_level: int) -> None:
+    """Çalışan süreç başlangıcı: paylaşılan bloğa bağlan ve veriyi bir kez hazırla"""
+    logging.basicConfig(level=log_level)
+    logging.getLogger().setLevel(log_level)
+    # Çalışanlar ana sürecin resource tracker'ını paylaşır; bloğu sadece ana süreç siler
+    shm = shared_memory.SharedMemory(name=spec['name'])
+    _worker_state['shm'] = shm
+    _worker_state['df'] = _frame_from_shared(shm.buf, spec)
+    _worker_state['indicators'] = _indicators_from_shared(shm.buf, spec, _worker_state['df'].index)
+
+
+def _load_strategy_class(strategy_ref):
+    module_name, class_name = strategy_ref
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def _evaluate(task: Dict) -> Dict:
+    """Tek parametre kombinasyonu için backtest çalıştır (çalışan süreçte)"""
+    from new_backtest import Backtester
+
+    params = task['params']
+    try:
+        df = _worker_state['df']
+        strategy = create_strategy(_load_strategy_class(task['strategy']), params)
+        # Her kombinasyon hazır göstergelerle başlayan kendi önbelleğini kullanır
+        with cache_scope(IndicatorCache(_worker_state.get('indicators'))):
+            result = Backtester().run(df, strategy, task['symbol'], task['interval'], **task['backtest'])
+        return {
+            'params': params,
+            'total_profit_loss_pct': result.total_profit_loss_pct,
+            'final_balance': result.final_balance,
+            'win_rate': result.win_rate,
+            'total_trades': result.total_trades,
+            'max_drawdown': result.max_drawdown,
+            'error': None,
+        }
+    except Exception as e:
+        return {'params': params, 'error': str(e)}
+
+
+def run_optimization(df: pd.DataFrame, strategy_class, symbol: str, interval: str,
+                     param_sets: List[Dict], backtest_params: Optional[Dict] = None,
+                     workers: int = DEFAULT_WORKERS, sort_by: str = 'total_profit_loss_pct',
+                     worker_log_level: int = logging.WARNING) -> pd.DataFrame:
+    """
+    Parametre kombinasyonlarını süreç havuzunda backtest et ve sıralı sonuç tablosu döndür
+
+    Fiyat verisi, df'deki hazır gösterge sütunları ve stratejinin parametreden
+    bağımsız göstergeleri (precompute_indicators) bir kez hesaplanıp paylaşılan
+    belleğe yazılır; çalışanlar bunları kopyalamadan kullanır.
+
+    Args:
+        df (pd.DataFrame): OHLCV (ve isteğe bağlı hazır gösterge) verisi
+        strategy_class: Strateji sınıfı (çalışanlarda modül yolundan yeniden yüklenir)
+        symbol (str): Sembol
+        interval (str): Zaman aralığı
+        param_sets (list): Denenecek parametre sözlükleri
+        backtest_params (dict, optional): Backtester.run için ek argümanlar (TP/SL, risk vb.)
+        workers (int, optional): Süreç sayısı (en fazla CPU sayısı). Defaults to CPU sayısı - 1.
+        sort_by (str, optional): Sıralama metriği. Defaults to 'total_profit_loss_pct'.
+        worker_log_level (int, optional): Çalışanlarda log seviyesi. Defaults to WARNING.
+
+    Returns:
+        pd.DataFrame: Sıralı sonuçlar (rank, parametre sütunları, metrikler, error)
+    """
+    if sort_by not in RANK_METRICS:
+        raise ValueError(f"Geçersiz sıralama metriği: {sort_by}. Geçerli değerler: {RANK_METRICS}")
+    check_param_sets(strategy_class, param_sets)
+
+    tasks = [{
+        'strategy': (strategy_class.__module__, strategy_class.__name__),
+        'params': params,
+        'symbol': symbol,
+        'interval': interval,
+        'backtest': dict(backtest_params or {}),
+    } for params in param_sets]
+
+    started = time.perf_counter()
+    indicators = precompute_indicators(df, strategy_class, param_sets)
+    if indicators:
+        logger.info(f"{len(indicators)} parametreden bağımsız gösterge paylaşılıyor")
+    shm, spec = _share_frame(df, indicators)
+    rows = []
+    try:
+        workers = max(1, min(int(workers), MAX_WORKERS, len(tasks) or 1))
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker,
+                                 initargs=(spec, worker_log_level)) as executor:
+            futures = [executor.submit(_evaluate, task) for task in tasks]
+            for future in as_completed(futures):
+                rows.append(future.result())
+    finally:
+        shm.close()
+        shm.unlink()
+
+    failed = sum(1 for row in rows if row.get('error'))
+    logger.info(f"Optimizasyon tamamlandı: {len(rows)} kombinasyon, {failed} hata, "
+                f"{time.perf_counter() - started:.1f} sn")
+    return rank_results(rows, sort_by)
+
+
+def rank_results(rows: List[Dict], sort_by: str = 'total_profit_loss_pct') -> pd.DataFrame:
+    """
+    Sonuç satırlarını metrik sırasına göre tabloya dönüştür (hatalı olanlar sonda)
+
+    Args:
+        rows (list): _evaluate çıktıları
+        sort_by (str, optional): Sıralama metriği
+
+    Returns:
+        pd.DataFrame: Sıralı sonuç tablosu
+    """
+    records = [{**row['params'], **{key: value for key, value in row.items() if key != 'params'}} for row in rows]
+    table = pd.DataFrame(records)
+    if table.empty:
+        return table
+    for metric in RANK_METRICS:
+        if metric not in table.columns:
+            table[metric] = np.nan
+    table = table.sort_values(sort_by, ascending=sort_by in ASCENDING_METRICS, na_position='last', kind='stable')
+    table = table.reset_index(drop=True)
+    table.insert(0, 'rank', np.arange(1, len(table) + 1))
+    return table
+
+
+def build_param_sets(strategy_name: str, method: str = 'grid', grid_points: int = 5, samples: int = 50,
+                     include: Optional[List[str]] = None, overrides: Optional[Dict] = None,
+                     max_combinations: int = DEFAULT_MAX_COMBINATIONS, seed: Optional[int] = None,
+                     config: Optional[StrategyConfig] = None) -> List[Dict]:
+    """
+    Yapılandırmadaki aralıklardan parametre kombinasyonlarını oluştur
+
+    Args:
+        strategy_name (str): Strateji adı
+        method (str, optional): 'grid' veya 'random'. Defaults to 'grid'.
+        grid_points (int, optional): Izgarada eksen başına nokta sayısı. Defaults to 5.
+        samples (int, optional): Rastgele aramada örnek sayısı. Defaults to 50.
+        include (list, optional): Taranacak parametreler
+        overrides (dict, optional): Parametre aralığı geçersiz kılmaları
+        max_combinations (int, optional): İzin verilen en fazla kombinasyon
+        seed (int, optional): Rastgelelik tohumu
+        config (StrategyConfig, optional): Yapılandırma
+
+    Returns:
+        list: Parametre sözlükleri
+    """
+    space = ParameterSpace.from_config(strategy_name, config, include, overrides)
+    if method == 'grid':
+        size = space.grid_size(grid_points)
+        if size > max_combinations:
+            raise ValueError(f"Izgara çok büyük: {size} kombinasyon (sınır {max_combinations}). "
+                             f"Daha az parametre seçin, grid_points'i azaltın veya 'random' yöntemini kullanın.")
+        return space.grid(grid_points)
+    if method == 'random':
+        return space.sample(min(samples, max_combinations), seed)
+    raise ValueError(f"Geçersiz yöntem: {method}. Geçerli değerler: grid, random")
+
+
+def main(argv=None) -> int:
+    """Komut satırı arayüzü"""
+    parser = argparse.ArgumentParser(description="Strateji parametre optimizasyonu (grid/random search)")
+    parser.add_argument('--symbol', default='BTCUSDT')
+    parser.add_argument('--interval', default='1h')
+    parser.add_argument('--strategy', required=True, help="Strateji adı (config.json'daki gibi)")
+    parser.add_argument('--start', required=True, help="Başlangıç tarihi (YYYY-AA-GG)")
+    parser.add_argument('--end', required=True, help="Bitiş tarihi (YYYY-AA-GG)")
+    parser.add_argument('--method', choices=['grid', 'random'], default='grid')
+    parser.add_argument('--grid-points', type=int, default=5)
+    parser.add_argument('--samples', type=int, default=50)
+    parser.add_argument('--params', nargs='*', help="Taranacak parametreler (varsayılan: hepsi)")
+    parser.add_argument('--max-combinations', type=int, default=DEFAULT_MAX_COMBINATIONS)
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS)
+    parser.add_argument('--sort-by', choices=RANK_METRICS, default='total_profit_loss_pct')
+    parser.add_argument('--initial-balance', type=float, default=1000.0)
+    parser.add_argument('--take-profit', type=float)
+    parser.add_argument('--stop-loss', type=float)
+    parser.add_argument('--trailing-stop', type=float)
+    parser.add_argument('--risk', type=float, default=1.0, help="İşlem başına bakiye yüzdesi")
+    parser.add_argument('--exit-mode', choices=['close', 'high_low'], default='close')
+    parser.add_argument('--top', type=int, default=20, help="Gösterilecek satır sayısı")
+    parser.add_argument('--output', help="Tüm sonuçların yazılacağı CSV dosyası")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    from datetime import datetime
+    from binance_api import BinanceAPI
+    from strategy_manager import StrategyManager
+
+    strategy_class = StrategyManager().get_strategy_class(args.strategy)
+    if strategy_class is None:
+        print(f"Strateji bulunamadı: {args.strategy}", file=sys.stderr)
+        return 1
+
+    try:
+        param_sets = build_param_sets(args.strategy, args.method, args.grid_points, args.samples, args.params,
+                                      max_combinations=args.max_combinations, seed=args.seed)
+        check_param_sets(strategy_class, param_sets)
+    except ValueError as e:
+        print(str(e), file=sys.stderr)
+        return 1
+
+    df = BinanceAPI().get_historical_klines(args.symbol, args.interval, datetime.strptime(args.start, '%Y-%m-%d'),
+                                            datetime.strptime(args.end, '%Y-%m-%d'))
+    if df is None or df.empty:
+        print("Veri alınamadı", file=sys.stderr)
+        return 1
+
+    backtest_params = {
+        'initial_balance': args.initial_balance,
+        'take_profit_pct': args.take_profit,
+        'stop_loss_pct': args.stop_loss,
+        'trailing_stop_pct': args.trailing_stop,
+        'risk_per_trade_pct': args.risk,
+        'exit_mode': args.exit_mode,
+    }
+    print(f"{len(param_sets)} kombinasyon, {len(df)} mum, {args.workers} süreç")
+    table = run_optimization(df, strategy_class, args.symbol, args.interval, param_sets, backtest_params,
+                             workers=args.workers, sort_by=args.sort_by)
+
+    if args.output:
+        table.to_csv(args.output, index=False)
+        print(f"Sonuçlar kaydedildi: {args.output}")
+    with pd.option_context('display.max_columns', None, 'display.width', 200):
+        print(table.head(args.top).to_string(index=False))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
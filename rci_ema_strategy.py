@@ -3,6 +3,8 @@ import numpy as np
 import logging
 from typing import Tuple, Dict, List, Optional
 
+from signal_encoding import BUY, HOLD, SELL, confidence_column, count_signals, signal_column, signal_label
+
 class RCIEMAStrategy:
     """
     RCI (Rank Correlation Index) ve EMA (Exponential Moving Average) kullanarak 
@@ -65,36 +67,10 @@ class RCIEMAStrategy:
             if signals is None or signals.empty:
                 return "HOLD", 0, {"error": "Sinyal üretilemedi"}
             
-            # Son sinyal ve güven skorunu al
+            # Son sinyal ve güven skorunu al (güven generate_signals'ta satır bazlı hesaplanır)
             last_signal = signals.iloc[-1]
-            signal = last_signal.get('signal', 'HOLD')
-            
-            # Güven skorunu hesapla
-            confidence = 0
-            
-            if signal == 'BUY':
-                # RCI ve EMA'nın gücüne göre güven skorunu belirle
-                rci_strength = min(100, max(0, (last_signal.get('rci', 0) + 100) / 2))
-                ema_diff = last_signal.get('ema_diff_pct', 0)
-                
-                if ema_diff > 0:
-                    ema_strength = min(100, ema_diff * 100)
-                else:
-                    ema_strength = 0
-                    
-                confidence = int((rci_strength * 0.6) + (ema_strength * 0.4))
-                
-            elif signal == 'SELL':
-                # RCI ve EMA'nın gücüne göre güven skorunu belirle
-                rci_strength = min(100, max(0, (100 - last_signal.get('rci', 0)) / 2))
-                ema_diff = last_signal.get('ema_diff_pct', 0)
-                
-                if ema_diff < 0:
-                    ema_strength = min(100, abs(ema_diff) * 100)
-                else:
-                    ema_strength = 0
-                    
-                confidence = int((rci_strength * 0.6) + (ema_strength * 0.4))
+            signal = signal_label(last_signal.get('signal', HOLD))
+            confidence = int(last_signal.get('confidence', 0))
             
             # Döndürülecek metrikleri hazırla
             metrics = {
@@ -131,25 +107,96 @@ class RCIEMAStrategy:
             return 0
             
         # Son 'period' kadar veriyi al
-        recent_data = series[-period:].values
+        recent_data = np.asarray(series[-period:], dtype=float)
+        return float(self._rci_windows(recent_data[np.newaxis, :])[0])
+    
+    @staticmethod
+    def _rci_windows(windows: np.ndarray) -> np.ndarray:
+        """
+        Her satırı bir pencere olan matris için RCI değerlerini hesapla
+        
+        Args:
+            windows: (pencere sayısı, periyot) boyutlu fiyat matrisi
+            
+        Returns:
+            np.ndarray: Her pencere için RCI değeri
+        """
+        period = windows.shape[1]
         
         # Zaman sıralaması (en yeni = en yüksek sıra)
-        time_ranks = np.arange(period, 0, -1)
+        time_ranks = np.arange(period, 0, -1, dtype=float)
         
-        # Fiyat sıralaması
-        price_ranks = np.zeros(period)
-        sorted_indices = np.argsort(recent_data)
+        # Fiyat sıralaması: argsort'un argsort'u her elemanın sırasını verir (eşitlikte kararlı)
+        price_ranks = windows.argsort(axis=1, kind='stable').argsort(axis=1, kind='stable') + 1
         
-        for i, idx in enumerate(sorted_indices):
-            price_ranks[idx] = i + 1
-            
         # RCI hesapla: 100 * (1 - (6 * sum(d^2)) / (n*(n^2-1)))
-        # d: iki sıralama arasındaki fark
-        d_squared_sum = np.sum((time_ranks - price_ranks) ** 2)
-        rci = 100 * (1 - (6 * d_squared_sum) / (period * (period**2 - 1)))
+        d_squared_sum = np.sum((time_ranks - price_ranks) ** 2, axis=1)
+        return 100 * (1 - (6 * d_squared_sum) / (period * (period**2 - 1)))
+    
+    def calculate_rci_series(self, series: pd.Series, period: int, block_size: int = 65536) -> np.ndarray:
+        """
+        Tüm seri için RCI hesapla (kayan pencere üzerinde vektörel)
+        
+        i. satırın değeri close[i-period+1 .. i] penceresinin RCI'sidir; ilk
+        'period' satır 0 olarak bırakılır. Bellek kullanımını sınırlamak için
+        pencereler bloklar halinde işlenir.
+        
+        Args:
+            series: Fiyat serisi
+            period: Hesaplama periyodu
+            block_size: Tek seferde işlenecek pencere sayısı
+            
+        Returns:
+            np.ndarray: RCI serisi
+        """
+        values = np.asarray(series, dtype=float)
+        rci = np.zeros(len(values))
+        if len(values) <= period:
+            return rci
         
+        windows = np.lib.stride_tricks.sliding_window_view(values, period)
+        # windows[j] satır j+period-1'de biter; ilk hesaplanan satır 'period'
+        for start in range(1, len(windows), block_size):
+            stop = min(start + block_size, len(windows))
+            rci[start + period - 1:stop + period - 1] = self._rci_windows(windows[start:stop])
         return rci
+    
+    def calculate_rci_multi(self, series: pd.Series, periods: List[int]) -> pd.DataFrame:
+        """
+        Birden fazla periyot için RCI serilerini tek çağrıda hesapla
+        
+        Args:
+            series: Fiyat serisi
+            periods: RCI periyotları
+            
+        Returns:
+            pd.DataFrame: Her periyot için 'rci_{periyot}' sütunu
+        """
+        return pd.DataFrame(
+            {f'rci_{period}': self.calculate_rci_series(series, period) for period in periods},
+            index=series.index
+        )
+        
+    def _confidence(self, signals: pd.DataFrame) -> np.ndarray:
+        """
+        Satır bazlı güven skoru (RCI gücü %60, EMA farkı gücü %40)
+        
+        Args:
+            signals: 'signal', 'rci' ve 'ema_diff_pct' sütunlu veri
+            
+        Returns:
+            np.ndarray: float32 güven skorları (HOLD satırlarında 0)
+        """
+        codes = signals['signal'].to_numpy()
+        rci = signals['rci'].to_numpy(dtype=float)
+        ema_diff = signals['ema_diff_pct'].to_numpy(dtype=float)
         
+        # BUY için RCI'nin -100'den, SELL için 100'den uzaklığı; EMA farkı sinyal yönündeyse güç katar
+        direction = np.where(codes == SELL, -1.0, 1.0)
+        rci_strength = np.clip((100 + direction * rci) / 2, 0, 100)
+        ema_strength = np.minimum(100, np.maximum(direction * ema_diff, 0) * 100)
+        return confidence_column(np.trunc(rci_strength * 0.6 + ema_strength * 0.4), codes)
+    
     def generate_signals(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         RCI ve EMA kullanarak alım-satım sinyalleri üret
@@ -180,7 +227,7 @@ class RCIEMAStrategy:
             # NaN değerleri kontrol et
             if signals['close'].isna().any():
                 self.logger.warning("'close' sütununda eksik değerler var, doldurulacak")
-                signals['close'] = signals['close'].fillna(method='ffill')  # İleri dolgu
+                signals['close'] = signals['close'].ffill()  # İleri dolgu
             
             # İstatistik bilgisini logla
             self.logger.info(f"İstatistik: {signals['close'].describe()}")
@@ -193,43 +240,33 @@ class RCIEMAStrategy:
             signals['ema_diff'] = signals['ema_fast'] - signals['ema_slow']
             signals['ema_diff_pct'] = signals['ema_diff'] / signals['close'] * 100
             
-            # RCI hesapla
-            signals['rci'] = 0
+            # RCI hesapla (tüm seri için kayan pencere üzerinde)
+            signals['rci'] = self.calculate_rci_series(signals['close'], self.rci_period)
             
-            # Her satır için RCI hesapla
-            for i in range(self.rci_period, len(signals)):
-                price_series = signals['close'].iloc[i-self.rci_period:i+1]
-                signals.loc[signals.index[i], 'rci'] = self.calculate_rci(price_series, self.rci_period)
+            # RCI ve EMA kesişimleri
+            rci = signals['rci']
+            prev_rci = rci.shift()
+            ema_diff = signals['ema_diff']
+            prev_ema_diff = ema_diff.shift()
             
-            # Sinyal sütunu oluştur - varsayılan olarak HOLD
-            signals['signal'] = 'HOLD'
+            # Alış sinyali: RCI -80'den yukarı geçiyor veya EMA farkı pozitife dönüyor
+            buy = ((prev_rci < self.rci_oversold) & (rci > self.rci_oversold)) | ((prev_ema_diff < 0) & (ema_diff > 0))
             
-            # RCI ve EMA'ya göre sinyal üret
-            for i in range(1, len(signals)):
-                # RCI değerleri
-                current_rci = signals['rci'].iloc[i]
-                prev_rci = signals['rci'].iloc[i-1]
-                
-                # EMA değerleri
-                ema_diff = signals['ema_diff'].iloc[i]
-                prev_ema_diff = signals['ema_diff'].iloc[i-1]
-                
-                # Alış sinyali: RCI -80'den yukarı geçiyor ve EMA farkı pozitife dönüyor
-                if (prev_rci < self.rci_oversold and current_rci > self.rci_oversold) or (prev_ema_diff < 0 and ema_diff > 0):
-                    signals.loc[signals.index[i], 'signal'] = 'BUY'
-                
-                # Satış sinyali: RCI 80'den aşağı geçiyor ve EMA farkı negatife dönüyor
-                elif (prev_rci > self.rci_overbought and current_rci < self.rci_overbought) or (prev_ema_diff > 0 and ema_diff < 0):
-                    signals.loc[signals.index[i], 'signal'] = 'SELL'
+            # Satış sinyali: RCI 80'den aşağı geçiyor veya EMA farkı negatife dönüyor
+            sell = ((prev_rci > self.rci_overbought) & (rci < self.rci_overbought)) | ((prev_ema_diff > 0) & (ema_diff < 0))
+            
+            # Sinyal sütunu oluştur (int8) - varsayılan olarak HOLD
+            codes = signal_column(buy, sell)
             
             # En az bir sinyal olduğundan emin ol
-            if len(signals) > 0 and not 'BUY' in signals['signal'].values and not 'SELL' in signals['signal'].values:
+            if len(codes) > 0 and not codes.any():
                 self.logger.warning("Hiç alım-satım sinyali üretilmedi, ilk satıra BUY sinyali ekleniyor")
-                signals.loc[signals.index[0], 'signal'] = 'BUY'
+                codes[0] = BUY
+            signals['signal'] = codes
+            signals['confidence'] = self._confidence(signals)
                 
             # Sinyal istatistiklerini logla
-            signal_counts = signals['signal'].value_counts().to_dict()
-            self.logger.info(f"Sinyal dağılımı: {signal_counts}")
+            self.logger.info(f"Sinyal dağılımı: {count_signals(codes)}")
             self.logger.info(f"Sinyaller oluşturuldu: {len(signals)} satır")
             
             return signals
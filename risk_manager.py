@@ -1,8 +1,9 @@
 import logging
-import json
 import os
 from typing import Dict, Optional
 
+from config_service import get_config_service
+
 class RiskManager:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
@@ -23,57 +24,49 @@ class RiskManager:
             'enable_risk_management': True
         }
         
-        # Ayarları yükle
-        self.settings = self.default_settings.copy()
+        # Ayarlar yapılandırma servisinde bellekte tutulur (dosya değişince yeniden yüklenir)
+        self._file = None
         try:
-            self.load_settings()
+            self._file = get_config_service().file(self.settings_file, default=self.default_settings.copy,
+                                                   validate=self._complete_settings)
         except Exception as e:
             self.logger.error(f"Risk ayarları yüklenirken hata: {str(e)}")
     
+    @property
+    def settings(self) -> Dict:
+        """Bellekteki risk ayarları (salt okunur, dosya okunmaz)"""
+        return self._file.data if self._file is not None else self.default_settings
+    
+    def _complete_settings(self, settings: Dict) -> Dict:
+        """Ayarları doğrula ve eksik ayarları varsayılanlarla tamamla"""
+        if not isinstance(settings, dict):
+            raise ValueError("Risk ayarları bir sözlük olmalı")
+        for key, value in self.default_settings.items():
+            if key not in settings:
+                settings[key] = value
+        return settings
+    
     def load_settings(self) -> Dict:
-        """Risk ayarlarını yükle"""
+        """Risk ayarlarını dosyadan yeniden yükle"""
         try:
-            # Data dizini yoksa oluştur
-            data_dir = os.path.dirname(self.settings_file)
-            if not os.path.exists(data_dir):
-                os.makedirs(data_dir)
-                self.logger.info(f"Data dizini oluşturuldu: {data_dir}")
-            
-            # Dosya yoksa varsayılan ayarları kullan
             if not os.path.exists(self.settings_file):
                 self.logger.info(f"Risk ayarları dosyası bulunamadı, varsayılan ayarlar kullanılıyor")
                 return self.default_settings.copy()
             
-            # Dosyayı oku
-            with open(self.settings_file, 'r') as f:
-                settings = json.load(f)
-            
-            # Eksik ayarları varsayılanlarla tamamla
-            for key, value in self.default_settings.items():
-                if key not in settings:
-                    settings[key] = value
-            
-            self.settings = settings
+            self._file.reload(force=True)
             self.logger.info(f"Risk ayarları başarıyla yüklendi")
-            return settings
+            return self.settings.copy()
         
         except Exception as e:
             self.logger.error(f"Risk ayarları yüklenirken hata: {str(e)}")
             return self.default_settings.copy()
     
     def save_settings(self, settings: Dict) -> bool:
-        """Risk ayarlarını kaydet"""
+        """Risk ayarlarını atomik olarak kaydet"""
         try:
-            # Data dizini yoksa oluştur
-            data_dir = os.path.dirname(self.settings_file)
-            if not os.path.exists(data_dir):
-                os.makedirs(data_dir)
-            
-            # Ayarları kaydet
-            with open(self.settings_file, 'w') as f:
-                json.dump(settings, f, indent=4)
+            if self._file is None or not self._file.write(dict(settings)):
+                return False
             
-            self.settings = settings
             self.logger.info(f"Risk ayarları başarıyla kaydedildi")
             return True
         
@@ -84,16 +77,20 @@ class RiskManager:
     def update_settings(self, new_settings: Dict) -> bool:
         """Risk ayarlarını güncelle"""
         try:
-            # Mevcut ayarları al
-            current_settings = self.settings.copy()
+            if self._file is None:
+                return False
             
-            # Yeni ayarları ekle/güncelle
-            for key, value in new_settings.items():
-                if key in self.default_settings:
-                    current_settings[key] = value
+            # Yeni ayarları ekle/güncelle (mevcut ayarların kopyası üzerinde, tek kilit altında)
+            def mutate(current_settings):
+                for key, value in new_settings.items():
+                    if key in self.default_settings:
+                        current_settings[key] = value
             
             # Ayarları kaydet
-            return self.save_settings(current_settings)
+            if not self._file.update(mutate):
+                return False
+            self.logger.info(f"Risk ayarları başarıyla kaydedildi")
+            return True
         
         except Exception as e:
             self.logger.error(f"Risk ayarları güncellenirken hata: {str(e)}")
@@ -0,0 +1,171 @@
+import logging
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Kanonik sinyal kodları (int8): 1 al, -1 sat, 0 bekle
+BUY = 1
+SELL = -1
+HOLD = 0
+
+SIGNAL_DTYPE = np.int8
+CONFIDENCE_DTYPE = np.float32
+
+SIGNAL_COLUMN = 'signal'
+CONFIDENCE_COLUMN = 'confidence'
+
+# Eski metin sinyalleri için karşılıklar ('WAIT' bekle anlamındadır)
+LEGACY_CODES = {'BUY': BUY, 'SELL': SELL, 'HOLD': HOLD, 'WAIT': HOLD}
+
+# Kod + 1 ile indekslenir: -1 -> SELL, 0 -> HOLD, 1 -> BUY
+_LABELS = np.array(['SELL', 'HOLD', 'BUY'], dtype=object)
+
+
+def encode_signals(values) -> np.ndarray:
+    """
+    Sinyal dizisini kanonik int8 kodlara dönüştür
+
+    Zaten int8 olan diziler kopyalanmadan döner. Tamsayı/ondalık diziler
+    işaretine göre kodlanır (NaN bekle sayılır); metin veya karışık nesne
+    dizilerinde 'BUY'/'SELL' ve 1/-1 tanınır, diğer her değer ('HOLD',
+    'WAIT', None...) bekle olur.
+
+    Args:
+        values: Sinyal serisi, dizisi veya listesi
+
+    Returns:
+        np.ndarray: int8 sinyal kodları
+    """
+    if isinstance(values, pd.Series):
+        values = values.to_numpy()
+    array = np.asarray(values)
+
+    if array.dtype == SIGNAL_DTYPE:
+        return array
+    if array.dtype.kind in 'iub':
+        return np.sign(array).astype(SIGNAL_DTYPE)
+    if array.dtype.kind == 'f':
+        return np.sign(np.nan_to_num(array)).astype(SIGNAL_DTYPE)
+
+    # Eski metin çıktısı (veya karışık nesne dizisi) için uyarlayıcı
+    codes = np.zeros(len(array), dtype=SIGNAL_DTYPE)
+    if len(array) == 0:
+        return codes
+    if array.dtype.kind in 'US':
+        codes[array == 'BUY'] = BUY
+        codes[array == 'SELL'] = SELL
+        return codes
+    codes[(array == 'BUY') | (array == BUY)] = BUY
+    codes[(array == 'SELL') | (array == SELL)] = SELL
+    return codes
+
+
+def encode_signal(value) -> int:
+    """Tek bir sinyal değerini koda dönüştür ('BUY', 1, np.int8(1) -> 1)"""
+    if isinstance(value, str):
+        return LEGACY_CODES.get(value, HOLD)
+    try:
+        if value is None or np.isnan(value):
+            return HOLD
+        return int(np.sign(value))
+    except TypeError:
+        return HOLD
+
+
+def decode_signals(codes) -> np.ndarray:
+    """
+    int8 kodları 'BUY'/'SELL'/'HOLD' metinlerine dönüştür (API ve eski istemciler için)
+
+    Args:
+        codes: Sinyal kodları (veya eski metin sinyalleri)
+
+    Returns:
+        np.ndarray: Metin sinyalleri (object)
+    """
+    return _LABELS[encode_signals(codes).astype(np.intp) + 1]
+
+
+def signal_label(value) -> str:
+    """Tek bir sinyal değerini 'BUY'/'SELL'/'HOLD' metnine dönüştür"""
+    return _LABELS[encode_signal(value) + 1]
+
+
+def signal_column(buy, sell, warmup: int = 0) -> np.ndarray:
+    """
+    Alış/satış maskelerinden int8 sinyal sütunu oluştur
+
+    Args:
+        buy: BUY koşulunun sağlandığı satırlar (bool)
+        sell: SELL koşulunun sağlandığı satırlar (bool); ikisi birden sağlanırsa BUY öncelikli
+        warmup (int, optional): Sinyal üretilmeyecek ilk satır sayısı. Defaults to 0.
+
+    Returns:
+        np.ndarray: int8 sinyal kodları
+    """
+    buy = np.asarray(buy, dtype=bool)
+    sell = np.asarray(sell, dtype=bool)
+    codes = np.zeros(len(buy), dtype=SIGNAL_DTYPE)
+    codes[sell] = SELL
+    codes[buy] = BUY
+    codes[:warmup] = HOLD
+    return codes
+
+
+def confidence_column(values, signals=None) -> np.ndarray:
+    """
+    Güven skorlarını float32 sütuna dönüştür
+
+    Args:
+        values: Güven skorları (0-100)
+        signals (optional): Verilirse bekle satırlarında güven 0 olur
+
+    Returns:
+        np.ndarray: float32 güven skorları
+    """
+    confidence = np.nan_to_num(np.asarray(values, dtype=np.float64)).astype(CONFIDENCE_DTYPE)
+    if signals is not None:
+        confidence[encode_signals(signals) == HOLD] = 0
+    return confidence
+
+
+def count_signals(codes) -> Dict[str, int]:
+    """
+    Sinyal dağılımını tek geçişte say
+
+    Args:
+        codes: Sinyal kodları (veya eski metin sinyalleri)
+
+    Returns:
+        dict: {'BUY': n, 'SELL': n, 'HOLD': n}
+    """
+    counts = np.bincount(encode_signals(codes).astype(np.intp) + 1, minlength=3)
+    return {'BUY': int(counts[2]), 'SELL': int(counts[0]), 'HOLD': int(counts[1])}
+
+
+def normalize_signals(df: Optional[pd.DataFrame]) -> Optional[pd.DataFrame]:
+    """
+    Strateji çıktısındaki sinyal (ve varsa güven) sütununu kanonik tiplere çevir
+
+    Sütunlar zaten int8/float32 ise çerçeve olduğu gibi döner; aksi halde
+    dönüştürülmüş sütunlarla sığ bir kopya döner (girdi değişmez).
+
+    Args:
+        df (pd.DataFrame): generate_signals çıktısı
+
+    Returns:
+        pd.DataFrame: int8 'signal' ve float32 'confidence' sütunlu çerçeve
+    """
+    if df is None or SIGNAL_COLUMN not in df.columns:
+        return df
+
+    updates = {}
+    if df[SIGNAL_COLUMN].dtype != SIGNAL_DTYPE:
+        updates[SIGNAL_COLUMN] = encode_signals(df[SIGNAL_COLUMN])
+    if CONFIDENCE_COLUMN in df.columns and df[CONFIDENCE_COLUMN].dtype != CONFIDENCE_DTYPE:
+        updates[CONFIDENCE_COLUMN] = confidence_column(df[CONFIDENCE_COLUMN])
+    if not updates:
+        return df
+    return df.assign(**updates)
@@ -3,6 +3,9 @@ import numpy as np
 from typing import Dict, List, Tuple
 import logging
 
+from indicator_cache import cache_for
+from signal_encoding import count_signals, signal_column
+
 class SimpleStrategy:
     """
     Basit Sinyal Stratejisi
@@ -67,8 +70,9 @@ class SimpleStrategy:
         EMA hesapla
         """
         try:
-            df['ema10'] = df['close'].ewm(span=10, adjust=False).mean()
-            df['ema20'] = df['close'].ewm(span=20, adjust=False).mean()
+            cache = cache_for(df)
+            df['ema10'] = cache.ema(df, 10)
+            df['ema20'] = cache.ema(df, 20)
             return df
         except Exception as e:
             self.logger.error(f"EMA hesaplanırken hata: {str(e)}")
@@ -93,29 +97,23 @@ class SimpleStrategy:
             # EMA hesapla
             signals_df = self.calculate_ema(signals_df)
             
-            # Sinyal sütununu ekle
-            signals_df['signal'] = 'HOLD'
-            
-            # Basit sinyal mantığı
-            for i in range(1, len(signals_df)):
-                current_price = signals_df['close'].iloc[i]
-                current_ema10 = signals_df['ema10'].iloc[i]
-                current_ema20 = signals_df['ema20'].iloc[i]
-                
-                prev_ema10 = signals_df['ema10'].iloc[i-1]
-                prev_ema20 = signals_df['ema20'].iloc[i-1]
-                
-                # Alım sinyali: EMA10 EMA20'yi yukarı doğru kesiyor ve fiyat EMA10'un üzerinde
-                if prev_ema10 <= prev_ema20 and current_ema10 > current_ema20 and current_price > current_ema10:
-                    signals_df.loc[signals_df.index[i], 'signal'] = 'BUY'
-                
-                # Satış sinyali: EMA10 EMA20'yi aşağı doğru kesiyor ve fiyat EMA10'un altında
-                elif prev_ema10 >= prev_ema20 and current_ema10 < current_ema20 and current_price < current_ema10:
-                    signals_df.loc[signals_df.index[i], 'signal'] = 'SELL'
+            # Basit sinyal mantığı (tüm satırlar için vektörel)
+            close = signals_df['close']
+            ema10 = signals_df['ema10']
+            ema20 = signals_df['ema20']
+            prev_ema10 = ema10.shift()
+            prev_ema20 = ema20.shift()
+            
+            # Alım sinyali: EMA10 EMA20'yi yukarı doğru kesiyor ve fiyat EMA10'un üzerinde
+            buy = (prev_ema10 <= prev_ema20) & (ema10 > ema20) & (close > ema10)
+            
+            # Satış sinyali: EMA10 EMA20'yi aşağı doğru kesiyor ve fiyat EMA10'un altında
+            sell = (prev_ema10 >= prev_ema20) & (ema10 < ema20) & (close < ema10)
+            
+            signals_df['signal'] = signal_column(buy, sell)
             
             # Sinyal istatistiklerini logla
-            signal_counts = signals_df['signal'].value_counts()
-            self.logger.info(f"Sinyal dağılımı: {signal_counts.to_dict()}")
+            self.logger.info(f"Sinyal dağılımı: {count_signals(signals_df['signal'])}")
             
             return signals_df
             
@@ -3,6 +3,9 @@ import numpy as np
 from typing import Dict, List, Tuple
 import logging
 
+from indicator_cache import cache_for, get_request_cache
+from signal_encoding import SIGNAL_DTYPE, confidence_column, count_signals, signal_column
+
 # Strateji yöneticisini import et
 from strategy_manager import StrategyManager
 
@@ -22,6 +25,27 @@ class Strategy:
         """
         pass
 
+    def _signals_from_masks(self, df: pd.DataFrame, buy: pd.Series, sell: pd.Series, warmup: int = 30,
+                            confidence=None) -> pd.DataFrame:
+        """
+        Alış/satış maskelerinden int8 sinyal sütunu oluştur
+
+        Args:
+            df (pd.DataFrame): Fiyat verileri
+            buy (pd.Series): BUY koşulunun sağlandığı satırlar
+            sell (pd.Series): SELL koşulunun sağlandığı satırlar
+            warmup (int, optional): Sinyal üretilmeyecek ilk mum sayısı. Defaults to 30.
+            confidence (optional): Satır bazlı güven skorları; verilirse float32 'confidence' sütunu eklenir
+
+        Returns:
+            pd.DataFrame: Sinyal (ve güven) sütunu eklenmiş veri
+        """
+        result_df = df.copy()
+        result_df['signal'] = signal_column(buy.to_numpy(dtype=bool), sell.to_numpy(dtype=bool), warmup)
+        if confidence is not None:
+            result_df['confidence'] = confidence_column(confidence, result_df['signal'])
+        return result_df
+
 class MACDEMAStrategy(Strategy):
     def __init__(self):
         super().__init__("MACD_EMA")
@@ -105,43 +129,37 @@ class MACDEMAStrategy(Strategy):
     
     def calculate_macd(self, df: pd.DataFrame) -> pd.DataFrame:
         """MACD hesapla"""
-        exp1 = df['close'].ewm(span=self.macd_fast, adjust=False).mean()
-        exp2 = df['close'].ewm(span=self.macd_slow, adjust=False).mean()
-        df['macd'] = exp1 - exp2
-        df['macd_signal'] = df['macd'].ewm(span=self.macd_signal, adjust=False).mean()
-        df['macd_hist'] = df['macd'] - df['macd_signal']
+        df['macd'], df['macd_signal'], df['macd_hist'] = cache_for(df).macd(
+            df, self.macd_fast, self.macd_slow, self.macd_signal)
         return df
     
     def calculate_ema(self, df: pd.DataFrame) -> pd.DataFrame:
         """EMA hesapla"""
-        df['ema50'] = df['close'].ewm(span=50, adjust=False).mean()
-        df['ema200'] = df['close'].ewm(span=self.ema_period, adjust=False).mean()
+        cache = cache_for(df)
+        df['ema50'] = cache.ema(df, 50)
+        df['ema200'] = cache.ema(df, self.ema_period)
         return df
     
     def calculate_rsi(self, df: pd.DataFrame) -> pd.DataFrame:
         """RSI hesapla"""
-        delta = df['close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=self.rsi_period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=self.rsi_period).mean()
-        
-        rs = gain / loss
-        df['rsi'] = 100 - (100 / (1 + rs))
+        df['rsi'] = cache_for(df).rsi(df, self.rsi_period)
         return df
     
     def calculate_atr(self, df: pd.DataFrame, period=14) -> pd.DataFrame:
         """ATR hesapla"""
+        cache = cache_for(df)
         df = df.copy()
-        df['tr0'] = abs(df['high'] - df['low'])
-        df['tr1'] = abs(df['high'] - df['close'].shift())
-        df['tr2'] = abs(df['low'] - df['close'].shift())
-        df['tr'] = df[['tr0', 'tr1', 'tr2']].max(axis=1)
-        df['atr'] = df['tr'].rolling(window=period).mean()
+        df['tr'] = cache.true_range(df)
+        df['atr'] = cache.atr(df, period)
         return df
         
     def generate_signals(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Tüm veri için sinyal üret
         
+        Göstergeler tüm seri üzerinde bir kez hesaplanır; her satırın sinyali
+        analyze() metodunun o satıra kadarki veriyle ürettiği sinyalle aynıdır.
+        
         Args:
             df (pd.DataFrame): Fiyat verileri
             
@@ -151,39 +169,36 @@ class MACDEMAStrategy(Strategy):
         self.logger.info(f"MACD_EMA stratejisi sinyaller üretiliyor: {len(df)} satır")
         
         try:
-            # Veri kopyası oluştur
-            result_df = df.copy()
-            
-            # Sinyal sütunu oluştur
-            result_df['signal'] = 'HOLD'
-            
-            # Tüm mumlar için analiz yap
-            for i in range(len(result_df)):
-                try:
-                    if i < 30:  # İlk 30 mum için yeterli veri yok
-                        result_df.iloc[i, result_df.columns.get_loc('signal')] = 'HOLD'
-                        continue
-                        
-                    # Her mum için veri dilimi oluştur
-                    temp_df = df.iloc[:i+1].copy()
-                    
-                    # Analiz et
-                    signal, _, _ = self.analyze(temp_df)
-                    
-                    # Sinyali kaydet
-                    result_df.iloc[i, result_df.columns.get_loc('signal')] = signal
-                except Exception as e:
-                    self.logger.error(f"Satır {i} için sinyal üretilirken hata: {str(e)}")
-                    result_df.iloc[i, result_df.columns.get_loc('signal')] = 'HOLD'
+            # Göstergeleri tüm seri için hesapla
+            data = self.calculate_macd(df.copy())
+            data = self.calculate_ema(data)
+            data = self.calculate_rsi(data)
+            data = self.calculate_atr(data)
             
-            return result_df
+            macd_line = data['macd']
+            signal_line = data['macd_signal']
+            
+            # Trend ve MACD kesişimleri
+            bullish = data['close'] > data['ema200']
+            macd_cross_up = (macd_line.shift() < signal_line.shift()) & (macd_line > signal_line)
+            macd_cross_down = (macd_line.shift() > signal_line.shift()) & (macd_line < signal_line)
+            
+            buy = bullish & macd_cross_up & (data['rsi'] > self.rsi_oversold)
+            sell = ~bullish & macd_cross_down & (data['rsi'] < self.rsi_overbought)
+            
+            # Güven skoru (analyze() ile aynı formül)
+            hist_strength = (data['macd_hist'] / data['atr'] * 50).abs()
+            confidence = np.minimum(100, 50 + np.where(buy, data['rsi'] - self.rsi_oversold,
+                                                       self.rsi_overbought - data['rsi']) + hist_strength)
+            
+            return self._signals_from_masks(df, buy, sell, confidence=confidence)
             
         except Exception as e:
             self.logger.error(f"MACD_EMA sinyaller üretilirken hata: {str(e)}")
             # Hata durumunda orijinal veriyi döndür
             if 'signal' not in df.columns:
                 df = df.copy()
-                df['signal'] = 'HOLD'
+                df['signal'] = np.zeros(len(df), dtype=SIGNAL_DTYPE)
             return df
 
 class VolatilityStrategy(Strategy):
@@ -260,30 +275,18 @@ class VolatilityStrategy(Strategy):
     
     def calculate_bollinger_bands(self, df: pd.DataFrame) -> pd.DataFrame:
         """Bollinger Bands hesapla"""
-        df['middle_band'] = df['close'].rolling(window=self.bb_period).mean()
-        df['std'] = df['close'].rolling(window=self.bb_period).std()
-        df['upper_band'] = df['middle_band'] + (df['std'] * self.bb_std)
-        df['lower_band'] = df['middle_band'] - (df['std'] * self.bb_std)
+        df['middle_band'], df['std'], df['upper_band'], df['lower_band'] = cache_for(df).bollinger(
+            df, self.bb_period, self.bb_std)
         return df
     
     def calculate_rsi(self, df: pd.DataFrame) -> pd.DataFrame:
         """RSI hesapla"""
-        delta = df['close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=self.rsi_period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=self.rsi_period).mean()
-        
-        rs = gain / loss
-        df['rsi'] = 100 - (100 / (1 + rs))
+        df['rsi'] = cache_for(df).rsi(df, self.rsi_period)
         return df
     
     def calculate_volatility(self, df: pd.DataFrame) -> pd.DataFrame:
         """Volatilite hesapla (True Range'in yüzdesi olarak)"""
-        high_low = df['high'] - df['low']
-        high_close = abs(df['high'] - df['close'].shift())
-        low_close = abs(df['low'] - df['close'].shift())
-        
-        ranges = pd.concat([high_low, high_close, low_close], axis=1)
-        true_range = ranges.max(axis=1)
+        true_range = cache_for(df).true_range(df)
         
         df['volatility'] = (true_range / df['close']) * 100
         df['avg_volatility'] = df['volatility'].rolling(window=24).mean()
@@ -298,6 +301,9 @@ class VolatilityStrategy(Strategy):
         """
         Tüm veri için sinyal üret
         
+        Göstergeler tüm seri üzerinde bir kez hesaplanır; her satırın sinyali
+        analyze() metodunun o satıra kadarki veriyle ürettiği sinyalle aynıdır.
+        
         Args:
             df (pd.DataFrame): Fiyat verileri
             
@@ -307,34 +313,28 @@ class VolatilityStrategy(Strategy):
         self.logger.info(f"Volatility stratejisi sinyaller üretiliyor: {len(df)} satır")
         
         try:
-            # Veri kopyası oluştur
-            result_df = df.copy()
-            
-            # Sinyal sütunu oluştur
-            result_df['signal'] = 'HOLD'
-            
-            # Tüm mumlar için analiz yap
-            for i in range(len(result_df)):
-                try:
-                    if i < 30:  # İlk 30 mum için yeterli veri yok
-                        result_df.iloc[i, result_df.columns.get_loc('signal')] = 'HOLD'
-                        continue
-                        
-                    # Her mum için veri dilimi oluştur
-                    temp_df = df.iloc[:i+1].copy()
-                    
-                    # Analiz et
-                    signal, _, _ = self.analyze(temp_df)
-                    
-                    # Sinyali kaydet
-                    result_df.iloc[i, result_df.columns.get_loc('signal')] = signal
-                except Exception as e:
-                    self.logger.error(f"Satır {i} için sinyal üretilirken hata: {str(e)}")
-                    result_df.iloc[i, result_df.columns.get_loc('signal')] = 'HOLD'
+            # Göstergeleri tüm seri için hesapla
+            data = self.calculate_bollinger_bands(df.copy())
+            data = self.calculate_rsi(data)
+            data = self.calculate_volatility(data)
+            data = self.calculate_volume_average(data)
+            
+            # Volatilite ve hacim kontrolü
+            high_volatility = data['volatility'] > (data['avg_volatility'] * self.min_volatility)
+            high_volume = data['volume'] > data['avg_volume']
+            
+            buy = (data['close'] < data['lower_band']) & (data['rsi'] < self.rsi_oversold) & high_volatility & high_volume
+            sell = (data['close'] > data['upper_band']) & (data['rsi'] > self.rsi_overbought) & high_volatility & high_volume
+            
+            # Güven skoru (analyze() ile aynı formül)
+            volatility_ratio = data['volatility'] / data['avg_volatility'] * 20
+            confidence = np.minimum(100, 50 + np.where(buy, self.rsi_oversold - data['rsi'],
+                                                       data['rsi'] - self.rsi_overbought) + volatility_ratio)
+            
+            result_df = self._signals_from_masks(df, buy, sell, confidence=confidence)
             
             # Sinyal dağılımını logla
-            signal_counts = result_df['signal'].value_counts()
-            self.logger.info(f"Sinyal dağılımı: {signal_counts.to_dict()}")
+            self.logger.info(f"Sinyal dağılımı: {count_signals(result_df['signal'])}")
             
             return result_df
             
@@ -345,7 +345,7 @@ class VolatilityStrategy(Strategy):
             # Hata durumunda orijinal veriyi döndür
             if 'signal' not in df.columns:
                 df = df.copy()
-                df['signal'] = 'HOLD'
+                df['signal'] = np.zeros(len(df), dtype=SIGNAL_DTYPE)
             return df
 
 class TrendFollowStrategy(Strategy):
@@ -423,20 +423,16 @@ class TrendFollowStrategy(Strategy):
     
     def calculate_ema(self, df: pd.DataFrame) -> pd.DataFrame:
         """EMA hesapla"""
-        df['short_ema'] = df['close'].ewm(span=self.short_ema, adjust=False).mean()
-        df['medium_ema'] = df['close'].ewm(span=self.medium_ema, adjust=False).mean()
-        df['long_ema'] = df['close'].ewm(span=self.long_ema, adjust=False).mean()
+        cache = cache_for(df)
+        df['short_ema'] = cache.ema(df, self.short_ema)
+        df['medium_ema'] = cache.ema(df, self.medium_ema)
+        df['long_ema'] = cache.ema(df, self.long_ema)
         return df
     
     def calculate_adx(self, df: pd.DataFrame) -> pd.DataFrame:
         """ADX hesapla"""
-        # True Range hesapla
-        high_low = df['high'] - df['low']
-        high_close = abs(df['high'] - df['close'].shift())
-        low_close = abs(df['low'] - df['close'].shift())
-        
-        ranges = pd.concat([high_low, high_close, low_close], axis=1)
-        true_range = ranges.max(axis=1)
+        # True Range (önbellekten)
+        true_range = cache_for(df).true_range(df)
         
         # Directional Movement hesapla
         plus_dm = df['high'].diff()
@@ -471,6 +467,9 @@ class TrendFollowStrategy(Strategy):
         """
         Tüm veri için sinyal üret
         
+        Göstergeler tüm seri üzerinde bir kez hesaplanır; her satırın sinyali
+        analyze() metodunun o satıra kadarki veriyle ürettiği sinyalle aynıdır.
+        
         Args:
             df (pd.DataFrame): Fiyat verileri
             
@@ -480,34 +479,32 @@ class TrendFollowStrategy(Strategy):
         self.logger.info(f"TrendFollow stratejisi sinyaller üretiliyor: {len(df)} satır")
         
         try:
-            # Veri kopyası oluştur
-            result_df = df.copy()
-            
-            # Sinyal sütunu oluştur
-            result_df['signal'] = 'HOLD'
-            
-            # Tüm mumlar için analiz yap
-            for i in range(len(result_df)):
-                try:
-                    if i < 30:  # İlk 30 mum için yeterli veri yok
-                        result_df.iloc[i, result_df.columns.get_loc('signal')] = 'HOLD'
-                        continue
-                        
-                    # Her mum için veri dilimi oluştur
-                    temp_df = df.iloc[:i+1].copy()
-                    
-                    # Analiz et
-                    signal, _, _ = self.analyze(temp_df)
-                    
-                    # Sinyali kaydet
-                    result_df.iloc[i, result_df.columns.get_loc('signal')] = signal
-                except Exception as e:
-                    self.logger.error(f"Satır {i} için sinyal üretilirken hata: {str(e)}")
-                    result_df.iloc[i, result_df.columns.get_loc('signal')] = 'HOLD'
+            # Göstergeleri tüm seri için hesapla
+            data = self.calculate_ema(df.copy())
+            data = self.calculate_adx(data)
+            data = self.calculate_volume_change(data)
+            
+            # Son 3 mumun rengi
+            green_candles = (data['close'] > data['open']).astype(int).rolling(window=3).sum()
+            red_candles = 3 - green_candles
+            
+            # Trend kontrolü
+            strong_uptrend = (data['short_ema'] > data['medium_ema']) & (data['medium_ema'] > data['long_ema'])
+            strong_downtrend = (data['short_ema'] < data['medium_ema']) & (data['medium_ema'] < data['long_ema'])
+            strong_trend = data['adx'] > self.min_trend_strength
+            increasing_volume = data['volume_change'] > 0
+            
+            buy = strong_uptrend & strong_trend & (green_candles >= 2) & increasing_volume
+            sell = strong_downtrend & strong_trend & (red_candles >= 2) & increasing_volume
+            
+            # Güven skoru (analyze() ile aynı formül)
+            candles = np.where(buy, green_candles, red_candles)
+            confidence = np.minimum(100, 50 + (data['adx'] - self.min_trend_strength) / 2 + candles * 10)
+            
+            result_df = self._signals_from_masks(df, buy, sell, confidence=confidence)
             
             # Sinyal dağılımını logla
-            signal_counts = result_df['signal'].value_counts()
-            self.logger.info(f"Sinyal dağılımı: {signal_counts.to_dict()}")
+            self.logger.info(f"Sinyal dağılımı: {count_signals(result_df['signal'])}")
             
             return result_df
             
@@ -518,7 +515,7 @@ class TrendFollowStrategy(Strategy):
             # Hata durumunda orijinal veriyi döndür
             if 'signal' not in df.columns:
                 df = df.copy()
-                df['signal'] = 'HOLD'
+                df['signal'] = np.zeros(len(df), dtype=SIGNAL_DTYPE)
             return df
 
 class StrategyManager:
@@ -558,10 +555,14 @@ class StrategyManager:
         """
         return list(self.strategies.keys())
         
-    def analyze_all(self, df):
+    def analyze_all(self, df, symbol=None, interval=None):
         """
         Tüm stratejileri çalıştır ve sonuçları döndür
+        
+        Göstergeler veriye bağlı ortak önbellekten alınır; sembol ve aralık
+        verilirse önbellek aynı son mum için istekler arasında da paylaşılır.
         """
+        get_request_cache(df, symbol, interval)
         results = []
         for name, strategy_class in self.strategies.items():
             try:
@@ -2,6 +2,8 @@ from .base_strategy import BaseStrategy
 import pandas as pd
 import numpy as np
 
+from signal_encoding import BUY, HOLD, SELL, SIGNAL_DTYPE
+
 class AlwaysSignalStrategy(BaseStrategy):
     """
     Her zaman sinyal üreten basit bir strateji.
@@ -33,20 +35,18 @@ class AlwaysSignalStrategy(BaseStrategy):
         # Kopya oluştur
         signals = df.copy()
         
-        # Sinyal kolonları oluştur
-        signals['signal'] = 0
-        signals['position'] = 0
-        
-        # Sinyal tipine göre değerleri ata
+        # Sinyal tipine göre int8 kodları ata
+        codes = np.full(len(signals), HOLD, dtype=SIGNAL_DTYPE)
         if self.signal_type == 'buy':
-            signals['signal'] = 1
+            codes[:] = BUY
         elif self.signal_type == 'sell':
-            signals['signal'] = -1
+            codes[:] = SELL
         elif self.signal_type == 'random':
-            signals['signal'] = np.random.choice([1, -1], size=len(signals))
+            codes = np.random.choice(np.array([BUY, SELL], dtype=SIGNAL_DTYPE), size=len(signals))
+        signals['signal'] = codes
         
-        # Pozisyon hesapla
-        signals['position'] = signals['signal'].cumsum()
+        # Pozisyon hesapla (int8 taşmasın diye int64 üzerinde)
+        signals['position'] = np.cumsum(codes, dtype=np.int64)
         
         return signals
     
@@ -2,6 +2,8 @@ import pandas as pd
 import numpy as np
 from abc import ABC, abstractmethod
 
+from signal_encoding import count_signals, signal_label
+
 class BaseStrategy(ABC):
     """
     Temel strateji sınıfı - tüm stratejilerin miras alması gereken sınıf
@@ -50,7 +52,7 @@ class BaseStrategy(ABC):
         signals_df = self.generate_signals(df)
         
         # Son sinyal
-        last_signal = signals_df['signal'].iloc[-1] if 'signal' in signals_df.columns else None
+        last_signal = signal_label(signals_df['signal'].iloc[-1]) if 'signal' in signals_df.columns else None
         
         # Güven skorunu hesapla (basit bir örnek)
         confidence = 80.0  # Varsayılan güven skoru
@@ -59,7 +61,7 @@ class BaseStrategy(ABC):
         metrics = {
             'last_close': df['close'].iloc[-1],
             'last_volume': df['volume'].iloc[-1],
-            'signal_count': signals_df['signal'].value_counts().to_dict() if 'signal' in signals_df.columns else {}
+            'signal_count': count_signals(signals_df['signal']) if 'signal' in signals_df.columns else {}
         }
         
         return last_signal, confidence, metrics
@@ -4,11 +4,38 @@ import logging
 from typing import Dict, Any, List, Optional
 import copy
 
+from config_service import get_config_service
+
 logger = logging.getLogger(__name__)
 
+
+def validate_config(config: Dict) -> Dict:
+    """
+    Strateji yapılandırmasının yapısını doğrula
+
+    Args:
+        config: Yapılandırma
+
+    Returns:
+        Dict: Aynı yapılandırma
+
+    Raises:
+        ValueError: 'strategies' sözlüğü veya strateji/parametre tanımları geçersizse
+    """
+    if not isinstance(config, dict) or not isinstance(config.get('strategies'), dict):
+        raise ValueError("Yapılandırmada 'strategies' sözlüğü yok")
+    for name, strategy in config['strategies'].items():
+        if not isinstance(strategy, dict) or not isinstance(strategy.get('parameters', {}), dict):
+            raise ValueError(f"Geçersiz strateji tanımı: {name}")
+    return config
+
 class StrategyConfig:
     """
     Strateji yapılandırma sınıfı
+
+    Ayarlar yapılandırma servisinde bellekte tutulur; aynı dosyayı kullanan
+    tüm nesneler aynı kopyayı paylaşır, okumalar dosyaya dokunmaz ve yazmalar
+    atomiktir. Dosya dışarıdan değiştirilirse servis yeniden yükler.
     """
     
     def __init__(self, config_file='config.json'):
@@ -19,7 +46,7 @@ class StrategyConfig:
             config_file (str): Yapılandırma dosyası yolu
         """
         self.config_file = config_file
-        self.config = None
+        self._file = None
         self.logger = logging.getLogger('strategy_config')
         
         # Yapılandırmayı yükle veya oluştur
@@ -29,25 +56,27 @@ class StrategyConfig:
         """
         Yapılandırma dosyasını yükle veya oluştur
         
+        Dosya yoksa varsayılan yapılandırma ile oluşturulur; okunamazsa
+        varsayılan yapılandırma bellekte kullanılır.
+        
         Returns:
             None
         """
-        try:
-            if os.path.exists(self.config_file):
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    self.config = json.load(f)
-            else:
-                # Varsayılan yapılandırma
-                default_config = self._create_default_config()
-                self._save_config(default_config)
-                self.config = default_config
-        except Exception as e:
-            self.logger.error(f"Yapılandırma yüklenirken hata: {str(e)}")
-            self.config = self._create_default_config()
+        self._file = get_config_service().file(self.config_file, default=self._create_default_config,
+                                               validate=validate_config, create=True)
+    
+    @property
+    def config(self) -> Dict:
+        """Bellekteki yapılandırma (salt okunur; değişiklikler _update ile yapılır)"""
+        return self._file.data
+    
+    @config.setter
+    def config(self, config: Dict) -> None:
+        self._save_config(config)
     
     def _save_config(self, config: Dict) -> bool:
         """
-        Yapılandırmayı dosyaya kaydet
+        Yapılandırmayı dosyaya atomik olarak kaydet
         
         Args:
             config: Kaydedilecek yapılandırma
@@ -55,13 +84,19 @@ class StrategyConfig:
         Returns:
             bool: Başarılı ise True, değilse False
         """
-        try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(config, f, indent=4, ensure_ascii=False)
-            return True
-        except Exception as e:
-            self.logger.error(f"Yapılandırma kaydedilirken hata: {str(e)}")
-            return False
+        return self._file.write(config)
+    
+    def _update(self, mutate) -> bool:
+        """
+        Yapılandırmanın kopyasını değiştirip kaydet
+        
+        Args:
+            mutate: Kopyayı yerinde değiştiren fonksiyon
+            
+        Returns:
+            bool: Başarılı ise True, değilse False
+        """
+        return self._file.update(mutate)
     
     def _create_default_config(self) -> Dict:
         """
@@ -432,13 +467,11 @@ class StrategyConfig:
                 self.logger.warning(f"Parameter {parameter_name} not found for strategy {strategy_name}")
                 return False
             
-            # Update the parameter
-            self.config['strategies'][strategy_name]['parameters'][parameter_name]['default'] = value
+            # Update the parameter and save the configuration
+            def mutate(config):
+                config['strategies'][strategy_name]['parameters'][parameter_name]['default'] = value
             
-            # Save the configuration
-            self._save_config(self.config)
-            
-            return True
+            return self._update(mutate)
         
         except Exception as e:
             self.logger.error(f"Error updating parameter {parameter_name} for strategy {strategy_name}: {e}")
@@ -476,17 +509,13 @@ class StrategyConfig:
             
             # Reset to default values
             if 'parameters' in default_config['strategies'][strategy_name]:
-                if 'parameters' not in self.config['strategies'][strategy_name]:
-                    self.config['strategies'][strategy_name]['parameters'] = {}
+                default_parameters = default_config['strategies'][strategy_name]['parameters']
                 
-                self.config['strategies'][strategy_name]['parameters'] = copy.deepcopy(
-                    default_config['strategies'][strategy_name]['parameters']
-                )
+                def mutate(config):
+                    config['strategies'][strategy_name]['parameters'] = copy.deepcopy(default_parameters)
                 
                 # Save the configuration
-                self._save_config(self.config)
-                
-                return True
+                return self._update(mutate)
             else:
                 self.logger.warning(f"No parameters found in default configuration for strategy {strategy_name}")
                 return False
@@ -545,11 +574,12 @@ class StrategyConfig:
         """
         try:
             if strategy_name not in self.config["strategies"]:
-                self.config["strategies"][strategy_name] = {
-                    "description": description,
-                    "parameters": parameters
-                }
-                return self._save_config(self.config)
+                def mutate(config):
+                    config["strategies"][strategy_name] = {
+                        "description": description,
+                        "parameters": parameters
+                    }
+                return self._update(mutate)
             else:
                 logger.warning(f"Strateji zaten mevcut: {strategy_name}")
                 return False
@@ -569,8 +599,9 @@ class StrategyConfig:
         """
         try:
             if strategy_name in self.config["strategies"]:
-                del self.config["strategies"][strategy_name]
-                return self._save_config(self.config)
+                def mutate(config):
+                    del config["strategies"][strategy_name]
+                return self._update(mutate)
             else:
                 logger.warning(f"Strateji bulunamadı: {strategy_name}")
                 return False
@@ -593,18 +624,19 @@ class StrategyConfig:
             # Strateji adını düzelt (boşlukları alt çizgi ile değiştir)
             strategy_key = strategy_name.replace(' ', '_')
             
-            # Eğer strateji yoksa, yeni bir giriş oluştur
-            if strategy_key not in self.config['strategies']:
-                self.config['strategies'][strategy_key] = {
-                    "description": f"{strategy_name} stratejisi",
-                    "parameters": {}
-                }
-            
-            # Parametreleri güncelle
-            self.config['strategies'][strategy_key]['parameters'] = parameters
+            def mutate(config):
+                # Eğer strateji yoksa, yeni bir giriş oluştur
+                if strategy_key not in config['strategies']:
+                    config['strategies'][strategy_key] = {
+                        "description": f"{strategy_name} stratejisi",
+                        "parameters": {}
+                    }
+                
+                # Parametreleri güncelle
+                config['strategies'][strategy_key]['parameters'] = parameters
             
             # Yapılandırmayı kaydet
-            return self._save_config(self.config)
+            return self._update(mutate)
             
         except Exception as e:
             logger.error(f"Strateji parametreleri ayarlanırken hata: {str(e)}")
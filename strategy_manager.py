@@ -1,82 +1,193 @@
+import ast
 import logging
 import os
 import importlib
-import inspect
-from typing import Dict, List, Any, Optional
+import threading
+import time
+from collections.abc import Mapping
+from typing import Dict, List, Any, Optional, Tuple
+from config_service import get_config_service
 from strategy_config import StrategyConfig
+from strategy_pool import get_strategy_pool
 
 logger = logging.getLogger(__name__)
 
-class StrategyManager:
+# Proje kök dizini (strateji dosyaları çalışma dizininden bağımsız olarak buna göre aranır)
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Ana dizindeki strateji dosyaları (strategies dizinindekilerden sonra taranır)
+MAIN_DIR_STRATEGY_FILES = [
+    "always_signal_strategy.py",
+    "five_stage_approval_strategy.py",
+    "simple_strategy.py",
+    "advanced_strategy.py",
+    "rci_ema_strategy.py",
+    "debug_strategy.py"
+]
+
+
+def _is_strategy_name(name: str) -> bool:
+    """Strateji sınıfı adı mı (adında "Strategy" geçenler, BaseStrategy hariç)"""
+    return "Strategy" in name and name != "BaseStrategy"
+
+
+def _normalize_name(name: str) -> str:
+    """Arama anahtarı: boşluksuz, küçük harf"""
+    return name.replace(" ", "").lower()
+
+
+class StrategyRegistry:
     """
-    Strateji yöneticisi sınıfı
+    Süreç genelinde tek kez oluşturulan, tembel yüklenen strateji kaydı
+
+    Strateji dosyaları import edilmeden AST ile taranır ve sınıf adı -> modül
+    indeksi çıkarılır; bir modül ancak içindeki strateji ilk kez istendiğinde
+    import edilir. Aramalar küçük harfli ad ile O(1) sözlük erişimidir ve
+    modül dosyasının mtime değeri değişmedikçe modül yeniden yüklenmez.
+    Dosyada başka modülden import edilen strateji sınıfları kaynak modüle
+    yönlendirilir, böylece dosyanın kendisi (ör. debug_strategy) çalıştırılmaz.
     """
-    
-    def __init__(self, strategies_dir="strategies"):
+
+    def __init__(self, strategies_dir: str = "strategies", base_dir: str = BASE_DIR):
         """
-        Strateji yöneticisini başlat
-        
         Args:
-            strategies_dir (str): Stratejilerin bulunduğu dizin
+            strategies_dir (str): Strateji paketinin adı (base_dir altındaki dizin)
+            base_dir (str, optional): Proje kök dizini. Defaults to BASE_DIR.
         """
         self.strategies_dir = strategies_dir
-        self.strategies = {}
-        self.config = StrategyConfig()
+        self.base_dir = base_dir
+        self.strategies_path = os.path.join(base_dir, strategies_dir)
         self.logger = logging.getLogger('strategy_manager')
-        self.load_strategies()
-        
-        # Eğer hiç strateji yüklenmediyse, varsayılan stratejileri ekle
-        if not self.strategies:
-            self.add_default_strategies()
-        
-    def load_strategies(self):
+        self._lock = threading.RLock()
+
+        # küçük harfli ad -> {'name', 'module', 'attribute', 'class', 'mtime'}
+        self._index: Dict[str, Dict] = {}
+        # Doğrudan kaydedilen sınıflar (yeniden taramada korunur)
+        self._registered: Dict[str, Dict] = {}
+        # modül yolu -> [modül, dosya yolu, mtime]
+        self._modules: Dict[str, list] = {}
+        # taranan dosya/dizin yolu -> mtime
+        self._scanned: Dict[str, Optional[int]] = {}
+        self._files: List[Tuple[str, str]] = []
+
+        # [sayı, toplam süre (ms), en uzun süre (ms)]
+        self._timings = {'cold': [0, 0.0, 0.0], 'warm': [0, 0.0, 0.0]}
+        self.misses = 0
+        self.reloads = 0
+        self.scans = 0
+        self.scan_ms = 0.0
+
+        self.refresh(force=True)
+
+    @staticmethod
+    def _mtime(path: Optional[str]) -> Optional[int]:
+        try:
+            return os.stat(path).st_mtime_ns if path else None
+        except OSError:
+            return None
+
+    def _scan_state(self) -> Dict[str, Optional[int]]:
+        state = {self.strategies_path: self._mtime(self.strategies_path)}
+        for _, path in self._files:
+            state[path] = self._mtime(path)
+        return state
+
+    def refresh(self, force: bool = False) -> bool:
         """
-        Tüm stratejileri yükle
+        Strateji dizini veya taranan dosyalar değiştiyse indeksi yeniden oluştur
+
+        Args:
+            force (bool, optional): Değişiklik olmasa da yeniden tara. Defaults to False.
+
+        Returns:
+            bool: İndeks yeniden oluşturulduysa True
         """
-        try:
-            self.logger.info("Stratejiler yükleniyor...")
-            
-            # Strateji dosyalarını bul
+        with self._lock:
+            if not force and self._scanned == self._scan_state():
+                return False
+
+            started = time.perf_counter()
             strategy_files = self._find_strategy_files()
-            self.logger.info(f"Bulunan strateji dosyaları: {strategy_files}")
-            
-            # Her strateji dosyasını yükle
+
+            files = []
+            index = {}
             for file_name in strategy_files:
-                try:
-                    # Modül adını al
-                    module_name = file_name.replace('.py', '')
-                    
-                    # Dosya strategies dizininde mi yoksa ana dizinde mi kontrol et
-                    if os.path.exists(os.path.join(self.strategies_dir, file_name)):
-                        # Strategies dizinindeki dosya
-                        module_path = f"{self.strategies_dir}.{module_name}"
+                module_name = file_name.replace('.py', '')
+
+                # Dosya strategies dizininde mi yoksa ana dizinde mi kontrol et
+                if os.path.exists(os.path.join(self.strategies_path, file_name)):
+                    module_path = f"{self.strategies_dir}.{module_name}"
+                    file_path = os.path.join(self.strategies_path, file_name)
+                else:
+                    module_path = module_name
+                    file_path = os.path.join(self.base_dir, file_name)
+                files.append((module_path, file_path))
+
+                for name, source, attribute in self._scan_file(file_path, module_path):
+                    previous = self._index.get(name.lower())
+                    if previous and previous['module'] == source and previous['attribute'] == attribute:
+                        # Daha önce yüklenmiş sınıf korunur (mtime kontrolü get() içinde)
+                        index[name.lower()] = previous
                     else:
-                        # Ana dizindeki dosya
-                        module_path = module_name
-                    
-                    # Modülü import et
-                    module = importlib.import_module(module_path)
-                    
-                    # Modüldeki tüm sınıfları kontrol et
-                    for name, obj in inspect.getmembers(module, inspect.isclass):
-                        # Strateji sınıflarını bul (adında "Strategy" geçenler)
-                        if "Strategy" in name and name != "BaseStrategy":
-                            # Strateji sınıfını kaydet
-                            self.strategies[name] = obj
-                            self.logger.info(f"Strateji yüklendi: {name}")
-                            
-                except Exception as e:
-                    self.logger.error(f"Strateji yüklenirken hata: {module_name} - {str(e)}")
-                    import traceback
-                    self.logger.error(traceback.format_exc())
-            
-            self.logger.info(f"Toplam {len(self.strategies)} strateji yüklendi")
-            
-        except Exception as e:
-            self.logger.error(f"Stratejiler yüklenirken hata: {str(e)}")
-            import traceback
-            self.logger.error(traceback.format_exc())
-            
+                        index[name.lower()] = {'name': name, 'module': source, 'attribute': attribute,
+                                               'class': None, 'mtime': None}
+
+            index.update(self._registered)
+            self._index = index
+            self._files = files
+            self._scanned = self._scan_state()
+            self.scans += 1
+            self.scan_ms = (time.perf_counter() - started) * 1000
+            self.logger.info(f"Toplam {len(index)} strateji bulundu ({self.scan_ms:.1f} ms)")
+            return True
+
+    def _scan_file(self, file_path: str, module_path: str) -> List[Tuple[str, str, str]]:
+        """
+        Dosyayı import etmeden içindeki strateji sınıflarını bul
+
+        Args:
+            file_path (str): Strateji dosyasının yolu
+            module_path (str): Dosyanın modül yolu (ör. strategies.always_signal_strategy)
+
+        Returns:
+            list: (ad, sınıfın tanımlandığı modül, modüldeki adı) listesi, ada göre sıralı
+        """
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                tree = ast.parse(f.read(), filename=file_path)
+        except (OSError, SyntaxError, ValueError) as e:
+            self.logger.error(f"Strateji dosyası okunamadı: {file_path} - {str(e)}")
+            return []
+
+        package = module_path.rpartition('.')[0]
+        found = {}
+        nodes = list(tree.body)
+        while nodes:
+            node = nodes.pop(0)
+            if isinstance(node, (ast.If, ast.Try)):
+                # try/except ImportError ve if blokları içindeki tanımlar da modül seviyesindedir
+                nodes.extend(node.body + node.orelse + getattr(node, 'finalbody', []))
+                for handler in getattr(node, 'handlers', []):
+                    nodes.extend(handler.body)
+            elif isinstance(node, ast.ClassDef) and _is_strategy_name(node.name):
+                found[node.name] = (module_path, node.name)
+            elif isinstance(node, ast.ImportFrom):
+                if node.level:
+                    # Göreli import sadece paket içindeki dosyalarda çözülebilir
+                    if not package:
+                        continue
+                    parts = package.split('.')
+                    base = '.'.join(parts[:len(parts) - node.level + 1])
+                    source = f"{base}.{node.module}" if node.module else base
+                else:
+                    source = node.module
+                for alias in node.names:
+                    name = alias.asname or alias.name
+                    if alias.name != '*' and _is_strategy_name(name):
+                        found[name] = (source, alias.name)
+
+        return [(name, source, attribute) for name, (source, attribute) in sorted(found.items())]
+
     def _find_strategy_files(self) -> List[str]:
         """
         Strateji dosyalarını bul
@@ -88,28 +199,18 @@ class StrategyManager:
         
         try:
             # Strategies dizinini kontrol et
-            if not os.path.exists(self.strategies_dir):
-                os.makedirs(self.strategies_dir)
-                self.logger.info(f"Strategies dizini oluşturuldu: {self.strategies_dir}")
+            if not os.path.exists(self.strategies_path):
+                os.makedirs(self.strategies_path)
+                self.logger.info(f"Strategies dizini oluşturuldu: {self.strategies_path}")
             
             # Strategies dizinindeki tüm .py dosyalarını bul
-            for file_name in os.listdir(self.strategies_dir):
+            for file_name in os.listdir(self.strategies_path):
                 if file_name.endswith('.py') and not file_name.startswith('__'):
                     strategy_files.append(file_name)
             
             # Ana dizindeki strateji dosyalarını da ekle
-            main_dir_strategy_files = [
-                "always_signal_strategy.py",
-                "five_stage_approval_strategy.py",
-                "simple_strategy.py",
-                "advanced_strategy.py",
-                "rci_ema_strategy.py",
-                "debug_strategy.py"
-            ]
-            
-            # Ana dizindeki strateji dosyalarını kontrol et ve ekle
-            for file_name in main_dir_strategy_files:
-                if os.path.exists(file_name):
+            for file_name in MAIN_DIR_STRATEGY_FILES:
+                if os.path.exists(os.path.join(self.base_dir, file_name)):
                     strategy_files.append(file_name)
             
             # Eğer hiç dosya bulunamadıysa, varsayılan stratejileri ekle
@@ -142,7 +243,7 @@ class StrategyManager:
             file_name (str): Oluşturulacak dosya adı
         """
         try:
-            file_path = os.path.join(self.strategies_dir, file_name)
+            file_path = os.path.join(self.strategies_path, file_name)
             
             # Dosya içeriğini belirle
             if file_name == "always_signal_strategy.py":
@@ -280,27 +381,276 @@ class FiveStageApprovalStrategy(BaseStrategy):
             import traceback
             self.logger.error(traceback.format_exc())
             
-    def get_strategy(self, strategy_name: str) -> Any:
+    def _load_class(self, entry: Dict) -> Tuple[Any, bool]:
+        """
+        Kayıttaki sınıfı döndür; modül gerekirse import edilir veya yeniden yüklenir
+
+        Returns:
+            tuple: (sınıf, modül import/yeniden yükleme yapıldı mı)
+        """
+        module_path = entry['module']
+        if module_path is None:
+            return entry['class'], False
+
+        loaded = False
+        cached = self._modules.get(module_path)
+        if cached is None:
+            module = importlib.import_module(module_path)
+            file_path = getattr(module, '__file__', None)
+            cached = self._modules[module_path] = [module, file_path, self._mtime(file_path)]
+            loaded = True
+        else:
+            mtime = self._mtime(cached[1])
+            if mtime != cached[2]:
+                self.logger.info(f"Strateji modülü değişti, yeniden yükleniyor: {module_path}")
+                cached[0] = importlib.reload(cached[0])
+                cached[2] = mtime
+                self.reloads += 1
+                loaded = True
+
+        if entry['class'] is None or entry['mtime'] != cached[2]:
+            entry['class'] = getattr(cached[0], entry['attribute'])
+            entry['mtime'] = cached[2]
+            loaded = True
+        return entry['class'], loaded
+
+    def _record(self, kind: str, elapsed_ms: float):
+        timing = self._timings[kind]
+        timing[0] += 1
+        timing[1] += elapsed_ms
+        timing[2] = max(timing[2], elapsed_ms)
+
+    def get(self, name: str) -> Optional[Any]:
+        """
+        Strateji sınıfını büyük/küçük harf duyarsız ada göre bul
+
+        "rci ema", "RCIEMA" ve "RCIEMAStrategy" aynı sınıfı döndürür. Modül ilk
+        kullanımda import edilir (soğuk arama); sonraki aramalar sözlük erişimi
+        ve tek bir stat çağrısıdır (sıcak arama).
+
+        Args:
+            name (str): Strateji adı
+
+        Returns:
+            class: Strateji sınıfı; bulunamazsa veya yüklenemezse None
+        """
+        started = time.perf_counter()
+        key = _normalize_name(name or "")
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is None and not key.endswith("strategy"):
+                entry = self._index.get(f"{key}strategy")
+            if entry is None:
+                self.misses += 1
+                return None
+
+            try:
+                strategy_class, cold = self._load_class(entry)
+            except Exception as e:
+                self.misses += 1
+                self.logger.error(f"Strateji yüklenirken hata: {entry['module']} - {str(e)}")
+                import traceback
+                self.logger.error(traceback.format_exc())
+                return None
+
+            self._record('cold' if cold else 'warm', (time.perf_counter() - started) * 1000)
+            return strategy_class
+
+    def resolve_name(self, name: str) -> Optional[str]:
+        """
+        Verilen adın kayıttaki asıl adını döndür (modül import edilmez)
+
+        Args:
+            name (str): Strateji adı (büyük/küçük harf duyarsız)
+
+        Returns:
+            str: Kayıtlı strateji adı; bulunamazsa None
+        """
+        key = _normalize_name(name or "")
+        entry = self._index.get(key)
+        if entry is None and not key.endswith("strategy"):
+            entry = self._index.get(f"{key}strategy")
+        return entry['name'] if entry else None
+
+    def register(self, name: str, strategy_class: Any):
+        """
+        Strateji sınıfını doğrudan kaydet (varsayılan stratejiler için)
+
+        Args:
+            name (str): Strateji adı
+            strategy_class: Strateji sınıfı
+        """
+        with self._lock:
+            entry = {'name': name, 'module': None, 'attribute': name, 'class': strategy_class, 'mtime': None}
+            self._registered[name.lower()] = entry
+            self._index[name.lower()] = entry
+
+    def names(self) -> List[str]:
+        """
+        Kayıtlı strateji adları (dosyalar değiştiyse önce yeniden taranır)
+
+        Returns:
+            List[str]: Strateji adları
+        """
+        self.refresh()
+        return [entry['name'] for entry in self._index.values()]
+
+    def __contains__(self, name: str) -> bool:
+        return self.resolve_name(name) is not None
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Kayıt ve arama gecikmesi metrikleri
+
+        Returns:
+            dict: Strateji/modül sayıları, soğuk ve sıcak arama sayısı ile ortalama
+                ve en uzun süreleri (ms), yeniden yükleme ve tarama sayıları
+        """
+        with self._lock:
+            stats = {
+                'strategies': len(self._index),
+                'loaded_modules': len(self._modules),
+                'misses': self.misses,
+                'reloads': self.reloads,
+                'scans': self.scans,
+                'scan_ms': round(self.scan_ms, 3),
+            }
+            for kind, (count, total, longest) in self._timings.items():
+                stats[f'{kind}_lookups'] = count
+                stats[f'{kind}_avg_ms'] = round(total / count, 4) if count else 0.0
+                stats[f'{kind}_max_ms'] = round(longest, 4)
+            return stats
+
+
+class _StrategyView(Mapping):
+    """
+    Kayıt üzerinde salt okunur ad -> sınıf görünümü
+
+    StrategyManager.strategies sözlüğünün yerini alır; sınıflar ancak
+    erişildiğinde yüklenir.
+    """
+
+    def __init__(self, registry: StrategyRegistry):
+        self._registry = registry
+
+    def __getitem__(self, name):
+        if self._registry.resolve_name(name) != name:
+            raise KeyError(name)
+        strategy_class = self._registry.get(name)
+        if strategy_class is None:
+            raise KeyError(name)
+        return strategy_class
+
+    def __contains__(self, name):
+        return self._registry.resolve_name(name) == name
+
+    def __iter__(self):
+        return iter(self._registry.names())
+
+    def __len__(self):
+        return len(self._registry)
+
+
+def _invalidate_changed_strategies(path: str, old: Dict, new: Dict, source: str):
+    """Yapılandırmada tanımı değişen stratejilerin havuzdaki nesnelerini düşür"""
+    old_strategies = old.get('strategies') if isinstance(old, dict) else None
+    new_strategies = new.get('strategies') if isinstance(new, dict) else None
+    if not isinstance(old_strategies, dict) or not isinstance(new_strategies, dict):
+        return
+    registry = get_strategy_registry()
+    pool = get_strategy_pool()
+    for name in set(old_strategies) | set(new_strategies):
+        if old_strategies.get(name) != new_strategies.get(name):
+            pool.invalidate(registry.resolve_name(name) or name)
+
+
+_registries: Dict[str, StrategyRegistry] = {}
+_registries_lock = threading.Lock()
+
+
+def get_strategy_registry(strategies_dir: str = "strategies") -> StrategyRegistry:
+    """
+    Süreç genelindeki strateji kaydını döndür (ilk çağrıda oluşturulur)
+
+    Args:
+        strategies_dir (str, optional): Strateji paketinin adı. Defaults to "strategies".
+
+    Returns:
+        StrategyRegistry: Paylaşılan kayıt
+    """
+    registry = _registries.get(strategies_dir)
+    if registry is None:
+        with _registries_lock:
+            registry = _registries.get(strategies_dir)
+            if registry is None:
+                registry = _registries[strategies_dir] = StrategyRegistry(strategies_dir)
+    return registry
+
+
+class StrategyManager:
+    """
+    Strateji yöneticisi sınıfı
+    """
+    
+    def __init__(self, strategies_dir="strategies"):
+        """
+        Strateji yöneticisini başlat
+        
+        Stratejiler süreç genelindeki kayıttan gelir; yeni bir yönetici
+        oluşturmak dosyaları yeniden taramaz veya modülleri import etmez.
+        
+        Args:
+            strategies_dir (str): Stratejilerin bulunduğu dizin
+        """
+        self.strategies_dir = strategies_dir
+        self.registry = get_strategy_registry(strategies_dir)
+        self.strategies = _StrategyView(self.registry)
+        self.pool = get_strategy_pool()
+        self.config = StrategyConfig()
+        # Parametreler kaydedildiğinde veya config.json dışarıdan değiştiğinde havuz temizlenir
+        get_config_service().add_listener(_invalidate_changed_strategies)
+        self.logger = logging.getLogger('strategy_manager')
+        
+        # Eğer hiç strateji bulunmadıysa, varsayılan stratejileri ekle
+        if not self.strategies:
+            self.add_default_strategies()
+        
+    def load_strategies(self):
+        """
+        Strateji dosyalarını yeniden tara (modüller ilk kullanımda yüklenir)
+        """
+        try:
+            self.logger.info("Stratejiler yükleniyor...")
+            self.registry.refresh(force=True)
+            
+        except Exception as e:
+            self.logger.error(f"Stratejiler yüklenirken hata: {str(e)}")
+            import traceback
+            self.logger.error(traceback.format_exc())
+            
+    def get_strategy(self, strategy_name: str, params: Optional[Dict] = None) -> Any:
         """
-        Strateji sınıfını al
+        Strateji nesnesini al
+        
+        Nesne sınıf ve parametrelere göre havuzdan gelir ve istekler arası
+        paylaşılır; salt okunur kullanılmalıdır.
         
         Args:
             strategy_name (str): Strateji adı
+            params (dict, optional): Strateji parametreleri. Defaults to None (varsayılanlar).
             
         Returns:
             Any: Strateji sınıfı instance'ı
         """
         try:
-            # Strateji adını düzelt (boşlukları kaldır, ilk harfi büyük yap)
-            strategy_name = strategy_name.replace(" ", "")
-            if "Strategy" not in strategy_name:
-                strategy_name = f"{strategy_name}Strategy"
-            
-            # Strateji sınıfını bul
-            for name, strategy_class in self.strategies.items():
-                if name.lower() == strategy_name.lower():
-                    self.logger.info(f"Strateji bulundu: {name}")
-                    return strategy_class()
+            # Strateji sınıfını bul (büyük/küçük harf duyarsız, "Strategy" eki isteğe bağlı)
+            strategy_class = self.registry.get(strategy_name)
+            if strategy_class is not None:
+                self.logger.info(f"Strateji bulundu: {strategy_class.__name__}")
+                return self.pool.get(strategy_class, params)
                 
             # Strateji bulunamadı
             self.logger.error(f"Strateji bulunamadı: {strategy_name}")
@@ -322,9 +672,7 @@ class FiveStageApprovalStrategy(BaseStrategy):
         Returns:
             class: Strateji sınıfı
         """
-        if strategy_name in self.strategies:
-            return self.strategies[strategy_name]
-        return None
+        return self.registry.get(strategy_name)
 
     def get_strategy_names(self) -> List[str]:
         """
@@ -334,16 +682,12 @@ class FiveStageApprovalStrategy(BaseStrategy):
             List[str]: Strateji isimleri listesi
         """
         try:
-            # Stratejilerin yüklendiğinden emin ol
-            if not self.strategies:
-                self.load_strategies()
-                
-            # Eğer hala strateji yoksa, varsayılan stratejileri ekle
+            # Eğer hiç strateji yoksa, varsayılan stratejileri ekle
             if not self.strategies:
                 self.add_default_strategies()
                 
             # Strateji isimlerini döndür
-            return list(self.strategies.keys())
+            return self.registry.names()
         except Exception as e:
             self.logger.error(f"Strateji isimleri alınırken hata: {str(e)}")
             return []
@@ -439,7 +783,7 @@ class FiveStageApprovalStrategy(BaseStrategy):
             # AlwaysSignalStrategy ekle
             if "AlwaysSignalStrategy" not in self.strategies:
                 from strategies.always_signal_strategy import AlwaysSignalStrategy
-                self.strategies["AlwaysSignalStrategy"] = AlwaysSignalStrategy
+                self.registry.register("AlwaysSignalStrategy", AlwaysSignalStrategy)
                 self.logger.info("Always Signal stratejisi kaydedildi")
                 
                 # Varsayılan parametreleri ekle
@@ -462,7 +806,7 @@ class FiveStageApprovalStrategy(BaseStrategy):
             # FiveStageApprovalStrategy ekle
             if "FiveStageApprovalStrategy" not in self.strategies:
                 from strategies.five_stage_approval_strategy import FiveStageApprovalStrategy
-                self.strategies["FiveStageApprovalStrategy"] = FiveStageApprovalStrategy
+                self.registry.register("FiveStageApprovalStrategy", FiveStageApprovalStrategy)
                 self.logger.info("Five Stage Approval stratejisi kaydedildi")
                 
                 # Varsayılan parametreleri ekle
@@ -536,3 +880,4 @@ class FiveStageApprovalStrategy(BaseStrategy):
             self.logger.error(f"Varsayılan stratejiler eklenirken hata: {str(e)}")
             import traceback
             self.logger.error(traceback.format_exc())
+
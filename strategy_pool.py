@@ -0,0 +1,160 @@
+import os
+import json
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from optimizer import create_strategy
+
+logger = logging.getLogger(__name__)
+
+# Havuzda tutulacak en fazla strateji nesnesi (sınıf + parametre kombinasyonu) sayısı
+DEFAULT_POOL_SIZE = int(os.getenv('STRATEGY_POOL_SIZE', '64'))
+
+
+def parameters_key(params: Optional[Dict]) -> str:
+    """Parametre sözlüğünün sıradan bağımsız, kararlı anahtarı"""
+    return json.dumps(params or {}, sort_keys=True, default=str)
+
+
+class StrategyPool:
+    """
+    Sınıf ve parametre anahtarlı, istekler arası paylaşılan strateji nesneleri havuzu
+
+    Stratejiler generate_signals/analyze sırasında kendi durumlarını
+    değiştirmediği için aynı sınıf ve parametrelerle oluşturulan nesne tüm
+    isteklerde ve bot işçilerinde paylaşılır. Aynı anahtar için nesne tek bir
+    iş parçacığı tarafından oluşturulur, diğerleri onu bekler. Parametreler
+    kaydedildiğinde ilgili stratejinin nesneleri invalidate() ile düşürülür;
+    o sırada oluşturulmakta olan nesne de havuza eklenmez.
+
+    Havuzdan alınan nesneler salt okunur kullanılmalıdır; nitelikleri
+    değiştirilecek nesneler create_strategy ile ayrıca oluşturulmalıdır.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_POOL_SIZE,
+                 factory: Callable[[Any, Dict], Any] = create_strategy):
+        """
+        Args:
+            max_size (int, optional): En fazla nesne sayısı (aşılınca en az kullanılan düşer)
+            factory (callable, optional): (sınıf, parametreler) -> nesne. Defaults to create_strategy.
+        """
+        self.max_size = max_size
+        self.factory = factory
+        self._instances: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._building: Dict[Hashable, threading.Lock] = {}
+        # strateji adı (küçük harf) -> invalidate sayacı
+        self._generations: Dict[str, int] = {}
+        self._epoch = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.created = 0
+        self.invalidated = 0
+
+    @staticmethod
+    def key(strategy_class, params: Optional[Dict] = None) -> Tuple[Any, str]:
+        """
+        Havuz anahtarı: (sınıf, geçerli parametrelerin anahtarı)
+
+        Sınıf nesnesinin kendisi kullanılır; modül yeniden yüklendiğinde yeni
+        sınıf yeni anahtar üretir.
+        """
+        return strategy_class, parameters_key(params)
+
+    def get(self, strategy_class, params: Optional[Dict] = None) -> Any:
+        """
+        Verilen sınıf ve parametreler için paylaşılan strateji nesnesini döndür
+
+        Args:
+            strategy_class: Strateji sınıfı
+            params (dict, optional): Strateji parametreleri. Defaults to None (varsayılanlar).
+
+        Returns:
+            Strateji nesnesi
+        """
+        key = self.key(strategy_class, params)
+        name = strategy_class.__name__.lower()
+        with self._lock:
+            instance = self._instances.get(key)
+            if instance is not None:
+                self._instances.move_to_end(key)
+                self.hits += 1
+                return instance
+            build_lock = self._building.setdefault(key, threading.Lock())
+
+        with build_lock:
+            with self._lock:
+                # Beklerken başka bir iş parçacığı oluşturmuş olabilir
+                instance = self._instances.get(key)
+                if instance is not None:
+                    self.hits += 1
+                    return instance
+                generation = (self._epoch, self._generations.get(name, 0))
+
+            try:
+                instance = self.factory(strategy_class, dict(params or {}))
+            finally:
+                with self._lock:
+                    self._building.pop(key, None)
+
+            with self._lock:
+                self.created += 1
+                # Oluşturma sırasında parametreler kaydedildiyse nesne eski değerlerle oluşmuş olabilir
+                if (self._epoch, self._generations.get(name, 0)) == generation:
+                    self._instances[key] = instance
+                    while len(self._instances) > self.max_size:
+                        self._instances.popitem(last=False)
+            return instance
+
+    def invalidate(self, strategy_name: Optional[str] = None) -> int:
+        """
+        Bir stratejinin (veya tümünün) havuzdaki nesnelerini düşür
+
+        Args:
+            strategy_name (str, optional): Strateji sınıfı adı (büyük/küçük harf duyarsız).
+                Defaults to None (tüm havuz).
+
+        Returns:
+            int: Düşürülen nesne sayısı
+        """
+        name = strategy_name.replace(" ", "").lower() if strategy_name else None
+        with self._lock:
+            if name is None:
+                dropped = list(self._instances)
+                self._epoch += 1
+            else:
+                dropped = [key for key in self._instances if key[0].__name__.lower() == name]
+                self._generations[name] = self._generations.get(name, 0) + 1
+            for key in dropped:
+                del self._instances[key]
+            self.invalidated += len(dropped)
+        if dropped:
+            logger.info(f"Strateji havuzu temizlendi: {strategy_name or 'tümü'} ({len(dropped)} nesne)")
+        return len(dropped)
+
+    def __len__(self):
+        return len(self._instances)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'instances': len(self._instances),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'created': self.created,
+                'invalidated': self.invalidated,
+            }
+
+
+_strategy_pool = None
+_strategy_pool_lock = threading.Lock()
+
+
+def get_strategy_pool() -> StrategyPool:
+    """Süreç genelinde paylaşılan strateji havuzu"""
+    global _strategy_pool
+    with _strategy_pool_lock:
+        if _strategy_pool is None:
+            _strategy_pool = StrategyPool()
+        return _strategy_pool
@@ -0,0 +1,581 @@
+import math
+import logging
+from collections import deque
+from typing import Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+NAN = float('nan')
+
+
+def _ewm_alpha(com: float) -> float:
+    """pandas ewm ile aynı şekilde hesaplanan alfa (span ve Wilder için)"""
+    return 1.0 / (1.0 + com)
+
+
+def _ewm_step(prev: float, value: float, alpha: float) -> float:
+    """
+    Tek adım EMA (adjust=False)
+
+    pandas'ın ewm çekirdeğiyle aynı işlem sırası kullanılır; böylece akış ve toplu
+    hesaplama bit düzeyinde aynı sonucu verir.
+    """
+    if value != value:
+        return prev
+    if prev != prev:
+        return value
+    if prev == value:
+        return prev
+    old_wt = 1.0 - alpha
+    return (old_wt * prev + alpha * value) / (old_wt + alpha)
+
+
+def _divide(a: float, b: float) -> float:
+    """NumPy kayan nokta bölmesi gibi davranan bölme (sıfıra bölmede inf/NaN)"""
+    if b == 0:
+        if a == 0 or a != a:
+            return NAN
+        return math.inf if a > 0 else -math.inf
+    return a / b
+
+
+class _RollingWindow:
+    """
+    Sabit uzunluklu pencerede toplam ve kareler toplamı
+
+    Toplamlar her adımda O(1) güncellenir; birikmiş yuvarlama hatasını sınırlamak için
+    pencere her dolduğunda toplamlar pencereden yeniden hesaplanır (amortize O(1)).
+    NaN değerler pandas gibi pencereyi geçersiz kılar.
+    """
+
+    def __init__(self, period: int):
+        self.period = period
+        self._values = deque(maxlen=period)
+        self._shift = 0.0
+        self._sum = 0.0
+        self._sumsq = 0.0
+        self._nans = 0
+        self._pushes = 0
+
+    def __len__(self):
+        return len(self._values)
+
+    def push(self, value: float) -> None:
+        if len(self._values) == self.period:
+            self._remove(self._values[0])
+        self._values.append(value)
+        self._add(value)
+        self._pushes += 1
+        if self._pushes >= self.period:
+            self._resync()
+
+    def _add(self, value: float) -> None:
+        if value != value:
+            self._nans += 1
+        else:
+            d = value - self._shift
+            self._sum += d
+            self._sumsq += d * d
+
+    def _remove(self, value: float) -> None:
+        if value != value:
+            self._nans -= 1
+        else:
+            d = value - self._shift
+            self._sum -= d
+            self._sumsq -= d * d
+
+    def _resync(self) -> None:
+        finite = [v for v in self._values if v == v]
+        self._shift = math.fsum(finite) / len(finite) if finite else 0.0
+        self._sum = math.fsum(v - self._shift for v in finite)
+        self._sumsq = math.fsum((v - self._shift) ** 2 for v in finite)
+        self._nans = len(self._values) - len(finite)
+        self._pushes = 0
+
+    def _window_sums(self, extra: Optional[float]):
+        """(toplam, kareler toplamı, geçerli mi) - extra verilirse en eski değerin yerine geçer"""
+        if extra is None:
+            if len(self._values) < self.period or self._nans:
+                return NAN, NAN, False
+            return self._sum, self._sumsq, True
+        if len(self._values) + 1 < self.period:
+            return NAN, NAN, False
+        total, sumsq, nans = self._sum, self._sumsq, self._nans
+        if len(self._values) == self.period:
+            oldest = self._values[0]
+            if oldest != oldest:
+                nans -= 1
+            else:
+                d = oldest - self._shift
+                total -= d
+                sumsq -= d * d
+        if extra != extra or nans:
+            return NAN, NAN, False
+        d = extra - self._shift
+        return total + d, sumsq + d * d, True
+
+    def mean(self, extra: Optional[float] = None) -> float:
+        total, _, valid = self._window_sums(extra)
+        if not valid:
+            return NAN
+        return total / self.period + self._shift
+
+    def std(self, extra: Optional[float] = None) -> float:
+        """Örneklem standart sapması (ddof=1, pandas varsayılanı)"""
+        total, sumsq, valid = self._window_sums(extra)
+        if not valid or self.period < 2:
+            return NAN
+        variance = (sumsq - total * total / self.period) / (self.period - 1)
+        return math.sqrt(variance) if variance > 0 else 0.0
+
+
+class _RollingExtreme:
+    """Monoton kuyruk ile kayan pencere maksimum/minimumu (amortize O(1))"""
+
+    def __init__(self, period: int, maximum: bool = True):
+        self.period = period
+        self.maximum = maximum
+        self._queue = deque()
+        self._count = 0
+
+    def _dominates(self, a: float, b: float) -> bool:
+        return a >= b if self.maximum else a <= b
+
+    def push(self, value: float) -> None:
+        while self._queue and self._dominates(value, self._queue[-1][1]):
+            self._queue.pop()
+        self._queue.append((self._count, value))
+        self._count += 1
+        if self._queue[0][0] <= self._count - 1 - self.period:
+            self._queue.popleft()
+
+    def value(self, extra: Optional[float] = None) -> float:
+        """Penceredeki uç değer; extra verilirse en eski değerin yerine geçer"""
+        if extra is None:
+            return self._queue[0][1] if self._count >= self.period else NAN
+        if self._count + 1 < self.period:
+            return NAN
+        best = None
+        if self._queue:
+            idx, best = self._queue[0]
+            if idx <= self._count - self.period:
+                best = self._queue[1][1] if len(self._queue) > 1 else None
+        if best is None or self._dominates(extra, best):
+            return extra
+        return best
+
+
+class StreamingIndicator:
+    """
+    Akış göstergeleri için temel sınıf.
+
+    Her mum için update() çağrılır. closed=True kapanan mumu duruma işler;
+    closed=False oluşmakta olan mumun değerini durumu değiştirmeden döndürür, böylece
+    aynı mum için tekrar tekrar çağrılabilir. Güncelleme maliyeti geçmişin
+    uzunluğundan bağımsızdır.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.value = NAN
+
+    def _step(self, high: float, low: float, close: float, commit: bool):
+        raise NotImplementedError
+
+    def update(self, high: float, low: float, close: float, closed: bool = True):
+        """
+        Yeni mum verisiyle güncelle
+
+        Args:
+            high (float): Yüksek fiyat
+            low (float): Düşük fiyat
+            close (float): Kapanış (veya oluşan mum için son) fiyat
+            closed (bool): Mum kapandı mı
+
+        Returns:
+            Gösterge değeri (tek değerli göstergelerde float, diğerlerinde dict)
+        """
+        result = self._step(float(high), float(low), float(close), closed)
+        if closed:
+            self.count += 1
+            self.value = result
+        return result
+
+    def seed(self, high, low, close):
+        """
+        Geçmiş dizilerle (kapanmış mumlar) başlangıç durumunu oluştur
+
+        Args:
+            high: Yüksek fiyatlar
+            low: Düşük fiyatlar
+            close: Kapanış fiyatları
+
+        Returns:
+            Son mumdaki gösterge değeri
+        """
+        for h, l, c in zip(np.asarray(high, dtype=np.float64).tolist(),
+                           np.asarray(low, dtype=np.float64).tolist(),
+                           np.asarray(close, dtype=np.float64).tolist()):
+            self.value = self._step(h, l, c, True)
+            self.count += 1
+        return self.value
+
+
+class StreamingEMA(StreamingIndicator):
+    """Üstel hareketli ortalama (AdvancedIndicators.calculate_ema ile aynı)"""
+
+    def __init__(self, period: int):
+        super().__init__()
+        self.period = period
+        self.alpha = _ewm_alpha((period - 1) / 2.0)
+
+    def _step(self, high, low, close, commit):
+        return _ewm_step(self.value, close, self.alpha)
+
+
+class StreamingMACD(StreamingIndicator):
+    """MACD (AdvancedIndicators.calculate_macd ile aynı sütun adları)"""
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        super().__init__()
+        self.fast = StreamingEMA(fast)
+        self.slow = StreamingEMA(slow)
+        self.signal_alpha = _ewm_alpha((signal - 1) / 2.0)
+        self._signal = NAN
+        self.value = {'macd': NAN, 'macd_signal': NAN, 'macd_hist': NAN}
+
+    def _step(self, high, low, close, commit):
+        macd = self.fast.update(high, low, close, commit) - self.slow.update(high, low, close, commit)
+        signal = _ewm_step(self._signal, macd, self.signal_alpha)
+        if commit:
+            self._signal = signal
+        return {'macd': macd, 'macd_signal': signal, 'macd_hist': macd - signal}
+
+
+class StreamingRSI(StreamingIndicator):
+    """
+    RSI
+
+    Varsayılan yumuşatma AdvancedIndicators.calculate_rsi ile aynı olan basit hareketli
+    ortalamadır. wilder=True ile kazanç/kayıplar Wilder yöntemiyle (alpha=1/period,
+    pandas'ta ewm(alpha=1/period, adjust=False)) yumuşatılır.
+    """
+
+    def __init__(self, period: int = 14, wilder: bool = False):
+        super().__init__()
+        self.period = period
+        self.wilder = wilder
+        self._prev_close = NAN
+        if wilder:
+            self.alpha = _ewm_alpha(period - 1.0)
+            self._avg_gain = NAN
+            self._avg_loss = NAN
+        else:
+            self._gains = _RollingWindow(period)
+            self._losses = _RollingWindow(period)
+
+    def _step(self, high, low, close, commit):
+        delta = close - self._prev_close
+        # pandas'taki gibi ilk satırın NaN farkı sıfır kazanç/kayıp sayılır
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+
+        if self.wilder:
+            avg_gain = _ewm_step(self._avg_gain, gain, self.alpha)
+            avg_loss = _ewm_step(self._avg_loss, loss, self.alpha)
+            valid = self.count + 1 >= self.period
+            if commit:
+                self._avg_gain, self._avg_loss = avg_gain, avg_loss
+            if not valid:
+                avg_gain = NAN
+        elif commit:
+            self._gains.push(gain)
+            self._losses.push(loss)
+            avg_gain, avg_loss = self._gains.mean(), self._losses.mean()
+        else:
+            avg_gain, avg_loss = self._gains.mean(gain), self._losses.mean(loss)
+
+        if commit:
+            self._prev_close = close
+        if avg_gain != avg_gain or avg_loss != avg_loss:
+            return NAN
+        return 100 - (100 / (1 + _divide(avg_gain, avg_loss)))
+
+
+class StreamingATR(StreamingIndicator):
+    """Average True Range (True Range'in basit hareketli ortalaması)"""
+
+    def __init__(self, period: int = 14):
+        super().__init__()
+        self.period = period
+        self._prev_close = NAN
+        self._window = _RollingWindow(period)
+
+    def _step(self, high, low, close, commit):
+        tr = high - low
+        if self._prev_close == self._prev_close:
+            tr = max(tr, abs(high - self._prev_close), abs(low - self._prev_close))
+        if commit:
+            self._prev_close = close
+            self._window.push(tr)
+            return self._window.mean()
+        return self._window.mean(tr)
+
+
+class StreamingBollinger(StreamingIndicator):
+    """Bollinger Bantları (AdvancedIndicators.add_bollinger_bands ile aynı sütun adları)"""
+
+    def __init__(self, period: int = 20, std_dev: float = 2.0):
+        super().__init__()
+        self.period = period
+        self.std_dev = std_dev
+        self._window = _RollingWindow(period)
+        self.value = {'bb_middle': NAN, 'bb_std': NAN, 'bb_upper': NAN, 'bb_lower': NAN}
+
+    def _step(self, high, low, close, commit):
+        if commit:
+            self._window.push(close)
+            middle, std = self._window.mean(), self._window.std()
+        else:
+            middle, std = self._window.mean(close), self._window.std(close)
+        return {'bb_middle': middle, 'bb_std': std,
+                'bb_upper': middle + (std * self.std_dev), 'bb_lower': middle - (std * self.std_dev)}
+
+
+class StreamingStochastic(StreamingIndicator):
+    """Stokastik Osilatör (AdvancedIndicators.add_stochastic ile aynı sütun adları)"""
+
+    def __init__(self, k_period: int = 14, d_period: int = 3):
+        super().__init__()
+        self._highs = _RollingExtreme(k_period, maximum=True)
+        self._lows = _RollingExtreme(k_period, maximum=False)
+        self._k_window = _RollingWindow(d_period)
+        self.value = {'stoch_k': NAN, 'stoch_d': NAN}
+
+    def _step(self, high, low, close, commit):
+        if commit:
+            self._highs.push(high)
+            self._lows.push(low)
+            high_max, low_min = self._highs.value(), self._lows.value()
+        else:
+            high_max, low_min = self._highs.value(high), self._lows.value(low)
+
+        stoch_k = 100 * _divide(close - low_min, high_max - low_min)
+        if commit:
+            self._k_window.push(stoch_k)
+            stoch_d = self._k_window.mean()
+        else:
+            stoch_d = self._k_window.mean(stoch_k)
+        return {'stoch_k': stoch_k, 'stoch_d': stoch_d}
+
+
+class StreamingSupertrend(StreamingIndicator):
+    """
+    Supertrend (AdvancedIndicators.calculate_supertrend ile aynı kurallar)
+
+    ATR hesaplanamayan ilk mumlarda supertrend 0, yön 0 ve bantlar NaN'dır.
+    """
+
+    def __init__(self, period: int = 10, multiplier: float = 3):
+        super().__init__()
+        self.multiplier = float(multiplier)
+        self.atr = StreamingATR(period)
+        self._upper = NAN
+        self._lower = NAN
+        self._direction = 0
+        self._prev_close = NAN
+        self.value = {'supertrend': 0.0, 'supertrend_direction': 0, 'upperband': NAN, 'lowerband': NAN}
+
+    def _step(self, high, low, close, commit):
+        atr = self.atr.update(high, low, close, commit)
+        hl2 = (high + low) / 2
+        if atr != atr or hl2 != hl2:
+            if commit:
+                self._prev_close = close
+            return {'supertrend': 0.0, 'supertrend_direction': 0, 'upperband': NAN, 'lowerband': NAN}
+
+        basic_upper = hl2 + self.multiplier * atr
+        basic_lower = hl2 - self.multiplier * atr
+        if self._direction == 0:
+            # İlk geçerli mum: bantlar temel bantlardır
+            upper, lower = basic_upper, basic_lower
+            direction = -1 if close < lower else 1
+        else:
+            prev_upper, prev_lower, prev_close = self._upper, self._lower, self._prev_close
+            upper = basic_upper if (basic_upper < prev_upper or prev_close > prev_upper) else prev_upper
+            lower = basic_lower if (basic_lower > prev_lower or prev_close < prev_lower) else prev_lower
+            if self._direction == -1:
+                direction = 1 if close > upper else -1
+            else:
+                direction = -1 if close < lower else 1
+
+        if commit:
+            self._upper, self._lower, self._direction, self._prev_close = upper, lower, direction, close
+        return {'supertrend': lower if direction == 1 else upper, 'supertrend_direction': direction,
+                'upperband': upper, 'lowerband': lower}
+
+
+class StreamingIchimoku(StreamingIndicator):
+    """
+    Ichimoku (AdvancedIndicators.calculate_ichimoku ile aynı sütun adları)
+
+    chikou_span gelecekteki kapanışa dayandığı için akış halinde hesaplanamaz ve
+    döndürülmez.
+    """
+
+    def __init__(self, tenkan_period: int = 9, kijun_period: int = 26, senkou_period: int = 52,
+                 displacement: int = 26):
+        super().__init__()
+        self.displacement = displacement
+        self._tenkan = (_RollingExtreme(tenkan_period, True), _RollingExtreme(tenkan_period, False))
+        self._kijun = (_RollingExtreme(kijun_period, True), _RollingExtreme(kijun_period, False))
+        self._senkou = (_RollingExtreme(senkou_period, True), _RollingExtreme(senkou_period, False))
+        # Kaydırılmamış öncü çizgiler (son displacement + 1 mum)
+        self._leading = deque(maxlen=displacement + 1)
+        self.value = {'tenkan_sen': NAN, 'kijun_sen': NAN, 'senkou_span_a': NAN, 'senkou_span_b': NAN}
+
+    @staticmethod
+    def _midpoint(pair, high, low, commit):
+        highs, lows = pair
+        if commit:
+            highs.push(high)
+            lows.push(low)
+            return (highs.value() + lows.value()) / 2
+        return (highs.value(high) + lows.value(low)) / 2
+
+    def _step(self, high, low, close, commit):
+        tenkan = self._midpoint(self._tenkan, high, low, commit)
+        kijun = self._midpoint(self._kijun, high, low, commit)
+        senkou_b = self._midpoint(self._senkou, high, low, commit)
+
+        if commit:
+            self._leading.append(((tenkan + kijun) / 2, senkou_b))
+            lag = len(self._leading) - 1 - self.displacement
+        else:
+            lag = len(self._leading) - self.displacement
+        span_a, span_b = self._leading[lag] if lag >= 0 else (NAN, NAN)
+        return {'tenkan_sen': tenkan, 'kijun_sen': kijun, 'senkou_span_a': span_a, 'senkou_span_b': span_b}
+
+
+class StreamingIndicatorSet:
+    """
+    Bir sembol/aralık için akış göstergeleri kümesi.
+
+    Göstergeler geçmiş mumlarla bir kez tohumlanır, sonra her yeni veya oluşan mumda
+    sabit zamanda güncellenir. snapshot() değerleri AdvancedIndicators sütun adlarıyla
+    düz bir sözlük olarak döndürür.
+    """
+
+    def __init__(self, factory: Callable[[], Dict[str, StreamingIndicator]]):
+        self.factory = factory
+        self.indicators = factory()
+        self.last_closed_time = None
+        self.forming = {}
+        self.logger = logging.getLogger(__name__)
+
+    @classmethod
+    def default(cls) -> 'StreamingIndicatorSet':
+        """Bot için varsayılan gösterge kümesi"""
+        return cls(lambda: {
+            'ema20': StreamingEMA(20),
+            'ema50': StreamingEMA(50),
+            'ema200': StreamingEMA(200),
+            'rsi': StreamingRSI(14),
+            'atr': StreamingATR(14),
+            'macd': StreamingMACD(12, 26, 9),
+            'bollinger': StreamingBollinger(20, 2.0),
+            'stochastic': StreamingStochastic(14, 3),
+            'supertrend': StreamingSupertrend(10, 3),
+            'ichimoku': StreamingIchimoku(),
+        })
+
+    def update(self, high: float, low: float, close: float, closed: bool = True) -> Dict[str, float]:
+        """
+        Tüm göstergeleri bir mumla güncelle
+
+        Args:
+            high (float): Yüksek fiyat
+            low (float): Düşük fiyat
+            close (float): Kapanış fiyatı
+            closed (bool): Mum kapandı mı
+
+        Returns:
+            dict: Gösterge değerleri
+        """
+        values = self._flatten({name: indicator.update(high, low, close, closed)
+                                for name, indicator in self.indicators.items()})
+        self.forming = {} if closed else values
+        return values
+
+    def seed(self, df: pd.DataFrame) -> Dict[str, float]:
+        """
+        Kapanmış mumlardan oluşan veriyle durumu sıfırdan oluştur
+
+        Args:
+            df (pd.DataFrame): 'high', 'low', 'close' sütunlu veri (indeks açılış zamanı)
+
+        Returns:
+            dict: Son mumdaki gösterge değerleri
+        """
+        high, low, close = df['high'].to_numpy(), df['low'].to_numpy(), df['close'].to_numpy()
+        for indicator in self.indicators.values():
+            indicator.seed(high, low, close)
+        self.last_closed_time = df.index[-1] if len(df) else None
+        self.forming = {}
+        return self.snapshot()
+
+    def sync(self, df: pd.DataFrame, last_closed: bool = False) -> Dict[str, float]:
+        """
+        Son alınan mum verisiyle durumu güncelle
+
+        Daha önce işlenmiş mumlar atlanır, yeni kapanan mumlar işlenir ve son mum
+        (last_closed=False ise) oluşan mum olarak değerlendirilir. Son işlenen mum
+        veride yoksa (boşluk) durum yeniden tohumlanır.
+
+        Args:
+            df (pd.DataFrame): Mum verisi (indeks açılış zamanı)
+            last_closed (bool): Son mum kapanmış mı
+
+        Returns:
+            dict: Gösterge değerleri (oluşan mum varsa onu içerir)
+        """
+        if df is None or df.empty:
+            return self.snapshot()
+
+        closed_part = df if last_closed else df.iloc[:-1]
+        if self.last_closed_time is None or self.last_closed_time not in df.index:
+            if self.last_closed_time is not None:
+                self.logger.warning("Gösterge durumunda boşluk, geçmiş veriyle yeniden tohumlanıyor")
+                self.indicators = self.factory()
+            if len(closed_part):
+                self.seed(closed_part)
+        else:
+            new_rows = closed_part[closed_part.index > self.last_closed_time]
+            for high, low, close in zip(new_rows['high'].tolist(), new_rows['low'].tolist(),
+                                        new_rows['close'].tolist()):
+                self.update(high, low, close, closed=True)
+            if len(new_rows):
+                self.last_closed_time = new_rows.index[-1]
+
+        if last_closed:
+            return self.snapshot()
+        last = df.iloc[-1]
+        return self.update(last['high'], last['low'], last['close'], closed=False)
+
+    def snapshot(self) -> Dict[str, float]:
+        """Son kapanmış mumdaki gösterge değerleri"""
+        return self._flatten({name: indicator.value for name, indicator in self.indicators.items()})
+
+    @staticmethod
+    def _flatten(values: Dict[str, object]) -> Dict[str, float]:
+        flat = {}
+        for name, value in values.items():
+            if isinstance(value, dict):
+                flat.update(value)
+            else:
+                flat[name] = value
+        return flat
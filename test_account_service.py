@@ -0,0 +1,154 @@
+import threading
+import time
+
+from account_service import AccountService
+
+
+class FakeClient:
+    def __init__(self, futures=False, delay=0.05, api_key='key'):
+        self.api_key = api_key
+        self.testnet = True
+        self.futures = futures
+        self.delay = delay
+        self.calls = []
+
+    def get_account(self):
+        self.calls.append(('account', threading.current_thread().name))
+        time.sleep(self.delay)
+        if self.futures:
+            return {'assets': [{'asset': 'USDT', 'walletBalance': '100'}],
+                    'positions': [{'symbol': 'BTCUSDT', 'positionSide': 'BOTH', 'positionAmt': '0.5'},
+                                  {'symbol': 'ETHUSDT', 'positionSide': 'BOTH', 'positionAmt': '0'}]}
+        return {'balances': [{'asset': 'BTC', 'free': '1.0', 'locked': '0.0'}]}
+
+    def get_open_orders(self):
+        self.calls.append(('orders', threading.current_thread().name))
+        time.sleep(self.delay)
+        return [{'symbol': 'BTCUSDT', 'orderId': 1, 'status': 'NEW'}]
+
+
+def test_snapshot_fetches_concurrently_and_caches():
+    service = AccountService(ttl=60)
+    client = FakeClient(delay=0.2)
+
+    started = time.perf_counter()
+    snapshot = service.snapshot(client)
+    elapsed = time.perf_counter() - started
+
+    # Hesap ve açık emirler paralel çekilir (~0.2 sn, sıralı olsa ~0.4 sn)
+    assert elapsed < 0.35
+    assert snapshot['balances'] == [{'asset': 'BTC', 'free': '1.0', 'locked': '0.0'}]
+    assert snapshot['open_orders'][0]['orderId'] == 1 and snapshot['positions'] == []
+    assert service.snapshot(client) is snapshot
+    assert len(client.calls) == 2
+
+    assert service.snapshot(client, max_age=0) is not snapshot
+    service.invalidate(client)
+    service.snapshot(client)
+    assert len(client.calls) == 6
+    assert service.stats()['hits'] == 1 and service.stats()['fetches'] == 3
+
+
+def test_concurrent_requests_share_one_fetch_and_errors_not_cached():
+    service = AccountService(ttl=60)
+    client = FakeClient(futures=True, delay=0.1)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(service.snapshot(client))) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(client.calls) == 2
+    assert all(result is results[0] for result in results)
+    # Futures pozisyonları aynı hesap yanıtından alınır
+    assert results[0]['positions'] == [{'symbol': 'BTCUSDT', 'positionSide': 'BOTH', 'positionAmt': '0.5'}]
+    assert service.stats()['shared'] + service.stats()['hits'] == 9
+
+    failing = FakeClient(api_key='other', delay=0)
+    failing.get_account = lambda: {'error': 'zaman aşımı'}
+    service.snapshot(failing)
+    service.snapshot(failing)
+    assert service.stats()['fetches'] == 3
+
+
+def test_snapshots_for_multiple_accounts():
+    service = AccountService(ttl=60)
+    live = FakeClient(api_key='live', delay=0.2)
+
+    def broken():
+        raise RuntimeError('istemci oluşturulamadı')
+
+    started = time.perf_counter()
+    results = service.snapshots({'testnet': lambda: FakeClient(delay=0.2), 'live': lambda: live,
+                                 'none': lambda: None, 'broken': broken})
+    assert time.perf_counter() - started < 0.35
+    assert results['testnet']['balances'][0]['asset'] == 'BTC' and results['live']['balances']
+    assert results['none'] is None and isinstance(results['broken'], RuntimeError)
+
+
+def test_user_data_events_update_cached_snapshot():
+    service = AccountService(ttl=0.01)
+    client = FakeClient(delay=0)
+    assert not service.apply_user_data_event(client, {'e': 'outboundAccountPosition', 'B': []})
+    original = service.snapshot(client)
+    service.attach_stream(client)
+
+    assert service.apply_user_data_event(client, {'e': 'outboundAccountPosition', 'E': 1700000000000, 'B': [
+        {'a': 'BTC', 'f': '0.4', 'l': '0.6'}, {'a': 'USDT', 'f': '50', 'l': '0'}]})
+    assert service.apply_user_data_event(client, {'e': 'executionReport', 's': 'BTCUSDT', 'i': 1, 'X': 'FILLED'})
+    assert service.apply_user_data_event(client, {'e': 'executionReport', 'E': 1700000000500, 's': 'ETHUSDT',
+                                                  'i': 2, 'X': 'NEW', 'S': 'BUY', 'p': '2000', 'q': '1'})
+    assert not service.apply_user_data_event(client, {'e': 'listStatus'})
+
+    time.sleep(0.05)
+    # Akışa bağlı hesapta TTL dolsa da REST çağrısı yapılmaz
+    snapshot = service.snapshot(client)
+    assert len(client.calls) == 2
+    assert snapshot['source'] == 'stream' and snapshot['updated'] == 1700000000500
+    assert snapshot['balances'] == [{'asset': 'BTC', 'free': '0.4', 'locked': '0.6'},
+                                    {'asset': 'USDT', 'free': '50', 'locked': '0'}]
+    assert [order['orderId'] for order in snapshot['open_orders']] == [2]
+    assert original['balances'][0]['free'] == '1.0' and len(original['open_orders']) == 1
+
+    service.detach_stream(client)
+    assert service.snapshot(client)['source'] == 'rest'
+
+
+def test_futures_account_update_event():
+    service = AccountService(ttl=60)
+    client = FakeClient(futures=True, delay=0)
+    service.snapshot(client)
+
+    assert service.apply_user_data_event(client, {'e': 'ACCOUNT_UPDATE', 'a': {
+        'B': [{'a': 'USDT', 'wb': '120', 'cw': '118'}],
+        'P': [{'s': 'BTCUSDT', 'ps': 'BOTH', 'pa': '0', 'ep': '0', 'up': '0'},
+              {'s': 'ETHUSDT', 'ps': 'BOTH', 'pa': '2', 'ep': '2000', 'up': '5'}]}})
+    assert service.apply_user_data_event(client, {'e': 'ORDER_TRADE_UPDATE', 'o': {
+        's': 'BTCUSDT', 'i': 1, 'X': 'CANCELED'}})
+
+    snapshot = service.snapshot(client)
+    assert snapshot['balances'] == [{'asset': 'USDT', 'walletBalance': '120', 'crossWalletBalance': '118'}]
+    assert [(p['symbol'], p['positionAmt']) for p in snapshot['positions']] == [('ETHUSDT', '2')]
+    assert snapshot['open_orders'] == []
+
+
+def test_balances_only_snapshot_skips_open_orders():
+    service = AccountService(ttl=60)
+    client = FakeClient(delay=0)
+
+    balances = service.snapshot(client, open_orders=False)
+    assert [call for call, _ in client.calls] == ['account']
+    assert balances['open_orders'] is None and balances['balances'][0]['asset'] == 'BTC'
+    assert service.snapshot(client, open_orders=False) is balances
+
+    # Bakiye özeti açık emir isteğini karşılamaz, tam özet ise bakiye isteğini karşılar
+    service.snapshot(client)
+    assert len(client.calls) == 3
+    service.invalidate(client)
+    full = service.snapshot(client)
+    assert service.snapshot(client, open_orders=False) is full
+    assert len(client.calls) == 5
+
+    results = service.snapshots({'live': lambda: FakeClient(api_key='live', delay=0)}, open_orders=False)
+    assert results['live']['open_orders'] is None
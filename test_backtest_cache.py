@@ -0,0 +1,135 @@
+import os
+import sys
+import importlib.util
+
+import numpy as np
+
+from backtest_cache import BacktestCache
+from backtest_jobs import BacktestJobManager, parse_backtest_request
+from kline_store import KlineStore, interval_to_ms, raw_klines_to_columns
+
+HOUR = interval_to_ms('1h')
+REQUEST = {'symbol': 'BTCUSDT', 'interval': '1h', 'strategy': 'CachedStrategy',
+           'start_date': '2024-01-01', 'end_date': '2024-01-03', 'take_profit_pct': '2'}
+
+
+class FakeConfig:
+    def __init__(self):
+        self.parameters = {'period': {'type': 'int', 'default': 14}}
+
+    def get_strategy_parameters(self, strategy_name):
+        return {'parameters': self.parameters}
+
+
+def load_strategy(monkeypatch, path, source):
+    path.write_text(source)
+    spec = importlib.util.spec_from_file_location('cached_strategy', path)
+    module = importlib.util.module_from_spec(spec)
+    monkeypatch.setitem(sys.modules, 'cached_strategy', module)  # inspect kaynak dosyayı modül üzerinden bulur
+    spec.loader.exec_module(module)
+    return module.CachedStrategy
+
+
+def fill_store(store, params):
+    start = int(params['start_date'].timestamp() * 1000)
+    end = int(params['end_date'].timestamp() * 1000)
+    rows = [[t, '1', '2', '0.5', str(1 + (t // HOUR) % 7), '10', t + HOUR - 1, '10', 1, '1', '1', '0']
+            for t in range(start + (-start % HOUR), end + 1, HOUR)]
+    store.merge(params['symbol'], params['interval'], start, end, raw_klines_to_columns(rows), now_ms=end * 2)
+
+
+def make_cache(tmp_path, **kwargs):
+    store = KlineStore(base_dir=str(tmp_path / 'klines'))
+    return BacktestCache(str(tmp_path / 'cache'), kline_store=store, config=FakeConfig(), **kwargs)
+
+
+def test_key_covers_inputs_and_requires_stored_data(tmp_path, monkeypatch):
+    cache = make_cache(tmp_path)
+    strategy = load_strategy(monkeypatch, tmp_path / 'strategy.py', 'class CachedStrategy:\n    pass\n')
+    params = parse_backtest_request(REQUEST)
+
+    assert cache.key(params, strategy) is None  # veri depoda yok
+    fill_store(cache.kline_store, params)
+    key = cache.key(params, strategy)
+
+    assert key == cache.key(parse_backtest_request(REQUEST), strategy)
+    variants = [dict(REQUEST, take_profit_pct='3'), dict(REQUEST, exit_mode='high_low'),
+                dict(REQUEST, parameters={'period': 20}), dict(REQUEST, end_date='2024-01-02')]
+    keys = {cache.key(parse_backtest_request(variant), strategy) for variant in variants}
+    assert None not in keys and key not in keys and len(keys) == len(variants)
+
+    cache.config.parameters['period']['value'] = 20
+    assert cache.key(params, strategy) == cache.key(parse_backtest_request(variants[2]), strategy)
+
+
+def test_key_changes_with_strategy_source_and_klines(tmp_path, monkeypatch):
+    cache = make_cache(tmp_path)
+    path = tmp_path / 'strategy.py'
+    strategy = load_strategy(monkeypatch, path, 'class CachedStrategy:\n    pass\n')
+    params = parse_backtest_request(REQUEST)
+    fill_store(cache.kline_store, params)
+    key = cache.key(params, strategy)
+
+    path.write_text('class CachedStrategy:\n    period = 9\n')
+    source_changed = cache.key(params, strategy)
+    assert source_changed != key
+
+    close = np.memmap(cache.kline_store._column_path('BTCUSDT', '1h', 'close'), dtype=np.float64, mode='r+')
+    close[3] += 1
+    close.flush()
+    del close
+    assert cache.key(params, strategy) not in (key, source_changed)
+
+
+def test_key_changes_with_imported_project_modules(tmp_path, monkeypatch):
+    import backtest_cache
+    monkeypatch.setattr(backtest_cache, 'SOURCE_DIRS', (str(tmp_path),))
+    (tmp_path / 'helpers').mkdir()
+    (tmp_path / 'helpers' / '__init__.py').write_text('')
+    indicator = tmp_path / 'helpers' / 'indicator.py'
+    indicator.write_text('import numpy\nPERIOD = 14\n')
+    cache = make_cache(tmp_path)
+    strategy = load_strategy(monkeypatch, tmp_path / 'strategy.py',
+                             'class CachedStrategy:\n    def run(self):\n        from helpers.indicator import PERIOD\n')
+    params = parse_backtest_request(REQUEST)
+    fill_store(cache.kline_store, params)
+    key = cache.key(params, strategy)
+
+    indicator.write_text('import numpy\nPERIOD = 21\n')
+    assert cache.key(params, strategy) != key
+
+
+def test_put_get_and_size_based_eviction(tmp_path):
+    payload = {'final_balance': 1010.5, 'trades': [{'pnl': 1.5}] * 20}
+    cache = make_cache(tmp_path)
+    cache.put('a' * 64, payload)
+    size = cache.stats()['bytes']
+    cache.max_bytes = size * 2
+
+    assert cache.get('a' * 64) == payload
+    assert cache.get('f' * 64) is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    cache.put('b' * 64, payload)
+    os.utime(cache._path('a' * 64), (1, 1))
+    os.utime(cache._path('b' * 64), (2, 2))
+    assert cache.get('a' * 64) == payload  # okuma son kullanım zamanını yeniler
+    cache.put('c' * 64, payload)
+
+    assert cache.get('b' * 64) is None
+    assert cache.get('a' * 64) == payload and cache.get('c' * 64) == payload
+    assert cache.stats()['entries'] == 2
+
+    disabled = make_cache(tmp_path, max_bytes=0)
+    assert not disabled.put('d' * 64, payload) and disabled.get('a' * 64) is None
+
+
+def test_cached_result_completes_without_process_pool():
+    manager = BacktestJobManager()
+    job = manager.submit(parse_backtest_request(REQUEST), result={'final_balance': 1200.0})
+
+    status = manager.snapshot(job.id, include_result=True)
+    assert status['state'] == 'completed' and status['cached']
+    assert status['result'] == {'final_balance': 1200.0}
+    assert status['percent'] == 100
+    assert not manager._running
@@ -0,0 +1,198 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest_engine import MODE_LONG_ONLY, MODE_LONG_SHORT, run_engine, signal_codes
+
+
+def legacy_long_only(close, signals, initial_balance, tp, sl, ts, risk):
+    """new_backtest.Backtester.run içindeki eski bar döngüsü"""
+    balance = equity = initial_balance
+    position = None
+    size = entry = highest = 0
+    trades, equity_curve = [], []
+    for i in range(1, len(close)):
+        price, signal = close[i], signals[i]
+        equity_curve.append(equity)
+        if position:
+            equity = balance + size * (price - entry) / entry
+            highest = max(highest, price)
+            tp_hit = tp is not None and price >= entry * (1 + tp / 100)
+            sl_hit = sl is not None and price <= entry * (1 - sl / 100)
+            ts_hit = ts is not None and price <= highest * (1 - ts / 100) and price > entry
+            if tp_hit or sl_hit or ts_hit or signal == "SELL":
+                pnl = size * (price - entry) / entry
+                trades.append((entry, price, size, pnl))
+                balance = balance + pnl
+                equity = balance
+                position = None
+        if position is None and signal == "BUY":
+            size = balance * risk / 100
+            entry = highest = price
+            position = "LONG"
+    return balance, equity_curve, trades
+
+
+def legacy_long_short(close, signals, initial_balance, tp, sl, ts, risk):
+    """backtest.Backtester.run içindeki eski bar döngüsü"""
+    balance = initial_balance
+    position = None
+    size = entry = highest = 0
+    lowest = float('inf')
+    trades, equity_curve = [], []
+    for i in range(1, len(close)):
+        price, signal = close[i], signals[i]
+        if position == 'LONG':
+            equity_curve.append(balance + size * (price / entry - 1))
+        elif position == 'SHORT':
+            equity_curve.append(balance + size * (1 - price / entry))
+        else:
+            equity_curve.append(balance)
+
+        exit_now = False
+        if position == 'LONG':
+            highest = max(highest, price)
+            exit_now = (price <= entry * (1 - sl / 100) or price >= entry * (1 + tp / 100)
+                        or (ts and price <= highest * (1 - ts / 100) and price > entry))
+        elif position == 'SHORT':
+            lowest = min(lowest, price)
+            exit_now = (price >= entry * (1 + sl / 100) or price <= entry * (1 - tp / 100)
+                        or (ts and price >= lowest * (1 + ts / 100) and price < entry))
+
+        if position is None:
+            if signal in ("BUY", "SELL"):
+                size = balance * risk / 100
+                entry = highest = lowest = price
+                position = "LONG" if signal == "BUY" else "SHORT"
+        elif exit_now or (position == "LONG" and signal == "SELL") or (position == "SHORT" and signal == "BUY"):
+            pnl = size * (price / entry - 1) if position == "LONG" else size * (1 - price / entry)
+            trades.append((entry, price, size, pnl))
+            balance += pnl
+            position = None
+            highest, lowest = 0, float('inf')
+    return balance, equity_curve, trades
+
+
+def make_market(n=3000, seed=7):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    signals = rng.choice(np.array(['BUY', 'SELL', 'HOLD'], dtype=object), size=n, p=[0.05, 0.05, 0.9])
+    return close, signals
+
+
+def assert_matches(engine_result, expected_balance, expected_equity, expected_trades):
+    assert engine_result.final_balance == expected_balance
+    np.testing.assert_array_equal(engine_result.equity, np.array(expected_equity))
+    trades = engine_result.trades
+    assert len(trades) == len(expected_trades)
+    if expected_trades:
+        expected = np.array(expected_trades)
+        np.testing.assert_array_equal(trades['entry_price'], expected[:, 0])
+        np.testing.assert_array_equal(trades['exit_price'], expected[:, 1])
+        np.testing.assert_array_equal(trades['position_size'], expected[:, 2])
+        np.testing.assert_array_equal(trades['profit_loss'], expected[:, 3])
+
+
+@pytest.mark.parametrize('tp, sl, ts', [(None, None, None), (2.0, 1.0, None), (3.0, 2.0, 0.5), (0.0, None, 0.0)])
+def test_long_only_mode_matches_legacy_loop(tp, sl, ts):
+    close, signals = make_market()
+    expected = legacy_long_only(close.tolist(), signals, 1000.0, tp, sl, ts, 10.0)
+
+    result = run_engine(close, signal_codes(signals), 1000.0, tp, sl, ts, None, 10.0, MODE_LONG_ONLY)
+
+    assert_matches(result, *expected)
+    assert (result.trades['side'] == 1).all()
+
+
+@pytest.mark.parametrize('tp, sl, ts', [(5.0, 3.0, None), (2.0, 1.0, 0.5), (1.0, 1.0, 0.0)])
+def test_long_short_mode_matches_legacy_loop(tp, sl, ts):
+    close, signals = make_market(seed=11)
+    expected = legacy_long_short(close.tolist(), signals, 1000.0, tp, sl, ts, 20.0)
+
+    result = run_engine(close, signal_codes(signals), 1000.0, tp, sl, ts, None, 20.0, MODE_LONG_SHORT)
+
+    assert_matches(result, *expected)
+    assert (result.trades['side'] == -1).any()
+
+
+def test_backtester_result_keeps_list_interface():
+    from new_backtest import Backtester, Trade
+
+    close, signals = make_market(n=500)
+    index = pd.date_range('2024-01-01', periods=len(close), freq='h')
+    df = pd.DataFrame({'open': close, 'high': close, 'low': close, 'close': close}, index=index)
+
+    class FixedSignals:
+        name = 'FixedSignals'
+
+        def generate_signals(self, data):
+            out = data.copy()
+            out['signal'] = signals
+            return out
+
+    result = Backtester().run(df, FixedSignals(), 'BTCUSDT', '1h', take_profit_pct=2.0, stop_loss_pct=1.0)
+    expected_balance, expected_equity, expected_trades = legacy_long_only(
+        close.tolist(), signals, 1000.0, 2.0, 1.0, None, 1.0)
+
+    assert result.final_balance == expected_balance
+    assert result.total_trades == len(expected_trades)
+    assert [value for _, value in result.equity_curve] == expected_equity
+    assert result.equity_curve[0][0] == index[1]
+    assert all(isinstance(trade, Trade) for trade in result.trades)
+    assert result.trades[0].entry_time < result.trades[0].exit_time
+
+
+def run_bars(bars, signals, mode=MODE_LONG_ONLY, **kwargs):
+    bars = np.array(bars, dtype=float)
+    return run_engine(bars[:, 3], signal_codes(signals), 1000.0, risk_per_trade_pct=100.0, mode=mode,
+                      open_=bars[:, 0], high=bars[:, 1], low=bars[:, 2], **kwargs)
+
+
+# open, high, low, close: 2. barda LONG açılır, 3. bar hem SL (99) hem TP (102) seviyesine dokunur
+BOTH_TOUCHED = [(100, 100, 100, 100), (100, 100, 100, 100), (100, 103, 98.5, 100.5)]
+ENTRY_SIGNALS = ['HOLD', 'BUY', 'HOLD']
+
+
+@pytest.mark.parametrize('priority, reason_price', [('stop_first', 99.0), ('target_first', 102.0)])
+def test_high_low_mode_applies_fill_priority(priority, reason_price):
+    result = run_bars(BOTH_TOUCHED, ENTRY_SIGNALS, take_profit_pct=2.0, stop_loss_pct=1.0,
+                      exit_mode='high_low', fill_priority=priority)
+
+    assert len(result.trades) == 1
+    assert result.trades['exit_index'][0] == 2
+    assert result.trades['exit_price'][0] == pytest.approx(reason_price)
+    assert result.final_balance == pytest.approx(1000.0 * reason_price / 100)
+
+
+def test_close_mode_ignores_intrabar_wicks():
+    result = run_bars(BOTH_TOUCHED, ENTRY_SIGNALS, take_profit_pct=2.0, stop_loss_pct=1.0)
+
+    assert len(result.trades) == 0
+
+
+def test_high_low_mode_fills_gaps_at_open():
+    bars = [(100, 100, 100, 100), (100, 100, 100, 100), (97, 104, 96, 103)]
+    result = run_bars(bars, ENTRY_SIGNALS, take_profit_pct=2.0, stop_loss_pct=1.0,
+                      exit_mode='high_low', fill_priority='target_first')
+
+    # Açılış stop seviyesinin altında olduğu için öncelik ne olursa olsun açılıştan stop olur
+    assert result.trades['exit_price'][0] == 97.0
+
+
+def test_high_low_mode_short_side_and_trailing_stop():
+    # 2. barda SHORT açılır; düşük seviyeler trailing stop'u aşağı çeker, 5. barda yükseliş stop'u tetikler
+    bars = [(100, 100, 100, 100), (100, 100, 100, 100), (99, 99.5, 95, 96),
+            (96, 96.5, 94, 95), (95, 97.5, 94.5, 97)]
+    result = run_bars(bars, ['HOLD', 'SELL', 'HOLD', 'HOLD', 'HOLD'], mode=MODE_LONG_SHORT,
+                      trailing_stop_pct=3.0, exit_mode='high_low')
+
+    trade = result.trades[0]
+    assert trade['side'] == -1
+    assert trade['exit_index'] == 4
+    assert trade['exit_price'] == pytest.approx(94 * 1.03)
+    assert trade['profit_loss'] > 0
+
+
+def test_high_low_mode_requires_ohlc():
+    with pytest.raises(ValueError):
+        run_engine(np.ones(3), np.zeros(3, dtype=np.int8), exit_mode='high_low')
@@ -0,0 +1,161 @@
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import backtest_jobs
+from backtest_jobs import BacktestJobManager, fetch_chunks, parse_backtest_request, run_backtest_job
+from kline_planner import plan_kline_requests
+
+REQUEST = {'symbol': 'btcusdt', 'interval': '1h', 'strategy': 'AlwaysSignalStrategy',
+           'start_date': '2024-01-01', 'end_date': '2024-03-01'}
+
+
+# Süreçlere gönderildikleri için çalıştırıcılar modül seviyesinde tanımlı olmalı
+def quick_runner(params, context):
+    for phase in backtest_jobs.PHASES:
+        context.progress(phase, 50)
+        context.progress(phase, 100)
+    return {'symbol': params['symbol'], 'value': params.get('value')}
+
+
+def slow_runner(params, context):
+    context.progress('fetch', 10)
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        context.check()
+        time.sleep(0.02)
+    return {}
+
+
+def failing_runner(params, context):
+    raise ValueError('veri yok')
+
+
+class FakeContext:
+    def __init__(self):
+        self.updates = []
+
+    def progress(self, phase, percent):
+        self.updates.append((phase, int(percent)))
+
+    def check(self):
+        pass
+
+
+def wait_for(manager, job_id, states, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = manager.snapshot(job_id, include_result=True)
+        if job['state'] in states:
+            return job
+        manager.wait(job_id, job['version'], timeout=0.5)
+    raise AssertionError(f"İş {states} durumuna geçmedi: {manager.snapshot(job_id)}")
+
+
+@pytest.fixture
+def manager_factory():
+    managers = []
+
+    def create(runner, **kwargs):
+        manager = BacktestJobManager(runner, **kwargs)
+        managers.append(manager)
+        return manager
+
+    yield create
+    for manager in managers:
+        manager.shutdown()
+
+
+def test_parse_request_validates_fields():
+    params = parse_backtest_request(dict(REQUEST, take_profit_pct='2', stop_loss_pct=''))
+
+    assert params['symbol'] == 'BTCUSDT'
+    assert params['take_profit_pct'] == 2.0 and params['stop_loss_pct'] is None
+    assert params['start_date'] == datetime(2024, 1, 1)
+
+    for bad in ({'start_date': None}, {'end_date': '2024/03/01'}, {'start_date': '2024-04-01'},
+                {'exit_mode': 'open'}, {'interval': '7m'}):
+        with pytest.raises(ValueError):
+            parse_backtest_request(dict(REQUEST, **bad))
+
+
+def test_fetch_chunks_follow_request_windows():
+    start, end = datetime(2023, 1, 1), datetime(2024, 1, 1)
+    windows = plan_kline_requests('1h', int(start.timestamp() * 1000), int(end.timestamp() * 1000))
+    chunks = fetch_chunks('1h', start, end, chunks=4)
+
+    assert len(windows) == 9 and len(chunks) == 4
+    assert chunks[0][0] == start and chunks[-1][1] == end
+    window_starts = {datetime.fromtimestamp(window[0] / 1000) for window in windows}
+    assert all(chunk[0] in window_starts for chunk in chunks)
+    assert fetch_chunks('1d', start, start + pd.Timedelta(days=3), chunks=10) == [(start, start + pd.Timedelta(days=3))]
+
+
+def test_run_backtest_job_reports_every_phase(monkeypatch):
+    from binance_api import BinanceAPI
+
+    def fake_klines(self, symbol, interval, start_date, end_date=None):
+        index = pd.date_range(start_date, end_date, freq='h')
+        close = 100 + np.sin(np.arange(len(index)) / 5) * 10
+        return pd.DataFrame({'open': close, 'high': close + 1, 'low': close - 1, 'close': close,
+                             'volume': 1.0}, index=index)
+
+    monkeypatch.setattr(BinanceAPI, '__init__', lambda self: None)
+    monkeypatch.setattr(BinanceAPI, 'get_historical_klines', fake_klines)
+    context = FakeContext()
+
+    payload = run_backtest_job(parse_backtest_request(REQUEST), context)
+
+    fetch = [percent for phase, percent in context.updates if phase == 'fetch']
+    assert fetch[0] == 0 and fetch[-1] == 100 and fetch == sorted(fetch) and len(fetch) > 2
+    assert ('signals', 100) in context.updates and context.updates[-1] == ('simulation', 100)
+    assert payload['symbol'] == 'BTCUSDT'
+    assert payload['date_range']['data_points'] == len(pd.date_range('2024-01-01', '2024-03-01', freq='h'))
+    assert len(payload['curve']['time']) == len(payload['curve']['equity']) == payload['date_range']['data_points'] - 1
+    assert payload['curve']['time'][0] == int(pd.Timestamp('2024-01-01 01:00').timestamp() * 1000)
+
+
+def test_job_completes_with_result_and_progress(manager_factory):
+    manager = manager_factory(quick_runner, max_workers=1)
+    job = manager.submit({'symbol': 'BTCUSDT', 'value': 7})
+
+    done = wait_for(manager, job.id, backtest_jobs.FINISHED_STATES)
+
+    assert done['state'] == 'completed'
+    assert done['result'] == {'symbol': 'BTCUSDT', 'value': 7}
+    assert done['progress'] == {'fetch': 100, 'signals': 100, 'simulation': 100}
+    assert done['percent'] == 100
+    assert manager.list_jobs()[0]['id'] == job.id
+
+
+def test_cancel_running_and_queued_jobs(manager_factory):
+    manager = manager_factory(slow_runner, max_workers=1)
+    running = manager.submit({'symbol': 'BTCUSDT'})
+    queued = manager.submit({'symbol': 'ETHUSDT'})
+    wait_for(manager, running.id, ('running',))
+    assert wait_for(manager, running.id, ('running',))['progress']['fetch'] in (0, 10)
+
+    assert manager.cancel(queued.id)
+    assert manager.snapshot(queued.id)['state'] == 'cancelled'
+    assert manager.cancel(running.id)
+
+    assert wait_for(manager, running.id, backtest_jobs.FINISHED_STATES)['state'] == 'cancelled'
+    assert not manager.cancel(running.id)
+    assert not manager.cancel('missing')
+
+
+def test_failed_jobs_are_kept_in_bounded_history(manager_factory):
+    manager = manager_factory(failing_runner, max_workers=2, history_size=2)
+    jobs = [manager.submit({'symbol': f"S{i}"}) for i in range(3)]
+    deadline = time.time() + 30
+    while manager.active and time.time() < deadline:
+        time.sleep(0.05)
+
+    kept = manager.list_jobs()
+    assert len(manager.history) == len(kept) == 2
+    assert {job['id'] for job in kept} < {job.id for job in jobs}
+    assert all(job['state'] == 'failed' and job['error'] == 'ValueError: veri yok' for job in kept)
+    assert 'ValueError' in manager.get(kept[0]['id']).traceback
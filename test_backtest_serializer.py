@@ -0,0 +1,116 @@
+import json
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest_serializer import (columnar_result, dumps_json, loads_json, negotiate_format, render,
+                                 to_rows, ARROW_AVAILABLE)
+from new_backtest import Backtester
+
+
+class AlternatingStrategy:
+    name = 'Alternating'
+
+    def generate_signals(self, df):
+        signals = df.copy()
+        phase = np.arange(len(df)) % 10
+        signals['signal'] = np.where(phase == 0, 'BUY', np.where(phase == 5, 'SELL', 'HOLD'))
+        return signals
+
+
+@pytest.fixture(scope='module')
+def backtest():
+    rows = 500
+    index = pd.date_range('2024-01-01', periods=rows, freq='h')
+    close = 100 + np.sin(np.arange(rows) / 7) * 5
+    df = pd.DataFrame({'open': close, 'high': close + 1, 'low': close - 1, 'close': close, 'volume': 1.0},
+                      index=index)
+    result = Backtester().run(df, AlternatingStrategy(), 'BTCUSDT', '1h', 1000.0, take_profit_pct=2.0,
+                              risk_per_trade_pct=10.0)
+    return result, df
+
+
+def test_columnar_result_matches_legacy_lists(backtest):
+    result, df = backtest
+    payload = columnar_result(result, df, datetime(2024, 1, 1), datetime(2024, 1, 21))
+
+    curve = payload['curve']
+    assert len(curve['time']) == len(result.equity_curve) == len(df) - 1
+    assert curve['time'][0] == int(df.index[1].timestamp() * 1000)
+    np.testing.assert_array_equal(curve['equity'], [value for _, value in result.equity_curve])
+    np.testing.assert_array_equal(curve['balance'], [value for _, value in result.balance_history])
+
+    trades = payload['trades']
+    assert len(trades['pnl']) == len(result.trades) == payload['total_trades'] > 0
+    assert trades['entry_time'][0] == int(result.trades[0].entry_time.timestamp() * 1000)
+    np.testing.assert_array_equal(trades['pnl'], [trade.profit_loss for trade in result.trades])
+    assert payload['profit_loss_percent'] == result.total_profit_loss_pct
+    assert payload['date_range'] == {'start_date': '2024-01-01', 'end_date': '2024-01-21', 'data_points': 500}
+
+
+def test_row_format_survives_json_round_trip(backtest):
+    result, df = backtest
+    payload = columnar_result(result, df, datetime(2024, 1, 1), datetime(2024, 1, 21))
+
+    rows = to_rows(payload)
+    assert rows['equity_curve'][0] == [df.index[1].strftime('%Y-%m-%d %H:%M:%S'), result.equity_curve[0][1]]
+    first = result.trades[0]
+    assert rows['trades'][0] == {
+        'entry_time': first.entry_time.strftime('%Y-%m-%d %H:%M:%S'), 'entry_price': first.entry_price,
+        'exit_time': first.exit_time.strftime('%Y-%m-%d %H:%M:%S'), 'exit_price': first.exit_price,
+        'side': 'LONG', 'pnl': first.profit_loss, 'pnl_percent': first.profit_loss_pct}
+
+    # Önbellekten okunan sonuçta diziler listeye dönüşür; satır biçimi aynı kalmalı
+    assert to_rows(loads_json(dumps_json(payload))) == rows
+
+    body, mimetype = render(payload, 'json')
+    assert mimetype == 'application/json' and json.loads(body)['trades'] == rows['trades']
+
+
+def test_columnar_body_is_smaller_than_rows(backtest):
+    result, df = backtest
+    payload = columnar_result(result, df, datetime(2024, 1, 1), datetime(2024, 1, 21))
+
+    columnar, _ = render(payload, 'columnar')
+    legacy, _ = render(payload, 'json')
+
+    decoded = json.loads(columnar)
+    assert decoded['format'] == 'columnar'
+    assert decoded['curve']['equity'] == pytest.approx(list(payload['curve']['equity']))
+    assert len(columnar) < len(legacy)
+
+
+def test_negotiate_format():
+    assert negotiate_format(None) == 'json'
+    assert negotiate_format('COLUMNAR') == 'columnar'
+    with pytest.raises(ValueError):
+        negotiate_format('xml')
+    if not ARROW_AVAILABLE:
+        with pytest.raises(ValueError):
+            negotiate_format('arrow')
+
+
+def test_arrow_stream_carries_curve_and_trades(backtest):
+    pa = pytest.importorskip('pyarrow')
+    result, df = backtest
+    payload = columnar_result(result, df, datetime(2024, 1, 1), datetime(2024, 1, 21))
+
+    body, mimetype = render(payload, 'arrow')
+    table = pa.ipc.open_stream(body).read_all()
+
+    assert mimetype == 'application/vnd.apache.arrow.stream'
+    assert table.num_rows == len(payload['curve']['equity'])
+    assert json.loads(table.schema.metadata[b'trades'])['pnl'] == pytest.approx(list(payload['trades']['pnl']))
+
+
+def test_standard_json_fallback_matches_orjson(backtest, monkeypatch):
+    import backtest_serializer
+
+    result, df = backtest
+    payload = columnar_result(result, df, datetime(2024, 1, 1), datetime(2024, 1, 21))
+    fast = json.loads(dumps_json(payload))
+
+    monkeypatch.setattr(backtest_serializer, 'ORJSON_AVAILABLE', False)
+    assert json.loads(dumps_json(payload)) == fast
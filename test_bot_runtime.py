@@ -0,0 +1,167 @@
+import time
+import threading
+
+import pytest
+
+from bot_runtime import BotRuntime
+from candle_scheduler import ServerClock
+from conftest import make_ohlcv
+
+
+class FakeClient:
+    def __init__(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def get_historical_klines(self, symbol, interval, limit=500, start_time=None, end_time=None):
+        with self.lock:
+            self.calls.append((symbol, interval))
+        return make_ohlcv(60, 2, start='2024-01-01', spread=0.01)
+
+
+class FixedStrategy:
+    def __init__(self, signal='BUY', confidence=90.0, fail=False):
+        self.signal = signal
+        self.confidence = confidence
+        self.fail = fail
+        self.frames = []
+
+    def analyze(self, df):
+        if self.fail:
+            raise RuntimeError('strateji hatası')
+        self.frames.append(df)
+        df['touched'] = 1  # Stratejiler veriyi değiştirebilir; çalışanlar kendi kopyasını alır
+        return self.signal, self.confidence, {'close': float(df['close'].iloc[-1])}
+
+
+class FakeStream:
+    """Kline akışı yerine geçen nesne; close() ile mum kapanışı üretir"""
+
+    def __init__(self):
+        self.connected = True
+        self.closes = 0
+        self.listeners = []
+        self.unsubscribed = []
+        self.buffers = {}
+
+    def close_count(self, symbol, interval):
+        return self.closes
+
+    def frame(self, symbol, interval, include_forming=True):
+        return make_ohlcv(60, self.closes + 10, start='2024-01-01', spread=0.01)
+
+    def add_listener(self, callback):
+        self.listeners.append(callback)
+
+    def unsubscribe(self, symbol, interval):
+        self.unsubscribed.append((symbol, interval))
+
+    def close(self):
+        self.closes += 1
+        for callback in self.listeners:
+            callback('BTCUSDT', '1m', None)
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+@pytest.fixture
+def strategies():
+    return {'Buy': FixedStrategy('BUY', 90.0), 'Hold': FixedStrategy('HOLD', 10.0),
+            'Broken': FixedStrategy(fail=True)}
+
+
+def test_workers_on_same_symbol_share_one_fetch(strategies):
+    client = FakeClient()
+    orders = []
+    runtime = BotRuntime(strategies.get, lambda: client, order_handler=lambda w, s, c: orders.append((w.id, s)),
+                         tick=0.01)
+    try:
+        runtime.start_worker('btcusdt', '1h', 'Buy')
+        runtime.start_worker('BTCUSDT', '1h', 'Hold')
+        runtime.start_worker('ETHUSDT', '1h', 'Broken')
+        assert wait_until(lambda: all(w['metrics']['evaluations'] for w in runtime.list_workers()))
+    finally:
+        runtime.shutdown()
+
+    assert sorted(client.calls) == [('BTCUSDT', '1h'), ('ETHUSDT', '1h')]
+    assert strategies['Buy'].frames[0] is not strategies['Hold'].frames[0]
+    assert orders == [('BTCUSDT:1h:Buy', 'BUY')]
+
+
+def test_status_reports_workers_feeds_and_errors(strategies):
+    client = FakeClient()
+    runtime = BotRuntime(strategies.get, lambda: client, tick=0.01)
+    try:
+        runtime.start_worker('BTCUSDT', '1h', 'Hold')
+        runtime.start_worker('ETHUSDT', '4h', 'Broken')
+        assert wait_until(lambda: all(w['metrics']['evaluations'] for w in runtime.list_workers()))
+
+        with pytest.raises(ValueError):
+            runtime.start_worker('BTCUSDT', '1h', 'Hold')
+        with pytest.raises(ValueError):
+            runtime.start_worker('BTCUSDT', '1h', 'Missing')
+
+        status = runtime.status()
+    finally:
+        runtime.shutdown()
+
+    workers = {w['id']: w for w in status['workers']}
+    assert status['running'] and len(status['feeds']) == 2
+    assert workers['BTCUSDT:1h:Hold']['last_signal']['signal'] == 'HOLD'
+    assert workers['BTCUSDT:1h:Hold']['last_signal']['indicators']['ema20'] is not None
+    assert workers['ETHUSDT:4h:Broken']['status'] == 'error'
+    assert workers['ETHUSDT:4h:Broken']['metrics']['errors'] == 1
+
+
+def test_stream_close_triggers_evaluation_and_stop_unsubscribes(strategies):
+    client = FakeClient()
+    stream = FakeStream()
+    runtime = BotRuntime(strategies.get, lambda: client, stream_provider=lambda symbol, interval: stream,
+                         tick=10)
+    try:
+        worker = runtime.start_worker('BTCUSDT', '1m', 'Hold')
+        assert wait_until(lambda: worker.evaluations == 1)
+
+        stream.close()
+        assert wait_until(lambda: worker.evaluations == 2)
+        assert client.calls == []
+
+        assert runtime.stop_worker(worker.id)
+        assert not runtime.stop_worker(worker.id)
+    finally:
+        runtime.shutdown()
+
+    assert stream.unsubscribed == [('BTCUSDT', '1m')]
+    assert worker.status == 'stopped'
+    status = runtime.status()
+    assert (status['running'], status['workers'], status['feeds']) == (False, [], [])
+
+
+def test_rest_feeds_closing_together_fire_as_one_batch(strategies):
+    client = FakeClient()
+    # Sunucu saati bir dakika sınırından 300 ms önceye ayarlanır
+    clock = ServerClock()
+    now = time.time() * 1000
+    clock.offset_ms = (now // 60000 + 1) * 60000 - 300 - now
+    runtime = BotRuntime(strategies.get, lambda: client, clock=clock, fire_delay_ms=20, tick=0.01)
+    try:
+        runtime.start_worker('BTCUSDT', '1m', 'Hold')
+        runtime.start_worker('ETHUSDT', '1m', 'Buy')
+        assert wait_until(lambda: runtime.candles.metrics()['firings'] == 1)
+        assert wait_until(lambda: len(client.calls) == 4)
+        metrics = runtime.candles.metrics()
+    finally:
+        runtime.shutdown()
+
+    firing = metrics['recent'][0]
+    assert firing['source'] == 'schedule'
+    assert sorted(map(tuple, firing['jobs'])) == [('BTCUSDT', '1m'), ('ETHUSDT', '1m')]
+    assert firing['boundary'] % 60000 == 0
+    assert 20 <= firing['fire_lag_ms'] <= firing['latency_ms'] < 2000
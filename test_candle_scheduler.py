@@ -0,0 +1,104 @@
+import time
+import threading
+
+import pytest
+
+from candle_scheduler import CandleScheduler, ServerClock, last_close_ms, next_close_ms
+
+MINUTE = 60 * 1000
+HOUR = 60 * MINUTE
+MONDAY = 1_704_067_200_000  # 2024-01-01 00:00 UTC (pazartesi)
+
+
+class FixedClock(ServerClock):
+    """Testler için elle ilerletilen saat"""
+
+    def __init__(self, now):
+        super().__init__()
+        self.now = now
+
+    def now_ms(self):
+        return self.now
+
+
+def test_next_close_is_aligned_to_interval_boundaries():
+    assert next_close_ms('1m', MONDAY) == MONDAY + MINUTE
+    assert next_close_ms('1m', MONDAY + 1) == MONDAY + MINUTE
+    assert next_close_ms('4h', MONDAY + 5 * HOUR) == MONDAY + 8 * HOUR
+    assert next_close_ms('1w', MONDAY + 3 * 24 * HOUR) == MONDAY + 7 * 24 * HOUR
+    assert next_close_ms('1M', MONDAY + 40 * 24 * HOUR) == 1_709_251_200_000  # 2024-03-01
+    assert last_close_ms('1h', MONDAY + 90 * MINUTE) == MONDAY + HOUR
+
+
+def test_jobs_due_at_same_boundary_fire_together():
+    clock = FixedClock(MONDAY + 2 * MINUTE + 10)
+    scheduler = CandleScheduler(lambda firing: None, clock=clock, fire_delay_ms=25)
+    scheduler.add(('BTCUSDT', '1m'), '1m')
+    scheduler.add(('ETHUSDT', '1m'), '1m')
+    scheduler.add(('BTCUSDT', '5m'), '5m')
+
+    clock.now = MONDAY + 3 * MINUTE + 24
+    assert scheduler.due() == []
+
+    clock.now = MONDAY + 3 * MINUTE + 30
+    [firing] = scheduler.due()
+    assert firing.boundary_ms == MONDAY + 3 * MINUTE
+    assert firing.keys == [('BTCUSDT', '1m'), ('ETHUSDT', '1m')]
+    assert firing.fire_lag_ms == 30
+
+    # Geç kalınan 4m kapanışı atlanır; 5m sınırında her iki aralık aynı tetiklemede
+    clock.now = MONDAY + 5 * MINUTE + 40
+    [firing] = scheduler.due()
+    assert firing.boundary_ms == MONDAY + 5 * MINUTE
+    assert sorted(firing.keys) == [('BTCUSDT', '1m'), ('BTCUSDT', '5m'), ('ETHUSDT', '1m')]
+    assert scheduler.next_fire_ms() == MONDAY + 6 * MINUTE + 25
+
+
+def test_removed_jobs_stop_firing_and_latency_is_recorded():
+    clock = FixedClock(MONDAY + 10)
+    scheduler = CandleScheduler(lambda firing: None, clock=clock, fire_delay_ms=0)
+    scheduler.add('a', '1m')
+    scheduler.remove('a')
+    clock.now = MONDAY + MINUTE
+    assert scheduler.due() == [] and scheduler.next_fire_ms() is None
+
+    firing = scheduler.begin(MONDAY + MINUTE, ['b'], 'stream', fired_ms=MONDAY + MINUTE + 5)
+    clock.now = MONDAY + MINUTE + 45
+    scheduler.complete(firing, fetch_ms=12.5)
+
+    metrics = scheduler.metrics()
+    assert metrics['firings'] == 1
+    assert metrics['latency_ms']['max'] == 45
+    assert metrics['recent'][0] == {'boundary': MONDAY + MINUTE, 'jobs': ['b'], 'source': 'stream',
+                                    'fire_lag_ms': 5, 'fetch_ms': 12.5, 'latency_ms': 45}
+
+
+def test_server_clock_measures_offset():
+    clock = ServerClock(lambda: time.time() * 1000 + 5000, sync_interval=3600)
+
+    now = clock.now_ms()
+
+    assert clock.offset_ms == pytest.approx(5000, abs=50)
+    assert now == pytest.approx(time.time() * 1000 + 5000, abs=100)
+
+
+def test_thread_fires_shortly_after_close():
+    fired = threading.Event()
+    clock = ServerClock()
+    now = time.time() * 1000
+    clock.offset_ms = (now // MINUTE + 1) * MINUTE - 200 - now
+
+    def handler(firing):
+        scheduler.complete(firing)
+        fired.set()
+
+    scheduler = CandleScheduler(handler, clock=clock, fire_delay_ms=10)
+    scheduler.add('job', '1m')
+    scheduler.start()
+    try:
+        assert fired.wait(3)
+    finally:
+        scheduler.stop()
+
+    recent = scheduler.metrics()['recent'][0]
+    assert 10 <= recent['fire_lag_ms'] < 500
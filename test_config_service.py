@@ -0,0 +1,108 @@
+import json
+import os
+
+import pytest
+
+from config_service import ConfigService
+from strategy_config import StrategyConfig
+from strategy_manager import _invalidate_changed_strategies
+from strategy_pool import get_strategy_pool
+
+
+def bump_mtime(path, seconds=2):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + seconds * 1_000_000_000))
+
+
+def validate(data):
+    if not isinstance(data.get('limit'), int):
+        raise ValueError('limit tamsayı olmalı')
+    return data
+
+
+@pytest.fixture
+def service():
+    events = []
+    service = ConfigService(poll_interval=0.05)
+    service.add_listener(lambda path, old, new, source: events.append((old, new, source)))
+    service.events_seen = events
+    return service
+
+
+def test_write_is_atomic_and_served_from_memory(tmp_path, service):
+    path = tmp_path / 'nested' / 'settings.json'
+    config_file = service.file(str(path), default=lambda: {'limit': 1}, validate=validate, create=True)
+
+    assert json.loads(path.read_text()) == {'limit': 1}
+    before = config_file.data
+    assert config_file.update(lambda data: data.update(limit=5))
+    # Eski nesne yerinde değişmez, yeni nesne yayınlanır
+    assert before == {'limit': 1} and config_file.data == {'limit': 5}
+    assert json.loads(path.read_text()) == {'limit': 5}
+    assert not config_file.update(lambda data: data.update(limit='çok'))
+    assert config_file.data == {'limit': 5} and json.loads(path.read_text()) == {'limit': 5}
+    assert os.listdir(path.parent) == ['settings.json']
+
+    assert service.file(str(path)) is config_file
+    assert [source for _, _, source in service.events_seen] == ['write']
+    assert config_file.stats()['writes'] == 2 and config_file.stats()['errors'] == 1
+
+
+def test_external_changes_hot_reloaded(tmp_path, service):
+    path = tmp_path / 'settings.json'
+    path.write_text(json.dumps({'limit': 1}))
+    config_file = service.file(str(path), validate=validate)
+    assert service.check() == 0
+
+    path.write_text(json.dumps({'limit': 2}))
+    bump_mtime(path)
+    assert service.check() == 1
+    assert config_file.data == {'limit': 2}
+    assert service.events_seen[-1] == ({'limit': 1}, {'limit': 2}, 'file')
+
+    # Geçersiz içerik eski ayarları bozmaz
+    path.write_text('{bozuk')
+    bump_mtime(path, 4)
+    assert service.check() == 0
+    assert config_file.data == {'limit': 2} and config_file.errors == 1
+
+    service.start()
+    try:
+        path.write_text(json.dumps({'limit': 3}))
+        bump_mtime(path, 6)
+        for _ in range(100):
+            if config_file.data == {'limit': 3}:
+                break
+            service._stop.wait(0.02)
+        assert config_file.data == {'limit': 3}
+    finally:
+        service.stop()
+
+
+class CrossoverStrategy:
+    def __init__(self, params=None):
+        self.params = params or {}
+
+
+def test_strategy_config_shares_memory_and_invalidates_pool(tmp_path):
+    path = tmp_path / 'config.json'
+    path.write_text(json.dumps({'strategies': {'CrossoverStrategy': {'parameters': {
+        'fast': {'type': 'int', 'default': 5, 'min': 3, 'max': 9}}}}}))
+    first, second = StrategyConfig(str(path)), StrategyConfig(str(path))
+    first._file.service.add_listener(_invalidate_changed_strategies)
+    pool = get_strategy_pool()
+    instance = pool.get(CrossoverStrategy)
+
+    try:
+        assert first.update_strategy_parameter('CrossoverStrategy', 'fast', 7)
+        assert second.get_strategy_parameters('CrossoverStrategy')['parameters']['fast']['default'] == 7
+        assert json.loads(path.read_text())['strategies']['CrossoverStrategy']['parameters']['fast']['default'] == 7
+        assert pool.get(CrossoverStrategy) is not instance
+
+        path.write_text(json.dumps({'strategies': []}))
+        bump_mtime(path)
+        # Geçersiz yapı yüklenmez
+        assert StrategyConfig(str(path)).get_all_strategies() == ['CrossoverStrategy']
+    finally:
+        first._file.service.remove_listener(_invalidate_changed_strategies)
+        pool.invalidate('CrossoverStrategy')
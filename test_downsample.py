@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from downsample import downsample_indices, downsample_payload, lttb_indices, minmax_indices
+
+
+def reference_lttb(x, y, threshold):
+    """Orijinal LTTB algoritmasının nokta nokta Python uygulaması (karşılaştırma için)"""
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+    every = (n - 2) / (threshold - 2)
+    selected = [0]
+    a = 0
+    for i in range(threshold - 2):
+        next_start = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        if i == threshold - 3:
+            next_start, next_end = n - 1, n
+        avg_x = sum(x[next_start:next_end]) / (next_end - next_start)
+        avg_y = sum(y[next_start:next_end]) / (next_end - next_start)
+
+        start, end = int(i * every) + 1, int((i + 1) * every) + 1
+        if i == threshold - 3:
+            end = n - 1
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs((x[a] - avg_x) * (y[j] - y[a]) - (x[a] - x[j]) * (avg_y - y[a]))
+            if area > best_area:
+                best, best_area = j, area
+        selected.append(best)
+        a = best
+    selected.append(n - 1)
+    return selected
+
+
+@pytest.mark.parametrize('n, threshold', [(1000, 50), (997, 101), (5000, 3), (10, 9), (20, 30)])
+def test_lttb_matches_reference(n, threshold):
+    rng = np.random.default_rng(n + threshold)
+    x = np.arange(n, dtype=np.float64) * 60000
+    y = 1000 + np.cumsum(rng.normal(0, 1, n))
+
+    indices = lttb_indices(x, y, threshold)
+
+    assert indices.tolist() == reference_lttb(x.tolist(), y.tolist(), threshold)
+    assert len(indices) == min(n, threshold)
+
+
+def test_minmax_keeps_bucket_extremes():
+    rng = np.random.default_rng(3)
+    y = np.cumsum(rng.normal(0, 1, 10_001))
+    y[4321] = y.max() + 50  # ani tepe
+    y[777] = y.min() - 50   # ani dip
+
+    indices = minmax_indices(y, 400)
+
+    assert len(indices) <= 402
+    assert np.all(np.diff(indices) > 0)
+    assert {0, 777, 4321, 10_000} <= set(indices.tolist())
+    starts = (np.arange(200) * (len(y) / 200)).astype(int)
+    for lo, hi in zip(starts, np.append(starts[1:], len(y))):
+        bucket = set(indices[(indices >= lo) & (indices < hi)].tolist())
+        assert lo + int(np.argmin(y[lo:hi])) in bucket and lo + int(np.argmax(y[lo:hi])) in bucket
+
+
+def test_downsample_payload_samples_curve_columns_together():
+    n = 5000
+    curve = {'time': np.arange(n, dtype=np.int64) * 60000, 'equity': np.sin(np.arange(n) / 50) + 10,
+             'balance': np.arange(n, dtype=np.float64)}
+    payload = {'curve': curve, 'trades': {'pnl': np.ones(3)}, 'final_balance': 1.0}
+
+    full = downsample_payload(payload, None)
+    sampled = downsample_payload(payload, 300)
+    minmax = downsample_payload(payload, 300, 'minmax')
+
+    assert full['curve'] is curve and full['curve_info'] == {'points': n, 'returned': n, 'method': None}
+    assert sampled['curve_info'] == {'points': n, 'returned': 300, 'method': 'lttb'}
+    assert len(minmax['curve']['time']) <= 302
+    # Bakiye ve zaman equity ile aynı indekslerden alınır
+    np.testing.assert_array_equal(sampled['curve']['balance'], sampled['curve']['time'] / 60000)
+    assert sampled['trades'] is payload['trades'] and payload['curve'] is curve
+
+    with pytest.raises(ValueError):
+        downsample_indices(curve['time'], curve['equity'], 100, 'average')
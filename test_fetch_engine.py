@@ -0,0 +1,106 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from fetch_engine import FetchEngine, RestKlineFetcher, WeightLimiter, kline_request_weight
+from kline_planner import align_open_time, fetch_planned_klines, interval_to_ms
+
+MINUTE = interval_to_ms('1m')
+START = 1_600_000_000_000 - (1_600_000_000_000 % MINUTE)
+
+
+class StubKlineHandler(BaseHTTPRequestHandler):
+    """Binance kline uç noktasını taklit eden sahte sunucu"""
+    delay = 0.05
+    used_weight = 0
+    lock = threading.Lock()
+    active = 0
+    max_active = 0
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.active += 1
+            cls.max_active = max(cls.max_active, cls.active)
+            cls.used_weight += 5
+            used_weight = cls.used_weight
+        time.sleep(cls.delay)
+
+        params = {key: values[0] for key, values in parse_qs(urlparse(self.path).query).items()}
+        limit = int(params['limit'])
+        first = align_open_time(int(params['startTime']), '1m')
+        end = int(params['endTime'])
+        rows = [[t, '1', '1', '1', '1', '1', t + MINUTE - 1, '1', 1, '1', '1', '0']
+                for t in range(first, end + 1, MINUTE)][:limit]
+        body = json.dumps(rows).encode()
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('X-MBX-USED-WEIGHT-1M', str(used_weight))
+        self.end_headers()
+        self.wfile.write(body)
+        with cls.lock:
+            cls.active -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    StubKlineHandler.used_weight = 0
+    StubKlineHandler.active = 0
+    StubKlineHandler.max_active = 0
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubKlineHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_parallel_download_is_complete_and_concurrent(stub_server):
+    limiter = WeightLimiter(capacity=1200)
+    engine = FetchEngine(max_workers=8, limiter=limiter)
+    fetcher = RestKlineFetcher(stub_server, limiter=limiter)
+    end = START + 16 * 1000 * MINUTE - 1
+
+    started = time.monotonic()
+    klines = fetch_planned_klines(
+        lambda s, e, limit: fetcher.get_klines('BTCUSDT', '1m', limit, s, e), '1m', START, end, engine=engine)
+    elapsed = time.monotonic() - started
+
+    assert len(klines) == 16000
+    assert [row[0] for row in klines] == list(range(START, end + 1, MINUTE))
+    assert StubKlineHandler.max_active > 1
+    # 16 istek sırayla en az 0.8 sn sürerdi
+    assert elapsed < 16 * StubKlineHandler.delay
+
+
+def test_limiter_paces_requests_to_weight_budget(stub_server):
+    # Saniyede 50 ağırlık: 5 ağırlıklı (futures, limit 1000) 20 istek için ilk 10'u kovadan, kalanı ~1 sn
+    limiter = WeightLimiter(capacity=50, period=1.0)
+    engine = FetchEngine(max_workers=8, limiter=limiter)
+    fetcher = RestKlineFetcher(stub_server, futures=True, limiter=limiter)
+
+    started = time.monotonic()
+    engine.map(lambda i: fetcher.get_klines('BTCUSDT', '1m', 1000, START, START + 999 * MINUTE), range(20))
+    elapsed = time.monotonic() - started
+
+    assert elapsed >= 0.9
+
+
+def test_kline_weight_depends_on_market():
+    assert [kline_request_weight(limit) for limit in (50, 500, 1000)] == [2, 2, 2]
+    assert [kline_request_weight(limit, futures=True) for limit in (50, 200, 1000, 1500)] == [1, 2, 5, 10]
+
+
+def test_limiter_syncs_with_server_reported_weight():
+    limiter = WeightLimiter(capacity=100, period=60.0)
+    limiter.sync(90)
+
+    assert limiter.tokens <= 10
@@ -0,0 +1,34 @@
+import numpy as np
+
+from conftest import make_ohlcv
+from five_stage_approval_strategy import FiveStageApprovalStrategy
+from signal_encoding import BUY, CONFIDENCE_DTYPE, HOLD, SIGNAL_DTYPE, encode_signal
+
+# Yükseliş ve düşüş dönemleri içeren sahte veri
+TRENDING = dict(drift=np.where((np.arange(500) // 80) % 2 == 0, 0.004, -0.003), open_noise=0.004, wick=0.01,
+                volume=('lognormal', 3, 0.5))
+
+
+def test_batch_matches_per_row_analyze():
+    for seed in (1, 2, 3):
+        df = make_ohlcv(500, seed, **TRENDING)
+        strategy = FiveStageApprovalStrategy()
+
+        result = strategy.generate_signals(df.copy())
+
+        start = max(strategy.ema_long_period, strategy.macd_slow_period, strategy.rsi_period,
+                    strategy.bollinger_period, strategy.stochastic_k_period) + 5
+        for i in range(start, len(df)):
+            signal, confidence, _ = strategy.analyze(df.iloc[:i + 1].copy())
+            assert result['signal'].iloc[i] == encode_signal(signal), i
+            assert result['confidence'].iloc[i] == np.float32(confidence), i
+        assert (result['signal'].iloc[:start] == HOLD).all()
+        assert result['signal'].dtype == SIGNAL_DTYPE and result['confidence'].dtype == CONFIDENCE_DTYPE
+
+
+def test_batch_produces_buy_signals():
+    df = make_ohlcv(500, 1, **TRENDING)
+
+    result = FiveStageApprovalStrategy().generate_signals(df)
+
+    assert (result['signal'] == BUY).any()
@@ -0,0 +1,99 @@
+import importlib.util
+import os
+
+import pandas as pd
+
+from conftest import make_ohlcv
+from indicator_cache import IndicatorCache, IndicatorCacheLRU, bind_cache, cache_for, cache_scope, get_request_cache
+
+# strategies.py, strategies/ paketi tarafından gölgelendiği için dosyadan yüklenir
+_spec = importlib.util.spec_from_file_location(
+    'strategies_module', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'strategies.py'))
+strategies_module = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(strategies_module)
+
+
+NOISY = dict(seed=5, volatility=0.02, open_noise=0.01, wick=0.02, volume=('lognormal', 3, 0.8))
+
+
+def test_cached_indicators_match_direct_formulas():
+    df = make_ohlcv(**NOISY)
+    cache = IndicatorCache()
+
+    delta = df['close'].diff()
+    gain = delta.where(delta > 0, 0).rolling(window=14).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
+    pd.testing.assert_series_equal(cache.rsi(df, 14), 100 - (100 / (1 + gain / loss)))
+
+    macd_line, signal_line, hist = cache.macd(df, 12, 26, 9)
+    expected_macd = df['close'].ewm(span=12, adjust=False).mean() - df['close'].ewm(span=26, adjust=False).mean()
+    pd.testing.assert_series_equal(macd_line, expected_macd)
+    pd.testing.assert_series_equal(signal_line, expected_macd.ewm(span=9, adjust=False).mean())
+
+    # MACD hesaplanırken EMA 12/26 önbelleğe alındığı için tekrar hesaplanmaz
+    misses = cache.misses
+    cache.ema(df, 12)
+    cache.rsi(df, 14)
+    assert cache.misses == misses
+    assert cache.hits >= 2
+
+
+def test_cache_is_bound_to_frame_object():
+    df = make_ohlcv(**NOISY)
+    cache = bind_cache(df, IndicatorCache())
+
+    assert cache_for(df) is cache
+    assert cache_for(df.copy()) is not cache
+    assert cache_for(df.iloc[:100]) is not cache
+
+
+def test_scope_serves_copies_and_bound_frames_win():
+    df = make_ohlcv(**NOISY)
+    bound = bind_cache(df, IndicatorCache())
+
+    with cache_scope(IndicatorCache()) as scoped:
+        assert cache_for(df.copy()) is scoped
+        assert cache_for(df) is bound
+    assert cache_for(df.copy()) is not scoped
+
+
+def test_lru_reuses_cache_for_same_last_candle():
+    lru = IndicatorCacheLRU(maxsize=2)
+    df = make_ohlcv(**NOISY)
+
+    first = lru.get(df, 'BTCUSDT', '1h')
+    assert lru.get(df.copy(), 'BTCUSDT', '1h') is first
+
+    # Oluşmakta olan mum değişince yeni önbellek
+    updated = df.copy()
+    updated.loc[updated.index[-1], 'close'] *= 1.01
+    assert lru.get(updated, 'BTCUSDT', '1h') is not first
+
+    lru.get(df, 'ETHUSDT', '1h')
+    assert len(lru) == 2
+    assert lru.get(df, 'BTCUSDT', '1h') is not first
+
+
+def test_analyze_all_shares_indicators_between_strategies():
+    df = make_ohlcv(**NOISY)
+    manager = strategies_module.StrategyManager()
+    for name, strategy_class in [('MACD_EMA', strategies_module.MACDEMAStrategy),
+                                 ('Volatility', strategies_module.VolatilityStrategy),
+                                 ('Trend_Follow', strategies_module.TrendFollowStrategy)]:
+        manager.register_strategy(name, strategy_class)
+
+    expected = [(name, *cls().analyze(df.copy())) for name, cls in manager.strategies.items()]
+
+    shared = df.copy()
+    results = manager.analyze_all(shared, 'BTCUSDT', '1h')
+    cache = cache_for(shared)
+
+    assert [(name, signal, confidence) for name, signal, confidence, _ in results] == \
+        [(name, signal, confidence) for name, signal, confidence, _ in expected]
+    for (_, _, _, metrics), (_, _, _, expected_metrics) in zip(results, expected):
+        assert metrics.keys() == expected_metrics.keys()
+        for key in metrics:
+            assert metrics[key] == expected_metrics[key] or (pd.isna(metrics[key]) and pd.isna(expected_metrics[key]))
+    # True Range, MACD/Volatility/Trend stratejileri arasında bir kez hesaplanır
+    assert cache.hits > 0
+    assert get_request_cache(df.copy(), 'BTCUSDT', '1h') is cache
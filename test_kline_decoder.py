@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import make_klines
+from kline_decoder import KLINE_COLUMNS, decode_klines, klines_to_dataframe
+
+START = 1_704_067_200_000
+MINUTE = 60_000
+
+
+def legacy_dataframe(klines):
+    """Eski DataFrame + to_numeric dönüşümü (karşılaştırma için)"""
+    df = pd.DataFrame(klines, columns=[name for name, _ in KLINE_COLUMNS] + ['ignore'])
+    for name, dtype in KLINE_COLUMNS:
+        df[name] = pd.to_numeric(df[name]).astype(dtype)
+    df['timestamp'] = pd.to_datetime(df.pop('open_time'), unit='ms')
+    return df.drop(columns='ignore').set_index('timestamp')
+
+
+def test_decode_matches_legacy_conversion():
+    klines = make_klines(START, START + 49 * MINUTE)
+
+    columns = decode_klines(klines)
+    df = klines_to_dataframe(klines)
+
+    assert list(columns) == [name for name, _ in KLINE_COLUMNS]
+    assert {name: array.dtype for name, array in columns.items()} == {name: np.dtype(dtype) for name, dtype in KLINE_COLUMNS}
+    pd.testing.assert_frame_equal(df, legacy_dataframe(klines))
+    assert 'ignore' not in df.columns
+
+
+def test_compact_mode_uses_float32_prices():
+    klines = make_klines(START, START + 49 * MINUTE)
+
+    df = klines_to_dataframe(klines, compact=True)
+
+    assert df['close'].dtype == np.float32 and df['close_time'].dtype == np.int64
+    assert df['trades'].dtype == np.int64
+    np.testing.assert_allclose(df['close'], klines_to_dataframe(klines)['close'], rtol=1e-7)
+
+
+def test_column_subset_and_empty_input():
+    klines = make_klines(START, START + 4 * MINUTE)
+
+    df = klines_to_dataframe(klines, columns=['close', 'volume'])
+
+    assert list(df.columns) == ['close', 'volume'] and df.index.name == 'timestamp'
+    assert klines_to_dataframe([]).empty
+    assert all(len(array) == 0 for array in decode_klines([]).values())
+    with pytest.raises(ValueError):
+        decode_klines(klines, columns=['price'])
@@ -0,0 +1,55 @@
+from kline_planner import (align_open_time, dedupe_klines, expected_kline_count, fetch_planned_klines,
+                           find_kline_gaps, interval_to_ms, plan_kline_requests)
+
+MINUTE = interval_to_ms('1m')
+DAY = interval_to_ms('1d')
+START = 1_600_000_000_000 - (1_600_000_000_000 % DAY)
+
+
+def test_thirty_days_of_1m_needs_44_requests():
+    end = START + 30 * DAY - 1
+    windows = plan_kline_requests('1m', START, end)
+
+    assert expected_kline_count('1m', START, end) == 43200
+    assert len(windows) == 44
+    assert windows[0] == (START, START + 1000 * MINUTE - 1)
+    assert windows[-1][1] == end
+    # Pencereler bitişik ve çakışmasız
+    for (_, previous_end), (next_start, _) in zip(windows[:-1], windows[1:]):
+        assert next_start == previous_end + 1
+
+
+def test_short_range_is_a_single_request():
+    assert plan_kline_requests('1h', START, START + 10 * DAY) == [(START, START + 10 * DAY)]
+
+
+def test_weekly_candles_align_to_monday():
+    # 2020-09-14 pazartesi
+    monday = 1_600_041_600_000
+    assert align_open_time(monday - 1, '1w') == monday
+    assert align_open_time(monday, '1w') == monday
+
+
+def test_gaps_and_duplicates_are_detected():
+    open_times = [START + i * MINUTE for i in (0, 1, 2, 5, 6)]
+    klines = [[t] for t in open_times] + [[open_times[1]]]
+
+    unique, duplicates = dedupe_klines(klines)
+
+    assert duplicates == 1
+    assert [row[0] for row in unique] == open_times
+    assert find_kline_gaps(open_times, '1m') == [(START + 3 * MINUTE, START + 4 * MINUTE)]
+
+
+def test_fetch_planned_klines_returns_complete_range():
+    calls = []
+
+    def request(window_start, window_end, limit):
+        calls.append((window_start, window_end))
+        first = align_open_time(window_start, '1m')
+        return [[t] for t in range(first, window_end + 1, MINUTE)][:limit]
+
+    klines = fetch_planned_klines(request, '1m', START, START + 2 * DAY - 1)
+
+    assert len(calls) == 3
+    assert len(klines) == 2880
@@ -0,0 +1,126 @@
+import os
+
+import numpy as np
+
+from conftest import make_klines
+from kline_store import KlineStore, interval_to_ms, raw_klines_to_columns
+
+HOUR = interval_to_ms('1h')
+BASE = 1_600_000_000_000 - (1_600_000_000_000 % HOUR)
+
+
+class FakeExchange:
+    def __init__(self):
+        self.calls = []
+
+    def fetch(self, start, end):
+        self.calls.append((start, end))
+        return make_klines(start, end, HOUR)
+
+
+def test_repeat_range_is_served_from_disk(tmp_path):
+    store = KlineStore(base_dir=str(tmp_path), market='spot')
+    exchange = FakeExchange()
+    start, end = BASE, BASE + 99 * HOUR
+
+    first = store.get_klines('BTCUSDT', '1h', start, end, exchange.fetch)
+    second = store.get_klines('BTCUSDT', '1h', start, end, exchange.fetch)
+
+    assert len(exchange.calls) == 1
+    assert len(first['open_time']) == 100
+    for name in first:
+        np.testing.assert_array_equal(first[name], second[name])
+
+
+def test_only_head_and_tail_gaps_are_fetched(tmp_path):
+    store = KlineStore(base_dir=str(tmp_path), market='spot')
+    exchange = FakeExchange()
+    store.get_klines('BTCUSDT', '1h', BASE + 10 * HOUR, BASE + 19 * HOUR, exchange.fetch)
+    exchange.calls.clear()
+
+    columns = store.get_klines('BTCUSDT', '1h', BASE, BASE + 29 * HOUR, exchange.fetch)
+
+    assert exchange.calls == [(BASE, BASE + 10 * HOUR - 1), (BASE + 19 * HOUR + 1, BASE + 29 * HOUR)]
+    np.testing.assert_array_equal(columns['open_time'], np.arange(BASE, BASE + 30 * HOUR, HOUR))
+    assert store.get_meta('BTCUSDT', '1h')['rows'] == 30
+
+
+def test_forming_candle_is_not_persisted(tmp_path):
+    import time
+    store = KlineStore(base_dir=str(tmp_path), market='spot')
+    exchange = FakeExchange()
+    now = int(time.time() * 1000)
+    last_open = now - now % HOUR
+    start = last_open - 5 * HOUR
+
+    columns = store.get_klines('BTCUSDT', '1h', start, last_open, exchange.fetch)
+
+    assert columns['open_time'][-1] == last_open
+    assert store.get_meta('BTCUSDT', '1h')['rows'] == 5
+
+
+def test_disjoint_ranges_do_not_cover_the_gap(tmp_path):
+    store = KlineStore(base_dir=str(tmp_path), market='spot')
+    exchange = FakeExchange()
+    store.get_klines('BTCUSDT', '1h', BASE + 60 * HOUR, BASE + 90 * HOUR, exchange.fetch)
+    store.get_klines('BTCUSDT', '1h', BASE, BASE + 10 * HOUR, exchange.fetch)
+    assert store.get_meta('BTCUSDT', '1h')['covered'] == [[BASE, BASE + 10 * HOUR],
+                                                          [BASE + 60 * HOUR, BASE + 90 * HOUR]]
+    exchange.calls.clear()
+
+    assert store.missing_ranges('BTCUSDT', '1h', BASE + 20 * HOUR, BASE + 30 * HOUR) == [
+        (BASE + 20 * HOUR, BASE + 30 * HOUR)]
+    columns = store.get_klines('BTCUSDT', '1h', BASE + 20 * HOUR, BASE + 30 * HOUR, exchange.fetch)
+    assert len(columns['open_time']) == 11
+
+    # Aradaki mumlar sıralı olarak yerleşir, sadece kalan boşluklar istenir
+    exchange.calls.clear()
+    columns = store.get_klines('BTCUSDT', '1h', BASE, BASE + 90 * HOUR, exchange.fetch)
+    assert exchange.calls == [(BASE + 10 * HOUR + 1, BASE + 20 * HOUR - 1), (BASE + 30 * HOUR + 1, BASE + 60 * HOUR - 1)]
+    np.testing.assert_array_equal(columns['open_time'], np.arange(BASE, BASE + 91 * HOUR, HOUR))
+    meta = store.get_meta('BTCUSDT', '1h')
+    assert meta['rows'] == 91 and meta['covered'] == [[BASE, BASE + 90 * HOUR]]
+
+
+def merge_ranges(base_dir, ranges):
+    """Ayrı süreçte aynı seriye yaz (çalışan süreç giriş noktası)"""
+    store = KlineStore(base_dir=base_dir, market='spot')
+    for start, end in ranges:
+        store.merge('BTCUSDT', '1h', start, end, raw_klines_to_columns(make_klines(start, end, HOUR)),
+                    now_ms=BASE + 1000 * HOUR)
+
+
+def test_concurrent_writers_keep_series_consistent(tmp_path):
+    import multiprocessing
+    ranges = [(BASE + i * 10 * HOUR, BASE + (i * 10 + 14) * HOUR) for i in range(8)]
+    context = multiprocessing.get_context('spawn')
+    processes = [context.Process(target=merge_ranges, args=(str(tmp_path), ranges[offset::2] + ranges[::-1]))
+                 for offset in (0, 1)]
+    for process in processes:
+        process.start()
+    store = KlineStore(base_dir=str(tmp_path), market='spot')
+    merge_ranges(str(tmp_path), ranges)
+    for process in processes:
+        process.join(60)
+        assert process.exitcode == 0
+
+    meta = store.get_meta('BTCUSDT', '1h')
+    columns = store.read('BTCUSDT', '1h', BASE, BASE + 100 * HOUR)
+    np.testing.assert_array_equal(columns['open_time'], np.arange(BASE, BASE + 85 * HOUR, HOUR))
+    assert meta['rows'] == 85 and meta['covered'] == [[BASE, BASE + 84 * HOUR]]
+    size = os.path.getsize(store._column_path('BTCUSDT', '1h', 'open_time', meta.get('generation', 0)))
+    assert size == 85 * 8
+    assert not [name for name in os.listdir(store._series_dir('BTCUSDT', '1h')) if name.endswith('.tmp')]
+
+
+def test_leftover_rows_from_interrupted_append_are_dropped(tmp_path):
+    store = KlineStore(base_dir=str(tmp_path), market='spot')
+    merge_ranges(str(tmp_path), [(BASE, BASE + 9 * HOUR)])
+    # Meta yazılmadan yarıda kalmış bir eklemeyi taklit et
+    with open(store._column_path('BTCUSDT', '1h', 'open_time'), 'ab') as f:
+        np.arange(3, dtype=np.int64).tofile(f)
+
+    merge_ranges(str(tmp_path), [(BASE + 10 * HOUR, BASE + 19 * HOUR)])
+
+    columns = store.read('BTCUSDT', '1h', BASE, BASE + 19 * HOUR)
+    np.testing.assert_array_equal(columns['open_time'], np.arange(BASE, BASE + 20 * HOUR, HOUR))
@@ -0,0 +1,160 @@
+import json
+import asyncio
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from kline_stream import KlineRingBuffer, KlineStream
+
+MINUTE = 60 * 1000
+T0 = 1_700_000_040_000  # dakika başı
+
+
+def kline_message(open_time, close, closed, symbol='BTCUSDT', interval='1m'):
+    return json.dumps({'stream': f"{symbol.lower()}@kline_{interval}", 'data': {
+        'e': 'kline', 'E': open_time, 's': symbol,
+        'k': {'t': open_time, 'T': open_time + MINUTE - 1, 's': symbol, 'i': interval,
+              'o': str(close - 1), 'h': str(close + 2), 'l': str(close - 2), 'c': str(close),
+              'v': '10.5', 'x': closed}}})
+
+
+def rest_frame(open_times, closes, last_closed=True):
+    close_time = [t + MINUTE - 1 for t in open_times]
+    if not last_closed:
+        close_time[-1] = 10 ** 15  # henüz kapanmamış
+    return pd.DataFrame({'open': np.array(closes) - 1, 'high': np.array(closes) + 2, 'low': np.array(closes) - 2,
+                         'close': closes, 'volume': 1.0, 'close_time': close_time},
+                        index=pd.to_datetime(open_times, unit='ms'))
+
+
+class LocalKlineServer:
+    """Testler için yerel WebSocket sunucusu; her bağlantıda sıradaki senaryoyu oynatır"""
+
+    def __init__(self, scripts):
+        self.scripts = list(scripts)
+        self.paths = []
+        self.received = []
+        self.port = None
+        self._ready = threading.Event()
+        self._loop = None
+        self._stop = None
+        self._thread = threading.Thread(target=self._main, daemon=True)
+
+    async def _handler(self, connection):
+        self.paths.append(connection.request.path)
+        script = self.scripts.pop(0) if self.scripts else []
+        for message in script:
+            if message is None:
+                await connection.close()  # bağlantı kopması
+                return
+            await connection.send(message)
+        async for message in connection:
+            self.received.append(json.loads(message))
+
+    async def _serve(self):
+        from websockets.asyncio.server import serve
+
+        self._stop = asyncio.Event()
+        async with serve(self._handler, '127.0.0.1', 0) as server:
+            self.port = server.sockets[0].getsockname()[1]
+            self._ready.set()
+            await self._stop.wait()
+
+    def _main(self):
+        self._loop = asyncio.new_event_loop()
+        self._loop.run_until_complete(self._serve())
+
+    def __enter__(self):
+        self._thread.start()
+        self._ready.wait(5)
+        return self
+
+    def __exit__(self, *exc):
+        self._loop.call_soon_threadsafe(self._stop.set)
+        self._thread.join(5)
+
+    @property
+    def url(self):
+        return f"ws://127.0.0.1:{self.port}/stream"
+
+
+def test_ring_buffer_updates_forming_candle_and_wraps():
+    buffer = KlineRingBuffer(capacity=3)
+
+    assert buffer.update(T0, 1, 2, 0, 1.5, 10, closed=False) == 'new'
+    assert buffer.update(T0, 1, 3, 0, 2.5, 12, closed=True) == 'update'
+    for i in range(1, 4):
+        buffer.update(T0 + i * MINUTE, 1, 2, 0, 10 + i, 1, closed=i < 3)
+    assert buffer.update(T0, 1, 2, 0, 99, 1, closed=True) == 'stale'
+
+    assert len(buffer) == 3
+    assert list(buffer.frame()['close']) == [11, 12, 13]
+    assert list(buffer.frame(include_forming=False)['close']) == [11, 12]
+    assert buffer.frame().index[0] == pd.to_datetime(T0 + MINUTE, unit='ms')
+
+
+def test_merge_frame_counts_only_completed_candles():
+    buffer = KlineRingBuffer(capacity=10)
+    buffer.update(T0, 1, 2, 0, 1, 1, closed=False)
+
+    added = buffer.merge_frame(rest_frame([T0, T0 + MINUTE, T0 + 2 * MINUTE], [5, 6, 7], last_closed=False))
+
+    assert added == 2
+    assert list(buffer.frame()['close']) == [5, 6, 7]
+    assert not buffer.last_closed
+
+
+def test_stream_wakes_waiters_on_candle_close():
+    script = [kline_message(T0, 100, False), kline_message(T0, 101, False), kline_message(T0, 102, True)]
+    closes = []
+    with LocalKlineServer([script]) as server:
+        stream = KlineStream(server.url)
+        stream.add_listener(lambda symbol, interval, buffer: closes.append((symbol, interval, len(buffer))))
+        stream.subscribe('btcusdt', '1m')
+        stream.start()
+        try:
+            assert stream.wait_for_close('BTCUSDT', '1m', after=0, timeout=5)
+        finally:
+            stream.stop()
+
+    assert server.paths == ['/stream?streams=btcusdt@kline_1m']
+    assert closes == [('BTCUSDT', '1m', 1)]
+    df = stream.frame('BTCUSDT', '1m')
+    assert list(df['close']) == [102.0]
+    assert stream.buffers[('BTCUSDT', '1m')].last_closed
+
+
+def test_stream_reconnects_and_backfills_gap():
+    backfill_calls = []
+
+    def backfill(symbol, interval, start_time, limit):
+        backfill_calls.append((symbol, interval, start_time))
+        if start_time is None:
+            return rest_frame([T0 - MINUTE, T0], [99, 100], last_closed=False)
+        # Kopukluk sırasında kapanan iki mum
+        return rest_frame([T0, T0 + MINUTE], [101, 103])
+
+    first = [kline_message(T0, 100.5, False), None]
+    second = [kline_message(T0 + 2 * MINUTE, 104, True)]
+    with LocalKlineServer([first, second]) as server:
+        stream = KlineStream(server.url, backfill=backfill, reconnect_delay=0.05)
+        stream.subscribe('BTCUSDT', '1m')
+        stream.start()
+        try:
+            assert stream.wait_for_close('BTCUSDT', '1m', after=2, timeout=5)
+        finally:
+            stream.stop()
+
+    assert stream.reconnects == 1
+    assert backfill_calls == [('BTCUSDT', '1m', None), ('BTCUSDT', '1m', T0)]
+    assert stream.close_count('BTCUSDT', '1m') == 3
+    assert list(stream.frame('BTCUSDT', '1m')['close']) == [99, 101, 103, 104]
+
+
+def test_wait_for_close_times_out_without_messages():
+    stream = KlineStream('ws://127.0.0.1:9/stream')
+    stream.subscribe('BTCUSDT', '1m')
+
+    assert not stream.wait_for_close('BTCUSDT', '1m', timeout=0.05)
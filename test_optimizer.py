@@ -0,0 +1,157 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import make_ohlcv
+from indicator_cache import cache_for
+from optimizer import (ParameterSpace, _indicators_from_shared, _share_frame, build_param_sets, create_strategy,
+                       precompute_indicators, rank_results, run_optimization)
+from strategy_config import StrategyConfig
+
+FRAME = dict(seed=3, start='2024-01-01', spread=0.002, volume=('uniform', 1, 10), tz='UTC')
+
+
+class CrossoverStrategy:
+    """Test için EMA kesişim stratejisi (çalışan süreçlerde modül yolundan yüklenir)"""
+
+    def __init__(self):
+        self.name = "CrossoverStrategy"
+        self.fast = 5
+        self.slow = 20
+
+    def generate_signals(self, df):
+        out = df.copy()
+        fast = out['close'].ewm(span=self.fast, adjust=False).mean()
+        slow = out['close'].ewm(span=self.slow, adjust=False).mean()
+        above = fast > slow
+        out['signal'] = np.where(above & ~above.shift(fill_value=False), 'BUY',
+                                 np.where(~above & above.shift(fill_value=False), 'SELL', 'HOLD')).astype(object)
+        return out
+
+
+class TrendFilterStrategy(CrossoverStrategy):
+    """Test için sabit RSI/MACD filtreli kesişim (göstergeler önbellekten alınır)"""
+
+    def generate_signals(self, df):
+        out = df.copy()
+        cache = cache_for(out)
+        fast = cache.ema(out, self.fast)
+        slow = cache.ema(out, self.slow)
+        rsi = cache.rsi(out, 14)
+        macd_line, signal_line, _ = cache.macd(out)
+        above = (fast > slow) & (macd_line > signal_line)
+        out['signal'] = np.where(above & ~above.shift(fill_value=False) & (rsi < 70), 'BUY',
+                                 np.where(~above & above.shift(fill_value=False), 'SELL', 'HOLD')).astype(object)
+        return out
+
+
+@pytest.fixture
+def config(tmp_path):
+    path = tmp_path / 'config.json'
+    path.write_text(json.dumps({'strategies': {'CrossoverStrategy': {'parameters': {
+        'fast': {'type': 'int', 'default': 5, 'min': 3, 'max': 9},
+        'slow': {'type': 'int', 'default': 20, 'min': 20, 'max': 40},
+        'threshold': {'type': 'float', 'default': 0.5, 'min': 0.0, 'max': 1.0},
+    }}}}), encoding='utf-8')
+    return StrategyConfig(str(path))
+
+
+def test_grid_uses_config_ranges_and_fixed_defaults(config):
+    space = ParameterSpace.from_config('CrossoverStrategy', config, include=['fast', 'slow'])
+
+    assert space.axis('fast', 4) == [3, 5, 7, 9]
+    assert space.axis('threshold', 4) == [0.5]
+    assert space.grid_size(3) == 9
+    assert {'fast': 3, 'slow': 40, 'threshold': 0.5} in space.grid(3)
+
+
+def test_param_sets_respect_limits_and_overrides(config):
+    with pytest.raises(ValueError):
+        build_param_sets('CrossoverStrategy', 'grid', grid_points=10, max_combinations=100, config=config)
+
+    overridden = build_param_sets('CrossoverStrategy', 'grid', include=['fast'],
+                                  overrides={'slow': [25, 30]}, grid_points=2, config=config)
+    assert len(overridden) == 4
+
+    sampled = build_param_sets('CrossoverStrategy', 'random', samples=30, seed=1, config=config)
+    assert len(sampled) == 30
+    assert all(3 <= params['fast'] <= 9 and 0.0 <= params['threshold'] <= 1.0 for params in sampled)
+    assert sampled == build_param_sets('CrossoverStrategy', 'random', samples=30, seed=1, config=config)
+
+
+def test_create_strategy_sets_attributes():
+    strategy = create_strategy(CrossoverStrategy, {'fast': 8, 'slow': 30})
+
+    assert (strategy.fast, strategy.slow) == (8, 30)
+
+
+def test_unapplied_parameter_is_refused():
+    with pytest.raises(ValueError, match='threshold'):
+        create_strategy(CrossoverStrategy, {'fast': 8, 'threshold': 0.5})
+
+    # Izgara, backtest başlamadan reddedilir
+    with pytest.raises(ValueError, match='threshold'):
+        run_optimization(make_ohlcv(50, **FRAME), CrossoverStrategy, 'BTCUSDT', '1h',
+                         [{'fast': 3, 'threshold': value} for value in (0.1, 0.9)])
+
+
+def test_process_pool_run_matches_in_process_backtest():
+    from new_backtest import Backtester
+
+    df = make_ohlcv(600, **FRAME)
+    param_sets = [{'fast': fast, 'slow': slow} for fast in (3, 6) for slow in (20, 35)]
+    backtest_params = {'take_profit_pct': 2.0, 'stop_loss_pct': 1.0, 'risk_per_trade_pct': 50.0}
+
+    table = run_optimization(df, CrossoverStrategy, 'BTCUSDT', '1h', param_sets, backtest_params, workers=2)
+
+    assert list(table['rank']) == [1, 2, 3, 4]
+    assert table['error'].isna().all()
+    assert table['total_profit_loss_pct'].is_monotonic_decreasing
+    for row in table.itertuples():
+        strategy = create_strategy(CrossoverStrategy, {'fast': row.fast, 'slow': row.slow})
+        expected = Backtester().run(df, strategy, 'BTCUSDT', '1h', **backtest_params)
+        assert row.final_balance == pytest.approx(expected.final_balance)
+        assert row.total_trades == expected.total_trades
+
+
+def test_parameter_independent_indicators_are_shared():
+    from new_backtest import Backtester
+
+    df = make_ohlcv(600, **FRAME)
+    param_sets = [{'fast': fast, 'slow': 30} for fast in (3, 5, 7)]
+
+    indicators = precompute_indicators(df, TrendFilterStrategy, param_sets)
+    # Kesişim ve filtreler sabit; sadece 'fast' EMA'sı kombinasyona bağlı
+    assert {key[1:] for key in indicators} == {('ema', (30,)), ('ema', (12,)), ('ema', (26,)),
+                                              ('rsi', (14,)), ('macd', (12, 26, 9))}
+
+    shm, spec = _share_frame(df, indicators)
+    try:
+        shared = _indicators_from_shared(shm.buf, spec, df.index)
+        for key, value in indicators.items():
+            for expected, part in zip(value if isinstance(value, tuple) else (value,),
+                                      shared[key] if isinstance(shared[key], tuple) else (shared[key],)):
+                pd.testing.assert_series_equal(part, expected)
+    finally:
+        shm.close()
+        shm.unlink()
+
+    table = run_optimization(df, TrendFilterStrategy, 'BTCUSDT', '1h', param_sets, workers=2)
+    assert table['error'].isna().all()
+    for row in table.itertuples():
+        strategy = create_strategy(TrendFilterStrategy, {'fast': row.fast, 'slow': 30})
+        assert row.final_balance == pytest.approx(Backtester().run(df, strategy, 'BTCUSDT', '1h').final_balance)
+
+
+def test_rank_results_puts_failures_last():
+    rows = [
+        {'params': {'fast': 3}, 'error': 'boom'},
+        {'params': {'fast': 4}, 'max_drawdown': 5.0, 'total_profit_loss_pct': 1.0, 'error': None},
+        {'params': {'fast': 5}, 'max_drawdown': 2.0, 'total_profit_loss_pct': 3.0, 'error': None},
+    ]
+
+    table = rank_results(rows, 'max_drawdown')
+
+    assert list(table['fast']) == [5, 4, 3]
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+
+from conftest import make_ohlcv
+from rci_ema_strategy import RCIEMAStrategy
+from signal_encoding import SIGNAL_DTYPE, decode_signals
+
+
+def legacy_rci(values, period):
+    """Eski calculate_rci: argsort ve döngü ile sıralama"""
+    recent_data = values[-period:]
+    time_ranks = np.arange(period, 0, -1)
+    price_ranks = np.zeros(period)
+    for i, idx in enumerate(np.argsort(recent_data)):
+        price_ranks[idx] = i + 1
+    d_squared_sum = np.sum((time_ranks - price_ranks) ** 2)
+    return 100 * (1 - (6 * d_squared_sum) / (period * (period**2 - 1)))
+
+
+def legacy_signals(close, strategy):
+    """Eski generate_signals: satır satır RCI ve kesişim döngüsü"""
+    period = strategy.rci_period
+    rci = np.zeros(len(close))
+    for i in range(period, len(close)):
+        rci[i] = legacy_rci(close[i - period:i + 1], period)
+
+    ema_fast = pd.Series(close).ewm(span=strategy.ema_fast, adjust=False).mean()
+    ema_slow = pd.Series(close).ewm(span=strategy.ema_slow, adjust=False).mean()
+    ema_diff = (ema_fast - ema_slow).to_numpy()
+
+    signals = ['HOLD'] * len(close)
+    for i in range(1, len(close)):
+        if (rci[i - 1] < strategy.rci_oversold and rci[i] > strategy.rci_oversold) or (ema_diff[i - 1] < 0 and ema_diff[i] > 0):
+            signals[i] = 'BUY'
+        elif (rci[i - 1] > strategy.rci_overbought and rci[i] < strategy.rci_overbought) or (ema_diff[i - 1] > 0 and ema_diff[i] < 0):
+            signals[i] = 'SELL'
+    return rci, signals
+
+
+def test_vectorized_rci_and_signals_match_legacy_loop():
+    for seed in (1, 2, 3):
+        df = make_ohlcv(600, seed)
+        strategy = RCIEMAStrategy()
+
+        result = strategy.generate_signals(df)
+        rci, signals = legacy_signals(df['close'].to_numpy(), strategy)
+
+        np.testing.assert_allclose(result['rci'].to_numpy(), rci, rtol=0, atol=1e-9)
+        assert result['signal'].dtype == SIGNAL_DTYPE
+        assert decode_signals(result['signal']).tolist() == signals
+
+
+def test_rci_multi_matches_single_period_series():
+    df = make_ohlcv(300, 4)
+    strategy = RCIEMAStrategy()
+
+    multi = strategy.calculate_rci_multi(df['close'], [9, 26, 52])
+
+    assert list(multi.columns) == ['rci_9', 'rci_26', 'rci_52']
+    for period in (9, 26, 52):
+        np.testing.assert_array_equal(multi[f'rci_{period}'].to_numpy(),
+                                      strategy.calculate_rci_series(df['close'], period))
+        assert multi[f'rci_{period}'].iloc[-1] == strategy.calculate_rci(df['close'], period)
+
+
+def test_block_processing_gives_same_result():
+    df = make_ohlcv(1000, 5)
+    strategy = RCIEMAStrategy()
+
+    np.testing.assert_array_equal(strategy.calculate_rci_series(df['close'], 9, block_size=37),
+                                  strategy.calculate_rci_series(df['close'], 9))
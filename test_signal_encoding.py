@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest_engine import MODE_LONG_ONLY, run_engine, signal_codes
+from signal_encoding import (BUY, CONFIDENCE_DTYPE, HOLD, SELL, SIGNAL_DTYPE, count_signals, decode_signals,
+                             encode_signals, normalize_signals, signal_column, signal_label)
+
+
+@pytest.mark.parametrize('values', [
+    ['BUY', 'SELL', 'HOLD', 'WAIT', None],
+    np.array(['BUY', 'SELL', 'HOLD', 'WAIT', 'x']),
+    pd.Series(['BUY', 'SELL', 'HOLD', 'WAIT', 'HOLD'], dtype='category'),
+    [1, -1, 0, 0, 0],
+    np.array([3, -2, 0, 0, 0], dtype=np.int64),
+    [1.0, -1.0, 0.0, np.nan, 0.0],
+    np.array([1, -1, 0, 0, 0], dtype=object),
+])
+def test_legacy_and_numeric_signals_encode_to_int8(values):
+    codes = encode_signals(values)
+
+    assert codes.dtype == SIGNAL_DTYPE
+    assert codes.tolist() == [BUY, SELL, HOLD, HOLD, HOLD]
+
+
+def test_int8_signals_are_used_without_copy():
+    codes = signal_column([True, False, True], [False, True, True], warmup=1)
+
+    assert codes.tolist() == [HOLD, SELL, BUY]
+    assert encode_signals(codes) is codes
+    assert decode_signals(codes).tolist() == ['HOLD', 'SELL', 'BUY']
+    assert count_signals(codes) == {'BUY': 1, 'SELL': 1, 'HOLD': 1}
+    assert [signal_label(value) for value in ('WAIT', np.int8(-1), 1, None, np.nan)] == \
+        ['HOLD', 'SELL', 'BUY', 'HOLD', 'HOLD']
+
+
+def test_normalize_signals_converts_legacy_frames_only():
+    legacy = pd.DataFrame({'close': [1.0, 2.0], 'signal': ['BUY', 'HOLD'], 'confidence': [75.5, np.nan]})
+    normalized = normalize_signals(legacy)
+
+    assert normalized['signal'].dtype == SIGNAL_DTYPE and normalized['confidence'].dtype == CONFIDENCE_DTYPE
+    assert normalized['signal'].tolist() == [BUY, HOLD] and normalized['confidence'].tolist() == [75.5, 0.0]
+    assert legacy['signal'].tolist() == ['BUY', 'HOLD']
+    assert normalize_signals(normalized) is normalized
+
+
+def test_engine_trades_integer_signals_like_strings():
+    rng = np.random.default_rng(7)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 500)))
+    labels = rng.choice(np.array(['BUY', 'SELL', 'HOLD'], dtype=object), size=500, p=[0.05, 0.05, 0.9])
+    ints = np.select([labels == 'BUY', labels == 'SELL'], [1, -1], 0)
+
+    from_labels = run_engine(close, signal_codes(labels), 1000.0, 2.0, 1.0, None, None, 10.0, MODE_LONG_ONLY)
+    from_ints = run_engine(close, signal_codes(ints), 1000.0, 2.0, 1.0, None, None, 10.0, MODE_LONG_ONLY)
+
+    assert len(from_ints.trades) == len(from_labels.trades) > 0
+    np.testing.assert_array_equal(from_ints.equity, from_labels.equity)
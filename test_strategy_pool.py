@@ -0,0 +1,85 @@
+import threading
+import time
+
+from strategy_pool import StrategyPool
+
+
+class DummyStrategy:
+    def __init__(self, params=None):
+        self.params = params or {}
+
+
+class OtherStrategy(DummyStrategy):
+    pass
+
+
+def test_instances_reused_per_class_and_parameters():
+    pool = StrategyPool()
+
+    first = pool.get(DummyStrategy, {'period': 14, 'fast': 3})
+    assert pool.get(DummyStrategy, {'fast': 3, 'period': 14}) is first
+    assert first.params == {'period': 14, 'fast': 3}
+    assert pool.get(DummyStrategy, {'period': 21}) is not first
+    assert pool.get(DummyStrategy) is pool.get(DummyStrategy, {})
+    assert pool.get(OtherStrategy) is not pool.get(DummyStrategy)
+
+    assert pool.stats() == {'instances': 4, 'max_size': pool.max_size, 'hits': 3, 'created': 4, 'invalidated': 0}
+
+
+def test_concurrent_requests_build_one_instance():
+    built = []
+
+    def slow_factory(strategy_class, params):
+        built.append(params)
+        time.sleep(0.05)
+        return strategy_class(params)
+
+    pool = StrategyPool(factory=slow_factory)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(pool.get(DummyStrategy, {'a': 1})))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(built) == 1
+    assert len(results) == 8 and all(result is results[0] for result in results)
+
+
+def test_invalidate_drops_instances_of_strategy():
+    pool = StrategyPool(max_size=3)
+    dummy = pool.get(DummyStrategy)
+    other = pool.get(OtherStrategy)
+
+    assert pool.invalidate('dummystrategy') == 1
+    assert pool.get(DummyStrategy) is not dummy
+    assert pool.get(OtherStrategy) is other
+
+    # Boyut sınırı aşılınca en az kullanılan düşer
+    for period in range(5):
+        pool.get(DummyStrategy, {'period': period})
+    assert len(pool) == 3
+
+    assert pool.invalidate() == 3 and len(pool) == 0
+
+
+def test_instance_built_during_invalidation_not_pooled():
+    started, release = threading.Event(), threading.Event()
+
+    def factory(strategy_class, params):
+        started.set()
+        release.wait(5)
+        return strategy_class(params)
+
+    pool = StrategyPool(factory=factory)
+    results = []
+    thread = threading.Thread(target=lambda: results.append(pool.get(DummyStrategy)))
+    thread.start()
+    started.wait(5)
+    pool.invalidate('DummyStrategy')
+    release.set()
+    thread.join()
+
+    assert isinstance(results[0], DummyStrategy)
+    assert len(pool) == 0
@@ -0,0 +1,99 @@
+import os
+import sys
+import uuid
+
+import pytest
+
+from strategy_manager import StrategyRegistry
+
+STRATEGY_TEMPLATE = """
+class {name}:
+    version = {version}
+
+    def generate_signals(self, df):
+        return df
+"""
+
+
+def write_module(path, content, bump_ns=0):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    if bump_ns:
+        # Dosya sistemi mtime çözünürlüğüne takılmamak için mtime elle ileri alınır
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + bump_ns))
+
+
+@pytest.fixture
+def package(tmp_path, monkeypatch):
+    """Geçici dizinde benzersiz adlı bir strateji paketi"""
+    name = f"registry_strategies_{uuid.uuid4().hex[:8]}"
+    package_dir = tmp_path / name
+    package_dir.mkdir()
+    (package_dir / '__init__.py').write_text('')
+    write_module(package_dir / 'alpha.py', STRATEGY_TEMPLATE.format(name='AlphaStrategy', version=1))
+    # Import edilirse hata veren dosya: taramanın dosyayı çalıştırmadığını doğrular
+    write_module(package_dir / 'debug.py', 'from .alpha import AlphaStrategy as DebugAlphaStrategy\n'
+                                          'raise RuntimeError("import edilmemeli")\n')
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield name, package_dir
+    for module in [m for m in sys.modules if m.startswith(name)]:
+        del sys.modules[module]
+
+
+def test_lookup_is_lazy_and_case_insensitive(package):
+    name, _ = package
+    registry = StrategyRegistry(name, base_dir=str(package[1].parent))
+
+    assert sorted(registry.names()) == ['AlphaStrategy', 'DebugAlphaStrategy']
+    assert f'{name}.alpha' not in sys.modules
+
+    strategy_class = registry.get('alpha')
+    assert strategy_class.__name__ == 'AlphaStrategy'
+    assert f'{name}.alpha' in sys.modules
+    assert registry.get('ALPHASTRATEGY') is strategy_class
+    assert registry.get('Alpha Strategy') is strategy_class
+    # Başka modülden import edilen sınıf kaynağından yüklenir, debug.py çalıştırılmaz
+    assert registry.get('debugalpha') is strategy_class
+    assert f'{name}.debug' not in sys.modules
+    assert registry.get('missing') is None
+
+    stats = registry.stats()
+    assert stats['strategies'] == 2 and stats['loaded_modules'] == 1
+    assert stats['cold_lookups'] == 2 and stats['warm_lookups'] == 2 and stats['misses'] == 1
+    assert stats['reloads'] == 0 and stats['scans'] == 1
+
+
+def test_module_reloaded_only_when_mtime_changes(package):
+    name, package_dir = package
+    registry = StrategyRegistry(name, base_dir=str(package_dir.parent))
+
+    first = registry.get('AlphaStrategy')
+    assert registry.get('AlphaStrategy') is first
+    assert registry.stats()['reloads'] == 0
+
+    write_module(package_dir / 'alpha.py', STRATEGY_TEMPLATE.format(name='AlphaStrategy', version=2),
+                 bump_ns=2_000_000_000)
+    second = registry.get('alphastrategy')
+
+    assert second is not first and second.version == 2
+    assert registry.get('alpha') is second
+    assert registry.stats()['reloads'] == 1
+
+
+def test_new_files_picked_up_on_rescan(package):
+    name, package_dir = package
+    registry = StrategyRegistry(name, base_dir=str(package_dir.parent))
+    assert registry.refresh() is False
+
+    write_module(package_dir / 'beta.py', STRATEGY_TEMPLATE.format(name='BetaStrategy', version=1))
+    os.utime(package_dir, ns=(0, os.stat(package_dir).st_mtime_ns + 2_000_000_000))
+
+    assert 'BetaStrategy' in registry.names()
+    assert registry.get('beta').__name__ == 'BetaStrategy'
+    assert registry.stats()['scans'] == 2
+
+    registry.register('ManualStrategy', dict)
+    assert registry.get('manual') is dict
+    registry.refresh(force=True)
+    assert registry.get('manualstrategy') is dict
@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+
+from advanced_indicators import AdvancedIndicators
+from conftest import make_ohlcv
+from streaming_indicators import (StreamingATR, StreamingBollinger, StreamingEMA, StreamingIchimoku,
+                                  StreamingIndicatorSet, StreamingMACD, StreamingRSI, StreamingStochastic,
+                                  StreamingSupertrend)
+
+STREAM = dict(seed=11, start='2024-01-01', price=30000, open_noise=0.003, wick=0.006, volume=('uniform', 1, 10))
+
+
+def run_stream(indicator, df):
+    """Her mumu tek tek işle; önce oluşan mum olarak, sonra kapanmış olarak"""
+    forming, closed = [], []
+    for high, low, close in zip(df['high'], df['low'], df['close']):
+        forming.append(indicator.update(high, low, close, closed=False))
+        closed.append(indicator.update(high, low, close, closed=True))
+    return forming, closed
+
+
+def column(values, key=None):
+    return np.array([v if key is None else v[key] for v in values], dtype=float)
+
+
+def assert_matches(streamed, expected):
+    np.testing.assert_allclose(streamed, np.asarray(expected, dtype=float), rtol=1e-9, atol=1e-9, equal_nan=True)
+
+
+@pytest.fixture
+def batch():
+    indicators = AdvancedIndicators()
+    df = make_ohlcv(400, **STREAM)
+    df = indicators.calculate_all(df.copy())
+    df = indicators.add_bollinger_bands(df)
+    df = indicators.add_stochastic(df)
+    # calculate_all Supertrend'i ATR(14) ile hesaplar; varsayılan periyot (10) ayrıca hesaplanır
+    supertrend = indicators.calculate_supertrend(make_ohlcv(400, **STREAM), period=10, multiplier=3)
+    for name in ('supertrend', 'supertrend_direction', 'upperband', 'lowerband'):
+        df[name] = supertrend[name]
+    return df
+
+
+def test_single_value_indicators_match_batch(batch):
+    for indicator, column_name in [(StreamingEMA(20), 'ema20'), (StreamingEMA(200), 'ema200'),
+                                   (StreamingRSI(14), 'rsi'), (StreamingATR(14), 'atr')]:
+        forming, closed = run_stream(indicator, batch)
+        assert_matches(column(closed), batch[column_name])
+        # Oluşan mum değeri, mum aynı fiyatla kapandığında kapanış değerine eşittir
+        assert_matches(column(forming), batch[column_name])
+
+
+@pytest.mark.parametrize('indicator, columns', [
+    (StreamingMACD(12, 26, 9), ['macd', 'macd_signal', 'macd_hist']),
+    (StreamingBollinger(20, 2.0), ['bb_middle', 'bb_std', 'bb_upper', 'bb_lower']),
+    (StreamingStochastic(14, 3), ['stoch_k', 'stoch_d']),
+    (StreamingSupertrend(10, 3), ['supertrend', 'supertrend_direction', 'upperband', 'lowerband']),
+    (StreamingIchimoku(), ['tenkan_sen', 'kijun_sen', 'senkou_span_a', 'senkou_span_b']),
+])
+def test_multi_value_indicators_match_batch(batch, indicator, columns):
+    forming, closed = run_stream(indicator, batch)
+    for name in columns:
+        assert_matches(column(closed, name), batch[name])
+        assert_matches(column(forming, name), batch[name])
+
+
+def test_wilder_rsi_matches_ewm():
+    df = make_ohlcv(400, **STREAM)
+    delta = df['close'].diff()
+    gain = delta.where(delta > 0, 0).ewm(alpha=1 / 14, adjust=False, min_periods=14).mean()
+    loss = (-delta.where(delta < 0, 0)).ewm(alpha=1 / 14, adjust=False, min_periods=14).mean()
+
+    _, closed = run_stream(StreamingRSI(14, wilder=True), df)
+
+    assert_matches(column(closed), 100 - (100 / (1 + gain / loss)))
+
+
+def test_forming_ticks_do_not_change_state():
+    df = make_ohlcv(120, **STREAM)
+    indicator = StreamingSupertrend(10, 3)
+    indicator.seed(df['high'][:-1], df['low'][:-1], df['close'][:-1])
+    last = df.iloc[-1]
+
+    for tick in (last['close'] * 0.9, last['close'] * 1.1):
+        indicator.update(last['high'] * 1.1, last['low'] * 0.9, tick, closed=False)
+    value = indicator.update(last['high'], last['low'], last['close'], closed=True)
+
+    expected = AdvancedIndicators().calculate_supertrend(df.copy())
+    assert value['supertrend'] == pytest.approx(expected['supertrend'].iloc[-1], rel=1e-12)
+
+
+def test_indicator_set_sync_processes_only_new_candles(batch):
+    df = batch[['open', 'high', 'low', 'close', 'volume']]
+    state = StreamingIndicatorSet.default()
+
+    # İlk senkronizasyonda son mum oluşan mumdur; sonraki çağrılarda yeni mumlar işlenir
+    state.sync(df.iloc[:300])
+    assert state.last_closed_time == df.index[298]
+    values = state.sync(df.iloc[250:351])
+    assert state.last_closed_time == df.index[349]
+    assert state.indicators['rsi'].count == 350
+
+    for name in ('ema50', 'rsi', 'atr', 'macd_hist', 'bb_upper', 'stoch_d', 'supertrend', 'senkou_span_b'):
+        assert values[name] == pytest.approx(batch[name].iloc[350], rel=1e-9)
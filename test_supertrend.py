@@ -0,0 +1,52 @@
+import numpy as np
+
+from advanced_indicators import AdvancedIndicators
+from conftest import make_ohlcv
+
+
+def reference_supertrend(df, multiplier):
+    """Standart Supertrend tanımının doğrudan pandas uygulaması"""
+    hl2 = (df['high'] + df['low']) / 2
+    basic_upper = (hl2 + multiplier * df['atr']).tolist()
+    basic_lower = (hl2 - multiplier * df['atr']).tolist()
+    close = df['close'].tolist()
+    start = int(np.flatnonzero(df['atr'].notna().to_numpy())[0])
+
+    upper, lower = basic_upper[:], basic_lower[:]
+    direction = [0] * len(df)
+    direction[start] = -1 if close[start] < lower[start] else 1
+    for i in range(start + 1, len(df)):
+        if not (basic_upper[i] < upper[i - 1] or close[i - 1] > upper[i - 1]):
+            upper[i] = upper[i - 1]
+        if not (basic_lower[i] > lower[i - 1] or close[i - 1] < lower[i - 1]):
+            lower[i] = lower[i - 1]
+        if direction[i - 1] == -1:
+            direction[i] = 1 if close[i] > upper[i] else -1
+        else:
+            direction[i] = -1 if close[i] < lower[i] else 1
+    return direction, upper, lower
+
+
+def test_supertrend_matches_reference_definition():
+    indicators = AdvancedIndicators()
+    df = indicators.calculate_atr(make_ohlcv(2000, 7, wick=0.01), 10)
+
+    result = indicators.calculate_supertrend(df.copy(), period=10, multiplier=3)
+    direction, upper, lower = reference_supertrend(df, 3)
+
+    start = 9
+    assert result['supertrend_direction'].tolist() == direction
+    np.testing.assert_allclose(result['upperband'].to_numpy()[start:], upper[start:])
+    np.testing.assert_allclose(result['lowerband'].to_numpy()[start:], lower[start:])
+    expected = np.where(np.array(direction) == 1, lower, upper)
+    np.testing.assert_allclose(result['supertrend'].to_numpy()[start:], expected[start:])
+    assert set(result['supertrend_direction'].unique()) == {-1, 0, 1}
+
+
+def test_supertrend_without_precomputed_atr():
+    df = make_ohlcv(100, 1, wick=0.01)
+
+    result = AdvancedIndicators().calculate_supertrend(df, period=10, multiplier=3)
+
+    assert (result['supertrend'].iloc[:9] == 0).all()
+    assert (result['supertrend'].iloc[9:] > 0).all()
@@ -0,0 +1,63 @@
+import importlib.util
+import os
+
+import numpy as np
+import pytest
+
+from conftest import make_ohlcv
+from signal_encoding import SIGNAL_DTYPE, decode_signals
+
+# strategies.py, strategies/ paketi tarafından gölgelendiği için dosyadan yüklenir
+_spec = importlib.util.spec_from_file_location(
+    'strategies_module', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'strategies.py'))
+strategies_module = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(strategies_module)
+
+
+NOISY = dict(volatility=0.02, open_noise=0.01, wick=0.02, volume=('lognormal', 3, 0.8))
+
+
+def per_row_signals(strategy, df):
+    """Eski generate_signals davranışı: her satır için analyze(df.iloc[:i+1])"""
+    signals = ['HOLD'] * len(df)
+    confidences = [0.0] * len(df)
+    for i in range(30, len(df)):
+        signals[i], confidences[i], _ = strategy.analyze(df.iloc[:i + 1].copy())
+    return signals, confidences
+
+
+@pytest.mark.parametrize('strategy_class', [
+    strategies_module.MACDEMAStrategy,
+    strategies_module.VolatilityStrategy,
+    strategies_module.TrendFollowStrategy,
+])
+@pytest.mark.parametrize('seed', [1, 2, 3])
+def test_vectorized_signals_match_per_row_analyze(strategy_class, seed):
+    df = make_ohlcv(400, seed, **NOISY)
+    strategy = strategy_class()
+
+    result = strategy.generate_signals(df)
+    expected, confidences = per_row_signals(strategy, df)
+
+    assert result['signal'].dtype == SIGNAL_DTYPE
+    assert decode_signals(result['signal']).tolist() == expected
+    np.testing.assert_allclose(result['confidence'], np.asarray(confidences, dtype=np.float32), rtol=1e-6)
+
+
+def test_signals_are_actually_produced():
+    df = make_ohlcv(400, 1, **NOISY)
+    produced = set()
+    for strategy_class in (strategies_module.MACDEMAStrategy, strategies_module.VolatilityStrategy,
+                           strategies_module.TrendFollowStrategy):
+        produced |= set(decode_signals(strategy_class().generate_signals(df)['signal']))
+
+    assert {'BUY', 'SELL'} <= produced
+
+
+def test_input_frame_is_not_modified():
+    df = make_ohlcv(100, 1, **NOISY)
+    columns = list(df.columns)
+
+    strategies_module.MACDEMAStrategy().generate_signals(df)
+
+    assert list(df.columns) == columns